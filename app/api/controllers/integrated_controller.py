@@ -1,7 +1,14 @@
 """
 통합 서비스 컨트롤러
+
+분류 + 위치 조회는 이미지를 읽고 추론하는 동안 사용자 좌표의 모든 쓰레기 종류 주변 배출 장소를
+미리 조회(prefetch)하고, 분류가 끝나면 예측된 종류의 결과만 골라 씁니다.
+전체 지연 시간은 추론과 위치 조회의 합이 아닌 둘 중 긴 쪽에 가까워지며,
+단계별 소요 시간(timings_ms)을 응답에 포함합니다.
 """
-from typing import Dict, Any, List, Optional
+import time
+import asyncio
+from typing import Dict, Any, List, Optional, Awaitable, Tuple
 from fastapi import UploadFile, File, HTTPException, Query
 from sqlalchemy.orm import Session
 
@@ -9,6 +16,21 @@ from app.api.base import BaseController, APIResponse, RequestValidator, ErrorHan
 from app.core.interfaces import IImageClassifier, ILocationService
 
 
+async def _timed(awaitable: Awaitable[Any]) -> Tuple[Any, float]:
+    """결과와 소요 시간(ms)"""
+    started = time.perf_counter()
+    result = await awaitable
+    return result, round((time.perf_counter() - started) * 1000, 1)
+
+
+def _discard(task: "asyncio.Future") -> None:
+    """더 기다리지 않을 작업 정리 (실행 중이면 취소, 끝났으면 예외를 회수해 경고가 남지 않게 함)"""
+    if not task.done():
+        task.cancel()
+    elif not task.cancelled():
+        task.exception()
+
+
 class IntegratedController(BaseController):
     """통합 서비스 컨트롤러"""
     
@@ -21,13 +43,14 @@ class IntegratedController(BaseController):
         """요청 데이터 검증"""
         return True
     
-    def classify_and_find_locations(self, 
+    async def classify_and_find_locations(self, 
                                   file: UploadFile,
                                   latitude: float,
                                   longitude: float,
                                   radius_km: float = 5.0,
                                   limit: int = 10) -> APIResponse:
-        """이미지 분류 + 주변 배출 장소 조회"""
+        """이미지 분류 + 주변 배출 장소 조회 (추론과 위치 조회를 동시에 실행)"""
+        started = time.perf_counter()
         try:
             # 파일 검증
             if not RequestValidator.validate_image_file(file.content_type):
@@ -45,28 +68,32 @@ class IntegratedController(BaseController):
             if not RequestValidator.validate_limit(limit):
                 return APIResponse.error("제한 수는 0보다 크고 100 이하여야 합니다.")
             
-            # 1. 이미지 분류
-            contents = file.read()
-            classification_result = self.classifier.classify_image_from_bytes(contents)
+            # 1. 분류 결과를 기다리지 않고 모든 쓰레기 종류의 주변 배출 장소 조회 시작
+            waste_info = self.location_service.get_waste_type_info()
+            prefetch = self._prefetch_locations(latitude, longitude, list(waste_info), radius_km, limit)
+            try:
+                # 2. 이미지 읽기와 분류 (추론은 이벤트 루프를 막지 않도록 작업 스레드에서 실행)
+                contents, read_ms = await _timed(file.read())
+                classification_result, inference_ms = await _timed(
+                    asyncio.to_thread(self.classifier.classify_image_from_bytes, contents)
+                )
             
-            if 'error' in classification_result:
-                return APIResponse.error(classification_result['error'])
+                if 'error' in classification_result:
+                    return APIResponse.error(classification_result['error'])
             
-            # 2. 분류된 쓰레기 종류에 따른 주변 배출 장소 조회
-            waste_type = classification_result['predicted_class']
-            nearby_locations = self.location_service.find_nearby_locations(
-                latitude=latitude,
-                longitude=longitude,
-                waste_type=waste_type,
-                radius_km=radius_km,
-                limit=limit
+                # 3. 미리 조회한 결과에서 분류된 종류의 배출 장소 선택
+                waste_type = classification_result['predicted_class']
+                (locations_by_type, location_ms), location_wait_ms = await _timed(prefetch)
+            finally:
+                _discard(prefetch)
+            nearby_locations = await self._select_locations(
+                locations_by_type, waste_type, latitude, longitude, radius_km, limit
             )
             
-            # 3. 쓰레기 종류별 정보 조회
-            waste_info = self.location_service.get_waste_type_info()
+            # 4. 쓰레기 종류별 정보 조회
             waste_type_info = waste_info.get(waste_type, {})
             
-            # 4. 결과 통합
+            # 5. 결과 통합
             result = {
                 "classification": {
                     "filename": file.filename,
@@ -83,6 +110,13 @@ class IntegratedController(BaseController):
                 "user_location": {
                     "latitude": latitude,
                     "longitude": longitude
+                },
+                "timings_ms": {
+                    "read": read_ms,
+                    "inference": inference_ms,
+                    "location_lookup": location_ms,
+                    "location_wait": location_wait_ms,
+                    "total": round((time.perf_counter() - started) * 1000, 1)
                 }
             }
             
@@ -91,13 +125,14 @@ class IntegratedController(BaseController):
         except Exception as e:
             raise ErrorHandler.handle_internal_error(e)
     
-    def batch_classify_and_find_locations(self, 
+    async def batch_classify_and_find_locations(self, 
                                          files: List[UploadFile],
                                          latitude: float,
                                          longitude: float,
                                          radius_km: float = 5.0,
                                          limit: int = 10) -> APIResponse:
-        """여러 이미지 일괄 분류 + 주변 배출 장소 조회"""
+        """여러 이미지 일괄 분류 + 주변 배출 장소 조회 (모든 이미지가 같은 좌표라 위치는 한 번만 조회)"""
+        started = time.perf_counter()
         try:
             if len(files) > 10:
                 return APIResponse.error("한 번에 최대 10개 파일까지만 처리 가능합니다.")
@@ -116,84 +151,138 @@ class IntegratedController(BaseController):
             
             waste_info = self.location_service.get_waste_type_info()
             results = []
+            inference_ms = 0.0
             
-            for file in files:
-                try:
-                    # 파일 검증
-                    if not RequestValidator.validate_image_file(file.content_type):
+            # 분류하는 동안 모든 쓰레기 종류의 주변 배출 장소를 한 번 조회
+            prefetch = self._prefetch_locations(latitude, longitude, list(waste_info), radius_km, limit)
+            locations_by_type: Optional[Dict[str, List[Dict[str, Any]]]] = None
+            location_ms = location_wait_ms = 0.0
+            
+            try:
+                for file in files:
+                    try:
+                        # 파일 검증
+                        if not RequestValidator.validate_image_file(file.content_type):
+                            results.append({
+                                "filename": file.filename,
+                                "error": "이미지 파일이 아닙니다.",
+                                "classification": None,
+                                "nearby_locations": None
+                            })
+                            continue
+                        
+                        # 파일 읽기
+                        contents = await file.read()
+                        
+                        # 이미지 분류 (작업 스레드)
+                        classification_result, elapsed_ms = await _timed(
+                            asyncio.to_thread(self.classifier.classify_image_from_bytes, contents)
+                        )
+                        inference_ms += elapsed_ms
+                        
+                        if 'error' in classification_result:
+                            results.append({
+                                "filename": file.filename,
+                                "error": classification_result['error'],
+                                "classification": None,
+                                "nearby_locations": None
+                            })
+                            continue
+                        
+                        # 미리 조회한 결과에서 분류된 쓰레기 종류의 배출 장소 선택
+                        waste_type = classification_result['predicted_class']
+                        if locations_by_type is None:
+                            (locations_by_type, location_ms), location_wait_ms = await _timed(prefetch)
+                        nearby_locations = await self._select_locations(
+                            locations_by_type, waste_type, latitude, longitude, radius_km, limit
+                        )
+                        
+                        # 쓰레기 종류별 정보
+                        waste_type_info = waste_info.get(waste_type, {})
+                        
+                        # 결과 추가
                         results.append({
                             "filename": file.filename,
-                            "error": "이미지 파일이 아닙니다.",
-                            "classification": None,
-                            "nearby_locations": None
+                            "classification": {
+                                "predicted_class": classification_result['predicted_class'],
+                                "confidence": classification_result['confidence'],
+                                "is_recyclable": classification_result['is_recyclable'],
+                                "class_probabilities": classification_result['class_probabilities']
+                            },
+                            "waste_type_info": waste_type_info,
+                            "nearby_locations": {
+                                "count": len(nearby_locations),
+                                "locations": nearby_locations
+                            }
                         })
-                        continue
-                    
-                    # 파일 읽기
-                    contents = file.read()
                     
-                    # 이미지 분류
-                    classification_result = self.classifier.classify_image_from_bytes(contents)
-                    
-                    if 'error' in classification_result:
+                    except Exception as e:
                         results.append({
                             "filename": file.filename,
-                            "error": classification_result['error'],
+                            "error": f"처리 중 오류가 발생했습니다: {str(e)}",
                             "classification": None,
                             "nearby_locations": None
                         })
-                        continue
-                    
-                    # 분류된 쓰레기 종류에 따른 주변 배출 장소 조회
-                    waste_type = classification_result['predicted_class']
-                    nearby_locations = self.location_service.find_nearby_locations(
-                        latitude=latitude,
-                        longitude=longitude,
-                        waste_type=waste_type,
-                        radius_km=radius_km,
-                        limit=limit
-                    )
                     
-                    # 쓰레기 종류별 정보
-                    waste_type_info = waste_info.get(waste_type, {})
+            finally:
+                _discard(prefetch)
                     
-                    # 결과 추가
-                    results.append({
-                        "filename": file.filename,
-                        "classification": {
-                            "predicted_class": classification_result['predicted_class'],
-                            "confidence": classification_result['confidence'],
-                            "is_recyclable": classification_result['is_recyclable'],
-                            "class_probabilities": classification_result['class_probabilities']
-                        },
-                        "waste_type_info": waste_type_info,
-                        "nearby_locations": {
-                            "count": len(nearby_locations),
-                            "locations": nearby_locations
-                        }
-                    })
-                    
-                except Exception as e:
-                    results.append({
-                        "filename": file.filename,
-                        "error": f"처리 중 오류가 발생했습니다: {str(e)}",
-                        "classification": None,
-                        "nearby_locations": None
-                    })
-            
             return APIResponse.success({
                 "total_files": len(files),
                 "user_location": {
                     "latitude": latitude,
                     "longitude": longitude
                 },
-                "results": results
+                "results": results,
+                "timings_ms": {
+                    "inference": round(inference_ms, 1),
+                    "location_lookup": location_ms,
+                    "location_wait": location_wait_ms,
+                    "total": round((time.perf_counter() - started) * 1000, 1)
+                }
             })
             
         except Exception as e:
             raise ErrorHandler.handle_internal_error(e)
     
-    def get_smart_recommendation(self, 
+    def _prefetch_locations(self,
+                            latitude: float,
+                            longitude: float,
+                            waste_types: List[str],
+                            radius_km: float,
+                            limit: int) -> "asyncio.Future":
+        """여러 쓰레기 종류의 주변 배출 장소 조회를 백그라운드로 시작 (결과와 소요 시간 반환)"""
+        async def prefetch():
+            # 조회 코루틴은 작업 안에서 만들어 시작 전에 취소돼도 대기되지 않은 코루틴이 남지 않게 함
+            return await _timed(self.location_service.find_nearby_locations_multi(
+                latitude=latitude,
+                longitude=longitude,
+                waste_types=waste_types,
+                radius_km=radius_km,
+                limit=limit
+            ))
+        
+        return asyncio.ensure_future(prefetch())
+    
+    async def _select_locations(self,
+                                locations_by_type: Dict[str, List[Dict[str, Any]]],
+                                waste_type: str,
+                                latitude: float,
+                                longitude: float,
+                                radius_km: float,
+                                limit: int) -> List[Dict[str, Any]]:
+        """미리 조회한 결과에서 종류별 배출 장소 선택 (미리 조회하지 않은 종류면 따로 조회)"""
+        if waste_type in locations_by_type:
+            return locations_by_type[waste_type]
+        return await self.location_service.find_nearby_locations(
+            latitude=latitude,
+            longitude=longitude,
+            waste_type=waste_type,
+            radius_km=radius_km,
+            limit=limit
+        )
+    
+    async def get_smart_recommendation(self, 
                                latitude: float,
                                longitude: float,
                                radius_km: float = 5.0) -> APIResponse:
@@ -210,16 +299,16 @@ class IntegratedController(BaseController):
             waste_info = self.location_service.get_waste_type_info()
             recommendations = {}
             
-            # 각 쓰레기 종류별로 최적 배출 장소 조회
-            for waste_type in ['glass', 'paper', 'plastic', 'metal']:
-                nearby_locations = self.location_service.find_nearby_locations(
-                    latitude=latitude,
-                    longitude=longitude,
-                    waste_type=waste_type,
-                    radius_km=radius_km,
-                    limit=3  # 각 종류별로 최대 3개씩
-                )
+            # 후보를 한 번만 조회해 쓰레기 종류별 최적 배출 장소로 나눔 (각 종류별로 최대 3개씩)
+            locations_by_type = await self.location_service.find_nearby_locations_multi(
+                latitude=latitude,
+                longitude=longitude,
+                waste_types=['glass', 'paper', 'plastic', 'metal'],
+                radius_km=radius_km,
+                limit=3
+            )
                 
+            for waste_type, nearby_locations in locations_by_type.items():
                 recommendations[waste_type] = {
                     "waste_info": waste_info.get(waste_type, {}),
                     "locations": nearby_locations,
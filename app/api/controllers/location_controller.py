@@ -1,20 +1,23 @@
 """
 위치 기반 서비스 컨트롤러
 """
+import codecs
+import asyncio
 from typing import Dict, Any, List, Optional
-from fastapi import HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import HTTPException, Query, UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.base import BaseController, APIResponse, RequestValidator, ErrorHandler
 from app.core.interfaces import ILocationService
+from app.services.location_import import detect_import_format
 
 
 class LocationController(BaseController):
-    """위치 기반 서비스 컨트롤러"""
+    """위치 기반 서비스 컨트롤러 (비동기 DB 세션 사용)"""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         super().__init__(db)
-        self.location_service = self.get_service('location_service')
+        self.location_service = self.get_service('async_location_service')
     
     def validate_request(self, request_data: Dict[str, Any]) -> bool:
         """요청 데이터 검증"""
@@ -41,8 +44,8 @@ class LocationController(BaseController):
             if not RequestValidator.validate_limit(limit):
                 return APIResponse.error("제한 수는 0보다 크고 100 이하여야 합니다.")
             
-            # 주변 배출 장소 조회 (공공 API + 로컬 DB)
-            locations = await self.location_service.find_nearby_locations(
+            # 주변 배출 장소 조회 (공공 API + 로컬 DB 동시 조회)
+            result = await self.location_service.search_nearby_locations(
                 latitude=latitude,
                 longitude=longitude,
                 waste_type=waste_type,
@@ -51,17 +54,18 @@ class LocationController(BaseController):
             )
             
             return APIResponse.success({
-                "count": len(locations),
-                "locations": locations
+                "count": len(result['locations']),
+                "locations": result['locations'],
+                "sources": result['sources']
             })
             
         except Exception as e:
             raise ErrorHandler.handle_internal_error(e)
     
-    def get_location_by_id(self, location_id: int) -> APIResponse:
+    async def get_location_by_id(self, location_id: int) -> APIResponse:
         """ID로 배출 장소 조회"""
         try:
-            location = self.location_service.get_location_by_id(location_id)
+            location = await self.location_service.get_location_by_id(location_id)
             
             if not location:
                 raise ErrorHandler.handle_not_found_error("배출 장소")
@@ -73,7 +77,7 @@ class LocationController(BaseController):
         except Exception as e:
             raise ErrorHandler.handle_internal_error(e)
     
-    def add_recycling_location(self, location_data: Dict[str, Any]) -> APIResponse:
+    async def add_recycling_location(self, location_data: Dict[str, Any]) -> APIResponse:
         """새로운 분리수거 배출 장소 추가"""
         try:
             # 필수 필드 검증
@@ -90,7 +94,7 @@ class LocationController(BaseController):
                 return APIResponse.error("올바르지 않은 좌표입니다.")
             
             # 배출 장소 추가
-            location = self.location_service.add_recycling_location(**location_data)
+            location = await self.location_service.add_recycling_location(**location_data)
             
             return APIResponse.success({
                 "message": "배출 장소가 성공적으로 추가되었습니다.",
@@ -100,7 +104,7 @@ class LocationController(BaseController):
         except Exception as e:
             raise ErrorHandler.handle_internal_error(e)
     
-    def update_recycling_location(self, location_id: int, location_data: Dict[str, Any]) -> APIResponse:
+    async def update_recycling_location(self, location_id: int, location_data: Dict[str, Any]) -> APIResponse:
         """분리수거 배출 장소 정보 수정"""
         try:
             # 좌표 검증 (있는 경우)
@@ -112,7 +116,7 @@ class LocationController(BaseController):
                     return APIResponse.error("올바르지 않은 좌표입니다.")
             
             # 배출 장소 수정
-            location = self.location_service.update_recycling_location(location_id, **location_data)
+            location = await self.location_service.update_recycling_location(location_id, **location_data)
             
             if not location:
                 raise ErrorHandler.handle_not_found_error("배출 장소")
@@ -127,10 +131,10 @@ class LocationController(BaseController):
         except Exception as e:
             raise ErrorHandler.handle_internal_error(e)
     
-    def delete_recycling_location(self, location_id: int) -> APIResponse:
+    async def delete_recycling_location(self, location_id: int) -> APIResponse:
         """분리수거 배출 장소 삭제"""
         try:
-            success = self.location_service.delete_recycling_location(location_id)
+            success = await self.location_service.delete_recycling_location(location_id)
             
             if not success:
                 raise ErrorHandler.handle_not_found_error("배출 장소")
@@ -144,33 +148,62 @@ class LocationController(BaseController):
         except Exception as e:
             raise ErrorHandler.handle_internal_error(e)
     
-    def save_user_location(self, 
+    async def save_user_location(self, 
                           latitude: float, 
                           longitude: float,
                           user_id: Optional[str] = None,
-                          address: Optional[str] = None) -> APIResponse:
-        """사용자 위치 저장"""
+                          address: Optional[str] = None,
+                          wait: bool = False) -> APIResponse:
+        """사용자 위치 저장 (wait=False면 지연 쓰기 버퍼에 넣고 바로 반환)"""
         try:
             # 좌표 검증
             if not RequestValidator.validate_coordinates(latitude, longitude):
                 return APIResponse.error("올바르지 않은 좌표입니다.")
             
             # 사용자 위치 저장
-            user_location = self.location_service.save_user_location(
+            user_location = await self.location_service.save_user_location(
                 latitude=latitude,
                 longitude=longitude,
                 user_id=user_id,
-                address=address
+                address=address,
+                wait=wait
             )
             
+            queued = user_location['id'] is None
             return APIResponse.success({
-                "message": "사용자 위치가 성공적으로 저장되었습니다.",
+                "message": "사용자 위치 저장이 접수되었습니다." if queued else "사용자 위치가 성공적으로 저장되었습니다.",
+                "queued": queued,
                 "location": user_location
             })
             
         except Exception as e:
             raise ErrorHandler.handle_internal_error(e)
     
+    async def import_locations(self, file: UploadFile, source: str) -> APIResponse:
+        """CSV/JSON 파일의 배출 장소 대량 가져오기"""
+        try:
+            try:
+                file_format = detect_import_format(file.filename)
+            except ValueError as e:
+                return APIResponse.error(str(e))
+            
+            import_service = self.service_container.get('location_import_service')
+            # 업로드 파일을 텍스트로 스트리밍하며 DB 쓰기는 스레드에서 실행
+            stream = codecs.getreader('utf-8-sig')(file.file)
+            try:
+                result = await asyncio.to_thread(import_service.import_stream, stream, file_format, source)
+            except ValueError as e:
+                return APIResponse.error(str(e))
+            
+            return APIResponse.success({
+                "message": f"배출 장소 {result['inserted']}건 추가, {result['updated']}건 갱신되었습니다.",
+                "filename": file.filename,
+                "result": result
+            })
+        
+        except Exception as e:
+            raise ErrorHandler.handle_internal_error(e)
+    
     def get_waste_type_info(self) -> APIResponse:
         """쓰레기 종류별 정보 조회"""
         try:
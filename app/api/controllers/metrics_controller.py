@@ -0,0 +1,54 @@
+"""
+운영 지표 컨트롤러
+"""
+from typing import Dict, Any
+from sqlalchemy.orm import Session
+
+from app.api.base import BaseController, APIResponse, ErrorHandler
+from app.core.http_client import http_client_manager
+from app.core.database import engine, async_engine
+
+
+class MetricsController(BaseController):
+    """운영 지표 컨트롤러 (HTTP/DB 연결 풀, 위치 인덱스, 공공 시설 캐시 등)"""
+    
+    def __init__(self, db: Session):
+        super().__init__(db)
+    
+    def validate_request(self, request_data: Dict[str, Any]) -> bool:
+        """요청 데이터 검증 (지표 조회는 입력 없음)"""
+        return True
+    
+    def get_metrics(self) -> APIResponse:
+        """지표 조회"""
+        try:
+            metrics = {
+                "http_client": http_client_manager.stats(),
+                "db_pool": {
+                    "sync": engine.pool.status(),
+                    "async": async_engine.pool.status()
+                }
+            }
+            
+            # 아직 생성되지 않은 싱글톤은 지표 조회 때문에 만들지 않음
+            location_index = self.service_container.get_if_created('location_index')
+            if location_index is not None:
+                metrics["location_index"] = location_index.stats()
+            
+            public_api_service = self.service_container.get_if_created('public_api_service')
+            if public_api_service is not None:
+                metrics["facility_cache"] = public_api_service.facility_cache.stats()
+                metrics["public_api_breaker"] = public_api_service.breaker.stats()
+            
+            facility_sync_service = self.service_container.get_if_created('facility_sync_service')
+            if facility_sync_service is not None:
+                metrics["facility_sync"] = facility_sync_service.stats()
+            
+            user_location_buffer = self.service_container.get_if_created('user_location_buffer')
+            if user_location_buffer is not None:
+                metrics["user_location_buffer"] = user_location_buffer.stats()
+            
+            return APIResponse.success(metrics)
+        
+        except Exception as e:
+            raise ErrorHandler.handle_internal_error(e)
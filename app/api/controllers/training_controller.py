@@ -0,0 +1,84 @@
+"""
+훈련 작업 컨트롤러
+"""
+from typing import Dict, Any, Optional
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.api.base import BaseController, APIResponse, ErrorHandler
+
+
+class TrainingController(BaseController):
+    """훈련 작업 컨트롤러 (훈련은 별도 프로세스에서 실행)"""
+    
+    def __init__(self, db: Session):
+        super().__init__(db)
+        self.job_manager = self.get_service('training_job_manager')
+    
+    def validate_request(self, request_data: Dict[str, Any]) -> bool:
+        """요청 데이터 검증"""
+        return bool(request_data.get('data_dir')) and request_data.get('epochs', 1) >= 1
+    
+    def submit_job(self, request_data: Dict[str, Any]) -> APIResponse:
+        """훈련 작업 제출"""
+        try:
+            if not self.validate_request(request_data):
+                return APIResponse.error("data_dir가 필요하며 에포크 수는 1 이상이어야 합니다.")
+            
+            job = self.job_manager.submit(**request_data)
+            return APIResponse.success({"job": job}, message="훈련 작업이 제출되었습니다.")
+        
+        except ValueError as e:
+            return APIResponse.error(str(e))
+        except Exception as e:
+            raise ErrorHandler.handle_internal_error(e)
+    
+    def list_jobs(self) -> APIResponse:
+        """훈련 작업 목록 조회"""
+        try:
+            jobs = self.job_manager.list_jobs()
+            return APIResponse.success({"count": len(jobs), "jobs": jobs})
+        except Exception as e:
+            raise ErrorHandler.handle_internal_error(e)
+    
+    def get_job(self, job_id: str) -> APIResponse:
+        """훈련 작업 상태 조회 (에포크별 진행 상황 포함)"""
+        try:
+            job = self.job_manager.get_status(job_id)
+            if not job:
+                raise ErrorHandler.handle_not_found_error("훈련 작업")
+            return APIResponse.success({"job": job})
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise ErrorHandler.handle_internal_error(e)
+    
+    def cancel_job(self, job_id: str) -> APIResponse:
+        """훈련 작업 취소"""
+        try:
+            job = self.job_manager.cancel(job_id)
+            if not job:
+                raise ErrorHandler.handle_not_found_error("훈련 작업")
+            return APIResponse.success({"job": job}, message="훈련 작업이 취소되었습니다.")
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise ErrorHandler.handle_internal_error(e)
+    
+    def deploy_job(self, job_id: str) -> APIResponse:
+        """완료된 훈련 작업의 모델을 추론 서비스에 적용"""
+        try:
+            job = self.job_manager.deploy(job_id)
+            if not job:
+                raise ErrorHandler.handle_not_found_error("훈련 작업")
+            
+            if not job['deployment'].get('reloaded'):
+                return APIResponse.error(job['deployment'].get('error', '모델 교체에 실패했습니다.'), data={"job": job})
+            return APIResponse.success({"job": job}, message="모델이 교체되었습니다.")
+        
+        except ValueError as e:
+            return APIResponse.error(str(e))
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise ErrorHandler.handle_internal_error(e)
@@ -24,7 +24,7 @@ async def classify_and_find_locations(
     """이미지 분류 + 주변 배출 장소 조회 통합 API"""
     try:
         controller = IntegratedController(db)
-        response = controller.classify_and_find_locations(
+        response = await controller.classify_and_find_locations(
             file=file,
             latitude=latitude,
             longitude=longitude,
@@ -48,7 +48,7 @@ async def batch_classify_and_find_locations(
     """여러 이미지 일괄 분류 + 주변 배출 장소 조회"""
     try:
         controller = IntegratedController(db)
-        response = controller.batch_classify_and_find_locations(
+        response = await controller.batch_classify_and_find_locations(
             files=files,
             latitude=latitude,
             longitude=longitude,
@@ -70,7 +70,7 @@ async def get_smart_recommendation(
     """스마트 추천 - 사용자 위치 기반 최적 배출 장소 추천"""
     try:
         controller = IntegratedController(db)
-        response = controller.get_smart_recommendation(
+        response = await controller.get_smart_recommendation(
             latitude=latitude,
             longitude=longitude,
             radius_km=radius_km
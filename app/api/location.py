@@ -1,14 +1,15 @@
 """
 개선된 위치 기반 서비스 API v2
 """
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, File, UploadFile
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 from pydantic import BaseModel
 
 from app.api.base import ErrorHandler
 from app.api.controllers.location_controller import LocationController
-from app.core.database import get_db
+from app.core.database import get_async_db
+from app.services.location_import import IMPORT_SOURCE
 
 router = APIRouter(prefix="/location", tags=["location"])
 
@@ -32,7 +33,7 @@ async def get_nearby_locations(
     waste_type: Optional[str] = Query(None, description="쓰레기 종류"),
     radius_km: float = Query(5.0, description="검색 반경 (km)"),
     limit: int = Query(10, description="최대 결과 수"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """주변 분리수거 배출 장소 조회 (공공 API + 로컬 DB)"""
     try:
@@ -49,15 +50,30 @@ async def get_nearby_locations(
         raise ErrorHandler.handle_internal_error(e)
 
 
+@router.post("/admin/import")
+async def import_locations(
+    file: UploadFile = File(..., description="배출 장소 CSV/JSON 파일"),
+    source: str = Query(IMPORT_SOURCE, description="데이터 출처 (같은 출처 안에서 external_id로 upsert)"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """배출 장소 대량 가져오기 (배치 upsert 후 공간 인덱스 재구성)"""
+    try:
+        controller = LocationController(db)
+        response = await controller.import_locations(file, source)
+        return response.to_dict()
+    except Exception as e:
+        raise ErrorHandler.handle_internal_error(e)
+
+
 @router.get("/{location_id}")
 async def get_location_by_id(
     location_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """ID로 배출 장소 조회"""
     try:
         controller = LocationController(db)
-        response = controller.get_location_by_id(location_id)
+        response = await controller.get_location_by_id(location_id)
         return response.to_dict()
     except Exception as e:
         raise ErrorHandler.handle_internal_error(e)
@@ -66,12 +82,12 @@ async def get_location_by_id(
 @router.post("/add")
 async def add_recycling_location(
     request: RecyclingLocationRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """새로운 분리수거 배출 장소 추가"""
     try:
         controller = LocationController(db)
-        response = controller.add_recycling_location(request.dict())
+        response = await controller.add_recycling_location(request.dict())
         return response.to_dict()
     except Exception as e:
         raise ErrorHandler.handle_internal_error(e)
@@ -81,12 +97,12 @@ async def add_recycling_location(
 async def update_recycling_location(
     location_id: int,
     request: RecyclingLocationRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """분리수거 배출 장소 정보 수정"""
     try:
         controller = LocationController(db)
-        response = controller.update_recycling_location(location_id, request.dict())
+        response = await controller.update_recycling_location(location_id, request.dict())
         return response.to_dict()
     except Exception as e:
         raise ErrorHandler.handle_internal_error(e)
@@ -95,12 +111,12 @@ async def update_recycling_location(
 @router.delete("/{location_id}")
 async def delete_recycling_location(
     location_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """분리수거 배출 장소 삭제"""
     try:
         controller = LocationController(db)
-        response = controller.delete_recycling_location(location_id)
+        response = await controller.delete_recycling_location(location_id)
         return response.to_dict()
     except Exception as e:
         raise ErrorHandler.handle_internal_error(e)
@@ -112,16 +128,18 @@ async def save_user_location(
     longitude: float = Query(..., description="경도"),
     user_id: Optional[str] = Query(None, description="사용자 ID"),
     address: Optional[str] = Query(None, description="주소"),
-    db: Session = Depends(get_db)
+    wait: bool = Query(False, description="저장이 끝날 때까지 기다리고 생성된 id 반환"),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """사용자 위치 저장"""
+    """사용자 위치 저장 (기본적으로 지연 쓰기 버퍼에 넣고 바로 반환)"""
     try:
         controller = LocationController(db)
-        response = controller.save_user_location(
+        response = await controller.save_user_location(
             latitude=latitude,
             longitude=longitude,
             user_id=user_id,
-            address=address
+            address=address,
+            wait=wait
         )
         return response.to_dict()
     except Exception as e:
@@ -129,7 +147,7 @@ async def save_user_location(
 
 
 @router.get("/waste-types/info")
-async def get_waste_type_info(db: Session = Depends(get_db)):
+async def get_waste_type_info(db: AsyncSession = Depends(get_async_db)):
     """쓰레기 종류별 정보 조회"""
     try:
         controller = LocationController(db)
@@ -0,0 +1,24 @@
+"""
+운영 지표 API
+"""
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.api.base import ErrorHandler
+from app.api.controllers.metrics_controller import MetricsController
+from app.core.database import get_db
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("")
+async def get_metrics(db: Session = Depends(get_db)):
+    """HTTP 연결 풀(사용 중 연결, 대기 횟수 등)과 서비스 지표 조회"""
+    try:
+        controller = MetricsController(db)
+        response = controller.get_metrics()
+        return response.to_dict()
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise ErrorHandler.handle_internal_error(e)
@@ -0,0 +1,103 @@
+"""
+훈련 작업 API
+"""
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from typing import Optional, Dict, Any
+from pydantic import BaseModel
+
+from app.api.base import ErrorHandler
+from app.api.controllers.training_controller import TrainingController
+from app.core.database import get_db
+
+router = APIRouter(prefix="/training", tags=["training"])
+
+
+class TrainingJobRequest(BaseModel):
+    """훈련 작업 제출 요청 모델"""
+    data_dir: str
+    epochs: int = 10
+    manifest_path: Optional[str] = None
+    head_config: Optional[Dict[str, Any]] = None
+    auto_reload: bool = False
+
+
+@router.post("/jobs")
+async def submit_training_job(
+    request: TrainingJobRequest,
+    db: Session = Depends(get_db)
+):
+    """훈련 작업 제출 (별도 프로세스에서 실행)"""
+    try:
+        controller = TrainingController(db)
+        response = controller.submit_job(request.dict())
+        return response.to_dict()
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise ErrorHandler.handle_internal_error(e)
+
+
+@router.get("/jobs")
+async def list_training_jobs(db: Session = Depends(get_db)):
+    """훈련 작업 목록 조회"""
+    try:
+        controller = TrainingController(db)
+        response = controller.list_jobs()
+        return response.to_dict()
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise ErrorHandler.handle_internal_error(e)
+
+
+@router.get("/jobs/{job_id}")
+async def get_training_job(
+    job_id: str,
+    db: Session = Depends(get_db)
+):
+    """훈련 작업 상태 및 에포크별 진행 상황 조회"""
+    try:
+        controller = TrainingController(db)
+        response = controller.get_job(job_id)
+        return response.to_dict()
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise ErrorHandler.handle_internal_error(e)
+
+
+@router.delete("/jobs/{job_id}")
+async def cancel_training_job(
+    job_id: str,
+    db: Session = Depends(get_db)
+):
+    """훈련 작업 취소"""
+    try:
+        controller = TrainingController(db)
+        # 작업 관리자 잠금을 기다릴 수 있으므로 이벤트 루프 밖에서 실행
+        response = await asyncio.to_thread(controller.cancel_job, job_id)
+        return response.to_dict()
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise ErrorHandler.handle_internal_error(e)
+
+
+@router.post("/jobs/{job_id}/deploy")
+async def deploy_training_job(
+    job_id: str,
+    db: Session = Depends(get_db)
+):
+    """완료된 작업의 모델을 추론 서비스에 무중단 적용"""
+    try:
+        controller = TrainingController(db)
+        # 모델 로드와 워밍업 추론이 서빙 요청을 막지 않도록 이벤트 루프 밖에서 실행
+        response = await asyncio.to_thread(controller.deploy_job, job_id)
+        return response.to_dict()
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise ErrorHandler.handle_internal_error(e)
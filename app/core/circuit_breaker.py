@@ -0,0 +1,214 @@
+"""
+외부 API 호출용 서킷 브레이커
+
+최근 호출의 실패율과 지연 시간을 추적해 상위 서비스가 느려지거나 실패하면 회로를 열고(open),
+일정 시간 동안 호출 없이 즉시 실패시켜 요청 지연이 상위 장애에 묶이지 않게 합니다.
+대기 시간이 지나면 반열림(half-open) 상태에서 일부 호출로 복구 여부를 확인합니다.
+
+타임아웃은 고정값 대신 최근 성공 호출 지연 시간의 p95에 배수를 곱해 정하고,
+[최소, 최대] 범위로 제한합니다. 타임아웃도 실패로 집계됩니다.
+
+환경 변수 (접두사는 create_circuit_breaker의 env_prefix, 예: PUBLIC_API_BREAKER):
+{prefix}_FAILURE_RATE: 회로를 여는 실패율 (기본값: 0.5)
+{prefix}_MIN_CALLS: 실패율을 판단할 최소 호출 수 (기본값: 10)
+{prefix}_WINDOW: 실패율을 계산할 최근 호출 수 (기본값: 50)
+{prefix}_CONSECUTIVE_FAILURES: 바로 회로를 여는 연속 실패 수 (기본값: 5)
+{prefix}_OPEN_SECONDS: 열린 상태 유지 시간(초), 반열림 확인 실패 시 두 배씩 늘어남 (기본값: 30)
+{prefix}_TIMEOUT_MIN_MS / {prefix}_TIMEOUT_MAX_MS: 적응형 타임아웃 범위 (기본값: 500 / 5000)
+"""
+import os
+import time
+import asyncio
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import numpy as np
+
+
+# 회로 상태
+STATE_CLOSED = 'closed'
+STATE_OPEN = 'open'
+STATE_HALF_OPEN = 'half_open'
+
+MIN_LATENCY_SAMPLES = 20
+MAX_OPEN_SECONDS = 600.0
+
+
+class CircuitOpenError(Exception):
+    """회로가 열려 있어 호출하지 않음"""
+
+
+class CircuitBreaker:
+    """실패율/연속 실패 기반 서킷 브레이커와 p95 기반 적응형 타임아웃"""
+    
+    def __init__(self,
+                 name: str,
+                 failure_rate_threshold: float = 0.5,
+                 min_calls: int = 10,
+                 window_size: int = 50,
+                 consecutive_failure_threshold: int = 5,
+                 open_seconds: float = 30.0,
+                 half_open_max_calls: int = 1,
+                 min_timeout: float = 0.5,
+                 max_timeout: float = 5.0,
+                 timeout_multiplier: float = 1.5,
+                 latency_window: int = 200):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.min_calls = min_calls
+        self.consecutive_failure_threshold = consecutive_failure_threshold
+        self.base_open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.timeout_multiplier = timeout_multiplier
+        
+        self.state = STATE_CLOSED
+        self._outcomes = deque(maxlen=window_size)  # 최근 호출 성공 여부
+        self._latencies = deque(maxlen=latency_window)  # 최근 성공 호출 지연 시간(초)
+        self._consecutive_failures = 0
+        self._open_seconds = open_seconds
+        self._opened_at = 0.0
+        self._half_open_in_flight = 0
+        
+        self.calls = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.rejected = 0
+        self.opened = 0
+        self.last_failure: Optional[str] = None
+    
+    def timeout(self) -> float:
+        """현재 호출 타임아웃(초): 최근 p95 x 배수 (표본이 적으면 최대값)"""
+        if len(self._latencies) < MIN_LATENCY_SAMPLES:
+            return self.max_timeout
+        p95 = float(np.percentile(self._latencies, 95))
+        return min(max(p95 * self.timeout_multiplier, self.min_timeout), self.max_timeout)
+    
+    def allow_request(self) -> bool:
+        """호출 가능 여부 (열린 상태에서 대기 시간이 지나면 반열림으로 전환)"""
+        if self.state == STATE_OPEN and time.monotonic() - self._opened_at >= self._open_seconds:
+            self.state = STATE_HALF_OPEN
+            self._half_open_in_flight = 0
+        if self.state == STATE_CLOSED:
+            return True
+        if self.state == STATE_HALF_OPEN and self._half_open_in_flight < self.half_open_max_calls:
+            return True
+        return False
+    
+    async def call(self, func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """
+        회로를 통해 비동기 함수 호출
+        
+        Raises:
+            CircuitOpenError: 회로가 열려 있음
+            asyncio.TimeoutError: 적응형 타임아웃 초과
+        """
+        if not self.allow_request():
+            self.rejected += 1
+            raise CircuitOpenError(f"{self.name} 회로가 열려 있습니다")
+        
+        probing = self.state == STATE_HALF_OPEN
+        if probing:
+            self._half_open_in_flight += 1
+        self.calls += 1
+        started = time.monotonic()
+        try:
+            result = await asyncio.wait_for(func(*args, **kwargs), timeout=self.timeout())
+        except asyncio.CancelledError:
+            # 호출자가 취소한 경우는 상위 서비스 상태와 무관하므로 집계하지 않음
+            if probing:
+                self._half_open_in_flight -= 1
+            raise
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            self._record_failure(probing, "timeout")
+            raise
+        except Exception as e:
+            self._record_failure(probing, str(e) or type(e).__name__)
+            raise
+        
+        self._record_success(probing, time.monotonic() - started)
+        return result
+    
+    def _record_success(self, probing: bool, latency: float):
+        self._outcomes.append(True)
+        self._latencies.append(latency)
+        self._consecutive_failures = 0
+        if probing:
+            self._half_open_in_flight -= 1
+            # 확인 호출 성공: 회로를 닫고 이전 실패 기록 초기화
+            self.state = STATE_CLOSED
+            self._outcomes.clear()
+            self._open_seconds = self.base_open_seconds
+    
+    def _record_failure(self, probing: bool, reason: str):
+        self.failures += 1
+        self.last_failure = reason
+        self._outcomes.append(False)
+        self._consecutive_failures += 1
+        if probing:
+            self._half_open_in_flight -= 1
+            # 확인 호출 실패: 대기 시간을 늘려 다시 엶
+            self._open(min(self._open_seconds * 2, MAX_OPEN_SECONDS))
+            return
+        if self.state == STATE_CLOSED and self._should_open():
+            self._open(self.base_open_seconds)
+    
+    def _should_open(self) -> bool:
+        if self._consecutive_failures >= self.consecutive_failure_threshold:
+            return True
+        if len(self._outcomes) < self.min_calls:
+            return False
+        return self._failure_rate() >= self.failure_rate_threshold
+    
+    def _failure_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return sum(1 for ok in self._outcomes if not ok) / len(self._outcomes)
+    
+    def _open(self, open_seconds: float):
+        self.state = STATE_OPEN
+        self._opened_at = time.monotonic()
+        self._open_seconds = open_seconds
+        self.opened += 1
+    
+    def stats(self) -> Dict[str, Any]:
+        """회로 상태와 지연 시간 지표"""
+        latencies_ms = np.array(self._latencies) * 1000.0
+        retry_in = None
+        if self.state == STATE_OPEN:
+            retry_in = round(max(0.0, self._open_seconds - (time.monotonic() - self._opened_at)), 1)
+        return {
+            'name': self.name,
+            'state': self.state,
+            'calls': self.calls,
+            'failures': self.failures,
+            'timeouts': self.timeouts,
+            'rejected': self.rejected,
+            'opened': self.opened,
+            'recent_failure_rate': round(self._failure_rate(), 4),
+            'consecutive_failures': self._consecutive_failures,
+            'retry_in_seconds': retry_in,
+            'timeout_ms': round(self.timeout() * 1000, 1),
+            'latency_p50_ms': round(float(np.percentile(latencies_ms, 50)), 1) if len(latencies_ms) else None,
+            'latency_p95_ms': round(float(np.percentile(latencies_ms, 95)), 1) if len(latencies_ms) else None,
+            'last_failure': self.last_failure
+        }
+
+
+def create_circuit_breaker(name: str, env_prefix: str) -> CircuitBreaker:
+    """환경 변수({env_prefix}_*)로 설정한 서킷 브레이커 생성"""
+    def env(key: str, default: str) -> str:
+        return os.getenv(f"{env_prefix}_{key}", default)
+    
+    return CircuitBreaker(
+        name,
+        failure_rate_threshold=float(env("FAILURE_RATE", "0.5")),
+        min_calls=int(env("MIN_CALLS", "10")),
+        window_size=int(env("WINDOW", "50")),
+        consecutive_failure_threshold=int(env("CONSECUTIVE_FAILURES", "5")),
+        open_seconds=float(env("OPEN_SECONDS", "30")),
+        min_timeout=float(env("TIMEOUT_MIN_MS", "500")) / 1000.0,
+        max_timeout=float(env("TIMEOUT_MAX_MS", "5000")) / 1000.0
+    )
@@ -1,14 +1,40 @@
 """
 데이터 처리기 - 이미지 전처리 및 데이터 증강
 """
+import os
 import numpy as np
 from PIL import Image
-from typing import List, Tuple, Optional, Any
+from typing import List, Tuple, Optional, Any, Dict
 import tensorflow as tf
 from tensorflow.keras.preprocessing import image
 from tensorflow.keras.preprocessing.image import ImageDataGenerator
 
 from app.core.interfaces import IDataProcessor
+# 품질 검사는 TensorFlow 없이 동작하도록 image_quality에 있음 (기존 임포트 경로 유지)
+from app.core.image_quality import (
+    IMAGE_EXTENSIONS,
+    MANIFEST_FILENAME,
+    MANIFEST_VERSION,
+    PARALLEL_THRESHOLD,
+    ImageValidator,
+    DataQualityChecker,
+    inspect_image_file
+)
+
+
+def create_augmentation_layers(name: str = 'augmentation') -> tf.keras.Sequential:
+    """
+    배치 단위 데이터 증강 레이어
+    
+    기존 ImageDataGenerator 설정(회전 20도, 이동 20%, 좌우 반전, 확대/축소 20%)과 같은 변환을
+    배치 전체에 대해 그래프 안에서 수행합니다. 훈련 시에만 동작하고 추론 시에는 입력을 그대로 통과시킵니다.
+    """
+    return tf.keras.Sequential([
+        tf.keras.layers.RandomRotation(20 / 360, fill_mode='nearest'),
+        tf.keras.layers.RandomTranslation(0.2, 0.2, fill_mode='nearest'),
+        tf.keras.layers.RandomFlip('horizontal'),
+        tf.keras.layers.RandomZoom(0.2, fill_mode='nearest')
+    ], name=name)
 
 
 class DataProcessor(IDataProcessor):
@@ -16,19 +42,12 @@ class DataProcessor(IDataProcessor):
     
     def __init__(self, target_size: Tuple[int, int] = (224, 224)):
         self.target_size = target_size
-        self._augmentation_generator = None
+        self._augmentation_layers = None
         self._setup_augmentation()
     
     def _setup_augmentation(self):
-        """데이터 증강 설정"""
-        self._augmentation_generator = ImageDataGenerator(
-            rotation_range=20,
-            width_shift_range=0.2,
-            height_shift_range=0.2,
-            horizontal_flip=True,
-            zoom_range=0.2,
-            fill_mode='nearest'
-        )
+        """데이터 증강 설정 (배치 단위 전처리 레이어)"""
+        self._augmentation_layers = create_augmentation_layers()
     
     def preprocess_image(self, image_path: str) -> np.ndarray:
         """이미지 전처리"""
@@ -67,27 +86,34 @@ class DataProcessor(IDataProcessor):
         return image_array
     
     def augment_data(self, data: Any) -> Any:
-        """데이터 증강"""
-        if self._augmentation_generator is None:
+        """
+        데이터 증강
+        
+        이미지 배치(N, H, W, 3)를 주면 증강된 배치를, 디렉토리 경로를 주면
+        배치 단위로 증강하는 (이미지, 원-핫 레이블) tf.data 데이터셋을 반환합니다.
+        """
+        if self._augmentation_layers is None:
             self._setup_augmentation()
         
-        return self._augmentation_generator.flow_from_directory(
+        if not isinstance(data, str):
+            return self._augmentation_layers(data, training=True).numpy()
+        
+        dataset = tf.keras.utils.image_dataset_from_directory(
             data,
-            target_size=self.target_size,
+            label_mode='categorical',
+            image_size=self.target_size,
             batch_size=32,
-            class_mode='categorical',
             shuffle=True
         )
+        return dataset.map(
+            lambda images, labels: (self._augmentation_layers(images / 255.0, training=True), labels),
+            num_parallel_calls=tf.data.AUTOTUNE
+        ).prefetch(tf.data.AUTOTUNE)
     
     def create_training_generator(self, data_dir: str, validation_split: float = 0.2):
-        """훈련 데이터 생성기 생성"""
+        """훈련 데이터 생성기 생성 (증강은 모델 내 전처리 레이어에서 수행)"""
         train_datagen = ImageDataGenerator(
             rescale=1./255,
-            rotation_range=20,
-            width_shift_range=0.2,
-            height_shift_range=0.2,
-            horizontal_flip=True,
-            zoom_range=0.2,
             validation_split=validation_split
         )
         
@@ -110,81 +136,101 @@ class DataProcessor(IDataProcessor):
         )
         
         return train_generator, validation_generator
-
-
-class ImageValidator:
-    """이미지 검증기"""
-    
-    @staticmethod
-    def validate_image_file(image_path: str) -> bool:
-        """이미지 파일 검증"""
-        try:
-            with Image.open(image_path) as img:
-                img.verify()
-            return True
-        except Exception:
-            return False
     
-    @staticmethod
-    def validate_image_format(image_path: str, allowed_formats: List[str] = None) -> bool:
-        """이미지 형식 검증"""
-        if allowed_formats is None:
-            allowed_formats = ['JPEG', 'PNG', 'BMP', 'TIFF']
+    def create_manifest_generators(self,
+                                   manifest_path: str,
+                                   validation_split: float = 0.2,
+                                   batch_size: int = 32):
+        """
+        중복 제거 매니페스트로부터 훈련/검증 데이터 생성기 생성
         
-        try:
-            with Image.open(image_path) as img:
-                return img.format in allowed_formats
-        except Exception:
-            return False
-    
-    @staticmethod
-    def validate_image_size(image_path: str, min_size: Tuple[int, int] = (32, 32)) -> bool:
-        """이미지 크기 검증"""
-        try:
-            with Image.open(image_path) as img:
-                return img.size[0] >= min_size[0] and img.size[1] >= min_size[1]
-        except Exception:
-            return False
+        검증 분할은 내용 해시로 정해지므로 실행마다 같은 이미지가 같은 쪽에 들어갑니다.
+        """
+        from app.core.deduplication import load_dedup_manifest
+        
+        manifest = load_dedup_manifest(manifest_path)
+        class_names = manifest['class_names']
+        
+        train_records, validation_records = [], []
+        for record in manifest['images']:
+            if int(record['sha1'][:8], 16) / 0xFFFFFFFF < validation_split:
+                validation_records.append(record)
+            else:
+                train_records.append(record)
+        
+        # 증강은 모델 내 전처리 레이어에서 배치 단위로 수행
+        train_datagen = ImageDataGenerator(rescale=1./255)
+        validation_datagen = ImageDataGenerator(rescale=1./255)
+        
+        train_generator = ManifestSequence(
+            manifest['data_dir'], train_records, class_names,
+            target_size=self.target_size,
+            batch_size=batch_size,
+            image_data_generator=train_datagen,
+            shuffle=True
+        )
+        validation_generator = ManifestSequence(
+            manifest['data_dir'], validation_records, class_names,
+            target_size=self.target_size,
+            batch_size=batch_size,
+            image_data_generator=validation_datagen,
+            shuffle=False
+        )
+        
+        return train_generator, validation_generator
 
 
-class DataQualityChecker:
-    """데이터 품질 검사기"""
+class ManifestSequence(tf.keras.utils.Sequence):
+    """매니페스트 이미지 목록 기반 배치 생성기"""
     
-    def __init__(self, data_processor: DataProcessor):
-        self.data_processor = data_processor
-        self.validator = ImageValidator()
+    def __init__(self,
+                 data_dir: str,
+                 records: List[Dict[str, Any]],
+                 class_names: List[str],
+                 target_size: Tuple[int, int] = (224, 224),
+                 batch_size: int = 32,
+                 image_data_generator: Optional[ImageDataGenerator] = None,
+                 shuffle: bool = True):
+        super().__init__()
+        self.data_dir = data_dir
+        self.records = records
+        self.class_names = class_names
+        self.class_indices = {name: i for i, name in enumerate(class_names)}
+        self.target_size = target_size
+        self.batch_size = batch_size
+        self.image_data_generator = image_data_generator
+        self.shuffle = shuffle
+        self.samples = len(records)
+        self._order = np.arange(self.samples)
+        self.on_epoch_end()
     
-    def check_dataset_quality(self, data_dir: str) -> dict:
-        """데이터셋 품질 검사"""
-        import os
-        
-        quality_report = {
-            'total_images': 0,
-            'valid_images': 0,
-            'invalid_images': 0,
-            'class_distribution': {},
-            'size_distribution': {},
-            'format_distribution': {}
-        }
-        
-        for class_name in os.listdir(data_dir):
-            class_path = os.path.join(data_dir, class_name)
-            if not os.path.isdir(class_path):
-                continue
-            
-            class_images = []
-            for filename in os.listdir(class_path):
-                if filename.lower().endswith(('.jpg', '.jpeg', '.png', '.bmp', '.tiff')):
-                    image_path = os.path.join(class_path, filename)
-                    
-                    quality_report['total_images'] += 1
-                    
-                    if self.validator.validate_image_file(image_path):
-                        quality_report['valid_images'] += 1
-                        class_images.append(image_path)
-                    else:
-                        quality_report['invalid_images'] += 1
-            
-            quality_report['class_distribution'][class_name] = len(class_images)
+    def __len__(self) -> int:
+        return int(np.ceil(self.samples / self.batch_size))
+    
+    def load_image(self, record: Dict[str, Any]) -> np.ndarray:
+        """이미지 디코딩 및 크기 조정"""
+        with Image.open(os.path.join(self.data_dir, record['path'])) as img:
+            # PIL은 (너비, 높이) 순서
+            img = img.convert('RGB').resize(self.target_size[::-1])
+            return np.asarray(img, dtype=np.float32)
+    
+    def __getitem__(self, index: int) -> Tuple[np.ndarray, np.ndarray]:
+        batch_indices = self._order[index * self.batch_size:(index + 1) * self.batch_size]
+        batch_x = np.zeros((len(batch_indices),) + tuple(self.target_size) + (3,), dtype=np.float32)
+        batch_y = np.zeros((len(batch_indices), len(self.class_names)), dtype=np.float32)
         
-        return quality_report
+        for i, record_index in enumerate(batch_indices):
+            record = self.records[record_index]
+            x = self.load_image(record)
+            if self.image_data_generator is not None:
+                x = self.image_data_generator.random_transform(x)
+                x = self.image_data_generator.standardize(x)
+            batch_x[i] = x
+            batch_y[i, self.class_indices[record['class_name']]] = 1.0
+        
+        return batch_x, batch_y
+    
+    def on_epoch_end(self):
+        """에포크마다 순서 섞기"""
+        if self.shuffle:
+            np.random.shuffle(self._order)
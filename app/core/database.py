@@ -1,23 +1,121 @@
 """
 데이터베이스 설정
+
+연결 풀 (SQLite 메모리 DB 제외):
+DB_POOL_SIZE: 유지할 연결 수 (기본값: 10)
+DB_MAX_OVERFLOW: 풀 크기를 넘어 추가로 열 수 있는 연결 수 (기본값: 20)
+DB_POOL_TIMEOUT: 풀에서 연결을 기다리는 최대 시간(초) (기본값: 30)
+DB_POOL_RECYCLE: 연결을 다시 여는 주기(초), 서버 측 유휴 연결 종료 대비 (기본값: 1800)
+DB_POOL_PRE_PING: 풀에서 꺼낼 때 연결 확인 여부 (기본값: PostgreSQL 등 서버 DB만 true)
+
+SQLite 연결마다 적용하는 PRAGMA:
+SQLITE_JOURNAL_MODE: 저널 모드, WAL이면 쓰기 중에도 읽기가 막히지 않음 (기본값: WAL)
+SQLITE_SYNCHRONOUS: 동기화 수준, WAL에서는 NORMAL도 커밋 내구성 유지 (기본값: NORMAL)
+SQLITE_MMAP_SIZE: 메모리 매핑 크기(바이트) (기본값: 268435456)
+SQLITE_CACHE_SIZE: 페이지 캐시 크기, 음수는 KiB 단위 (기본값: -65536)
+SQLITE_BUSY_TIMEOUT_MS: 잠금 대기 시간(ms) (기본값: 5000)
 """
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from typing import AsyncIterator, Dict, Any
 import os
 
 # 데이터베이스 URL 설정
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./recycling_app.db")
 
+
+def _is_sqlite(database_url: str) -> bool:
+    return make_url(database_url).get_backend_name() == 'sqlite'
+
+
+def _is_memory_sqlite(database_url: str) -> bool:
+    return _is_sqlite(database_url) and make_url(database_url).database in (None, '', ':memory:')
+
+
+def engine_options(database_url: str) -> Dict[str, Any]:
+    """연결 풀 설정 (환경 변수)"""
+    if _is_memory_sqlite(database_url):
+        # 메모리 DB는 연결마다 별도 DB이므로 풀 설정을 적용하지 않음
+        return {}
+    pre_ping_default = "false" if _is_sqlite(database_url) else "true"
+    return {
+        'pool_size': int(os.getenv("DB_POOL_SIZE", "10")),
+        'max_overflow': int(os.getenv("DB_MAX_OVERFLOW", "20")),
+        'pool_timeout': float(os.getenv("DB_POOL_TIMEOUT", "30")),
+        'pool_recycle': int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        'pool_pre_ping': os.getenv("DB_POOL_PRE_PING", pre_ping_default).lower() in ("1", "true", "yes"),
+    }
+
+
+def sqlite_pragmas() -> Dict[str, str]:
+    """SQLite 연결마다 적용할 PRAGMA (적용 순서대로)"""
+    return {
+        'journal_mode': os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+        'synchronous': os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+        'busy_timeout': os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"),
+        'cache_size': os.getenv("SQLITE_CACHE_SIZE", "-65536"),
+        'mmap_size': os.getenv("SQLITE_MMAP_SIZE", "268435456"),
+    }
+
+
+def apply_sqlite_pragmas(target_engine: Engine, pragmas: Dict[str, str] = None) -> None:
+    """엔진의 새 SQLite 연결마다 PRAGMA 적용 (비동기 엔진은 sync_engine 전달)"""
+    pragmas = sqlite_pragmas() if pragmas is None else pragmas
+    
+    @event.listens_for(target_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+def create_db_engine(database_url: str) -> Engine:
+    """풀 설정과 SQLite PRAGMA를 적용한 엔진 생성"""
+    connect_args = {"check_same_thread": False} if _is_sqlite(database_url) else {}
+    db_engine = create_engine(database_url, connect_args=connect_args, **engine_options(database_url))
+    if _is_sqlite(database_url):
+        apply_sqlite_pragmas(db_engine)
+    return db_engine
+
+
 # SQLAlchemy 엔진 생성
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
-)
+engine = create_db_engine(DATABASE_URL)
 
 # 세션 팩토리 생성
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 백엔드별 비동기 드라이버
+ASYNC_DRIVERS = {
+    'sqlite': 'sqlite+aiosqlite',
+    'postgresql': 'postgresql+asyncpg',
+    'postgres': 'postgresql+asyncpg',
+}
+
+
+def async_database_url(database_url: str) -> str:
+    """DB URL의 드라이버를 비동기 드라이버로 교체 (sqlite -> aiosqlite, postgresql -> asyncpg)"""
+    url = make_url(database_url)
+    drivername = ASYNC_DRIVERS.get(url.get_backend_name())
+    if drivername is None:
+        return database_url
+    return url.set(drivername=drivername).render_as_string(hide_password=False)
+
+
+# 비동기 엔진/세션 팩토리 (비동기 핸들러에서 DB I/O가 이벤트 루프를 막지 않도록 사용)
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", async_database_url(DATABASE_URL))
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **engine_options(ASYNC_DATABASE_URL))
+if _is_sqlite(ASYNC_DATABASE_URL):
+    apply_sqlite_pragmas(async_engine.sync_engine)
+
+# 커밋 후에도 엔티티 속성을 다시 읽지 않도록 만료하지 않음 (비동기 세션은 지연 로딩 불가)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 # 베이스 클래스
 Base = declarative_base()
 
@@ -31,6 +129,12 @@ def get_db():
         db.close()
 
 
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """비동기 데이터베이스 세션 의존성"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def create_tables():
     """테이블 생성"""
     # 모든 모델의 Base를 import하여 테이블 생성
@@ -40,3 +144,12 @@ def create_tables():
     # 모든 테이블 생성
     LocationBase.metadata.create_all(bind=engine)
     ChatLogBase.metadata.create_all(bind=engine)
+    
+    # 기존 테이블에 새 컬럼 추가 및 백필
+    from app.core.migrations import run_migrations
+    run_migrations(engine)
+    
+    # 기존 테이블에 새로 추가된 인덱스 생성
+    for table in LocationBase.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
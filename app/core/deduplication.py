@@ -0,0 +1,290 @@
+"""
+훈련 데이터 중복 제거 - 내용 해시 + 지각 해시(dHash) 기반
+
+근접 중복은 해상도가 큰 이미지부터 대표로 삼아, 모든 구성원이 대표와 임계값 이내인
+클러스터로 묶습니다 (A≈B≈C처럼 이어진 연쇄로 먼 이미지가 묶이지 않음).
+클래스가 다른 이미지가 한 클러스터에 있으면 클래스마다 한 장씩 남기고
+매니페스트의 label_conflicts에 기록합니다.
+"""
+import os
+import json
+import time
+import multiprocessing
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import List, Dict, Optional, Any, Tuple
+
+import numpy as np
+from PIL import Image
+
+from app.core.image_quality import DataQualityChecker, PARALLEL_THRESHOLD
+
+
+# 중복 제거 매니페스트 (훈련기가 사용)
+DEDUP_MANIFEST_VERSION = 1
+
+# 지각 해시 캐시 (내용 해시 -> 지각 해시)
+PHASH_CACHE_FILENAME = '.phash_cache.json'
+
+
+def compute_perceptual_hash(image_path: str, hash_size: int = 8) -> Optional[int]:
+    """
+    difference hash (dHash) 계산 (프로세스 풀 작업 함수)
+    
+    흑백 (hash_size + 1) x hash_size 축소 이미지에서 인접 픽셀의 밝기 차이 부호를
+    비트로 사용합니다. 재압축, 리사이즈, 약한 색 보정에 강합니다.
+    """
+    try:
+        with Image.open(image_path) as img:
+            img.draft('L', (hash_size * 8, hash_size * 8))
+            pixels = np.asarray(
+                img.convert('L').resize((hash_size + 1, hash_size), Image.BILINEAR),
+                dtype=np.int16
+            )
+    except Exception:
+        return None
+    
+    bits = (pixels[:, 1:] > pixels[:, :-1]).flatten()
+    return int(''.join('1' if bit else '0' for bit in bits), 2)
+
+
+def hamming_distance(hash1: int, hash2: int) -> int:
+    """두 해시 간 해밍 거리"""
+    return bin(hash1 ^ hash2).count('1')
+
+
+class BKTree:
+    """해밍 거리 기반 BK-tree (근접 해시 검색)"""
+    
+    def __init__(self):
+        # 노드: [hash, 항목 목록, {거리: 자식 노드}]
+        self._root = None
+        self.size = 0
+    
+    def add(self, hash_value: int, item: Any):
+        """해시 추가 (같은 해시는 한 노드에 모음)"""
+        self.size += 1
+        if self._root is None:
+            self._root = [hash_value, [item], {}]
+            return
+        
+        node = self._root
+        while True:
+            distance = hamming_distance(hash_value, node[0])
+            if distance == 0:
+                node[1].append(item)
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [hash_value, [item], {}]
+                return
+            node = child
+    
+    def search(self, hash_value: int, max_distance: int) -> List[Tuple[int, Any]]:
+        """max_distance 이내의 (거리, 항목) 목록"""
+        if self._root is None:
+            return []
+        
+        results = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            distance = hamming_distance(hash_value, node[0])
+            if distance <= max_distance:
+                results.extend((distance, item) for item in node[1])
+            
+            # 삼각 부등식으로 탐색 범위 제한
+            for child_distance, child in node[2].items():
+                if distance - max_distance <= child_distance <= distance + max_distance:
+                    stack.append(child)
+        
+        return results
+
+
+class DatasetDeduplicator:
+    """훈련 데이터셋 중복 제거기"""
+    
+    def __init__(self,
+                 quality_checker: DataQualityChecker,
+                 hamming_threshold: int = 6,
+                 max_workers: Optional[int] = None):
+        self.quality_checker = quality_checker
+        self.hamming_threshold = hamming_threshold
+        self.max_workers = max_workers
+    
+    def _load_phash_cache(self, cache_path: str) -> Dict[str, int]:
+        """지각 해시 캐시 로드"""
+        if not os.path.exists(cache_path):
+            return {}
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception:
+            return {}
+    
+    def _save_phash_cache(self, cache_path: str, cache: Dict[str, int]):
+        """지각 해시 캐시 저장"""
+        tmp_path = f"{cache_path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(cache, f)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            print(f"지각 해시 캐시 저장 실패: {e}")
+    
+    def _compute_perceptual_hashes(self, data_dir: str, records: List[Dict[str, Any]]) -> Dict[str, int]:
+        """내용 해시별 지각 해시 계산 (캐시에 없는 것만 병렬 계산)"""
+        cache_path = os.path.join(data_dir, PHASH_CACHE_FILENAME)
+        cache = self._load_phash_cache(cache_path)
+        
+        pending = [r for r in records if r['sha1'] not in cache]
+        if pending:
+            paths = [os.path.join(data_dir, r['path']) for r in pending]
+            if len(paths) < PARALLEL_THRESHOLD:
+                hashes = [compute_perceptual_hash(path) for path in paths]
+            else:
+                # TensorFlow를 import한 프로세스는 fork하지 않도록 spawn 사용
+                with ProcessPoolExecutor(max_workers=self.max_workers,
+                                         mp_context=multiprocessing.get_context('spawn')) as executor:
+                    hashes = list(executor.map(compute_perceptual_hash, paths, chunksize=64))
+            
+            for record, phash in zip(pending, hashes):
+                if phash is not None:
+                    cache[record['sha1']] = phash
+            self._save_phash_cache(cache_path, cache)
+        
+        return cache
+    
+    def _cluster_near_duplicates(self, hashes: List[int]) -> List[int]:
+        """
+        근접 중복 클러스터 ID 목록 반환 (클러스터 ID는 대표의 인덱스)
+        
+        앞쪽 항목부터 BK-tree에 있는 대표들과만 비교해 가장 가까운 대표의 클러스터에 넣고,
+        임계값 이내의 대표가 없으면 새 대표가 됩니다. 따라서 대표는 각 클러스터의 첫 항목이고
+        모든 구성원은 대표와 임계값 이내입니다.
+        """
+        cluster_ids = []
+        representatives = BKTree()
+        
+        for index, phash in enumerate(hashes):
+            matches = representatives.search(phash, self.hamming_threshold)
+            if matches:
+                cluster_ids.append(min(matches)[1])
+            else:
+                cluster_ids.append(index)
+                representatives.add(phash, index)
+        
+        return cluster_ids
+    
+    def deduplicate(self,
+                    data_dir: str,
+                    output_path: Optional[str] = None,
+                    seconds_per_image: Optional[float] = None) -> Dict[str, Any]:
+        """
+        데이터셋 중복 제거
+        
+        Args:
+            data_dir: 클래스별 하위 디렉토리로 구성된 데이터 디렉토리
+            output_path: 중복 제거 매니페스트 저장 경로
+            seconds_per_image: 에포크당 이미지 1장 처리 시간 (절약 시간 추정용)
+        
+        Returns:
+            중복 제거 보고서
+        """
+        start_time = time.perf_counter()
+        data_dir = os.path.abspath(data_dir)
+        if output_path is None:
+            output_path = os.path.join(data_dir, 'dedup_manifest.json')
+        
+        records = [r for r in self.quality_checker.scan_dataset(data_dir) if r['valid']]
+        records.sort(key=lambda r: r['path'])
+        
+        # 1. 내용 해시 기준 완전 중복 제거 (클래스별 경로순 첫 이미지를 대표로,
+        #    클래스가 다른 완전 중복은 2단계에서 레이블 충돌로 기록)
+        exact_groups = defaultdict(list)
+        for record in records:
+            exact_groups[(record['sha1'], record['class_name'])].append(record)
+        unique_records = [group[0] for group in exact_groups.values()]
+        exact_removed = len(records) - len(unique_records)
+        
+        # 2. 지각 해시 기준 근접 중복 클러스터링 (해상도가 가장 큰 이미지부터 대표로)
+        phash_cache = self._compute_perceptual_hashes(data_dir, unique_records)
+        hashable = [r for r in unique_records if r['sha1'] in phash_cache]
+        hashable.sort(key=lambda r: (-r['width'] * r['height'], r['path']))
+        unhashable = [r for r in unique_records if r['sha1'] not in phash_cache]
+        cluster_ids = self._cluster_near_duplicates([phash_cache[r['sha1']] for r in hashable])
+        
+        clusters = defaultdict(list)
+        for record, cluster_id in zip(hashable, cluster_ids):
+            clusters[cluster_id].append(record)
+        
+        kept_records = list(unhashable)
+        label_conflicts = []
+        for members in clusters.values():
+            # 구성원은 해상도순이므로 클래스별 첫 항목이 그 클래스의 대표
+            kept_by_class: Dict[str, Dict[str, Any]] = {}
+            for record in members:
+                kept_by_class.setdefault(record['class_name'], record)
+            kept_records.extend(kept_by_class.values())
+            if len(kept_by_class) > 1:
+                label_conflicts.append({
+                    'kept': [
+                        {'path': r['path'], 'class_name': r['class_name']}
+                        for r in kept_by_class.values()
+                    ],
+                    'members': [
+                        {'path': r['path'], 'class_name': r['class_name']}
+                        for r in members
+                    ]
+                })
+        kept_records.sort(key=lambda r: r['path'])
+        near_removed = len(unique_records) - len(kept_records)
+        
+        # 3. 매니페스트 저장
+        class_names = sorted({r['class_name'] for r in records})
+        manifest = {
+            'version': DEDUP_MANIFEST_VERSION,
+            'data_dir': data_dir,
+            'created_at': datetime.utcnow().isoformat(),
+            'hamming_threshold': self.hamming_threshold,
+            'class_names': class_names,
+            'images': [
+                {'path': r['path'], 'class_name': r['class_name'], 'sha1': r['sha1']}
+                for r in kept_records
+            ],
+            # 클래스가 다른 이미지가 섞인 클러스터 (검토 필요, 클래스마다 한 장씩 남김)
+            'label_conflicts': label_conflicts
+        }
+        os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        
+        # 4. 보고서
+        removed = exact_removed + near_removed
+        report = {
+            'manifest_path': output_path,
+            'total_images': len(records),
+            'kept_images': len(kept_records),
+            'removed_images': removed,
+            'exact_duplicates_removed': exact_removed,
+            'near_duplicates_removed': near_removed,
+            'label_conflict_clusters': len(label_conflicts),
+            'epoch_time_saved_ratio': round(removed / len(records), 4) if records else 0.0,
+            'elapsed_sec': round(time.perf_counter() - start_time, 3)
+        }
+        if seconds_per_image is not None:
+            report['epoch_time_saved_sec'] = round(removed * seconds_per_image, 2)
+        
+        return report
+
+
+def load_dedup_manifest(manifest_path: str) -> Dict[str, Any]:
+    """중복 제거 매니페스트 로드"""
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    
+    if manifest.get('version') != DEDUP_MANIFEST_VERSION:
+        raise ValueError(f"지원하지 않는 매니페스트 버전입니다: {manifest.get('version')}")
+    
+    return manifest
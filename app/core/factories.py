@@ -1,14 +1,24 @@
 """
 팩토리 패턴을 사용한 객체 생성
 """
+import os
 from typing import Optional, Dict, Any
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.interfaces import IImageClassifier, ILocationService, IModelTrainer, IDataProcessor, IRepository
 from app.models.recycling_classifier import RecyclingClassifier
+from app.models.classifier_backends import load_classifier
 from app.services.inference_service import InferenceService
 from app.services.location_service import LocationService
+from app.services.async_location_service import AsyncLocationService
+from app.services.public_api_service import PublicAPIService
+from app.services.spatial_index import LocationSpatialIndex, create_location_index
+from app.services.facility_sync import FacilitySyncService, live_public_api_enabled
+from app.services.location_import import LocationImportService
+from app.services.user_location_buffer import UserLocationWriteBuffer, create_user_location_buffer, write_behind_enabled
 from app.services.model_trainer import ModelTrainer
+from app.services.training_jobs import TrainingJobManager, default_training_cores
 from app.core.data_processor import DataProcessor
 from app.repositories.location_repository import LocationRepository
 
@@ -25,6 +35,11 @@ class ClassifierFactory:
     def create_inference_service(model_path: str = "models/recycling_classifier.h5") -> IImageClassifier:
         """추론 서비스 생성"""
         return InferenceService(model_path)
+    
+    @staticmethod
+    def create_classifier_for_path(model_path: str) -> IImageClassifier:
+        """모델 파일 확장자에 맞는 백엔드(Keras, TFLite, ONNX) 분류기 생성"""
+        return load_classifier(model_path)
 
 
 class LocationServiceFactory:
@@ -32,8 +47,56 @@ class LocationServiceFactory:
     
     @staticmethod
     def create_location_service(db_session: Session) -> ILocationService:
-        """위치 서비스 생성"""
-        return LocationService(db_session)
+        """위치 서비스 생성 (프로세스 공용 공간 인덱스와 공공 API 서비스 사용)"""
+        return LocationService(
+            db_session,
+            service_container.get('location_index'),
+            service_container.get('public_api_service'),
+            use_public_api=live_public_api_enabled()
+        )
+    
+    @staticmethod
+    def create_async_location_service(db_session: AsyncSession) -> ILocationService:
+        """비동기 DB 세션을 쓰는 위치 서비스 생성 (USER_LOCATION_WRITE_BEHIND면 사용자 위치 지연 쓰기)"""
+        return AsyncLocationService(
+            db_session,
+            service_container.get('location_index'),
+            service_container.get('public_api_service'),
+            use_public_api=live_public_api_enabled(),
+            user_location_buffer=service_container.get('user_location_buffer') if write_behind_enabled() else None
+        )
+    
+    @staticmethod
+    def create_public_api_service() -> PublicAPIService:
+        """공공 API 서비스 생성 (공유 HTTP 클라이언트 사용)"""
+        return PublicAPIService()
+    
+    @staticmethod
+    def create_location_index() -> LocationSpatialIndex:
+        """배출 장소 공간 인덱스 생성 (LOCATION_INDEX_CELL_DEGREES로 셀 크기 설정)"""
+        return create_location_index()
+    
+    @staticmethod
+    def create_facility_sync_service() -> FacilitySyncService:
+        """공공 시설 동기화 서비스 생성 (자체 DB 세션 사용, 공간 인덱스 증분 갱신)"""
+        from app.core.database import SessionLocal
+        return FacilitySyncService(
+            service_container.get('public_api_service'),
+            SessionLocal,
+            service_container.get('location_index')
+        )
+    
+    @staticmethod
+    def create_location_import_service() -> LocationImportService:
+        """배출 장소 대량 가져오기 서비스 생성 (가져온 뒤 공간 인덱스 재구성)"""
+        from app.core.database import engine
+        return LocationImportService(engine, service_container.get('location_index'))
+    
+    @staticmethod
+    def create_user_location_buffer() -> UserLocationWriteBuffer:
+        """사용자 위치 지연 쓰기 버퍼 생성 (비동기 엔진으로 일괄 삽입)"""
+        from app.core.database import async_engine
+        return create_user_location_buffer(async_engine)
     
     @staticmethod
     def create_location_repository(db_session: Session) -> IRepository:
@@ -48,6 +111,30 @@ class ModelTrainerFactory:
     def create_model_trainer() -> IModelTrainer:
         """모델 훈련기 생성"""
         return ModelTrainer()
+    
+    @staticmethod
+    def create_training_job_manager() -> TrainingJobManager:
+        """
+        훈련 작업 관리자 생성 (환경 변수로 자원 한도 설정)
+        
+        TRAINING_MAX_JOBS: 동시 실행 작업 수 (기본값: 1)
+        TRAINING_RESERVED_CORES: 서빙용으로 남길 CPU 코어 수 (기본값: 절반)
+        TRAINING_MEMORY_LIMIT_MB: 훈련 프로세스 메모리 한도 (기본값: 제한 없음)
+        TRAINING_NICE: 훈련 프로세스 nice 값 (기본값: 10)
+        """
+        reserved_cores = os.getenv("TRAINING_RESERVED_CORES")
+        memory_limit_mb = os.getenv("TRAINING_MEMORY_LIMIT_MB")
+        
+        def reload_inference_model(model_path: str) -> Dict[str, Any]:
+            return service_container.get('inference_service').reload_model(model_path)
+        
+        return TrainingJobManager(
+            max_concurrent_jobs=int(os.getenv("TRAINING_MAX_JOBS", "1")),
+            cpu_cores=default_training_cores(int(reserved_cores) if reserved_cores else None),
+            memory_limit_mb=int(memory_limit_mb) if memory_limit_mb else None,
+            nice=int(os.getenv("TRAINING_NICE", "10")),
+            on_artifact=reload_inference_model
+        )
 
 
 class DataProcessorFactory:
@@ -100,6 +187,12 @@ class ServiceContainer:
                 raise ValueError(f"Singleton service '{name}' not registered")
         return self._services[name]
 
+    def get_if_created(self, name: str) -> Optional[Any]:
+        """이미 생성된 싱글톤 인스턴스 (생성 전이면 None)"""
+        if name in self._singletons:
+            return self._services.get(name)
+        return None
+
 
 # 전역 서비스 컨테이너
 service_container = ServiceContainer()
@@ -0,0 +1,237 @@
+"""
+지리 계산 유틸리티 (haversine 거리, geohash 인코딩, 반경 셀 커버)
+
+거리 계산은 단일 쌍(math)과 NumPy 배열 단위(일대다, 다대다 행렬) 두 형태를 제공합니다.
+후보가 여러 개면 Python 루프 대신 배열 함수를 사용하세요.
+
+geohash는 경도/위도 비트를 번갈아 섞은 base32 문자열입니다. 알파벳이 ASCII 순서라
+같은 접두사를 가진 셀은 문자열 범위 [prefix, prefix + '{') 에 모이므로,
+일반 B-tree 인덱스의 범위 검색으로 접두사 질의를 처리할 수 있습니다.
+"""
+import math
+from typing import List, Dict, Any, Optional, Tuple, Sequence, Union
+
+import numpy as np
+
+
+EARTH_RADIUS_KM = 6371.0
+GEOHASH_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+GEOHASH_PRECISION = 9  # 저장 정밀도 (셀 약 4.8m x 4.8m)
+GEOHASH_PREFIX_END = '{'  # base32 알파벳의 마지막 문자 'z' 바로 다음 ASCII 문자
+DEFAULT_MAX_COVER_CELLS = 32
+
+
+ArrayLike = Union[Sequence[float], np.ndarray]
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """두 지점 간의 대원 거리 (km)"""
+    dlat = math.radians(lat2 - lat1)
+    dlon = math.radians(lon2 - lon1)
+    a = (math.sin(dlat / 2) ** 2 +
+         math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlon / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _haversine_radians(lat1: np.ndarray, lon1: np.ndarray,
+                       lat2: np.ndarray, lon2: np.ndarray) -> np.ndarray:
+    """라디안 좌표 배열 간 대원 거리 (브로드캐스팅)"""
+    a = (np.sin((lat2 - lat1) * 0.5) ** 2 +
+         np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) * 0.5) ** 2)
+    return (2 * EARTH_RADIUS_KM) * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def distances_from(latitude: float, longitude: float,
+                   latitudes: ArrayLike, longitudes: ArrayLike) -> np.ndarray:
+    """한 지점에서 여러 지점까지의 거리 (km), shape (n,)"""
+    latitudes = np.radians(np.asarray(latitudes, dtype=np.float64))
+    longitudes = np.radians(np.asarray(longitudes, dtype=np.float64))
+    return _haversine_radians(math.radians(latitude), math.radians(longitude), latitudes, longitudes)
+
+
+def distance_matrix(latitudes_a: ArrayLike, longitudes_a: ArrayLike,
+                    latitudes_b: ArrayLike, longitudes_b: ArrayLike) -> np.ndarray:
+    """두 지점 집합 간 거리 행렬 (km), shape (len(a), len(b))"""
+    lat_a = np.radians(np.asarray(latitudes_a, dtype=np.float64))[:, None]
+    lon_a = np.radians(np.asarray(longitudes_a, dtype=np.float64))[:, None]
+    lat_b = np.radians(np.asarray(latitudes_b, dtype=np.float64))[None, :]
+    lon_b = np.radians(np.asarray(longitudes_b, dtype=np.float64))[None, :]
+    return _haversine_radians(lat_a, lon_a, lat_b, lon_b)
+
+
+def filter_by_distance(locations: List[Dict[str, Any]], latitude: float, longitude: float,
+                       radius_km: float) -> List[Dict[str, Any]]:
+    """
+    반경 내 장소만 남기고 distance_km(소수 둘째 자리)를 채워 거리순 정렬
+    
+    좌표가 없는 장소는 (0, 0)으로 간주합니다.
+    """
+    if not locations:
+        return []
+    distances = distances_from(
+        latitude, longitude,
+        [location.get('latitude') or 0 for location in locations],
+        [location.get('longitude') or 0 for location in locations]
+    )
+    order = np.argsort(distances, kind='stable')
+    result = []
+    for i in order:
+        if distances[i] > radius_km:
+            break
+        location = locations[i]
+        location['distance_km'] = round(float(distances[i]), 2)
+        result.append(location)
+    return result
+
+
+def deduplicate_locations(locations: List[Dict[str, Any]],
+                          limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    중복 장소 제거 (이름과 주소 기준, 앞쪽 항목 우선)
+    
+    limit을 주면 고유 장소가 limit개 모이는 즉시 멈춥니다.
+    """
+    unique_locations = []
+    seen = set()
+    for location in locations:
+        if limit is not None and len(unique_locations) >= limit:
+            break
+        key = (location.get('name', ''), location.get('address', ''))
+        if key not in seen:
+            seen.add(key)
+            unique_locations.append(location)
+    return unique_locations
+
+
+def _geohash_bits(precision: int) -> Tuple[int, int]:
+    """정밀도별 (위도 비트 수, 경도 비트 수)"""
+    total = precision * 5
+    return total // 2, (total + 1) // 2
+
+
+def geohash_cell_size(precision: int) -> Tuple[float, float]:
+    """정밀도별 셀 크기 (위도 도, 경도 도)"""
+    lat_bits, lon_bits = _geohash_bits(precision)
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lon_bits)
+
+
+def _encode_cell(lat_index: int, lon_index: int, precision: int) -> str:
+    """셀 인덱스를 geohash 문자열로 변환 (경도 비트부터 교차 배치)"""
+    lat_bits, lon_bits = _geohash_bits(precision)
+    chars = []
+    value = 0
+    bit_count = 0
+    lat_pos, lon_pos = lat_bits, lon_bits
+    for k in range(precision * 5):
+        if k % 2 == 0:
+            lon_pos -= 1
+            bit = (lon_index >> lon_pos) & 1
+        else:
+            lat_pos -= 1
+            bit = (lat_index >> lat_pos) & 1
+        value = (value << 1) | bit
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(GEOHASH_BASE32[value])
+            value = 0
+            bit_count = 0
+    return ''.join(chars)
+
+
+def _cell_index(latitude: float, longitude: float, precision: int) -> Tuple[int, int]:
+    lat_bits, lon_bits = _geohash_bits(precision)
+    lat_cells, lon_cells = 1 << lat_bits, 1 << lon_bits
+    lat_index = int((latitude + 90.0) / 180.0 * lat_cells)
+    lon_index = int((longitude + 180.0) / 360.0 * lon_cells)
+    return min(max(lat_index, 0), lat_cells - 1), lon_index % lon_cells
+
+
+def encode_geohash(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    """위경도를 geohash 문자열로 인코딩"""
+    if not 1 <= precision <= 12:
+        raise ValueError("geohash 정밀도는 1~12 사이여야 합니다")
+    if not -90.0 <= latitude <= 90.0 or not -180.0 <= longitude <= 180.0:
+        raise ValueError(f"잘못된 좌표입니다: ({latitude}, {longitude})")
+    lat_index, lon_index = _cell_index(latitude, longitude, precision)
+    return _encode_cell(lat_index, lon_index, precision)
+
+
+def decode_geohash(geohash: str) -> Tuple[float, float, float, float]:
+    """geohash 셀의 경계 (최소 위도, 최소 경도, 최대 위도, 최대 경도)"""
+    lat_lo, lat_hi = -90.0, 90.0
+    lon_lo, lon_hi = -180.0, 180.0
+    even = True
+    for char in geohash:
+        value = GEOHASH_BASE32.index(char)
+        for shift in range(4, -1, -1):
+            bit = (value >> shift) & 1
+            if even:
+                mid = (lon_lo + lon_hi) / 2
+                lon_lo, lon_hi = (mid, lon_hi) if bit else (lon_lo, mid)
+            else:
+                mid = (lat_lo + lat_hi) / 2
+                lat_lo, lat_hi = (mid, lat_hi) if bit else (lat_lo, mid)
+            even = not even
+    return lat_lo, lon_lo, lat_hi, lon_hi
+
+
+def radius_bounding_box(latitude: float, longitude: float,
+                        radius_km: float) -> Tuple[float, float, float, float]:
+    """
+    반경 원을 덮는 경계 상자 (최소 위도, 최소 경도, 최대 위도, 최대 경도)
+    
+    극을 포함하면 경도 전 범위(-180~180)를 반환합니다. 경도 범위는 날짜변경선을
+    넘으면 -180 미만/180 초과 값이 될 수 있습니다.
+    """
+    angular = radius_km / EARTH_RADIUS_KM
+    dlat = math.degrees(angular)
+    lat_lo, lat_hi = latitude - dlat, latitude + dlat
+    if lat_hi >= 90.0 or lat_lo <= -90.0 or angular >= math.pi / 2:
+        return max(lat_lo, -90.0), -180.0, min(lat_hi, 90.0), 180.0
+    
+    # 구면 캡의 최대 경도 폭
+    dlon = math.degrees(math.asin(min(1.0, math.sin(angular) / math.cos(math.radians(latitude)))))
+    return lat_lo, longitude - dlon, lat_hi, longitude + dlon
+
+
+def _cover_ranges(latitude: float, longitude: float, radius_km: float,
+                  precision: int) -> Tuple[int, int, int, int, int]:
+    """반경 경계 상자를 덮는 셀 인덱스 범위 (i_lo, i_hi, j_lo, j_hi, 경도 셀 수)"""
+    lat_lo, lon_lo, lat_hi, lon_hi = radius_bounding_box(latitude, longitude, radius_km)
+    lat_bits, lon_bits = _geohash_bits(precision)
+    lat_size, lon_size = geohash_cell_size(precision)
+    lon_cells = 1 << lon_bits
+    
+    i_lo = max(int((lat_lo + 90.0) / lat_size), 0)
+    i_hi = min(int((lat_hi + 90.0) / lat_size), (1 << lat_bits) - 1)
+    j_lo = int(math.floor((lon_lo + 180.0) / lon_size))
+    j_hi = int(math.floor((lon_hi + 180.0) / lon_size))
+    if j_hi - j_lo + 1 >= lon_cells:
+        j_lo, j_hi = 0, lon_cells - 1
+    return i_lo, i_hi, j_lo, j_hi, lon_cells
+
+
+def geohash_cells(latitude: float, longitude: float, radius_km: float, precision: int) -> List[str]:
+    """반경 원을 덮는 지정 정밀도의 geohash 셀 목록"""
+    i_lo, i_hi, j_lo, j_hi, lon_cells = _cover_ranges(latitude, longitude, radius_km, precision)
+    return sorted({
+        _encode_cell(i, j % lon_cells, precision)
+        for i in range(i_lo, i_hi + 1)
+        for j in range(j_lo, j_hi + 1)
+    })
+
+
+def geohash_cover(latitude: float, longitude: float, radius_km: float,
+                  max_cells: int = DEFAULT_MAX_COVER_CELLS,
+                  max_precision: int = GEOHASH_PRECISION) -> List[str]:
+    """
+    반경 원을 덮는 geohash 셀 목록
+    
+    셀 수가 max_cells 이하가 되는 가장 높은 정밀도를 고릅니다. 반환된 셀은
+    접두사이므로 저장된(더 긴) geohash와 범위 비교로 매칭합니다.
+    """
+    for precision in range(max_precision, 0, -1):
+        i_lo, i_hi, j_lo, j_hi, _ = _cover_ranges(latitude, longitude, radius_km, precision)
+        if (i_hi - i_lo + 1) * (j_hi - j_lo + 1) <= max_cells or precision == 1:
+            return geohash_cells(latitude, longitude, radius_km, precision)
+    return []
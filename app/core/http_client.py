@@ -0,0 +1,185 @@
+"""
+앱 수명 동안 공유하는 HTTP 클라이언트
+
+요청마다 AsyncClient를 만들면 매번 DNS 조회와 TCP/TLS 핸드셰이크를 다시 하므로,
+연결 풀과 keep-alive를 유지하는 클라이언트 하나를 공유합니다.
+풀 한도와 타임아웃은 환경 변수로 조정합니다.
+
+HTTP_MAX_CONNECTIONS: 최대 동시 연결 수 (기본값: 100)
+HTTP_MAX_KEEPALIVE: 유지할 유휴 연결 수 (기본값: 20)
+HTTP_KEEPALIVE_EXPIRY: 유휴 연결 유지 시간(초) (기본값: 30)
+HTTP_CONNECT_TIMEOUT: 연결 타임아웃(초) (기본값: 5)
+HTTP_READ_TIMEOUT: 응답 읽기 타임아웃(초) (기본값: 30)
+HTTP_POOL_TIMEOUT: 풀에서 연결을 기다리는 최대 시간(초) (기본값: 5)
+HTTP_HTTP2: HTTP/2 사용 여부 (기본값: h2 패키지가 있으면 사용)
+"""
+import os
+import time
+import importlib.util
+from typing import Dict, Any, Optional
+
+import httpx
+
+
+def _env_float(name: str, default: float) -> float:
+    return float(os.getenv(name, str(default)))
+
+
+def http_timeout() -> httpx.Timeout:
+    """연결/읽기/쓰기/풀 대기 타임아웃 분리 설정"""
+    read_timeout = _env_float("HTTP_READ_TIMEOUT", 30.0)
+    return httpx.Timeout(
+        connect=_env_float("HTTP_CONNECT_TIMEOUT", 5.0),
+        read=read_timeout,
+        write=read_timeout,
+        pool=_env_float("HTTP_POOL_TIMEOUT", 5.0)
+    )
+
+
+def http_limits() -> httpx.Limits:
+    """연결 풀 한도"""
+    return httpx.Limits(
+        max_connections=int(os.getenv("HTTP_MAX_CONNECTIONS", "100")),
+        max_keepalive_connections=int(os.getenv("HTTP_MAX_KEEPALIVE", "20")),
+        keepalive_expiry=_env_float("HTTP_KEEPALIVE_EXPIRY", 30.0)
+    )
+
+
+def http2_enabled() -> bool:
+    """HTTP/2 사용 여부 (h2 패키지 필요)"""
+    available = importlib.util.find_spec("h2") is not None
+    setting = os.getenv("HTTP_HTTP2")
+    if setting is None:
+        return available
+    return available and setting.lower() in ("1", "true", "yes")
+
+
+class InstrumentedTransport(httpx.AsyncBaseTransport):
+    """
+    요청 수, 진행 중 요청, 새 연결, 풀 대기, 연결 획득 시간을 집계하는 전송 계층 래퍼
+    
+    httpx/httpcore의 공개 훅(전송 계층 위임, 요청 trace 확장)만 사용합니다. 풀 내부 상태는
+    공개 API가 없으므로 연결 수 대신 진행 중 요청 수로 풀 사용량을 추정합니다.
+    """
+    
+    def __init__(self, transport: httpx.AsyncBaseTransport, max_connections: Optional[int] = None,
+                 http2: bool = False):
+        self._transport = transport
+        self.max_connections = max_connections
+        self.http2 = http2
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.new_connections = 0
+        self.pool_waits = 0
+        self.acquire_ms_total = 0.0
+        self.acquire_ms_max = 0.0
+    
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        state = {'acquired': False}
+        outer_trace = request.extensions.get('trace')
+        
+        async def trace(event_name: str, info: Dict[str, Any]):
+            # 첫 연결 단계(새 연결 시작 또는 재사용 연결로 헤더 전송)까지를 연결 획득 시간으로 봄
+            if not state['acquired'] and (
+                event_name.startswith('connection.') or event_name.endswith('send_request_headers.started')
+            ):
+                state['acquired'] = True
+                acquire_ms = (time.perf_counter() - started) * 1000.0
+                self.acquire_ms_total += acquire_ms
+                self.acquire_ms_max = max(self.acquire_ms_max, acquire_ms)
+            if event_name == 'connection.connect_tcp.started':
+                self.new_connections += 1
+            if outer_trace is not None:
+                await outer_trace(event_name, info)
+        
+        request.extensions['trace'] = trace
+        # HTTP/1.1은 요청마다 연결 하나를 쓰므로 진행 중 요청이 풀 한도에 닿으면 연결 반납을 기다림
+        # (HTTP/2는 한 연결에서 여러 요청을 처리하므로 집계하지 않음)
+        if not self.http2 and self.max_connections and self.in_flight >= self.max_connections:
+            self.pool_waits += 1
+        self.requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            return await self._transport.handle_async_request(request)
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            self.in_flight -= 1
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'in_flight': self.in_flight,
+            'max_in_flight': self.max_in_flight,
+            'new_connections': self.new_connections,
+            'connection_reuse_ratio': round(1 - self.new_connections / self.requests, 4) if self.requests else None,
+            'pool_waits': self.pool_waits,
+            'acquire_ms_avg': round(self.acquire_ms_total / self.requests, 3) if self.requests else 0.0,
+            'acquire_ms_max': round(self.acquire_ms_max, 3)
+        }
+    
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class HTTPClientManager:
+    """공유 AsyncClient 생성/종료 관리"""
+    
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+        self._transport: Optional[InstrumentedTransport] = None
+    
+    async def get_client(self) -> httpx.AsyncClient:
+        """공유 클라이언트 (처음 호출 시 생성)"""
+        # 생성 과정에 await가 없으므로 이벤트 루프 안에서는 잠금 없이도 한 번만 생성됨
+        if self._client is None or self._client.is_closed:
+            limits = http_limits()
+            http2 = http2_enabled()
+            self._transport = InstrumentedTransport(
+                httpx.AsyncHTTPTransport(limits=limits, http2=http2, retries=1),
+                max_connections=limits.max_connections,
+                http2=http2
+            )
+            self._client = httpx.AsyncClient(
+                transport=self._transport,
+                timeout=http_timeout(),
+                follow_redirects=True
+            )
+        return self._client
+    
+    async def close(self) -> None:
+        """클라이언트와 풀의 모든 연결 종료"""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+    
+    def stats(self) -> Dict[str, Any]:
+        """연결 풀 지표"""
+        limits = http_limits()
+        return {
+            'active': self._client is not None and not self._client.is_closed,
+            'http2': http2_enabled(),
+            'max_connections': limits.max_connections,
+            'max_keepalive_connections': limits.max_keepalive_connections,
+            **(self._transport.stats() if self._transport is not None else {})
+        }
+
+
+# 전역 HTTP 클라이언트 관리자
+http_client_manager = HTTPClientManager()
+
+
+async def get_http_client() -> httpx.AsyncClient:
+    """공유 HTTP 클라이언트 가져오기"""
+    return await http_client_manager.get_client()
+
+
+async def close_http_client() -> None:
+    """공유 HTTP 클라이언트 종료 (서버 종료 시 호출)"""
+    await http_client_manager.close()
@@ -0,0 +1,277 @@
+"""
+이미지 품질 검사 - 무결성/형식/크기 검증과 검증 결과 매니페스트
+
+PIL과 표준 라이브러리만 사용합니다. 검사 프로세스 풀은 spawn으로 띄우므로
+작업자는 작업 함수(inspect_image_file)가 있는 이 모듈만 임포트하며, TensorFlow를 임포트하지 않습니다.
+"""
+import io
+import os
+import json
+import time
+import hashlib
+import multiprocessing
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple, Optional, Any, Dict
+
+from PIL import Image
+
+
+class ImageValidator:
+    """이미지 검증기"""
+    
+    @staticmethod
+    def validate_image_file(image_path: str) -> bool:
+        """이미지 파일 검증"""
+        try:
+            with Image.open(image_path) as img:
+                img.verify()
+            return True
+        except Exception:
+            return False
+    
+    @staticmethod
+    def validate_image_format(image_path: str, allowed_formats: List[str] = None) -> bool:
+        """이미지 형식 검증"""
+        if allowed_formats is None:
+            allowed_formats = ['JPEG', 'PNG', 'BMP', 'TIFF']
+        
+        try:
+            with Image.open(image_path) as img:
+                return img.format in allowed_formats
+        except Exception:
+            return False
+    
+    @staticmethod
+    def validate_image_size(image_path: str, min_size: Tuple[int, int] = (32, 32)) -> bool:
+        """이미지 크기 검증"""
+        try:
+            with Image.open(image_path) as img:
+                return img.size[0] >= min_size[0] and img.size[1] >= min_size[1]
+        except Exception:
+            return False
+
+
+# 데이터셋 스캔 대상 이미지 확장자
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.tiff')
+
+# 검증 결과 매니페스트 (경로 + mtime + 크기로 캐시)
+MANIFEST_FILENAME = '.quality_manifest.json'
+MANIFEST_VERSION = 1
+
+# 이 수 미만의 파일만 새로 검증할 때는 프로세스 풀을 띄우지 않음
+# (작업자 시작 비용이 작업자당 0.1~0.3초라 이미지당 수 ms인 검사는 수백 장부터 이득)
+PARALLEL_THRESHOLD = 512
+
+
+def inspect_image_file(image_path: str) -> Dict[str, Any]:
+    """
+    이미지 파일 검사 (프로세스 풀 작업 함수)
+    
+    파일을 한 번만 읽어 내용 해시, 형식, 크기를 구하고 verify()로 무결성을 검증합니다.
+    """
+    result = {
+        'valid': False,
+        'format': None,
+        'width': None,
+        'height': None,
+        'sha1': None
+    }
+    
+    try:
+        with open(image_path, 'rb') as f:
+            data = f.read()
+        result['sha1'] = hashlib.sha1(data).hexdigest()
+        
+        with Image.open(io.BytesIO(data)) as img:
+            result['format'] = img.format
+            result['width'], result['height'] = img.size
+            img.verify()
+        result['valid'] = True
+    except Exception:
+        pass
+    
+    return result
+
+
+class DataQualityChecker:
+    """데이터 품질 검사기"""
+    
+    # 짧은 변 기준 크기 구간 (하한, 라벨)
+    SIZE_BUCKETS = [
+        (1024, '>=1024'),
+        (512, '512-1023'),
+        (224, '224-511'),
+        (32, '32-223'),
+        (0, '<32')
+    ]
+    
+    def __init__(self,
+                 data_processor: Optional[Any] = None,  # 하위 호환용 (검사에는 사용하지 않음)
+                 manifest_path: Optional[str] = None,
+                 max_workers: Optional[int] = None):
+        self.data_processor = data_processor
+        self.validator = ImageValidator()
+        self.manifest_path = manifest_path
+        self.max_workers = max_workers
+        self._last_scan_stats = {'cached_images': 0, 'validated_images': 0}
+    
+    def _get_manifest_path(self, data_dir: str) -> str:
+        """매니페스트 파일 경로"""
+        return self.manifest_path or os.path.join(data_dir, MANIFEST_FILENAME)
+    
+    def _load_manifest(self, manifest_path: str) -> Dict[str, Dict[str, Any]]:
+        """매니페스트 로드 (없거나 손상된 경우 빈 캐시)"""
+        if not os.path.exists(manifest_path):
+            return {}
+        
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('version') != MANIFEST_VERSION:
+                return {}
+            return manifest.get('entries', {})
+        except Exception as e:
+            print(f"매니페스트를 읽을 수 없어 전체를 다시 검증합니다: {e}")
+            return {}
+    
+    def _save_manifest(self, manifest_path: str, entries: Dict[str, Dict[str, Any]]):
+        """매니페스트 저장 (임시 파일에 쓴 뒤 교체)"""
+        tmp_path = f"{manifest_path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': MANIFEST_VERSION, 'entries': entries}, f)
+            os.replace(tmp_path, manifest_path)
+        except OSError as e:
+            print(f"매니페스트 저장 실패: {e}")
+    
+    def _list_image_files(self, data_dir: str) -> List[Tuple[str, str, os.stat_result]]:
+        """(클래스명, 상대 경로, stat) 목록"""
+        files = []
+        with os.scandir(data_dir) as class_entries:
+            for class_entry in sorted(class_entries, key=lambda e: e.name):
+                if not class_entry.is_dir():
+                    continue
+                with os.scandir(class_entry.path) as image_entries:
+                    for image_entry in image_entries:
+                        if not image_entry.is_file():
+                            continue
+                        if not image_entry.name.lower().endswith(IMAGE_EXTENSIONS):
+                            continue
+                        rel_path = os.path.join(class_entry.name, image_entry.name)
+                        files.append((class_entry.name, rel_path, image_entry.stat()))
+        return files
+    
+    def _inspect_files(self, paths: List[str]) -> List[Dict[str, Any]]:
+        """파일 검사 (많으면 프로세스 풀에서 병렬 처리)"""
+        if len(paths) < PARALLEL_THRESHOLD:
+            return [inspect_image_file(path) for path in paths]
+        
+        # TensorFlow가 스레드를 띄운 프로세스를 fork하면 교착될 수 있으므로 spawn 사용
+        with ProcessPoolExecutor(max_workers=self.max_workers,
+                                 mp_context=multiprocessing.get_context('spawn')) as executor:
+            return list(executor.map(inspect_image_file, paths, chunksize=64))
+    
+    def scan_dataset(self, data_dir: str) -> List[Dict[str, Any]]:
+        """
+        데이터셋 스캔
+        
+        매니페스트에 경로, mtime, 크기가 같은 항목이 있으면 재사용하고,
+        새로 추가되었거나 변경된 파일만 검증합니다.
+        
+        Returns:
+            이미지별 레코드 목록 (path는 data_dir 기준 상대 경로)
+        """
+        manifest_path = self._get_manifest_path(data_dir)
+        cached_entries = self._load_manifest(manifest_path)
+        
+        records = []
+        pending = []
+        for class_name, rel_path, stat in self._list_image_files(data_dir):
+            cached = cached_entries.get(rel_path)
+            if cached and cached['mtime_ns'] == stat.st_mtime_ns and cached['size'] == stat.st_size:
+                records.append(cached)
+                continue
+            
+            record = {
+                'path': rel_path,
+                'class_name': class_name,
+                'mtime_ns': stat.st_mtime_ns,
+                'size': stat.st_size
+            }
+            records.append(record)
+            pending.append(record)
+        
+        if pending:
+            results = self._inspect_files([os.path.join(data_dir, r['path']) for r in pending])
+            for record, result in zip(pending, results):
+                record.update(result)
+        
+        # 삭제된 파일은 매니페스트에서 제외됨
+        if pending or len(cached_entries) != len(records):
+            self._save_manifest(manifest_path, {r['path']: r for r in records})
+        
+        self._last_scan_stats = {
+            'cached_images': len(records) - len(pending),
+            'validated_images': len(pending)
+        }
+        return records
+    
+    def _size_bucket(self, width: int, height: int) -> str:
+        """짧은 변 기준 크기 구간"""
+        short_side = min(width, height)
+        for lower_bound, label in self.SIZE_BUCKETS:
+            if short_side >= lower_bound:
+                return label
+        return self.SIZE_BUCKETS[-1][1]
+    
+    def check_dataset_quality(self, data_dir: str) -> dict:
+        """데이터셋 품질 검사"""
+        start_time = time.perf_counter()
+        records = self.scan_dataset(data_dir)
+        
+        quality_report = {
+            'total_images': len(records),
+            'valid_images': 0,
+            'invalid_images': 0,
+            'class_distribution': {},
+            'size_distribution': {},
+            'format_distribution': {},
+            'duplicate_images': 0,
+            'duplicate_groups': 0,
+            'cross_class_duplicates': 0
+        }
+        
+        class_counts = Counter()
+        size_counts = Counter()
+        format_counts = Counter()
+        hash_groups = defaultdict(list)
+        
+        for record in records:
+            # 유효 이미지가 없는 클래스도 0으로 표시
+            class_counts.setdefault(record['class_name'], 0)
+            if not record['valid']:
+                quality_report['invalid_images'] += 1
+                continue
+            
+            quality_report['valid_images'] += 1
+            class_counts[record['class_name']] += 1
+            size_counts[self._size_bucket(record['width'], record['height'])] += 1
+            format_counts[record['format']] += 1
+            hash_groups[record['sha1']].append(record['class_name'])
+        
+        for class_names in hash_groups.values():
+            if len(class_names) < 2:
+                continue
+            quality_report['duplicate_groups'] += 1
+            quality_report['duplicate_images'] += len(class_names) - 1
+            if len(set(class_names)) > 1:
+                quality_report['cross_class_duplicates'] += 1
+        
+        quality_report['class_distribution'] = dict(class_counts)
+        quality_report['size_distribution'] = dict(size_counts)
+        quality_report['format_distribution'] = dict(format_counts)
+        quality_report.update(self._last_scan_stats)
+        quality_report['elapsed_sec'] = round(time.perf_counter() - start_time, 3)
+        
+        return quality_report
@@ -23,6 +23,10 @@ class IImageClassifier(ABC):
     def get_class_info(self) -> Dict[str, Any]:
         """클래스 정보 반환"""
         pass
+    
+    def predict_batch(self, image_arrays: np.ndarray) -> List[Dict[str, Any]]:
+        """여러 이미지 배열 일괄 예측 (기본 구현은 한 장씩 예측)"""
+        return [self.predict_from_array(image_array) for image_array in image_arrays]
 
 
 class ILocationService(ABC):
@@ -38,6 +42,26 @@ class ILocationService(ABC):
         """주변 분리수거 배출 장소 찾기"""
         pass
     
+    @abstractmethod
+    def search_nearby_locations(self, 
+                                latitude: float, 
+                                longitude: float, 
+                                waste_type: Optional[str] = None,
+                                radius_km: float = 5.0,
+                                limit: int = 10) -> Dict[str, Any]:
+        """주변 분리수거 배출 장소와 출처별 조회 결과 찾기"""
+        pass
+    
+    @abstractmethod
+    def find_nearby_locations_multi(self, 
+                                    latitude: float, 
+                                    longitude: float, 
+                                    waste_types: List[str],
+                                    radius_km: float = 5.0,
+                                    limit: int = 3) -> Dict[str, List[Dict[str, Any]]]:
+        """여러 쓰레기 종류의 주변 배출 장소를 한 번에 찾기 (종류별 최대 limit개)"""
+        pass
+    
     @abstractmethod
     def get_location_by_id(self, location_id: int) -> Optional[Dict[str, Any]]:
         """ID로 배출 장소 조회"""
@@ -108,3 +132,32 @@ class IRepository(ABC):
     def find_by_criteria(self, criteria: Dict[str, Any]) -> List[Any]:
         """조건에 따른 엔티티 조회"""
         pass
+
+
+class IAsyncRepository(ABC):
+    """비동기 저장소 인터페이스 (AsyncSession 사용)"""
+    
+    @abstractmethod
+    async def create(self, entity: Any) -> Any:
+        """엔티티 생성"""
+        pass
+    
+    @abstractmethod
+    async def get_by_id(self, entity_id: int) -> Optional[Any]:
+        """ID로 엔티티 조회"""
+        pass
+    
+    @abstractmethod
+    async def update(self, entity_id: int, data: Dict[str, Any]) -> Optional[Any]:
+        """엔티티 업데이트"""
+        pass
+    
+    @abstractmethod
+    async def delete(self, entity_id: int) -> bool:
+        """엔티티 삭제"""
+        pass
+    
+    @abstractmethod
+    async def find_by_criteria(self, criteria: Dict[str, Any]) -> List[Any]:
+        """조건에 따른 엔티티 조회"""
+        pass
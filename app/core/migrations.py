@@ -0,0 +1,191 @@
+"""
+데이터베이스 스키마 마이그레이션
+
+create_all은 새 테이블만 만들고 기존 테이블에 컬럼을 추가하지 않으므로,
+기존 DB에 필요한 컬럼/인덱스 추가와 데이터 백필을 순서대로 적용합니다.
+적용된 마이그레이션은 schema_migrations 테이블에 기록되어 한 번만 실행됩니다.
+"""
+from datetime import datetime
+from typing import Callable, List, Tuple, Optional
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.geo import encode_geohash
+from app.models.location import WASTE_TYPE_BITS, WASTE_TYPE_INDEXES, waste_type_mask
+
+
+BACKFILL_BATCH_SIZE = 5000
+
+
+def _has_column(connection: Connection, table: str, column: str) -> bool:
+    return column in {c['name'] for c in inspect(connection).get_columns(table)}
+
+
+def _has_table(connection: Connection, table: str) -> bool:
+    return inspect(connection).has_table(table)
+
+
+def _backfill_geohash(connection: Connection, table: str) -> int:
+    """geohash가 비어 있는 행을 배치 단위로 채움"""
+    updated = 0
+    while True:
+        rows = connection.execute(
+            text(f"SELECT id, latitude, longitude FROM {table} "
+                 f"WHERE geohash IS NULL AND latitude IS NOT NULL AND longitude IS NOT NULL "
+                 f"ORDER BY id LIMIT :limit"),
+            {'limit': BACKFILL_BATCH_SIZE}
+        ).fetchall()
+        if not rows:
+            return updated
+        
+        connection.execute(
+            text(f"UPDATE {table} SET geohash = :geohash WHERE id = :id"),
+            [{'id': row[0], 'geohash': encode_geohash(row[1], row[2])} for row in rows]
+        )
+        updated += len(rows)
+
+
+def _add_location_geohash(connection: Connection) -> None:
+    """배출 장소/사용자 위치에 geohash 컬럼과 인덱스 추가 후 백필"""
+    for table in ('recycling_locations', 'user_locations'):
+        if not _has_table(connection, table):
+            continue
+        if not _has_column(connection, table, 'geohash'):
+            connection.execute(text(f"ALTER TABLE {table} ADD COLUMN geohash VARCHAR(12)"))
+        connection.execute(text(f"CREATE INDEX IF NOT EXISTS ix_{table}_geohash ON {table} (geohash)"))
+        updated = _backfill_geohash(connection, table)
+        print(f"{table}: geohash {updated}건 백필")
+
+
+def _add_waste_type_mask(connection: Connection) -> None:
+    """배출 장소 쓰레기 종류 비트마스크 컬럼 추가 후 변환"""
+    table = 'recycling_locations'
+    if not _has_table(connection, table):
+        return
+    if not _has_column(connection, table, 'waste_type_mask'):
+        connection.execute(text(f"ALTER TABLE {table} ADD COLUMN waste_type_mask INTEGER NOT NULL DEFAULT 0"))
+    
+    converted = 0
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            text(f"SELECT id, waste_types FROM {table} WHERE id > :last_id ORDER BY id LIMIT :limit"),
+            {'last_id': last_id, 'limit': BACKFILL_BATCH_SIZE}
+        ).fetchall()
+        if not rows:
+            break
+        connection.execute(
+            text(f"UPDATE {table} SET waste_type_mask = :mask WHERE id = :id"),
+            [{'id': row[0], 'mask': waste_type_mask(row[1])} for row in rows]
+        )
+        converted += len(rows)
+        last_id = rows[-1][0]
+    
+    print(f"{table}: waste_type_mask {converted}건 변환")
+
+
+def _add_location_source(connection: Connection) -> None:
+    """배출 장소 출처/외부 ID/내용 해시 컬럼과 동기화 upsert 키 인덱스 추가"""
+    table = 'recycling_locations'
+    if not _has_table(connection, table):
+        return
+    columns = [
+        ('source', "VARCHAR(50) NOT NULL DEFAULT 'local'"),
+        ('external_id', 'VARCHAR(100)'),
+        ('content_hash', 'VARCHAR(64)'),
+        ('synced_at', 'TIMESTAMP'),
+    ]
+    for column, definition in columns:
+        if not _has_column(connection, table, column):
+            connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {definition}"))
+    connection.execute(text(
+        f"CREATE UNIQUE INDEX IF NOT EXISTS ux_{table}_source_external_id ON {table} (source, external_id)"
+    ))
+
+
+def _drop_unused_location_indexes(connection: Connection) -> None:
+    """
+    반경 검색에 쓰이지 않는 배출 장소 인덱스 삭제
+    
+    반경 검색은 geohash 셀 범위 검색(ix_recycling_locations_geohash)을 사용하므로
+    (latitude, longitude) 복합 인덱스와 활성 장소의 종류별 geohash 부분 인덱스는 쓰기 비용만 늘립니다.
+    종류로만 거르는 조회용 인덱스는 0005에서 따로 만듭니다.
+    """
+    table = 'recycling_locations'
+    if not _has_table(connection, table):
+        return
+    names = [f'ix_{table}_lat_lon'] + [f'ix_{table}_{waste_type}_geohash' for waste_type in WASTE_TYPE_BITS]
+    for name in names:
+        connection.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+
+def _add_waste_type_indexes(connection: Connection) -> None:
+    """
+    쓰레기 종류별 부분 인덱스 추가
+    
+    by_waste_type/find_by_criteria처럼 반경 없이 종류로만 거르는 조회가 전체 테이블을 읽지 않고
+    해당 종류의 행만 읽도록 합니다. 활성 여부를 조건에 넣지 않아 is_active 필터가 없는 조회도
+    쓸 수 있으며, 반경 검색은 그대로 geohash 인덱스를 사용합니다.
+    """
+    if not _has_table(connection, 'recycling_locations'):
+        return
+    for index in WASTE_TYPE_INDEXES:
+        index.create(bind=connection, checkfirst=True)
+
+
+# (버전, 설명, 적용 함수) - 순서대로 적용
+MIGRATIONS: List[Tuple[str, str, Callable[[Connection], None]]] = [
+    ('0001_location_geohash', '위치 geohash 컬럼/인덱스 추가 및 백필', _add_location_geohash),
+    ('0002_waste_type_mask', '쓰레기 종류 비트마스크 컬럼 추가 및 변환', _add_waste_type_mask),
+    ('0003_location_source', '배출 장소 출처/외부 ID/내용 해시 컬럼 추가', _add_location_source),
+    ('0004_drop_unused_location_indexes', '반경 검색에 쓰이지 않는 위경도 복합/종류별 부분 인덱스 삭제',
+     _drop_unused_location_indexes),
+    ('0005_waste_type_indexes', '종류로만 거르는 조회용 쓰레기 종류별 부분 인덱스 추가', _add_waste_type_indexes),
+]
+
+
+def _ensure_migration_table(connection: Connection) -> None:
+    connection.execute(text(
+        "CREATE TABLE IF NOT EXISTS schema_migrations ("
+        "version VARCHAR(100) PRIMARY KEY, "
+        "description VARCHAR(200), "
+        "applied_at TIMESTAMP NOT NULL)"
+    ))
+
+
+def applied_migrations(engine: Engine) -> List[str]:
+    """적용된 마이그레이션 버전 목록"""
+    with engine.begin() as connection:
+        _ensure_migration_table(connection)
+        rows = connection.execute(text("SELECT version FROM schema_migrations ORDER BY version")).fetchall()
+    return [row[0] for row in rows]
+
+
+def run_migrations(engine: Optional[Engine] = None) -> List[str]:
+    """
+    미적용 마이그레이션 실행
+    
+    각 마이그레이션은 자신의 기록과 함께 하나의 트랜잭션으로 적용됩니다.
+    
+    Returns:
+        이번에 적용된 마이그레이션 버전 목록
+    """
+    if engine is None:
+        from app.core.database import engine
+    
+    done = set(applied_migrations(engine))
+    applied = []
+    for version, description, migrate in MIGRATIONS:
+        if version in done:
+            continue
+        with engine.begin() as connection:
+            migrate(connection)
+            connection.execute(
+                text("INSERT INTO schema_migrations (version, description, applied_at) "
+                     "VALUES (:version, :description, :applied_at)"),
+                {'version': version, 'description': description, 'applied_at': datetime.utcnow()}
+            )
+        print(f"마이그레이션 적용: {version} ({description})")
+        applied.append(version)
+    return applied
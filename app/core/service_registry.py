@@ -21,9 +21,40 @@ def register_services():
         DataProcessorFactory.create_data_processor
     )
     
+    # 훈련은 서빙 프로세스 밖의 별도 프로세스에서 실행
     service_container.register_singleton(
-        'model_trainer',
-        ModelTrainerFactory.create_model_trainer
+        'training_job_manager',
+        ModelTrainerFactory.create_training_job_manager
+    )
+    
+    # 배출 장소 공간 인덱스 (첫 조회 시 DB에서 적재, 쓰기 시 증분 갱신)
+    service_container.register_singleton(
+        'location_index',
+        LocationServiceFactory.create_location_index
+    )
+    
+    # 공공 API 서비스 (앱 수명 동안 HTTP 연결 풀 공유)
+    service_container.register_singleton(
+        'public_api_service',
+        LocationServiceFactory.create_public_api_service
+    )
+    
+    # 공공 시설 전체 동기화 (FACILITY_SYNC_INTERVAL 주기로 실행)
+    service_container.register_singleton(
+        'facility_sync_service',
+        LocationServiceFactory.create_facility_sync_service
+    )
+    
+    # 배출 장소 대량 가져오기 (CSV/JSON 배치 upsert)
+    service_container.register_singleton(
+        'location_import_service',
+        LocationServiceFactory.create_location_import_service
+    )
+    
+    # 사용자 위치 지연 쓰기 버퍼 (크기/시간 기준 일괄 삽입, 종료 시 플러시)
+    service_container.register_singleton(
+        'user_location_buffer',
+        LocationServiceFactory.create_user_location_buffer
     )
     
     # 일시적 서비스 등록 (DB 세션 필요)
@@ -40,11 +71,14 @@ def register_services():
 
 def get_service_with_db(service_name: str, db: Session):
     """DB 세션이 필요한 서비스 가져오기"""
-    if service_name in ['location_service', 'location_repository']:
+    if service_name in ['location_service', 'async_location_service', 'location_repository']:
         # DB 세션이 필요한 서비스는 매번 새로 생성
         if service_name == 'location_service':
             from app.core.factories import LocationServiceFactory
             return LocationServiceFactory.create_location_service(db)
+        elif service_name == 'async_location_service':
+            from app.core.factories import LocationServiceFactory
+            return LocationServiceFactory.create_async_location_service(db)
         elif service_name == 'location_repository':
             from app.core.factories import LocationServiceFactory
             return LocationServiceFactory.create_location_repository(db)
@@ -4,8 +4,13 @@ from app.api.threads import router as threads_router
 from app.api.recycling import router as recycling_router
 from app.api.location import router as location_router
 from app.api.integrated import router as integrated_router
-from app.core.database import create_tables
+from app.api.training import router as training_router
+from app.api.metrics import router as metrics_router
+from app.core.database import create_tables, async_engine
 from app.core.service_registry import register_services
+from app.core.factories import service_container
+from app.core.http_client import close_http_client
+from app.services.facility_sync import facility_sync_interval
 
 app = FastAPI(
     title="분리수거 품목 분류 API",
@@ -32,4 +37,50 @@ register_services()
 app.include_router(threads_router)
 app.include_router(recycling_router)
 app.include_router(location_router)
-app.include_router(integrated_router)
\ No newline at end of file
+app.include_router(integrated_router)
+app.include_router(training_router)
+app.include_router(metrics_router)
+
+
+@app.on_event("startup")
+async def start_facility_sync():
+    """FACILITY_SYNC_INTERVAL이 설정되면 공공 시설 주기 동기화 시작"""
+    interval = facility_sync_interval()
+    if interval > 0:
+        service_container.get('facility_sync_service').start(interval)
+
+
+@app.on_event("shutdown")
+def shutdown_training_jobs():
+    """서버 종료 시 실행 중인 훈련 작업 종료"""
+    job_manager = service_container.get_if_created('training_job_manager')
+    if job_manager is not None:
+        job_manager.shutdown()
+
+
+@app.on_event("shutdown")
+async def shutdown_facility_sync():
+    """서버 종료 시 주기 동기화 중지 (HTTP 연결 풀 종료 전)"""
+    sync_service = service_container.get_if_created('facility_sync_service')
+    if sync_service is not None:
+        await sync_service.stop()
+
+
+@app.on_event("shutdown")
+async def shutdown_http_client():
+    """서버 종료 시 공유 HTTP 연결 풀 종료"""
+    await close_http_client()
+
+
+@app.on_event("shutdown")
+async def shutdown_user_location_buffer():
+    """서버 종료 시 버퍼에 남은 사용자 위치 저장 (비동기 DB 연결 풀 종료 전)"""
+    user_location_buffer = service_container.get_if_created('user_location_buffer')
+    if user_location_buffer is not None:
+        await user_location_buffer.stop()
+
+
+@app.on_event("shutdown")
+async def shutdown_async_engine():
+    """서버 종료 시 비동기 DB 연결 풀 종료"""
+    await async_engine.dispose()
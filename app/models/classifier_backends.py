@@ -0,0 +1,145 @@
+"""
+경량 추론 백엔드 분류기 (TFLite, ONNX)
+
+Keras 모델(RecyclingClassifier)과 같은 IImageClassifier 인터페이스를 제공하므로
+평가/추론 코드가 백엔드에 관계없이 동작합니다.
+"""
+import os
+import json
+from abc import ABC, abstractmethod
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+from PIL import Image
+
+from app.core.interfaces import IImageClassifier
+from app.models.recycling_classifier import RecyclingClassifier, RECYCLABLE_CLASSES, build_prediction
+
+
+DEFAULT_CLASS_NAMES = ['glass', 'paper', 'plastic', 'metal', 'trash']
+
+
+class _ArrayClassifier(IImageClassifier, ABC):
+    """배열 입력 -> 확률 배열 출력 백엔드 공통 구현 (백엔드는 _run 구현)"""
+    
+    def __init__(self, model_path: str):
+        self.model_path = model_path
+        self.class_names = list(DEFAULT_CLASS_NAMES)
+        self.num_classes = len(self.class_names)
+        self.input_size = (224, 224, 3)
+        self._load_class_info(model_path)
+    
+    def _load_class_info(self, model_path: str):
+        """모델 옆의 <이름>_classes.json 로드"""
+        class_file = f"{os.path.splitext(model_path)[0]}_classes.json"
+        if os.path.exists(class_file):
+            with open(class_file, 'r', encoding='utf-8') as f:
+                class_info = json.load(f)
+                self.class_names = class_info['class_names']
+                self.num_classes = class_info['num_classes']
+    
+    @abstractmethod
+    def _run(self, batch: np.ndarray) -> np.ndarray:
+        """(N, H, W, 3) float32 배치 -> (N, num_classes) 확률"""
+        pass
+    
+    def preprocess_image(self, image_path: str) -> np.ndarray:
+        """이미지 전처리"""
+        img = Image.open(image_path)
+        img = img.convert('RGB')
+        img = img.resize(self.input_size[:2])
+        img_array = np.array(img, dtype=np.float32) / 255.0
+        return np.expand_dims(img_array, axis=0)
+    
+    def predict(self, image_path: str) -> Dict[str, Any]:
+        """이미지 분류 예측"""
+        return self.predict_batch(self.preprocess_image(image_path))[0]
+    
+    def predict_from_array(self, image_array: np.ndarray) -> Dict[str, Any]:
+        """numpy 배열로부터 이미지 분류 예측"""
+        if len(image_array.shape) == 3:
+            image_array = np.expand_dims(image_array, axis=0)
+        return self.predict_batch(image_array)[0]
+    
+    def predict_batch(self, image_arrays: np.ndarray) -> List[Dict[str, Any]]:
+        """여러 이미지 배열 일괄 예측"""
+        probabilities = self._run(np.asarray(image_arrays, dtype=np.float32))
+        return [build_prediction(p, self.class_names) for p in probabilities]
+    
+    def get_class_info(self) -> Dict[str, Any]:
+        """클래스 정보 반환"""
+        return {
+            'class_names': self.class_names,
+            'num_classes': self.num_classes,
+            'recyclable_classes': RECYCLABLE_CLASSES
+        }
+
+
+class TFLiteClassifier(_ArrayClassifier):
+    """TFLite 인터프리터 기반 분류기 (양자화 입출력 지원)"""
+    
+    def __init__(self, model_path: str, num_threads: Optional[int] = None):
+        super().__init__(model_path)
+        import tensorflow as tf
+        
+        self.interpreter = tf.lite.Interpreter(model_path=model_path, num_threads=num_threads)
+        self.interpreter.allocate_tensors()
+        self._input = self.interpreter.get_input_details()[0]
+        self._output = self.interpreter.get_output_details()[0]
+        self.input_size = tuple(int(d) for d in self._input['shape'][1:])
+    
+    def _run(self, batch: np.ndarray) -> np.ndarray:
+        # 배치 크기가 바뀌면 입력 텐서 크기 조정
+        if int(self._input['shape'][0]) != len(batch):
+            self.interpreter.resize_tensor_input(self._input['index'], batch.shape)
+            self.interpreter.allocate_tensors()
+            self._input = self.interpreter.get_input_details()[0]
+            self._output = self.interpreter.get_output_details()[0]
+        
+        scale, zero_point = self._input['quantization']
+        if np.issubdtype(self._input['dtype'], np.integer) and scale:
+            batch = np.round(batch / scale + zero_point).astype(self._input['dtype'])
+        self.interpreter.set_tensor(self._input['index'], batch.astype(self._input['dtype']))
+        self.interpreter.invoke()
+        
+        output = self.interpreter.get_tensor(self._output['index'])
+        scale, zero_point = self._output['quantization']
+        if np.issubdtype(output.dtype, np.integer) and scale:
+            output = (output.astype(np.float32) - zero_point) * scale
+        return output
+
+
+class ONNXClassifier(_ArrayClassifier):
+    """onnxruntime 기반 분류기 (NHWC 입력 모델)"""
+    
+    def __init__(self, model_path: str):
+        super().__init__(model_path)
+        try:
+            import onnxruntime as ort
+        except ImportError:
+            raise ImportError("ONNX 모델을 사용하려면 onnxruntime을 설치하세요: pip install onnxruntime")
+        
+        self.session = ort.InferenceSession(model_path, providers=ort.get_available_providers())
+        model_input = self.session.get_inputs()[0]
+        self._input_name = model_input.name
+        if all(isinstance(d, int) for d in model_input.shape[1:]):
+            self.input_size = tuple(model_input.shape[1:])
+    
+    def _run(self, batch: np.ndarray) -> np.ndarray:
+        return self.session.run(None, {self._input_name: batch})[0]
+
+
+def load_classifier(model_path: str) -> IImageClassifier:
+    """확장자에 맞는 백엔드로 분류기 로드 (.h5/.keras, .tflite, .onnx)"""
+    if not os.path.exists(model_path):
+        raise ValueError(f"모델을 찾을 수 없습니다: {model_path}")
+    
+    extension = os.path.splitext(model_path)[1].lower()
+    if extension == '.tflite':
+        return TFLiteClassifier(model_path)
+    if extension == '.onnx':
+        return ONNXClassifier(model_path)
+    if extension in ('.h5', '.keras'):
+        return RecyclingClassifier(model_path)
+    
+    raise ValueError(f"지원하지 않는 모델 형식입니다: {extension}")
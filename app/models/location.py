@@ -1,32 +1,104 @@
 """
 위치 기반 쓰레기 배출 정보 모델
 """
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean, Index, event, literal_column
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from typing import List, Dict, Optional
 
+from app.core.geo import encode_geohash
+
 Base = declarative_base()
 
+# 배출 장소 출처 (source). 직접 등록한 장소는 local, 동기화된 장소는 출처 시스템 이름
+LOCAL_SOURCE = 'local'
+PUBLIC_API_SOURCE = 'public_api'
+
+# 쓰레기 종류별 비트 (waste_type_mask). 새 종류는 뒤에 추가만 하고 기존 비트는 바꾸지 않음
+WASTE_TYPE_BITS = {
+    'glass': 1 << 0,
+    'paper': 1 << 1,
+    'plastic': 1 << 2,
+    'metal': 1 << 3,
+    'trash': 1 << 4,
+}
+
+
+def split_waste_types(waste_types) -> List[str]:
+    """콤마 구분 문자열/리스트를 정규화된 쓰레기 종류 목록으로 변환 (순서 유지, 중복 제거)"""
+    if not waste_types:
+        return []
+    if isinstance(waste_types, str):
+        waste_types = waste_types.split(',')
+    result = []
+    for waste_type in waste_types:
+        waste_type = waste_type.strip().lower() if waste_type else ''
+        if waste_type and waste_type not in result:
+            result.append(waste_type)
+    return result
+
+
+def waste_type_mask(waste_types) -> int:
+    """쓰레기 종류 목록을 비트마스크로 변환 (알 수 없는 종류는 무시)"""
+    mask = 0
+    for waste_type in split_waste_types(waste_types):
+        mask |= WASTE_TYPE_BITS.get(waste_type, 0)
+    return mask
+
 
 class RecyclingLocation(Base):
     """분리수거 배출 장소 모델"""
     __tablename__ = "recycling_locations"
+    __table_args__ = (
+        # 동기화 upsert 키 (출처별 외부 ID). 직접 등록한 장소는 external_id가 NULL
+        Index('ux_recycling_locations_source_external_id', 'source', 'external_id', unique=True),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(200), nullable=False, comment="배출 장소명")
     address = Column(String(500), nullable=False, comment="주소")
     latitude = Column(Float, nullable=False, comment="위도")
     longitude = Column(Float, nullable=False, comment="경도")
+    geohash = Column(String(12), nullable=True, index=True, comment="위치 geohash (삽입/수정 시 자동 계산)")
     waste_types = Column(String(200), nullable=False, comment="수거 가능한 쓰레기 종류 (comma separated)")
+    waste_type_mask = Column(Integer, nullable=False, default=0, server_default='0',
+                             comment="쓰레기 종류 비트마스크 (삽입/수정 시 자동 계산)")
     operating_hours = Column(String(100), nullable=True, comment="운영 시간")
     contact_info = Column(String(100), nullable=True, comment="연락처")
     description = Column(Text, nullable=True, comment="설명")
     is_active = Column(Boolean, default=True, comment="활성 상태")
+    source = Column(String(50), nullable=False, default=LOCAL_SOURCE, server_default=LOCAL_SOURCE,
+                    comment="데이터 출처 (local, public_api)")
+    external_id = Column(String(100), nullable=True, comment="출처 시스템의 시설 ID")
+    content_hash = Column(String(64), nullable=True, comment="동기화된 내용 해시 (변경 감지용)")
+    synced_at = Column(DateTime, nullable=True, comment="마지막 동기화 시각")
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    @classmethod
+    def accepts_waste_type(cls, waste_type: str):
+        """
+        쓰레기 종류 필터 조건
+        
+        비트마스크에 있는 종류는 종류별 부분 인덱스(WASTE_TYPE_INDEXES)의 조건과 같은 형태
+        ((waste_type_mask & bit) != 0, 리터럴)로 돌려주어 종류만으로 거르는 조회가 인덱스를
+        쓰게 하고, 그 외 종류는 문자열 검색으로 처리합니다. 반경 검색은 geohash 인덱스 범위
+        검색으로 후보를 좁히고 이 조건은 그 후보에만 적용됩니다.
+        """
+        bit = WASTE_TYPE_BITS.get(waste_type.strip().lower()) if waste_type else None
+        if bit is None:
+            return cls.waste_types.contains(waste_type)
+        return cls.waste_type_mask.op('&')(literal_column(str(bit))) != literal_column('0')
+    
+    def get_waste_types(self) -> List[str]:
+        """수거 가능한 쓰레기 종류 목록 (비트마스크 종류 + 그 외 문자열 종류)"""
+        listed = split_waste_types(self.waste_types)
+        if not self.waste_type_mask:
+            return listed
+        known = [w for w in WASTE_TYPE_BITS if self.waste_type_mask & WASTE_TYPE_BITS[w]]
+        return known + [w for w in listed if w not in WASTE_TYPE_BITS]
+    
     def to_dict(self) -> Dict:
         """딕셔너리로 변환"""
         return {
@@ -35,11 +107,13 @@ class RecyclingLocation(Base):
             'address': self.address,
             'latitude': self.latitude,
             'longitude': self.longitude,
-            'waste_types': self.waste_types.split(',') if self.waste_types else [],
+            'waste_types': self.get_waste_types(),
             'operating_hours': self.operating_hours,
             'contact_info': self.contact_info,
             'description': self.description,
             'is_active': self.is_active,
+            'data_source': self.source or LOCAL_SOURCE,
+            'external_id': self.external_id,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
@@ -53,6 +127,7 @@ class UserLocation(Base):
     user_id = Column(String(100), nullable=True, comment="사용자 ID (선택사항)")
     latitude = Column(Float, nullable=False, comment="위도")
     longitude = Column(Float, nullable=False, comment="경도")
+    geohash = Column(String(12), nullable=True, index=True, comment="위치 geohash (삽입/수정 시 자동 계산)")
     address = Column(String(500), nullable=True, comment="주소")
     created_at = Column(DateTime, default=datetime.utcnow)
     
@@ -66,3 +141,35 @@ class UserLocation(Base):
             'address': self.address,
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
+
+
+# 쓰레기 종류별 부분 인덱스 (by_waste_type/find_by_criteria처럼 종류로만 거르는 조회용).
+# 조건이 accepts_waste_type과 같은 식이어야 플래너가 인덱스를 고름
+WASTE_TYPE_INDEXES = [
+    Index(
+        f'ix_recycling_locations_type_{waste_type}',
+        RecyclingLocation.geohash,
+        sqlite_where=RecyclingLocation.accepts_waste_type(waste_type),
+        postgresql_where=RecyclingLocation.accepts_waste_type(waste_type)
+    )
+    for waste_type in WASTE_TYPE_BITS
+]
+
+
+def _set_waste_type_mask(mapper, connection, target):
+    """쓰레기 종류 문자열로부터 비트마스크 컬럼 갱신"""
+    target.waste_type_mask = waste_type_mask(target.waste_types)
+
+
+def _set_geohash(mapper, connection, target):
+    """위경도로부터 geohash 컬럼 갱신"""
+    if target.latitude is not None and target.longitude is not None:
+        target.geohash = encode_geohash(target.latitude, target.longitude)
+
+
+for _model in (RecyclingLocation, UserLocation):
+    event.listen(_model, 'before_insert', _set_geohash)
+    event.listen(_model, 'before_update', _set_geohash)
+
+event.listen(RecyclingLocation, 'before_insert', _set_waste_type_mask)
+event.listen(RecyclingLocation, 'before_update', _set_waste_type_mask)
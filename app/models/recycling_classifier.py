@@ -7,11 +7,53 @@ from tensorflow.keras import layers
 import numpy as np
 from PIL import Image
 import os
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Optional, Any
 import json
 
+from app.core.data_processor import DataProcessor, create_augmentation_layers
+from app.core.interfaces import IImageClassifier
 
-class RecyclingClassifier:
+
+RECYCLABLE_CLASSES = ['glass', 'paper', 'plastic', 'metal']
+
+# 분류 헤드 기본 하이퍼파라미터 (하이퍼파라미터 탐색으로 교체 가능)
+DEFAULT_HEAD_CONFIG = {
+    'learning_rate': 0.001,
+    'dense_units': 128,
+    'dropout': 0.2
+}
+
+# 백본 특징(GlobalAveragePooling) 레이어 이름과 분류 헤드 레이어 이름
+FEATURE_LAYER_NAME = 'feature_pool'
+HEAD_LAYER_NAMES = ['head_dropout_1', 'head_dense', 'head_dropout_2', 'head_output']
+
+
+def build_classification_head(features: tf.Tensor, num_classes: int, head_config: Optional[Dict[str, Any]] = None) -> tf.Tensor:
+    """백본 특징 위에 분류 헤드 추가 (Dropout -> Dense -> Dropout -> softmax)"""
+    config = {**DEFAULT_HEAD_CONFIG, **(head_config or {})}
+    x = layers.Dropout(config['dropout'], name=HEAD_LAYER_NAMES[0])(features)
+    x = layers.Dense(config['dense_units'], activation='relu', name=HEAD_LAYER_NAMES[1])(x)
+    x = layers.Dropout(config['dropout'], name=HEAD_LAYER_NAMES[2])(x)
+    return layers.Dense(num_classes, activation='softmax', name=HEAD_LAYER_NAMES[3])(x)
+
+
+def build_prediction(probabilities: np.ndarray, class_names: List[str]) -> Dict[str, Any]:
+    """클래스 확률 벡터로부터 예측 결과 딕셔너리 생성"""
+    predicted_class_idx = int(np.argmax(probabilities))
+    predicted_class = class_names[predicted_class_idx]
+    
+    return {
+        'predicted_class': predicted_class,
+        'confidence': float(probabilities[predicted_class_idx]),
+        'class_probabilities': {
+            class_names[i]: float(probabilities[i])
+            for i in range(len(class_names))
+        },
+        'is_recyclable': predicted_class in RECYCLABLE_CLASSES
+    }
+
+
+class RecyclingClassifier(IImageClassifier):
     """분리수거 품목 분류 모델 클래스"""
     
     def __init__(self, model_path: str = None):
@@ -29,7 +71,7 @@ class RecyclingClassifier:
         if model_path and os.path.exists(model_path):
             self.load_model(model_path)
     
-    def create_base_model(self) -> keras.Model:
+    def create_base_model(self, head_config: Optional[Dict[str, Any]] = None) -> keras.Model:
         """EfficientNetV2 기반 모델 생성"""
         # EfficientNetV2-S 모델 로드 (사전 훈련된 가중치 사용)
         base_model = keras.applications.EfficientNetV2S(
@@ -41,28 +83,28 @@ class RecyclingClassifier:
         # 사전 훈련된 모델의 가중치 고정 (처음 몇 개 레이어만)
         base_model.trainable = False
         
-        # 분류 헤드 추가
+        # 분류 헤드 추가 (증강 레이어는 훈련 시에만 동작)
         inputs = keras.Input(shape=self.input_size)
-        x = base_model(inputs, training=False)
-        x = layers.GlobalAveragePooling2D()(x)
-        x = layers.Dropout(0.2)(x)
-        x = layers.Dense(128, activation='relu')(x)
-        x = layers.Dropout(0.2)(x)
-        outputs = layers.Dense(self.num_classes, activation='softmax')(x)
+        x = create_augmentation_layers()(inputs)
+        x = base_model(x, training=False)
+        x = layers.GlobalAveragePooling2D(name=FEATURE_LAYER_NAME)(x)
+        outputs = build_classification_head(x, self.num_classes, head_config)
         
         model = keras.Model(inputs, outputs)
         return model
     
-    def prepare_data(self, data_dir: str, validation_split: float = 0.2) -> Tuple[tf.data.Dataset, tf.data.Dataset]:
-        """데이터셋 준비"""
-        # 데이터 증강 설정
+    def prepare_data(self,
+                     data_dir: str,
+                     validation_split: float = 0.2,
+                     manifest_path: Optional[str] = None) -> Tuple[tf.data.Dataset, tf.data.Dataset]:
+        """데이터셋 준비 (매니페스트가 있으면 중복 제거된 이미지 목록 사용)"""
+        if manifest_path:
+            data_processor = DataProcessor(target_size=self.input_size[:2])
+            return data_processor.create_manifest_generators(manifest_path, validation_split)
+        
+        # 데이터 생성기 (증강은 모델 내 전처리 레이어에서 배치 단위로 수행)
         train_datagen = keras.preprocessing.image.ImageDataGenerator(
             rescale=1./255,
-            rotation_range=20,
-            width_shift_range=0.2,
-            height_shift_range=0.2,
-            horizontal_flip=True,
-            zoom_range=0.2,
             validation_split=validation_split
         )
         
@@ -88,20 +130,34 @@ class RecyclingClassifier:
         
         return train_generator, validation_generator
     
-    def fine_tune(self, data_dir: str, epochs: int = 10, save_path: str = "models/recycling_classifier.h5"):
-        """모델 파인튜닝"""
+    def fine_tune(self,
+                  data_dir: str,
+                  epochs: int = 10,
+                  save_path: str = "models/recycling_classifier.h5",
+                  manifest_path: Optional[str] = None,
+                  head_config: Optional[Dict[str, Any]] = None,
+                  callbacks: Optional[List[keras.callbacks.Callback]] = None,
+                  profiler: Optional[Any] = None):
+        """
+        모델 파인튜닝
+        
+        head_config로 헤드 하이퍼파라미터, callbacks로 추가 콜백을 지정할 수 있고,
+        profiler(TrainingProfiler)를 주면 훈련 입력 파이프라인을 계측합니다.
+        """
+        config = {**DEFAULT_HEAD_CONFIG, **(head_config or {})}
+        
         # 모델 생성
-        self.model = self.create_base_model()
+        self.model = self.create_base_model(config)
         
         # 컴파일
         self.model.compile(
-            optimizer=keras.optimizers.Adam(learning_rate=0.001),
+            optimizer=keras.optimizers.Adam(learning_rate=config['learning_rate']),
             loss='categorical_crossentropy',
             metrics=['accuracy']
         )
         
         # 데이터 준비
-        train_gen, val_gen = self.prepare_data(data_dir)
+        train_gen, val_gen = self.prepare_data(data_dir, manifest_path=manifest_path)
         
         # 콜백 설정
         callbacks = [
@@ -116,7 +172,13 @@ class RecyclingClassifier:
                 patience=2,
                 min_lr=1e-7
             )
-        ]
+        ] + list(callbacks or [])
+        
+        fit_kwargs = {}
+        if profiler is not None:
+            fit_kwargs['steps_per_epoch'] = len(train_gen)
+            train_gen = profiler.wrap_input(train_gen)
+            callbacks.append(profiler.callback())
         
         # 훈련
         history = self.model.fit(
@@ -124,7 +186,8 @@ class RecyclingClassifier:
             epochs=epochs,
             validation_data=val_gen,
             callbacks=callbacks,
-            verbose=1
+            verbose=1,
+            **fit_kwargs
         )
         
         # 모델 저장
@@ -172,22 +235,7 @@ class RecyclingClassifier:
         
         # 예측
         predictions = self.model.predict(processed_image, verbose=0)
-        predicted_class_idx = np.argmax(predictions[0])
-        confidence = float(predictions[0][predicted_class_idx])
-        predicted_class = self.class_names[predicted_class_idx]
-        
-        # 모든 클래스에 대한 확률
-        class_probabilities = {
-            self.class_names[i]: float(predictions[0][i])
-            for i in range(len(self.class_names))
-        }
-        
-        return {
-            'predicted_class': predicted_class,
-            'confidence': confidence,
-            'class_probabilities': class_probabilities,
-            'is_recyclable': predicted_class in ['glass', 'paper', 'plastic', 'metal']
-        }
+        return build_prediction(predictions[0], self.class_names)
     
     def predict_from_array(self, image_array: np.ndarray) -> Dict:
         """numpy 배열로부터 이미지 분류 예측"""
@@ -200,19 +248,20 @@ class RecyclingClassifier:
         
         # 예측
         predictions = self.model.predict(image_array, verbose=0)
-        predicted_class_idx = np.argmax(predictions[0])
-        confidence = float(predictions[0][predicted_class_idx])
-        predicted_class = self.class_names[predicted_class_idx]
-        
-        # 모든 클래스에 대한 확률
-        class_probabilities = {
-            self.class_names[i]: float(predictions[0][i])
-            for i in range(len(self.class_names))
-        }
+        return build_prediction(predictions[0], self.class_names)
+    
+    def predict_batch(self, image_arrays: np.ndarray) -> List[Dict[str, Any]]:
+        """여러 이미지 배열 일괄 예측 (한 번의 모델 호출)"""
+        if self.model is None:
+            raise ValueError("모델이 로드되지 않았습니다. load_model()을 먼저 호출하세요.")
         
+        predictions = self.model.predict(np.asarray(image_arrays), verbose=0)
+        return [build_prediction(probabilities, self.class_names) for probabilities in predictions]
+    
+    def get_class_info(self) -> Dict[str, Any]:
+        """클래스 정보 반환"""
         return {
-            'predicted_class': predicted_class,
-            'confidence': confidence,
-            'class_probabilities': class_probabilities,
-            'is_recyclable': predicted_class in ['glass', 'paper', 'plastic', 'metal']
+            'class_names': self.class_names,
+            'num_classes': self.num_classes,
+            'recyclable_classes': RECYCLABLE_CLASSES
         }
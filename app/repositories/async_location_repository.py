@@ -0,0 +1,166 @@
+"""
+위치 관련 비동기 저장소 (AsyncSession)
+
+동기 저장소(location_repository)와 같은 조회 조건을 사용하며, 쿼리 실행만 await로 합니다.
+비동기 핸들러에서 DB I/O가 이벤트 루프를 막지 않도록 사용합니다.
+"""
+from typing import List, Dict, Optional, Any
+from sqlalchemy import select, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.interfaces import IAsyncRepository
+from app.models.location import RecyclingLocation, UserLocation
+from app.repositories.location_repository import LocationQueryBuilder
+
+
+class AsyncLocationRepository(IAsyncRepository):
+    """위치 비동기 저장소 구현"""
+    
+    def __init__(self, db_session: AsyncSession):
+        self.db = db_session
+    
+    async def create(self, entity: Any) -> Any:
+        """엔티티 생성"""
+        self.db.add(entity)
+        await self.db.commit()
+        await self.db.refresh(entity)
+        return entity
+    
+    async def get_by_id(self, entity_id: int) -> Optional[Any]:
+        """ID로 엔티티 조회"""
+        return await self.db.get(RecyclingLocation, entity_id)
+    
+    async def get_by_ids(self, entity_ids: List[int]) -> List[Any]:
+        """여러 ID로 엔티티 조회 (입력 순서 유지)"""
+        if not entity_ids:
+            return []
+        
+        result = await self.db.execute(
+            select(RecyclingLocation).where(RecyclingLocation.id.in_(entity_ids))
+        )
+        by_id = {entity.id: entity for entity in result.scalars()}
+        return [by_id[entity_id] for entity_id in entity_ids if entity_id in by_id]
+    
+    async def update(self, entity_id: int, data: Dict[str, Any]) -> Optional[Any]:
+        """엔티티 업데이트"""
+        entity = await self.get_by_id(entity_id)
+        if not entity:
+            return None
+        
+        for key, value in data.items():
+            if hasattr(entity, key):
+                setattr(entity, key, value)
+        
+        await self.db.commit()
+        await self.db.refresh(entity)
+        return entity
+    
+    async def delete(self, entity_id: int) -> bool:
+        """엔티티 삭제 (소프트 삭제)"""
+        entity = await self.get_by_id(entity_id)
+        if not entity:
+            return False
+        
+        entity.is_active = False
+        await self.db.commit()
+        return True
+    
+    async def find_by_criteria(self, criteria: Dict[str, Any]) -> List[Any]:
+        """조건에 따른 엔티티 조회"""
+        statement = select(RecyclingLocation)
+        
+        if 'is_active' in criteria:
+            statement = statement.where(RecyclingLocation.is_active == criteria['is_active'])
+        
+        if 'waste_type' in criteria:
+            statement = statement.where(RecyclingLocation.accepts_waste_type(criteria['waste_type']))
+        
+        if 'name' in criteria:
+            statement = statement.where(RecyclingLocation.name.contains(criteria['name']))
+        
+        result = await self.db.execute(statement)
+        return list(result.scalars())
+
+
+class AsyncUserLocationRepository(IAsyncRepository):
+    """사용자 위치 비동기 저장소 구현"""
+    
+    def __init__(self, db_session: AsyncSession):
+        self.db = db_session
+    
+    async def create(self, entity: Any) -> Any:
+        """엔티티 생성"""
+        self.db.add(entity)
+        await self.db.commit()
+        await self.db.refresh(entity)
+        return entity
+    
+    async def get_by_id(self, entity_id: int) -> Optional[Any]:
+        """ID로 엔티티 조회"""
+        return await self.db.get(UserLocation, entity_id)
+    
+    async def update(self, entity_id: int, data: Dict[str, Any]) -> Optional[Any]:
+        """엔티티 업데이트"""
+        entity = await self.get_by_id(entity_id)
+        if not entity:
+            return None
+        
+        for key, value in data.items():
+            if hasattr(entity, key):
+                setattr(entity, key, value)
+        
+        await self.db.commit()
+        await self.db.refresh(entity)
+        return entity
+    
+    async def delete(self, entity_id: int) -> bool:
+        """엔티티 삭제"""
+        entity = await self.get_by_id(entity_id)
+        if not entity:
+            return False
+        
+        await self.db.delete(entity)
+        await self.db.commit()
+        return True
+    
+    async def find_by_criteria(self, criteria: Dict[str, Any]) -> List[Any]:
+        """조건에 따른 엔티티 조회"""
+        statement = select(UserLocation)
+        
+        if 'user_id' in criteria:
+            statement = statement.where(UserLocation.user_id == criteria['user_id'])
+        
+        if 'latitude' in criteria and 'longitude' in criteria:
+            # 위치 기반 조회 (반경 내)
+            lat = criteria['latitude']
+            lon = criteria['longitude']
+            radius = criteria.get('radius', 1.0)  # 기본 1km
+            
+            # 간단한 반경 계산 (실제로는 더 정확한 계산 필요)
+            statement = statement.where(
+                and_(
+                    UserLocation.latitude.between(lat - radius, lat + radius),
+                    UserLocation.longitude.between(lon - radius, lon + radius)
+                )
+            )
+        
+        result = await self.db.execute(statement)
+        return list(result.scalars())
+
+
+class AsyncLocationQueryBuilder(LocationQueryBuilder):
+    """
+    위치 비동기 쿼리 빌더
+    
+    select() 문도 filter/order_by/limit를 지원하므로 조건을 만드는 메서드는
+    LocationQueryBuilder를 그대로 사용하고 실행만 비동기로 합니다.
+    """
+    
+    def __init__(self, db_session: AsyncSession):
+        self.db = db_session
+        self.query = select(RecyclingLocation)
+    
+    async def build(self) -> List[RecyclingLocation]:
+        """쿼리 실행"""
+        result = await self.db.execute(self.query)
+        return list(result.scalars())
@@ -1,14 +1,19 @@
 """
 위치 관련 저장소 패턴 구현
 """
+import math
 from typing import List, Dict, Optional, Any
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, or_
 
 from app.core.interfaces import IRepository
+from app.core.geo import geohash_cover, GEOHASH_PREFIX_END, DEFAULT_MAX_COVER_CELLS
 from app.models.location import RecyclingLocation, UserLocation
 
 
+KM_PER_DEGREE = 111.195  # 위도 1도 거리 (지구 반지름 6371km 기준)
+
+
 class LocationRepository(IRepository):
     """위치 저장소 구현"""
     
@@ -28,6 +33,17 @@ class LocationRepository(IRepository):
             RecyclingLocation.id == entity_id
         ).first()
     
+    def get_by_ids(self, entity_ids: List[int]) -> List[Any]:
+        """여러 ID로 엔티티 조회 (입력 순서 유지)"""
+        if not entity_ids:
+            return []
+        
+        entities = self.db.query(RecyclingLocation).filter(
+            RecyclingLocation.id.in_(entity_ids)
+        ).all()
+        by_id = {entity.id: entity for entity in entities}
+        return [by_id[entity_id] for entity_id in entity_ids if entity_id in by_id]
+    
     def update(self, entity_id: int, data: Dict[str, Any]) -> Optional[Any]:
         """엔티티 업데이트"""
         entity = self.get_by_id(entity_id)
@@ -60,7 +76,7 @@ class LocationRepository(IRepository):
             query = query.filter(RecyclingLocation.is_active == criteria['is_active'])
         
         if 'waste_type' in criteria:
-            query = query.filter(RecyclingLocation.waste_types.contains(criteria['waste_type']))
+            query = query.filter(RecyclingLocation.accepts_waste_type(criteria['waste_type']))
         
         if 'name' in criteria:
             query = query.filter(RecyclingLocation.name.contains(criteria['name']))
@@ -149,7 +165,7 @@ class LocationQueryBuilder:
     
     def by_waste_type(self, waste_type: str):
         """쓰레기 종류별 조회"""
-        self.query = self.query.filter(RecyclingLocation.waste_types.contains(waste_type))
+        self.query = self.query.filter(RecyclingLocation.accepts_waste_type(waste_type))
         return self
     
     def by_name(self, name: str):
@@ -157,26 +173,50 @@ class LocationQueryBuilder:
         self.query = self.query.filter(RecyclingLocation.name.contains(name))
         return self
     
-    def within_radius(self, latitude: float, longitude: float, radius_km: float):
-        """반경 내 조회"""
-        # 실제 구현에서는 더 정확한 거리 계산 필요
-        lat_range = radius_km / 111.0  # 대략적인 위도 1도 = 111km
-        lon_range = radius_km / (111.0 * abs(latitude) / 90.0)  # 경도는 위도에 따라 다름
+    @staticmethod
+    def _squared_distance(latitude: float, longitude: float):
+        """등장방형 근사 거리의 제곱 (위도 도 단위, SQL 산술식)"""
+        lon_scale = math.cos(math.radians(latitude))
+        lat_diff = RecyclingLocation.latitude - latitude
+        lon_diff = (RecyclingLocation.longitude - longitude) * lon_scale
+        return lat_diff * lat_diff + lon_diff * lon_diff
+    
+    def _distance_filter(self, latitude: float, longitude: float, radius_km: float):
+        """등장방형 근사 거리 조건 (근사 오차만큼 여유를 둔 반경)"""
+        lat_range = radius_km / KM_PER_DEGREE
+        margin = 1.01 + math.tan(math.radians(min(abs(latitude), 89.0))) * math.radians(lat_range)
+        return self._squared_distance(latitude, longitude) <= (lat_range * margin) ** 2
+    
+    def within_cells(self, latitude: float, longitude: float, radius_km: float,
+                     max_cells: int = DEFAULT_MAX_COVER_CELLS):
+        """
+        반경 내 조회 (geohash 셀 커버)
+        
+        반경 원을 덮는 geohash 셀마다 geohash 인덱스 범위 조건
+        (geohash >= 셀 AND geohash < 셀 + '{')을 만들어 OR로 묶고,
+        등장방형 근사 거리 조건으로 셀 모서리를 제외합니다. 근사 오차(반경이 클수록,
+        고위도일수록 커짐)로 경계의 행이 빠지지 않도록 여유를 두며,
+        정확한 거리 판정은 호출 측에서 합니다.
+        """
+        cells = geohash_cover(latitude, longitude, radius_km, max_cells=max_cells)
         
         self.query = self.query.filter(
             and_(
-                RecyclingLocation.latitude.between(latitude - lat_range, latitude + lat_range),
-                RecyclingLocation.longitude.between(longitude - lon_range, longitude + lon_range)
+                or_(*[
+                    and_(RecyclingLocation.geohash >= cell,
+                         RecyclingLocation.geohash < cell + GEOHASH_PREFIX_END)
+                    for cell in cells
+                ]),
+                self._distance_filter(latitude, longitude, radius_km)
             )
         )
         return self
     
     def order_by_distance(self, latitude: float, longitude: float):
-        """거리순 정렬"""
-        # 실제 구현에서는 더 정확한 거리 계산 필요
+        """거리순 정렬 (DB에서 정렬하므로 limit와 함께 가까운 상위 k개만 반환)"""
         self.query = self.query.order_by(
-            (RecyclingLocation.latitude - latitude).label('lat_diff'),
-            (RecyclingLocation.longitude - longitude).label('lon_diff')
+            self._squared_distance(latitude, longitude),
+            RecyclingLocation.id
         )
         return self
     
@@ -0,0 +1,179 @@
+"""
+비동기 DB 세션을 사용하는 위치 기반 쓰레기 배출 정보 서비스
+
+LocationService와 같은 규칙(공간 인덱스, 출처별 지연 예산, 중복 제거)을 따르며,
+DB 조회/쓰기는 AsyncSession으로 await하므로 이벤트 루프를 막지 않습니다.
+"""
+from typing import List, Dict, Optional, Awaitable
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.location import RecyclingLocation, UserLocation
+from app.repositories.async_location_repository import (
+    AsyncLocationRepository, AsyncUserLocationRepository, AsyncLocationQueryBuilder
+)
+from app.services.location_service import LocationService, _env_seconds
+from app.services.public_api_service import PublicAPIService
+from app.services.spatial_index import LocationSpatialIndex
+from app.services.user_location_buffer import UserLocationWriteBuffer
+
+
+class AsyncLocationService(LocationService):
+    """비동기 위치 기반 서비스"""
+    
+    def __init__(self,
+                 db_session: AsyncSession,
+                 location_index: Optional[LocationSpatialIndex] = None,
+                 public_api_service: Optional[PublicAPIService] = None,
+                 use_public_api: bool = True,
+                 user_location_buffer: Optional[UserLocationWriteBuffer] = None):
+        self.db = db_session
+        self.location_index = location_index
+        self.location_repo = AsyncLocationRepository(db_session)
+        self.user_location_repo = AsyncUserLocationRepository(db_session)
+        self.public_api_service = public_api_service or PublicAPIService()
+        self.use_public_api = use_public_api
+        self.user_location_buffer = user_location_buffer
+        self.public_api_budget = _env_seconds("LOCATION_PUBLIC_API_BUDGET_MS", 1500)
+        self.db_budget = _env_seconds("LOCATION_DB_BUDGET_MS", 1000)
+        self.search_deadline = _env_seconds("LOCATION_SEARCH_DEADLINE_MS", 2000)
+    
+    def _local_lookup(self,
+                      latitude: float,
+                      longitude: float,
+                      waste_type: Optional[str],
+                      radius_km: float,
+                      limit: int) -> Awaitable[List[Dict]]:
+        """로컬 DB 조회 (비동기 세션으로 실행)"""
+        return self._find_local_locations_async(latitude, longitude, waste_type, radius_km, limit)
+    
+    async def _find_local_locations_async(self,
+                                          latitude: float,
+                                          longitude: float,
+                                          waste_type: Optional[str],
+                                          radius_km: float,
+                                          limit: int) -> List[Dict]:
+        """로컬 DB 반경 조회 (공간 인덱스가 있으면 인덱스로 후보 선택)"""
+        if self.location_index is not None and await self._ensure_index_loaded():
+            hits = self.location_index.within_radius(latitude, longitude, radius_km, waste_type, limit=limit)
+            locations = await self.location_repo.get_by_ids([location_id for location_id, _ in hits])
+            return self._indexed_results(hits, locations)
+        
+        query = self._nearby_query(AsyncLocationQueryBuilder(self.db), latitude, longitude, waste_type, radius_km, limit)
+        return self._radius_results(await query.build(), latitude, longitude, radius_km)
+    
+    async def _ensure_index_loaded(self) -> bool:
+        """
+        공간 인덱스 적재 (적재 완료 여부 반환)
+        
+        인덱스 적재는 동기 세션 API를 쓰므로 run_sync로 실행합니다. 다른 요청이 적재 중일 때
+        기다리면 이벤트 루프가 막혀 적재도 진행되지 않으므로 기다리지 않고 SQL 조회로 대신합니다.
+        """
+        if self.location_index.is_loaded:
+            return True
+        return await self.db.run_sync(self.location_index.ensure_loaded, False)
+    
+    def _local_multi_lookup(self,
+                            latitude: float,
+                            longitude: float,
+                            waste_types: List[str],
+                            radius_km: float,
+                            limit: int) -> Awaitable[List[Dict]]:
+        """여러 쓰레기 종류의 로컬 DB 조회 (비동기 세션으로 실행)"""
+        return self._find_local_locations_multi_async(latitude, longitude, waste_types, radius_km, limit)
+    
+    async def _find_local_locations_multi_async(self,
+                                                latitude: float,
+                                                longitude: float,
+                                                waste_types: List[str],
+                                                radius_km: float,
+                                                limit: int) -> List[Dict]:
+        """여러 쓰레기 종류의 로컬 DB 반경 조회 (종류별 상위 limit개의 합집합)"""
+        if self.location_index is not None and await self._ensure_index_loaded():
+            hits = self._union_hits(
+                self.location_index.within_radius_by_type(latitude, longitude, radius_km, waste_types, limit)
+            )
+            locations = await self.location_repo.get_by_ids([location_id for location_id, _ in hits])
+            return self._indexed_results(hits, locations)
+        
+        locations = {}
+        for waste_type in waste_types:
+            query = self._nearby_query(AsyncLocationQueryBuilder(self.db), latitude, longitude, waste_type, radius_km, limit)
+            for location in self._radius_results(await query.build(), latitude, longitude, radius_km):
+                locations[location['id']] = location
+        return list(locations.values())
+    
+    async def get_location_by_id(self, location_id: int) -> Optional[Dict]:
+        """ID로 배출 장소 조회"""
+        location = await self.location_repo.get_by_id(location_id)
+        
+        if location and location.is_active:
+            return location.to_dict()
+        return None
+    
+    async def add_recycling_location(self,
+                                     name: str,
+                                     address: str,
+                                     latitude: float,
+                                     longitude: float,
+                                     waste_types: List[str],
+                                     operating_hours: str = None,
+                                     contact_info: str = None,
+                                     description: str = None) -> Dict:
+        """새로운 분리수거 배출 장소 추가"""
+        location = RecyclingLocation(
+            name=name,
+            address=address,
+            latitude=latitude,
+            longitude=longitude,
+            waste_types=','.join(waste_types),
+            operating_hours=operating_hours,
+            contact_info=contact_info,
+            description=description
+        )
+        
+        created_location = await self.location_repo.create(location)
+        if self.location_index is not None:
+            self.location_index.upsert_location(created_location)
+        return created_location.to_dict()
+    
+    async def update_recycling_location(self,
+                                        location_id: int,
+                                        **kwargs) -> Optional[Dict]:
+        """분리수거 배출 장소 정보 수정"""
+        update_data = self._location_update_data(kwargs)
+        updated_location = await self.location_repo.update(location_id, update_data)
+        if updated_location and self.location_index is not None:
+            self.location_index.upsert_location(updated_location)
+        return updated_location.to_dict() if updated_location else None
+    
+    async def delete_recycling_location(self, location_id: int) -> bool:
+        """분리수거 배출 장소 삭제 (비활성화)"""
+        deleted = await self.location_repo.delete(location_id)
+        if deleted and self.location_index is not None:
+            self.location_index.remove(location_id)
+        return deleted
+    
+    async def save_user_location(self,
+                                 latitude: float,
+                                 longitude: float,
+                                 user_id: str = None,
+                                 address: str = None,
+                                 wait: bool = False) -> Dict:
+        """
+        사용자 위치 저장
+        
+        지연 쓰기 버퍼가 있으면 버퍼에 넣고 바로 반환합니다 (id는 None).
+        wait=True이면 직접 저장하고 생성된 id를 반환합니다.
+        """
+        if self.user_location_buffer is not None and not wait:
+            return await self.user_location_buffer.enqueue(latitude, longitude, user_id, address)
+        
+        user_location = UserLocation(
+            user_id=user_id,
+            latitude=latitude,
+            longitude=longitude,
+            address=address
+        )
+        
+        created_location = await self.user_location_repo.create(user_location)
+        return created_location.to_dict()
@@ -0,0 +1,335 @@
+"""
+공공 배출시설 데이터 타일 캐시
+
+공공 API 결과를 geohash 타일 단위로 캐시합니다. 주변 조회는 반경을 덮는 타일을 모아
+조립하므로, 가까운 위치의 요청끼리 같은 타일을 재사용합니다.
+
+- 한 조회에서 캐시에 없는 타일은 그 타일들을 모두 덮는 영역으로 상위 API를 한 번만 호출하고,
+  결과를 타일별로 나눠 저장합니다 (타일마다 호출하지 않음).
+- 상위 API는 쓰레기 종류로 거르지 않으므로 타일에는 모든 종류를 저장하고 조립 후 거릅니다.
+
+- TTL 안: 캐시 그대로 반환
+- TTL 경과, stale 허용 시간 안: 오래된 데이터를 즉시 반환하고 백그라운드에서 갱신
+- 조회 실패: 짧은 시간 동안 실패를 캐시(negative caching)해 장애 중인 상위 API를 반복 호출하지 않음
+- 메모리: 최대 타일 수를 넘으면 가장 오래 사용하지 않은 타일부터 제거 (LRU)
+
+FACILITY_CACHE_PRECISION: 타일 geohash 정밀도 (기본값: 5, 약 4.9km 셀)
+FACILITY_CACHE_TTL: 신선한 데이터 유지 시간(초) (기본값: 21600)
+FACILITY_CACHE_STALE_TTL: TTL 이후 오래된 데이터를 반환하는 추가 시간(초) (기본값: 86400)
+FACILITY_CACHE_NEGATIVE_TTL: 조회 실패 캐시 시간(초) (기본값: 60)
+FACILITY_CACHE_MAX_TILES: 최대 타일 수 (기본값: 4096)
+FACILITY_CACHE_MAX_QUERY_TILES: 한 조회의 최대 타일 수, 넘으면 캐시 우회 (기본값: 64)
+"""
+import os
+import time
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.core.geo import (
+    encode_geohash, decode_geohash, geohash_cells, haversine_km,
+    filter_by_distance
+)
+from app.models.location import split_waste_types
+
+logger = logging.getLogger(__name__)
+
+# (위도, 경도, 반경 km, 쓰레기 종류) -> 시설 목록. 실패 시 예외를 던져야 함
+# 캐시는 모든 종류를 저장하므로 쓰레기 종류는 항상 None으로 호출
+FacilityFetcher = Callable[[float, float, float, Optional[str]], Awaitable[List[Dict[str, Any]]]]
+
+
+class TileFetchError(Exception):
+    """타일 조회 실패 (negative cache 적중 포함)"""
+
+
+class _TileEntry:
+    """타일 캐시 항목"""
+    
+    __slots__ = ('facilities', 'fetched_at', 'expires_at', 'stale_until', 'retry_at', 'error')
+    
+    def __init__(self, facilities: List[Dict[str, Any]], fetched_at: float,
+                 expires_at: float, stale_until: float, error: Optional[str] = None):
+        self.facilities = facilities
+        self.fetched_at = fetched_at
+        self.expires_at = expires_at
+        self.stale_until = stale_until
+        self.retry_at = expires_at  # stale 데이터의 다음 갱신 시도 시각
+        self.error = error
+
+
+class FacilityTileCache:
+    """geohash 타일 단위 공공 시설 캐시 (TTL, stale-while-revalidate, negative caching, LRU)"""
+    
+    def __init__(self,
+                 fetcher: FacilityFetcher,
+                 precision: int = 5,
+                 ttl_seconds: float = 6 * 3600,
+                 stale_seconds: float = 24 * 3600,
+                 negative_ttl_seconds: float = 60,
+                 max_tiles: int = 4096,
+                 max_tiles_per_query: int = 64):
+        """
+        Args:
+            fetcher: 타일들을 덮는 중심/반경으로 상위 API를 호출하는 함수
+            precision: 타일 geohash 정밀도 (5 = 약 4.9km x 4.9km)
+            ttl_seconds: 신선한 데이터로 보는 시간
+            stale_seconds: TTL 이후 오래된 데이터를 반환하며 갱신할 수 있는 추가 시간
+            negative_ttl_seconds: 조회 실패를 캐시하는 시간
+            max_tiles: 메모리에 둘 최대 타일 수
+            max_tiles_per_query: 한 조회가 덮을 수 있는 최대 타일 수 (넘으면 캐시 우회)
+        """
+        self.fetcher = fetcher
+        self.precision = precision
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.max_tiles = max_tiles
+        self.max_tiles_per_query = max_tiles_per_query
+        
+        self._tiles: "OrderedDict[str, _TileEntry]" = OrderedDict()
+        # 조회 중인 타일 -> 타일 묶음 조회 결과(타일 -> 시설 목록)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._refresh_tasks: set = set()
+        self._counters = {
+            'hits': 0, 'stale_hits': 0, 'misses': 0, 'negative_hits': 0,
+            'fetches': 0, 'refreshes': 0, 'refresh_failures': 0, 'fetch_failures': 0,
+            'evictions': 0, 'bypasses': 0
+        }
+        self._served_age_total = 0.0
+        self._served_count = 0
+    
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    async def get_facilities(self, latitude: float, longitude: float, radius_km: float,
+                             waste_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        반경 내 시설 목록 (타일 조립 후 거리 필터링, 거리순)
+        
+        일부 타일만 실패하면 나머지 타일 결과를 반환하고, 모든 타일이 실패하면
+        TileFetchError를 던집니다.
+        """
+        tiles = geohash_cells(latitude, longitude, radius_km, self.precision)
+        if len(tiles) > self.max_tiles_per_query:
+            # 광역 조회는 타일 캐시를 채우지 않고 직접 조회
+            self._counters['bypasses'] += 1
+            facilities = await self.fetcher(latitude, longitude, radius_km, None)
+            return filter_by_distance(_filter_waste_type([dict(f) for f in facilities], waste_type),
+                                      latitude, longitude, radius_km)
+        
+        now = time.monotonic()
+        cached: Dict[str, List[Dict[str, Any]]] = {}
+        missing: List[str] = []
+        stale: List[str] = []
+        failures = 0
+        for tile in tiles:
+            entry = self._tiles.get(tile)
+            if entry is not None:
+                self._tiles.move_to_end(tile)
+                if entry.error is not None:
+                    if now < entry.expires_at:
+                        self._counters['negative_hits'] += 1
+                        failures += 1
+                        continue
+                elif now < entry.expires_at:
+                    self._counters['hits'] += 1
+                    self._record_served(now - entry.fetched_at)
+                    cached[tile] = entry.facilities
+                    continue
+                elif now < entry.stale_until:
+                    self._counters['stale_hits'] += 1
+                    self._record_served(now - entry.fetched_at)
+                    if now >= entry.retry_at:
+                        stale.append(tile)
+                    cached[tile] = entry.facilities
+                    continue
+            self._counters['misses'] += 1
+            missing.append(tile)
+        
+        if stale:
+            self._schedule_refresh(stale, latitude, longitude)
+        if missing:
+            try:
+                fetched = await self._fetch_coalesced(missing, latitude, longitude)
+            except TileFetchError:
+                fetched = {}
+            cached.update(fetched)
+            failures += sum(1 for tile in missing if tile not in fetched)
+        
+        if failures == len(tiles):
+            raise TileFetchError(f"타일 {failures}개 조회 실패")
+    
+        # 캐시 항목을 변경하지 않도록 복사 (distance_km는 요청마다 다름)
+        facilities = [dict(f) for tile_facilities in cached.values() for f in tile_facilities]
+        return filter_by_distance(_filter_waste_type(facilities, waste_type), latitude, longitude, radius_km)
+    
+    def _record_served(self, age_seconds: float):
+        self._served_age_total += age_seconds
+        self._served_count += 1
+    
+    # ------------------------------------------------------------------
+    # 상위 API 조회 (타일 묶음을 한 번에 조회, 같은 타일의 동시 요청은 한 번만 호출)
+    # ------------------------------------------------------------------
+    async def _fetch_coalesced(self, tiles: List[str], latitude: float,
+                               longitude: float) -> Dict[str, List[Dict[str, Any]]]:
+        """타일 묶음 조회 (다른 요청이 조회 중인 타일은 그 결과를 기다림, 모두 실패하면 TileFetchError)"""
+        futures = {}
+        to_fetch = []
+        for tile in tiles:
+            future = self._inflight.get(tile)
+            if future is None:
+                to_fetch.append(tile)
+            else:
+                futures[tile] = future
+    
+        if to_fetch:
+            future = asyncio.ensure_future(self._fetch_tiles(to_fetch, latitude, longitude))
+            for tile in to_fetch:
+                self._inflight[tile] = future
+                futures[tile] = future
+            future.add_done_callback(lambda done: self._release_inflight(to_fetch, done))
+        
+        result: Dict[str, List[Dict[str, Any]]] = {}
+        failure: Optional[TileFetchError] = None
+        for future in set(futures.values()):
+            try:
+                fetched = await asyncio.shield(future)
+            except TileFetchError as e:
+                failure = e
+                continue
+            result.update({tile: fetched[tile] for tile in tiles if tile in fetched})
+        if not result and failure is not None:
+            raise failure
+        return result
+    
+    def _release_inflight(self, tiles: List[str], future: asyncio.Future):
+        for tile in tiles:
+            if self._inflight.get(tile) is future:
+                del self._inflight[tile]
+    
+    async def _fetch_tiles(self, tiles: List[str], latitude: float,
+                           longitude: float) -> Dict[str, List[Dict[str, Any]]]:
+        """타일들을 모두 덮는 원으로 상위 API를 한 번 호출하고 결과를 타일별로 나눠 저장"""
+        # 질의 지점에서 가장 먼 타일 모서리까지를 반경으로 사용
+        radius_km = 0.0
+        for tile in tiles:
+            lat_lo, lon_lo, lat_hi, lon_hi = decode_geohash(tile)
+            for corner_lat in (lat_lo, lat_hi):
+                for corner_lon in (lon_lo, lon_hi):
+                    radius_km = max(radius_km, haversine_km(latitude, longitude, corner_lat, corner_lon))
+        
+        self._counters['fetches'] += 1
+        try:
+            facilities = await self.fetcher(latitude, longitude, radius_km, None)
+        except Exception as e:
+            self._counters['fetch_failures'] += 1
+            for tile in tiles:
+                self._store_failure(tile, str(e))
+            raise TileFetchError(str(e))
+        
+        # 시설은 자신이 속한 타일에만 저장 (타일 간 중복 방지)
+        by_tile: Dict[str, List[Dict[str, Any]]] = {tile: [] for tile in tiles}
+        for facility in facilities:
+            try:
+                tile = encode_geohash(facility['latitude'], facility['longitude'], self.precision)
+            except (KeyError, TypeError, ValueError):
+                continue
+            if tile in by_tile:
+                facility = dict(facility)
+                facility.pop('distance_km', None)
+                by_tile[tile].append(facility)
+        
+        now = time.monotonic()
+        for tile, in_tile in by_tile.items():
+            self._store(tile, _TileEntry(in_tile, now, now + self.ttl_seconds,
+                                         now + self.ttl_seconds + self.stale_seconds))
+        return by_tile
+    
+    def _store(self, key: str, entry: _TileEntry):
+        self._tiles[key] = entry
+        self._tiles.move_to_end(key)
+        while len(self._tiles) > self.max_tiles:
+            self._tiles.popitem(last=False)
+            self._counters['evictions'] += 1
+    
+    def _store_failure(self, key: str, error: str):
+        now = time.monotonic()
+        entry = self._tiles.get(key)
+        if entry is not None and entry.error is None and now < entry.stale_until:
+            # 갱신 실패: 오래된 데이터는 유지하되 재시도를 negative TTL 만큼 미룸
+            entry.retry_at = now + self.negative_ttl_seconds
+            return
+        self._store(key, _TileEntry([], now, now + self.negative_ttl_seconds, now, error))
+    
+    def _schedule_refresh(self, tiles: List[str], latitude: float, longitude: float):
+        """stale 타일 묶음 백그라운드 갱신 (이미 진행 중인 타일은 생략)"""
+        tiles = [tile for tile in tiles if tile not in self._inflight]
+        if not tiles:
+            return
+        self._counters['refreshes'] += 1
+        
+        async def refresh():
+            try:
+                await self._fetch_coalesced(tiles, latitude, longitude)
+            except TileFetchError as e:
+                self._counters['refresh_failures'] += 1
+                logger.warning(f"타일 갱신 실패 {tiles}: {e}")
+        
+        task = asyncio.ensure_future(refresh())
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+    
+    # ------------------------------------------------------------------
+    # 관리 / 지표
+    # ------------------------------------------------------------------
+    def clear(self):
+        """캐시 비우기"""
+        self._tiles.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """적중률과 데이터 신선도"""
+        now = time.monotonic()
+        lookups = (self._counters['hits'] + self._counters['stale_hits'] +
+                   self._counters['misses'] + self._counters['negative_hits'])
+        data_entries = [e for e in self._tiles.values() if e.error is None]
+        ages = [now - e.fetched_at for e in data_entries]
+        return {
+            **self._counters,
+            'lookups': lookups,
+            'hit_ratio': round((self._counters['hits'] + self._counters['stale_hits']) / lookups, 4) if lookups else None,
+            'stale_ratio': round(self._counters['stale_hits'] / lookups, 4) if lookups else None,
+            'tiles': len(self._tiles),
+            'negative_tiles': len(self._tiles) - len(data_entries),
+            'stale_tiles': sum(1 for e in data_entries if now >= e.expires_at),
+            'facilities': sum(len(e.facilities) for e in data_entries),
+            'max_tiles': self.max_tiles,
+            'max_age_seconds': round(max(ages), 1) if ages else None,
+            'served_age_seconds_avg': round(self._served_age_total / self._served_count, 1) if self._served_count else None,
+            'refreshing': len(self._refresh_tasks),
+            'precision': self.precision,
+            'ttl_seconds': self.ttl_seconds,
+            'stale_seconds': self.stale_seconds
+        }
+
+
+def _filter_waste_type(facilities: List[Dict[str, Any]], waste_type: Optional[str]) -> List[Dict[str, Any]]:
+    """쓰레기 종류를 받는 시설만 (종류 미지정 시 전체)"""
+    if not waste_type:
+        return facilities
+    waste_type = waste_type.strip().lower()
+    return [f for f in facilities if waste_type in split_waste_types(f.get('waste_types'))]
+
+
+def create_facility_cache(fetcher: FacilityFetcher) -> FacilityTileCache:
+    """환경 변수로 TTL, 정밀도, 최대 타일 수를 정해 캐시 생성"""
+    return FacilityTileCache(
+        fetcher,
+        precision=int(os.getenv("FACILITY_CACHE_PRECISION", "5")),
+        ttl_seconds=float(os.getenv("FACILITY_CACHE_TTL", str(6 * 3600))),
+        stale_seconds=float(os.getenv("FACILITY_CACHE_STALE_TTL", str(24 * 3600))),
+        negative_ttl_seconds=float(os.getenv("FACILITY_CACHE_NEGATIVE_TTL", "60")),
+        max_tiles=int(os.getenv("FACILITY_CACHE_MAX_TILES", "4096")),
+        max_tiles_per_query=int(os.getenv("FACILITY_CACHE_MAX_QUERY_TILES", "64"))
+    )
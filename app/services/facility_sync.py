@@ -0,0 +1,354 @@
+"""
+공공 배출시설 데이터 동기화
+
+요청마다 공공 API 첫 페이지만 조회하면 결과가 불완전하고 느리므로, 상위 데이터 전체를
+주기적으로 페이지 단위로 받아 로컬 DB(recycling_locations)에 반영합니다.
+요청 경로는 동기화된 로컬 데이터(공간 인덱스/DB 인덱스)만 조회합니다.
+
+- 페이지는 동시 요청 수를 제한해 병렬로 받고, 실패한 페이지는 재시도합니다.
+- (source, external_id)로 upsert하고, 내용 해시가 같으면 쓰지 않습니다.
+- 상위에서 사라진 시설은 비활성화(soft delete)합니다. 일부 페이지를 받지 못했거나
+  사라진 비율이 한도를 넘으면 잘못된 응답으로 보고 비활성화를 건너뜁니다.
+- 쓰기는 Core insert/update(executemany)로 배치 단위로 하고, 변경이 있으면 이미 적재된
+  공간 인덱스를 커밋 후 한 번에 다시 구성합니다.
+
+FACILITY_SYNC_INTERVAL: 앱 안에서 동기화를 실행하는 주기(초), 0이면 실행하지 않음 (기본값: 0)
+FACILITY_SYNC_PAGE_SIZE: 페이지당 시설 수 (기본값: 1000)
+FACILITY_SYNC_CONCURRENCY: 동시 페이지 요청 수 (기본값: 4)
+FACILITY_SYNC_MAX_DELETE_RATIO: 한 번에 비활성화할 수 있는 최대 비율 (기본값: 0.3)
+PUBLIC_API_LIVE_LOOKUP: 요청마다 공공 API도 조회할지 여부 (기본값: 동기화를 켜면 false)
+"""
+import os
+import json
+import time
+import asyncio
+import hashlib
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import bindparam, update
+from sqlalchemy.orm import Session
+
+from app.core.geo import encode_geohash
+from app.models.location import RecyclingLocation, PUBLIC_API_SOURCE, split_waste_types, waste_type_mask
+from app.services.public_api_service import PublicAPIService
+from app.services.spatial_index import LocationSpatialIndex
+
+logger = logging.getLogger(__name__)
+
+# 내용 해시에 포함하는 필드 (이 필드가 바뀔 때만 DB에 씀)
+SYNC_FIELDS = (
+    'name', 'address', 'latitude', 'longitude', 'waste_types',
+    'operating_hours', 'contact_info', 'description'
+)
+# 내용이 바뀐 시설을 갱신할 때 쓰는 컬럼
+SYNC_UPDATE_COLUMNS = SYNC_FIELDS + (
+    'geohash', 'waste_type_mask', 'content_hash', 'is_active', 'synced_at', 'updated_at'
+)
+DB_BATCH_SIZE = 500
+PAGE_RETRIES = 2
+
+
+def facility_sync_interval() -> float:
+    """앱 안에서 실행할 동기화 주기(초), 0이면 비활성"""
+    return float(os.getenv("FACILITY_SYNC_INTERVAL", "0"))
+
+
+def live_public_api_enabled() -> bool:
+    """요청마다 공공 API를 직접 조회할지 여부 (동기화를 켜면 기본적으로 로컬 데이터만 사용)"""
+    setting = os.getenv("PUBLIC_API_LIVE_LOOKUP")
+    if setting is None:
+        return facility_sync_interval() <= 0
+    return setting.lower() in ("1", "true", "yes")
+
+
+def _normalize_facility(facility: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """상위 시설을 RecyclingLocation 필드로 변환 (ID나 좌표가 잘못되면 None)"""
+    external_id = str(facility.get('id') or '').strip()
+    try:
+        latitude = float(facility.get('latitude'))
+        longitude = float(facility.get('longitude'))
+    except (TypeError, ValueError):
+        return None
+    # 좌표 누락 시 파서가 0으로 채우므로 (0, 0)도 잘못된 값으로 봄
+    if not external_id or not -90 <= latitude <= 90 or not -180 <= longitude <= 180 \
+            or (latitude == 0 and longitude == 0):
+        return None
+    
+    return {
+        'external_id': external_id[:100],
+        'name': (facility.get('name') or external_id)[:200],
+        'address': (facility.get('address') or '')[:500],
+        'latitude': latitude,
+        'longitude': longitude,
+        'waste_types': ','.join(split_waste_types(facility.get('waste_types'))),
+        'operating_hours': (facility.get('operating_hours') or None),
+        'contact_info': (facility.get('contact_info') or None),
+        'description': (facility.get('description') or None)
+    }
+
+
+def facility_content_hash(fields: Dict[str, Any]) -> str:
+    """동기화 필드의 내용 해시 (SHA-256)"""
+    payload = json.dumps([fields.get(name) for name in SYNC_FIELDS], ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class FacilitySyncService:
+    """공공 시설 전체 동기화 (페이지 병렬 수집 -> 해시 비교 upsert -> 사라진 시설 비활성화)"""
+    
+    def __init__(self,
+                 public_api_service: PublicAPIService,
+                 session_factory: Callable[[], Session],
+                 location_index: Optional[LocationSpatialIndex] = None,
+                 source: str = PUBLIC_API_SOURCE,
+                 page_size: Optional[int] = None,
+                 concurrency: Optional[int] = None,
+                 max_delete_ratio: Optional[float] = None):
+        self.public_api_service = public_api_service
+        self.session_factory = session_factory
+        self.location_index = location_index
+        self.source = source
+        self.page_size = page_size or int(os.getenv("FACILITY_SYNC_PAGE_SIZE", "1000"))
+        self.concurrency = concurrency or int(os.getenv("FACILITY_SYNC_CONCURRENCY", "4"))
+        self.max_delete_ratio = (max_delete_ratio if max_delete_ratio is not None
+                                 else float(os.getenv("FACILITY_SYNC_MAX_DELETE_RATIO", "0.3")))
+        
+        self._running = False
+        self._task: Optional[asyncio.Task] = None
+        self.runs = 0
+        self.failures = 0
+        self.last_result: Optional[Dict[str, Any]] = None
+        self.last_error: Optional[str] = None
+        self.last_success_at: Optional[datetime] = None
+    
+    # ------------------------------------------------------------------
+    # 동기화 1회 실행
+    # ------------------------------------------------------------------
+    async def sync(self) -> Dict[str, Any]:
+        """상위 데이터 전체를 한 번 동기화하고 결과 집계 반환"""
+        if self._running:
+            raise ValueError("시설 동기화가 이미 실행 중입니다")
+        self._running = True
+        started = time.perf_counter()
+        try:
+            facilities, pages, failed_pages = await self._fetch_all()
+            # DB 쓰기는 이벤트 루프를 막지 않도록 스레드에서 실행
+            result = await asyncio.to_thread(self._apply, facilities, failed_pages == 0)
+            result.update({
+                'pages': pages,
+                'failed_pages': failed_pages,
+                'duration_seconds': round(time.perf_counter() - started, 2),
+                'finished_at': datetime.utcnow().isoformat()
+            })
+            self.runs += 1
+            self.last_result = result
+            self.last_error = None
+            self.last_success_at = datetime.utcnow()
+            logger.info(f"시설 동기화 완료: {result}")
+            return result
+        except Exception as e:
+            self.failures += 1
+            self.last_error = str(e)
+            raise
+        finally:
+            self._running = False
+    
+    async def _fetch_all(self) -> Tuple[List[Dict[str, Any]], int, int]:
+        """모든 페이지 수집 (시설 목록, 전체 페이지 수, 실패한 페이지 수)"""
+        # 첫 페이지로 전체 건수를 알아낸 뒤 나머지 페이지를 제한된 동시성으로 수집
+        first_page, total_count = await self._fetch_page(1)
+        pages = max(1, -(-total_count // self.page_size))
+        
+        semaphore = asyncio.Semaphore(self.concurrency)
+        
+        async def fetch_limited(page_no: int):
+            async with semaphore:
+                return await self._fetch_page(page_no)
+        
+        results = await asyncio.gather(
+            *[fetch_limited(page_no) for page_no in range(2, pages + 1)],
+            return_exceptions=True
+        )
+        
+        facilities = list(first_page)
+        failed_pages = 0
+        for page_no, result in enumerate(results, start=2):
+            if isinstance(result, Exception):
+                failed_pages += 1
+                logger.warning(f"시설 동기화 {page_no}페이지 실패: {result}")
+                continue
+            facilities.extend(result[0])
+        return facilities, pages, failed_pages
+    
+    async def _fetch_page(self, page_no: int) -> Tuple[List[Dict[str, Any]], int]:
+        """한 페이지 조회 (실패 시 지수 백오프로 재시도)"""
+        for attempt in range(PAGE_RETRIES + 1):
+            try:
+                return await self.public_api_service.fetch_facility_page(page_no, self.page_size)
+            except Exception:
+                if attempt == PAGE_RETRIES:
+                    raise
+                await asyncio.sleep(0.5 * (2 ** attempt))
+    
+    def _apply(self, facilities: List[Dict[str, Any]], complete: bool) -> Dict[str, Any]:
+        """수집한 시설을 DB에 반영 (하나의 트랜잭션)"""
+        incoming: Dict[str, Dict[str, Any]] = {}
+        invalid = 0
+        for facility in facilities:
+            fields = _normalize_facility(facility)
+            if fields is None:
+                invalid += 1
+                continue
+            fields['content_hash'] = facility_content_hash(fields)
+            # Core insert/update는 ORM 이벤트 리스너를 거치지 않으므로 직접 계산
+            fields['geohash'] = encode_geohash(fields['latitude'], fields['longitude'])
+            fields['waste_type_mask'] = waste_type_mask(fields['waste_types'])
+            incoming[fields['external_id']] = fields  # 중복 ID는 마지막 값 사용
+        
+        session = self.session_factory()
+        try:
+            # external_id -> (id, 내용 해시, 활성 여부)
+            existing = {
+                row.external_id: (row.id, row.content_hash, row.is_active)
+                for row in session.query(
+                    RecyclingLocation.id,
+                    RecyclingLocation.external_id,
+                    RecyclingLocation.content_hash,
+                    RecyclingLocation.is_active
+                ).filter(RecyclingLocation.source == self.source)
+            }
+            
+            now = datetime.utcnow()
+            to_insert = []
+            to_update: Dict[int, Dict[str, Any]] = {}
+            unchanged = 0
+            for external_id, fields in incoming.items():
+                current = existing.get(external_id)
+                if current is None:
+                    to_insert.append(fields)
+                elif current[1] != fields['content_hash'] or not current[2]:
+                    to_update[current[0]] = fields
+                else:
+                    unchanged += 1
+            
+            vanished = [
+                location_id for external_id, (location_id, _, is_active) in existing.items()
+                if is_active and external_id not in incoming
+            ]
+            active_count = sum(1 for _, _, is_active in existing.values() if is_active)
+            deactivate = complete and (
+                not active_count or len(vanished) <= active_count * self.max_delete_ratio
+            )
+            if vanished and not deactivate:
+                logger.warning(f"시설 동기화: 사라진 시설 {len(vanished)}건 비활성화 건너뜀 "
+                               f"(전체 수집 {'완료' if complete else '미완료'}, 활성 {active_count}건)")
+            
+            # 배치마다 executemany 한 번으로 삽입/갱신
+            table = RecyclingLocation.__table__
+            for start in range(0, len(to_insert), DB_BATCH_SIZE):
+                session.execute(table.insert(), [
+                    dict(fields, source=self.source, is_active=True, synced_at=now,
+                         created_at=now, updated_at=now)
+                    for fields in to_insert[start:start + DB_BATCH_SIZE]
+                ])
+            
+            update_rows = [
+                dict(fields, _id=location_id, is_active=True, synced_at=now, updated_at=now)
+                for location_id, fields in to_update.items()
+            ]
+            update_statement = (
+                update(table)
+                .where(table.c.id == bindparam('_id'))
+                .values({name: bindparam(name) for name in SYNC_UPDATE_COLUMNS})
+            )
+            for start in range(0, len(update_rows), DB_BATCH_SIZE):
+                session.execute(update_statement, [
+                    {name: row[name] for name in SYNC_UPDATE_COLUMNS + ('_id',)}
+                    for row in update_rows[start:start + DB_BATCH_SIZE]
+                ])
+            
+            deactivated = vanished if deactivate else []
+            for start in range(0, len(deactivated), DB_BATCH_SIZE):
+                session.query(RecyclingLocation).filter(
+                    RecyclingLocation.id.in_(deactivated[start:start + DB_BATCH_SIZE])
+                ).update({'is_active': False, 'synced_at': now, 'updated_at': now}, synchronize_session=False)
+            
+            session.commit()
+            
+            # 커밋된 변경만 공간 인덱스에 반영 (행마다 갱신하지 않고 한 번의 조회로 다시 구성)
+            if to_insert or to_update or deactivated:
+                self._rebuild_index(session)
+            
+            return {
+                'fetched': len(facilities),
+                'invalid': invalid,
+                'inserted': len(to_insert),
+                'updated': len(to_update),
+                'unchanged': unchanged,
+                'deactivated': len(deactivated),
+                'deactivation_skipped': len(vanished) - len(deactivated)
+            }
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+    
+    def _rebuild_index(self, session: Session) -> None:
+        """이미 적재된 공간 인덱스를 DB의 활성 장소로 다시 구성 (미적재면 첫 조회 때 적재)"""
+        if self.location_index is None or not self.location_index.is_loaded:
+            return
+        self.location_index.rebuild(
+            session.query(
+                RecyclingLocation.id,
+                RecyclingLocation.latitude,
+                RecyclingLocation.longitude,
+                RecyclingLocation.waste_types
+            )
+            .filter(RecyclingLocation.is_active == True)
+            .yield_per(10000)
+        )
+    
+    # ------------------------------------------------------------------
+    # 주기 실행
+    # ------------------------------------------------------------------
+    def start(self, interval_seconds: float) -> None:
+        """이벤트 루프에서 주기 동기화 시작 (이미 실행 중이면 무시)"""
+        if self._task is not None and not self._task.done():
+            return
+        self._task = asyncio.ensure_future(self._run_periodically(interval_seconds))
+    
+    async def stop(self) -> None:
+        """주기 동기화 중지"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+    
+    async def _run_periodically(self, interval_seconds: float) -> None:
+        while True:
+            try:
+                await self.sync()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"시설 동기화 실패: {e}")
+            await asyncio.sleep(interval_seconds)
+    
+    def stats(self) -> Dict[str, Any]:
+        """동기화 상태"""
+        return {
+            'running': self._running,
+            'scheduled': self._task is not None and not self._task.done(),
+            'runs': self.runs,
+            'failures': self.failures,
+            'last_success_at': self.last_success_at.isoformat() if self.last_success_at else None,
+            'last_error': self.last_error,
+            'last_result': self.last_result
+        }
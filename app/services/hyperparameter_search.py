@@ -0,0 +1,433 @@
+"""
+분류 헤드 하이퍼파라미터 탐색 - 캐시된 백본 특징 + 병렬 successive halving
+
+백본(EfficientNetV2-S)은 고정되어 있으므로 이미지별 특징을 한 번만 계산해 캐시하고,
+여러 헤드 설정(learning_rate, dense_units, dropout, batch_size)을 프로세스 풀에서 동시에 학습합니다.
+각 단계(rung)마다 검증 정확도 상위 1/eta만 남기고 에포크 예산을 eta배로 늘립니다.
+"""
+import os
+import json
+import math
+import time
+import random
+import hashlib
+import itertools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import List, Dict, Optional, Any, Tuple
+
+import numpy as np
+import tensorflow as tf
+from tensorflow import keras
+
+from app.core.data_processor import DataQualityChecker
+from app.models.recycling_classifier import (
+    RecyclingClassifier,
+    DEFAULT_HEAD_CONFIG,
+    FEATURE_LAYER_NAME,
+    HEAD_LAYER_NAMES,
+    build_classification_head
+)
+from app.services.knowledge_distiller import DECODABLE_FORMATS, load_image_tensor
+
+
+DEFAULT_SEARCH_SPACE = {
+    'learning_rate': [1e-4, 3e-4, 1e-3, 3e-3],
+    'dense_units': [64, 128, 256, 512],
+    'dropout': [0.0, 0.2, 0.4],
+    'batch_size': [32, 64]
+}
+
+# 워커 프로세스별 탐색 데이터 (x_train, y_train, x_val, y_val)
+_WORKER_DATA = None
+
+
+def _init_worker(data_dir: str, threads_per_worker: int):
+    """워커 초기화: 특징 배열을 메모리 맵으로 열고 TF 스레드 수 제한"""
+    global _WORKER_DATA
+    tf.config.threading.set_intra_op_parallelism_threads(threads_per_worker)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+    _WORKER_DATA = tuple(
+        np.load(os.path.join(data_dir, f"{name}.npy"), mmap_mode='r')
+        for name in ('x_train', 'y_train', 'x_val', 'y_val')
+    )
+
+
+def _optimizer_state(optimizer) -> List[np.ndarray]:
+    """옵티마이저 변수(스텝 수, Adam 모멘트) 값을 배열로 추출"""
+    variables = optimizer.variables
+    if callable(variables):
+        variables = variables()
+    return [np.array(variable) for variable in variables]
+
+
+def _restore_optimizer_state(model, state: List[np.ndarray]) -> bool:
+    """
+    이전 단계의 옵티마이저 상태를 복원
+    
+    옵티마이저 변수는 첫 스텝에서 지연 생성되므로 먼저 build()로 만든 뒤 값을 채웁니다.
+    변수 구성이 맞지 않으면 복원하지 않고 False를 반환합니다 (새 옵티마이저로 이어서 학습).
+    """
+    optimizer = model.optimizer
+    if not hasattr(optimizer, 'build'):
+        return False
+    optimizer.build(model.trainable_variables)
+    variables = optimizer.variables
+    if callable(variables):
+        variables = variables()
+    variables = list(variables)
+    if len(variables) != len(state) or any(
+        tuple(variable.shape) != value.shape for variable, value in zip(variables, state)
+    ):
+        return False
+    for variable, value in zip(variables, state):
+        variable.assign(value)
+    return True
+
+
+def _run_trial(trial_id: int,
+               config: Dict[str, Any],
+               num_classes: int,
+               initial_epoch: int,
+               epochs: int,
+               head_weights: Optional[Dict[str, List[np.ndarray]]],
+               optimizer_state: Optional[List[np.ndarray]],
+               seed: int) -> Dict[str, Any]:
+    """
+    헤드 한 개를 initial_epoch부터 epochs까지 학습 (프로세스 풀 작업 함수)
+    
+    다음 단계는 새 프로세스 작업으로 실행되므로 헤드 가중치와 함께 옵티마이저 상태
+    (스텝 수, Adam 1·2차 모멘트)를 넘겨받아 이어서 학습합니다. 상태를 복원하지 못하면
+    옵티마이저가 초기화된 채로 학습하며 결과의 optimizer_restored가 0이 됩니다.
+    """
+    x_train, y_train, x_val, y_val = _WORKER_DATA
+    tf.random.set_seed(seed)
+    np.random.seed(seed)
+    
+    inputs = keras.Input(shape=(x_train.shape[1],))
+    model = keras.Model(inputs, build_classification_head(inputs, num_classes, config))
+    model.compile(
+        optimizer=keras.optimizers.Adam(learning_rate=config['learning_rate']),
+        loss='sparse_categorical_crossentropy',
+        metrics=['accuracy']
+    )
+    if head_weights:
+        for name, weights in head_weights.items():
+            model.get_layer(name).set_weights(weights)
+    optimizer_restored = bool(optimizer_state) and _restore_optimizer_state(model, optimizer_state)
+    
+    start_time = time.perf_counter()
+    history = model.fit(
+        np.asarray(x_train), np.asarray(y_train),
+        batch_size=config.get('batch_size', 32),
+        epochs=epochs,
+        initial_epoch=initial_epoch,
+        validation_data=(np.asarray(x_val), np.asarray(y_val)),
+        verbose=0
+    )
+    
+    return {
+        'trial_id': trial_id,
+        'val_accuracy': float(history.history['val_accuracy'][-1]),
+        'val_loss': float(history.history['val_loss'][-1]),
+        'train_accuracy': float(history.history['accuracy'][-1]),
+        'train_sec': time.perf_counter() - start_time,
+        'optimizer_restored': float(optimizer_restored),
+        'head_weights': {name: model.get_layer(name).get_weights() for name in HEAD_LAYER_NAMES},
+        'optimizer_state': _optimizer_state(model.optimizer)
+    }
+
+
+class BackboneFeatureCache:
+    """
+    백본 특징 캐시
+    
+    이미지(경로, mtime, 크기)별 GlobalAveragePooling 특징을 .npz에 저장하여
+    탐색을 다시 실행해도 새 이미지만 백본을 통과시킵니다.
+    """
+    
+    def __init__(self, cache_dir: str = "models/cache", batch_size: int = 64):
+        self.cache_dir = cache_dir
+        self.batch_size = batch_size
+        self._extractor = None
+    
+    @staticmethod
+    def _file_key(path: str) -> str:
+        """파일 식별 키 (경로 + mtime + 크기)"""
+        stat = os.stat(path)
+        return f"{os.path.abspath(path)}:{stat.st_mtime_ns}:{stat.st_size}"
+    
+    def _cache_path(self, input_size: Tuple[int, int, int]) -> str:
+        """백본/입력 크기별 캐시 파일 경로"""
+        return os.path.join(self.cache_dir, f"backbone_features_efficientnetv2s_{input_size[0]}x{input_size[1]}.npz")
+    
+    def _get_extractor(self, classifier: RecyclingClassifier) -> keras.Model:
+        """분류 모델에서 백본 + 풀링까지만 잘라낸 특징 추출기"""
+        if self._extractor is None:
+            model = classifier.create_base_model()
+            self._extractor = keras.Model(model.input, model.get_layer(FEATURE_LAYER_NAME).output)
+        return self._extractor
+    
+    def get_features(self, classifier: RecyclingClassifier, image_paths: List[str]) -> np.ndarray:
+        """이미지별 백본 특징 (캐시에 없는 이미지만 추론)"""
+        cache_path = self._cache_path(classifier.input_size)
+        cache = {}
+        if os.path.exists(cache_path):
+            with np.load(cache_path, allow_pickle=False) as data:
+                cache = dict(zip(data['keys'].tolist(), data['features']))
+        
+        keys = [self._file_key(path) for path in image_paths]
+        missing = [(key, path) for key, path in zip(keys, image_paths) if key not in cache]
+        if missing:
+            print(f"백본 특징 계산: {len(missing)}장 (캐시됨: {len(keys) - len(missing)}장)")
+            target_size = classifier.input_size[:2]
+            dataset = tf.data.Dataset.from_tensor_slices([path for _, path in missing])
+            dataset = dataset.map(lambda path: load_image_tensor(path, target_size), num_parallel_calls=tf.data.AUTOTUNE)
+            dataset = dataset.batch(self.batch_size).prefetch(tf.data.AUTOTUNE)
+            features = self._get_extractor(classifier).predict(dataset, verbose=0).astype(np.float32)
+            for (key, _), row in zip(missing, features):
+                cache[key] = row
+            
+            os.makedirs(self.cache_dir, exist_ok=True)
+            cache_keys = list(cache.keys())
+            np.savez(cache_path, keys=np.array(cache_keys), features=np.stack([cache[k] for k in cache_keys]))
+        
+        return np.stack([cache[key] for key in keys])
+
+
+class HyperparameterSearch:
+    """분류 헤드 하이퍼파라미터 탐색기 (동기식 successive halving)"""
+    
+    def __init__(self,
+                 quality_checker: DataQualityChecker,
+                 search_space: Optional[Dict[str, List[Any]]] = None,
+                 max_workers: Optional[int] = None,
+                 cache_dir: str = "models/cache",
+                 seed: int = 42):
+        self.quality_checker = quality_checker
+        self.search_space = search_space or DEFAULT_SEARCH_SPACE
+        self.max_workers = max_workers or max(1, min(4, (os.cpu_count() or 1) // 2))
+        self.cache_dir = cache_dir
+        self.seed = seed
+        self.feature_cache = BackboneFeatureCache(cache_dir)
+    
+    def sample_configs(self, n_trials: int) -> List[Dict[str, Any]]:
+        """탐색 공간에서 중복 없이 n_trials개 설정 추출 (기본 헤드 설정을 항상 포함)"""
+        names = sorted(self.search_space)
+        grid = [dict(zip(names, values)) for values in itertools.product(*(self.search_space[n] for n in names))]
+        random.Random(self.seed).shuffle(grid)
+        
+        baseline = {name: DEFAULT_HEAD_CONFIG.get(name, self.search_space[name][0]) for name in names}
+        configs = [baseline] + [config for config in grid if config != baseline]
+        return configs[:max(1, n_trials)]
+    
+    def _collect(self, data_dir: str, manifest_path: Optional[str], validation_split: float):
+        """이미지 경로/레이블 수집 및 내용 해시 기준 고정 검증 분할"""
+        if manifest_path:
+            from app.core.deduplication import load_dedup_manifest
+            manifest = load_dedup_manifest(manifest_path)
+            data_dir = manifest['data_dir']
+            records = manifest['images']
+            class_names = manifest['class_names']
+        else:
+            records = [
+                r for r in self.quality_checker.scan_dataset(data_dir)
+                if r['valid'] and r['format'] in DECODABLE_FORMATS
+            ]
+            class_names = sorted({r['class_name'] for r in records})
+        
+        class_indices = {name: i for i, name in enumerate(class_names)}
+        train, validation = [], []
+        for record in records:
+            item = (os.path.join(data_dir, record['path']), class_indices[record['class_name']])
+            if int(record['sha1'][:8], 16) / 0xFFFFFFFF < validation_split:
+                validation.append(item)
+            else:
+                train.append(item)
+        return train, validation, class_names
+    
+    def _prepare_search_data(self, classifier: RecyclingClassifier, train, validation) -> str:
+        """특징 배열을 .npy로 저장 (워커가 메모리 맵으로 공유)"""
+        paths = [path for path, _ in train] + [path for path, _ in validation]
+        features = self.feature_cache.get_features(classifier, paths)
+        labels = np.array([label for _, label in train] + [label for _, label in validation], dtype=np.int64)
+        
+        fingerprint = hashlib.sha1('\n'.join(paths).encode('utf-8')).hexdigest()[:16]
+        search_dir = os.path.join(self.cache_dir, f"search_{fingerprint}")
+        os.makedirs(search_dir, exist_ok=True)
+        split = len(train)
+        arrays = {
+            'x_train': features[:split], 'y_train': labels[:split],
+            'x_val': features[split:], 'y_val': labels[split:]
+        }
+        for name, array in arrays.items():
+            np.save(os.path.join(search_dir, f"{name}.npy"), array)
+        return search_dir
+    
+    @staticmethod
+    def _rung_budgets(min_epochs: int, max_epochs: int, eta: int) -> List[int]:
+        """단계별 누적 에포크 예산 (min_epochs * eta^i, 마지막은 max_epochs)"""
+        budgets = []
+        budget = min_epochs
+        while budget < max_epochs:
+            budgets.append(budget)
+            budget *= eta
+        budgets.append(max_epochs)
+        return budgets
+    
+    def search(self,
+               data_dir: str,
+               n_trials: int = 27,
+               min_epochs: int = 1,
+               max_epochs: int = 27,
+               eta: int = 3,
+               validation_split: float = 0.2,
+               manifest_path: Optional[str] = None,
+               output_dir: str = "models/search",
+               save_path: str = "models/recycling_classifier_tuned.h5") -> Dict[str, Any]:
+        """
+        헤드 하이퍼파라미터 탐색 후 최고 설정을 전체 모델로 내보내기
+        
+        Args:
+            data_dir: 클래스별 하위 디렉토리로 구성된 훈련 데이터 디렉토리
+            n_trials: 시작 설정 수
+            min_epochs: 첫 단계 에포크 예산
+            max_epochs: 마지막 단계 에포크 예산
+            eta: 단계마다 남기는 비율의 역수 (상위 1/eta 유지)
+            validation_split: 검증 비율 (내용 해시 기준 고정 분할)
+            manifest_path: 중복 제거 매니페스트 경로 (선택사항)
+            output_dir: 리더보드 저장 디렉토리
+            save_path: 최고 헤드를 결합한 배포용 모델 저장 경로
+        
+        Returns:
+            리더보드 (최고 설정 포함)
+        """
+        if eta < 2:
+            raise ValueError(f"eta는 2 이상이어야 합니다: {eta}")
+        if not 1 <= min_epochs <= max_epochs:
+            raise ValueError(f"에포크 예산이 잘못되었습니다: min_epochs={min_epochs}, max_epochs={max_epochs}")
+        
+        start_time = time.perf_counter()
+        classifier = RecyclingClassifier()
+        train, validation, class_names = self._collect(data_dir, manifest_path, validation_split)
+        if not train or not validation:
+            raise ValueError(f"훈련/검증 이미지가 부족합니다: 훈련 {len(train)}장, 검증 {len(validation)}장")
+        classifier.class_names = class_names
+        classifier.num_classes = len(class_names)
+        
+        # 1. 백본 특징 (캐시)
+        search_dir = self._prepare_search_data(classifier, train, validation)
+        feature_sec = time.perf_counter() - start_time
+        
+        # 2. successive halving
+        configs = self.sample_configs(n_trials)
+        trials = [
+            {'trial_id': i, 'config': config, 'epochs': 0, 'rungs': [],
+             'head_weights': None, 'optimizer_state': None}
+            for i, config in enumerate(configs)
+        ]
+        budgets = self._rung_budgets(min_epochs, max_epochs, eta)
+        threads_per_worker = max(1, (os.cpu_count() or 1) // self.max_workers)
+        print(f"탐색 시작: 설정 {len(trials)}개, 단계별 에포크 {budgets}, 워커 {self.max_workers}개")
+        
+        survivors = trials
+        with ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(search_dir, threads_per_worker)
+        ) as executor:
+            for rung, budget in enumerate(budgets):
+                futures = [
+                    executor.submit(
+                        _run_trial, trial['trial_id'], trial['config'], len(class_names),
+                        trial['epochs'], budget, trial['head_weights'], trial['optimizer_state'],
+                        self.seed + trial['trial_id']
+                    )
+                    for trial in survivors
+                ]
+                for trial, future in zip(survivors, futures):
+                    result = future.result()
+                    trial['epochs'] = budget
+                    trial['head_weights'] = result.pop('head_weights')
+                    trial['optimizer_state'] = result.pop('optimizer_state')
+                    trial['rungs'].append({'rung': rung, 'epochs': budget, **{
+                        k: round(v, 4) for k, v in result.items() if k != 'trial_id'
+                    }})
+                
+                survivors.sort(key=lambda t: (-t['rungs'][-1]['val_accuracy'], t['rungs'][-1]['val_loss']))
+                best = survivors[0]['rungs'][-1]
+                print(f"단계 {rung} ({budget} 에포크): {len(survivors)}개 설정, "
+                      f"최고 검증 정확도 {best['val_accuracy']:.4f}")
+                
+                if rung < len(budgets) - 1:
+                    keep = max(1, math.ceil(len(survivors) / eta))
+                    for trial in survivors[keep:]:
+                        trial['head_weights'] = None
+                        trial['optimizer_state'] = None
+                    survivors = survivors[:keep]
+        
+        best_trial = survivors[0]
+        
+        # 3. 최고 헤드 + 백본 결합 모델 저장
+        model = classifier.create_base_model(best_trial['config'])
+        for name, weights in best_trial['head_weights'].items():
+            model.get_layer(name).set_weights(weights)
+        os.makedirs(os.path.dirname(save_path) or '.', exist_ok=True)
+        model.save(save_path)
+        class_info = {
+            'class_names': class_names,
+            'num_classes': len(class_names),
+            'head_config': best_trial['config']
+        }
+        with open(save_path.replace('.h5', '_classes.json'), 'w', encoding='utf-8') as f:
+            json.dump(class_info, f, ensure_ascii=False, indent=2)
+        
+        # 4. 리더보드
+        leaderboard = sorted(
+            trials,
+            key=lambda t: (-len(t['rungs']), -t['rungs'][-1]['val_accuracy'], t['rungs'][-1]['val_loss'])
+        )
+        report = {
+            'created_at': datetime.utcnow().isoformat(),
+            'data_dir': data_dir,
+            'manifest_path': manifest_path,
+            'train_images': len(train),
+            'validation_images': len(validation),
+            'search_space': self.search_space,
+            'eta': eta,
+            'rung_epochs': budgets,
+            'workers': self.max_workers,
+            'feature_sec': round(feature_sec, 2),
+            'elapsed_sec': round(time.perf_counter() - start_time, 2),
+            'total_trial_epochs': sum(t['epochs'] for t in trials),
+            'best': {
+                'trial_id': best_trial['trial_id'],
+                'config': best_trial['config'],
+                'val_accuracy': best_trial['rungs'][-1]['val_accuracy'],
+                'model_path': save_path
+            },
+            'trials': [
+                {key: trial[key] for key in ('trial_id', 'config', 'epochs', 'rungs')}
+                for trial in leaderboard
+            ]
+        }
+        os.makedirs(output_dir, exist_ok=True)
+        leaderboard_path = os.path.join(output_dir, 'leaderboard.json')
+        with open(leaderboard_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        report['leaderboard_path'] = leaderboard_path
+        
+        return report
+
+
+def load_head_config(path: str) -> Dict[str, Any]:
+    """리더보드(JSON의 best.config) 또는 헤드 설정 JSON 로드"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if 'best' in data:
+        return data['best']['config']
+    if 'head_config' in data:
+        return data['head_config']
+    return data
@@ -3,9 +3,10 @@
 """
 import os
 import io
+import threading
 import numpy as np
 from PIL import Image
-from typing import Dict, Optional
+from typing import Dict, Optional, Any
 from app.models.recycling_classifier import RecyclingClassifier
 
 
@@ -15,6 +16,7 @@ class InferenceService:
     def __init__(self, model_path: str = "models/recycling_classifier.h5"):
         self.model_path = model_path
         self.classifier = None
+        self._reload_lock = threading.Lock()
         self._load_model()
     
     def _load_model(self):
@@ -32,6 +34,30 @@ class InferenceService:
             print("python create_pretrained_model.py")
             self.classifier = None
     
+    def reload_model(self, model_path: Optional[str] = None) -> Dict[str, Any]:
+        """
+        모델 무중단 교체
+        
+        새 모델을 먼저 로드하고 예열한 뒤 참조만 바꾸므로, 교체 중에도 기존 모델로 요청을 처리합니다.
+        로드에 실패하면 기존 모델을 유지합니다.
+        """
+        model_path = model_path or self.model_path
+        with self._reload_lock:
+            if not os.path.exists(model_path):
+                return {'reloaded': False, 'error': f'모델 파일을 찾을 수 없습니다: {model_path}'}
+            
+            try:
+                classifier = RecyclingClassifier(model_path)
+                classifier.predict_from_array(np.zeros(classifier.input_size, dtype=np.float32))
+            except Exception as e:
+                return {'reloaded': False, 'error': f'모델 로드 중 오류가 발생했습니다: {e}'}
+            
+            previous_path = self.model_path
+            self.classifier = classifier
+            self.model_path = model_path
+            print(f"모델이 교체되었습니다: {previous_path} -> {model_path}")
+            return {'reloaded': True, 'model_path': model_path, 'previous_model_path': previous_path}
+    
     def is_model_loaded(self) -> bool:
         """모델이 로드되었는지 확인"""
         return self.classifier is not None and self.classifier.model is not None
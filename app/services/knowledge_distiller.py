@@ -0,0 +1,398 @@
+"""
+지식 증류 서비스 - EfficientNetV2-S teacher로부터 경량 student 모델 학습
+"""
+import os
+import json
+import time
+import hashlib
+from typing import List, Dict, Optional, Any, Tuple
+
+import numpy as np
+import tensorflow as tf
+from tensorflow import keras
+from tensorflow.keras import layers
+
+from app.core.data_processor import DataQualityChecker, IMAGE_EXTENSIONS
+from app.models.recycling_classifier import RecyclingClassifier
+
+
+# tf.image.decode_image로 디코딩 가능한 형식
+DECODABLE_FORMATS = ('JPEG', 'PNG', 'BMP', 'GIF')
+
+STUDENT_ARCHITECTURES = ['mobilenet_v3_small', 'mobilenet_v3_large', 'efficientnet_b0']
+
+
+def create_student_model(architecture: str,
+                         num_classes: int,
+                         input_size: Tuple[int, int, int] = (224, 224, 3)) -> keras.Model:
+    """
+    student 모델 생성
+    
+    입력은 teacher와 같은 [0, 1] 범위이며, 백본이 기대하는 범위로 내부에서 변환합니다.
+    로짓 레이어('logits') 뒤에 softmax를 붙여 RecyclingClassifier로 그대로 서빙할 수 있습니다.
+    """
+    if architecture == 'mobilenet_v3_small':
+        backbone = keras.applications.MobileNetV3Small(
+            input_shape=input_size, include_top=False, weights='imagenet', include_preprocessing=False
+        )
+        scale = layers.Rescaling(2.0, offset=-1.0)
+    elif architecture == 'mobilenet_v3_large':
+        backbone = keras.applications.MobileNetV3Large(
+            input_shape=input_size, include_top=False, weights='imagenet', include_preprocessing=False
+        )
+        scale = layers.Rescaling(2.0, offset=-1.0)
+    elif architecture == 'efficientnet_b0':
+        # EfficientNetB0는 [0, 255] 입력을 내부에서 정규화
+        backbone = keras.applications.EfficientNetB0(
+            input_shape=input_size, include_top=False, weights='imagenet'
+        )
+        scale = layers.Rescaling(255.0)
+    else:
+        raise ValueError(f"지원하지 않는 student 아키텍처입니다: {architecture}")
+    
+    inputs = keras.Input(shape=input_size)
+    x = scale(inputs)
+    x = backbone(x)
+    x = layers.GlobalAveragePooling2D()(x)
+    x = layers.Dropout(0.2)(x)
+    logits = layers.Dense(num_classes, name='logits')(x)
+    outputs = layers.Activation('softmax', name='probabilities')(logits)
+    
+    return keras.Model(inputs, outputs, name=f'student_{architecture}')
+
+
+def load_image_tensor(image_path: tf.Tensor, target_size: Tuple[int, int] = (224, 224)) -> tf.Tensor:
+    """이미지 파일을 [0, 1] 범위 텐서로 디코딩"""
+    image = tf.io.decode_image(tf.io.read_file(image_path), channels=3, expand_animations=False)
+    image = tf.image.resize(image, target_size)
+    return image / 255.0
+
+
+class TeacherLogitCache:
+    """
+    teacher 로짓 캐시
+    
+    teacher 모델 파일(경로, mtime, 크기)별로 이미지(경로, mtime, 크기)의 로짓을 .npz에 저장하여
+    에포크마다 teacher를 다시 실행하지 않습니다. 새 이미지만 추가로 계산합니다.
+    """
+    
+    def __init__(self,
+                 teacher: RecyclingClassifier,
+                 teacher_model_path: str,
+                 cache_dir: str = "models/cache",
+                 batch_size: int = 64):
+        self.teacher = teacher
+        self.teacher_model_path = teacher_model_path
+        self.cache_dir = cache_dir
+        self.batch_size = batch_size
+    
+    @staticmethod
+    def _file_key(path: str) -> str:
+        """파일 식별 키 (경로 + mtime + 크기)"""
+        stat = os.stat(path)
+        return f"{os.path.abspath(path)}:{stat.st_mtime_ns}:{stat.st_size}"
+    
+    def _cache_path(self) -> str:
+        """teacher 모델별 캐시 파일 경로"""
+        fingerprint = hashlib.sha1(self._file_key(self.teacher_model_path).encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"teacher_logits_{fingerprint[:16]}.npz")
+    
+    def _load(self, cache_path: str) -> Dict[str, np.ndarray]:
+        """캐시 로드"""
+        if not os.path.exists(cache_path):
+            return {}
+        with np.load(cache_path, allow_pickle=False) as cache:
+            return dict(zip(cache['keys'].tolist(), cache['logits']))
+    
+    def _compute(self, image_paths: List[str]) -> np.ndarray:
+        """teacher 추론으로 로짓 계산 (확률의 로그)"""
+        dataset = tf.data.Dataset.from_tensor_slices(image_paths)
+        dataset = dataset.map(load_image_tensor, num_parallel_calls=tf.data.AUTOTUNE)
+        dataset = dataset.batch(self.batch_size).prefetch(tf.data.AUTOTUNE)
+        
+        probabilities = self.teacher.model.predict(dataset, verbose=0)
+        return np.log(np.clip(probabilities, 1e-7, 1.0)).astype(np.float32)
+    
+    def get_logits(self, image_paths: List[str]) -> np.ndarray:
+        """이미지별 teacher 로짓 (캐시에 없는 이미지만 추론)"""
+        cache_path = self._cache_path()
+        cache = self._load(cache_path)
+        
+        keys = [self._file_key(path) for path in image_paths]
+        missing = [(key, path) for key, path in zip(keys, image_paths) if key not in cache]
+        if missing:
+            print(f"teacher 로짓 계산: {len(missing)}장 (캐시됨: {len(keys) - len(missing)}장)")
+            logits = self._compute([path for _, path in missing])
+            for (key, _), row in zip(missing, logits):
+                cache[key] = row
+            
+            os.makedirs(self.cache_dir, exist_ok=True)
+            cache_keys = list(cache.keys())
+            np.savez(cache_path, keys=np.array(cache_keys), logits=np.stack([cache[k] for k in cache_keys]))
+        
+        return np.stack([cache[key] for key in keys])
+
+
+class Distiller(keras.Model):
+    """student 학습용 증류 모델 (hard label CE + teacher soft target KL)"""
+    
+    def __init__(self, student: keras.Model, temperature: float = 4.0, alpha: float = 0.3):
+        super().__init__()
+        self.student = student
+        self.student_logits = keras.Model(student.inputs, student.get_layer('logits').output)
+        self.temperature = temperature
+        self.alpha = alpha
+        self.loss_tracker = keras.metrics.Mean(name='loss')
+        self.accuracy_tracker = keras.metrics.CategoricalAccuracy(name='accuracy')
+    
+    @property
+    def metrics(self):
+        return [self.loss_tracker, self.accuracy_tracker]
+    
+    def call(self, inputs, training=False):
+        return self.student(inputs, training=training)
+    
+    def _compute_loss(self, data, training: bool):
+        """증류 손실 (레이블 없는 이미지는 soft target 손실만 사용)"""
+        images, (labels, label_mask, teacher_logits) = data
+        logits = self.student_logits(images, training=training)
+        
+        temperature = self.temperature
+        soft_targets = tf.nn.softmax(teacher_logits / temperature)
+        log_soft_student = tf.nn.log_softmax(logits / temperature)
+        distillation_loss = tf.reduce_sum(
+            soft_targets * (tf.math.log(soft_targets + 1e-7) - log_soft_student), axis=-1
+        ) * (temperature ** 2)
+        hard_loss = tf.nn.softmax_cross_entropy_with_logits(labels=labels, logits=logits) * label_mask
+        
+        loss = tf.reduce_mean(self.alpha * hard_loss + (1.0 - self.alpha) * distillation_loss)
+        return loss, labels, label_mask, logits
+    
+    def _update_metrics(self, loss, labels, label_mask, logits):
+        self.loss_tracker.update_state(loss)
+        self.accuracy_tracker.update_state(labels, tf.nn.softmax(logits), sample_weight=label_mask)
+        return {metric.name: metric.result() for metric in self.metrics}
+    
+    def train_step(self, data):
+        with tf.GradientTape() as tape:
+            loss, labels, label_mask, logits = self._compute_loss(data, training=True)
+        
+        variables = self.student.trainable_variables
+        gradients = tape.gradient(loss, variables)
+        self.optimizer.apply_gradients(zip(gradients, variables))
+        return self._update_metrics(loss, labels, label_mask, logits)
+    
+    def test_step(self, data):
+        loss, labels, label_mask, logits = self._compute_loss(data, training=False)
+        return self._update_metrics(loss, labels, label_mask, logits)
+
+
+def measure_latency_ms(model: keras.Model, input_size: Tuple[int, int, int] = (224, 224, 3), runs: int = 30) -> float:
+    """이미지 1장 추론 지연 시간 중앙값 (ms)"""
+    sample = tf.zeros((1,) + tuple(input_size))
+    model(sample, training=False)
+    
+    timings = []
+    for _ in range(runs):
+        start_time = time.perf_counter()
+        model(sample, training=False)
+        timings.append((time.perf_counter() - start_time) * 1000)
+    return float(np.median(timings))
+
+
+class KnowledgeDistiller:
+    """teacher(RecyclingClassifier) → student 지식 증류기"""
+    
+    def __init__(self,
+                 quality_checker: DataQualityChecker,
+                 temperature: float = 4.0,
+                 alpha: float = 0.3,
+                 batch_size: int = 32,
+                 cache_dir: str = "models/cache"):
+        self.quality_checker = quality_checker
+        self.temperature = temperature
+        self.alpha = alpha
+        self.batch_size = batch_size
+        self.cache_dir = cache_dir
+    
+    def _collect_labeled(self, data_dir: str, validation_split: float):
+        """레이블 이미지 수집 (클래스 순서는 flow_from_directory와 동일한 이름순)"""
+        records = [
+            r for r in self.quality_checker.scan_dataset(data_dir)
+            if r['valid'] and r['format'] in DECODABLE_FORMATS
+        ]
+        class_dirs = sorted({r['class_name'] for r in records})
+        class_indices = {name: i for i, name in enumerate(class_dirs)}
+        
+        train, validation = [], []
+        for record in records:
+            item = (os.path.join(data_dir, record['path']), class_indices[record['class_name']])
+            if int(record['sha1'][:8], 16) / 0xFFFFFFFF < validation_split:
+                validation.append(item)
+            else:
+                train.append(item)
+        return train, validation, class_dirs
+    
+    @staticmethod
+    def _collect_unlabeled(unlabeled_dir: Optional[str]) -> List[str]:
+        """레이블 없는 이미지 수집 (하위 디렉토리 포함)"""
+        if not unlabeled_dir:
+            return []
+        
+        paths = []
+        for root, _, filenames in os.walk(unlabeled_dir):
+            for filename in filenames:
+                if filename.lower().endswith(IMAGE_EXTENSIONS) and not filename.lower().endswith('.tiff'):
+                    paths.append(os.path.join(root, filename))
+        return sorted(paths)
+    
+    def _build_dataset(self,
+                       image_paths: List[str],
+                       labels: np.ndarray,
+                       label_mask: np.ndarray,
+                       teacher_logits: np.ndarray,
+                       shuffle: bool) -> tf.data.Dataset:
+        """(이미지, (레이블, 레이블 마스크, teacher 로짓)) 데이터셋"""
+        dataset = tf.data.Dataset.from_tensor_slices(
+            (image_paths, (labels, label_mask, teacher_logits))
+        )
+        if shuffle:
+            dataset = dataset.shuffle(len(image_paths), reshuffle_each_iteration=True)
+        dataset = dataset.map(
+            lambda path, targets: (load_image_tensor(path), targets),
+            num_parallel_calls=tf.data.AUTOTUNE
+        )
+        return dataset.batch(self.batch_size).prefetch(tf.data.AUTOTUNE)
+    
+    def distill(self,
+                teacher_model_path: str,
+                data_dir: str,
+                unlabeled_dir: Optional[str] = None,
+                epochs: int = 10,
+                save_path: str = "models/recycling_classifier_student.h5",
+                student_architecture: str = 'mobilenet_v3_small',
+                validation_split: float = 0.1,
+                accuracy_budget: float = 0.02) -> Dict[str, Any]:
+        """
+        지식 증류 실행
+        
+        Args:
+            teacher_model_path: teacher 모델 경로 (.h5)
+            data_dir: 레이블 훈련 데이터 디렉토리
+            unlabeled_dir: 레이블 없는 이미지 디렉토리 (선택사항)
+            epochs: 훈련 에포크 수
+            save_path: student 모델 저장 경로
+            student_architecture: student 아키텍처
+            validation_split: 검증 비율
+            accuracy_budget: 허용 정확도 하락폭 (teacher 대비)
+        
+        Returns:
+            증류 결과 보고서
+        """
+        teacher = RecyclingClassifier(teacher_model_path)
+        if teacher.model is None:
+            raise ValueError(f"teacher 모델을 찾을 수 없습니다: {teacher_model_path}")
+        
+        train_items, validation_items, class_dirs = self._collect_labeled(data_dir, validation_split)
+        if len(class_dirs) != teacher.num_classes:
+            raise ValueError(
+                f"클래스 수가 teacher와 다릅니다: 데이터 {len(class_dirs)}개, teacher {teacher.num_classes}개"
+            )
+        unlabeled_paths = self._collect_unlabeled(unlabeled_dir)
+        
+        # teacher 로짓은 한 번만 계산하여 캐시
+        logit_cache = TeacherLogitCache(teacher, teacher_model_path, cache_dir=self.cache_dir)
+        labeled_paths = [path for path, _ in train_items + validation_items]
+        all_logits = logit_cache.get_logits(labeled_paths + unlabeled_paths)
+        
+        num_classes = teacher.num_classes
+        num_train, num_validation = len(train_items), len(validation_items)
+        labels = np.zeros((len(labeled_paths) + len(unlabeled_paths), num_classes), dtype=np.float32)
+        for i, (_, label) in enumerate(train_items + validation_items):
+            labels[i, label] = 1.0
+        label_mask = np.zeros(len(labels), dtype=np.float32)
+        label_mask[:len(labeled_paths)] = 1.0
+        
+        train_index = np.r_[0:num_train, len(labeled_paths):len(labels)]
+        validation_index = np.arange(num_train, num_train + num_validation)
+        all_paths = np.array(labeled_paths + unlabeled_paths)
+        
+        train_dataset = self._build_dataset(
+            all_paths[train_index], labels[train_index], label_mask[train_index], all_logits[train_index],
+            shuffle=True
+        )
+        validation_dataset = self._build_dataset(
+            all_paths[validation_index], labels[validation_index], label_mask[validation_index],
+            all_logits[validation_index], shuffle=False
+        )
+        
+        # student 학습
+        student = create_student_model(student_architecture, num_classes, teacher.input_size)
+        distiller = Distiller(student, temperature=self.temperature, alpha=self.alpha)
+        distiller.compile(optimizer=keras.optimizers.Adam(learning_rate=0.001))
+        
+        callbacks = [
+            keras.callbacks.EarlyStopping(
+                monitor='val_accuracy',
+                mode='max',
+                patience=3,
+                restore_best_weights=True
+            ),
+            keras.callbacks.ReduceLROnPlateau(
+                monitor='val_loss',
+                factor=0.5,
+                patience=2,
+                min_lr=1e-7
+            )
+        ]
+        
+        print(f"student 훈련 시작: {student_architecture} "
+              f"(레이블 {num_train}장, 레이블 없음 {len(unlabeled_paths)}장, 검증 {num_validation}장)")
+        history = distiller.fit(
+            train_dataset,
+            epochs=epochs,
+            validation_data=validation_dataset,
+            callbacks=callbacks,
+            verbose=1
+        )
+        
+        # student 저장 (RecyclingClassifier로 로드 가능한 형식)
+        os.makedirs(os.path.dirname(save_path) or '.', exist_ok=True)
+        student.save(save_path)
+        class_info = {
+            'class_names': teacher.class_names,
+            'num_classes': teacher.num_classes
+        }
+        with open(save_path.replace('.h5', '_classes.json'), 'w', encoding='utf-8') as f:
+            json.dump(class_info, f, ensure_ascii=False, indent=2)
+        
+        # teacher 정확도는 캐시된 로짓으로 계산
+        validation_labels = labels[validation_index].argmax(axis=1)
+        teacher_accuracy = float(
+            (all_logits[validation_index].argmax(axis=1) == validation_labels).mean()
+        ) if num_validation else 0.0
+        student_accuracy = float(distiller.evaluate(validation_dataset, verbose=0, return_dict=True)['accuracy']) \
+            if num_validation else 0.0
+        
+        teacher_latency = measure_latency_ms(teacher.model, teacher.input_size)
+        student_latency = measure_latency_ms(student, teacher.input_size)
+        
+        report = {
+            'student_path': save_path,
+            'student_architecture': student_architecture,
+            'epochs_trained': len(history.history['loss']),
+            'labeled_images': num_train,
+            'unlabeled_images': len(unlabeled_paths),
+            'validation_images': num_validation,
+            'teacher_accuracy': round(teacher_accuracy, 4),
+            'student_accuracy': round(student_accuracy, 4),
+            'accuracy_drop': round(teacher_accuracy - student_accuracy, 4),
+            'accuracy_budget': accuracy_budget,
+            'within_budget': teacher_accuracy - student_accuracy <= accuracy_budget,
+            'teacher_params': int(teacher.model.count_params()),
+            'student_params': int(student.count_params()),
+            'teacher_latency_ms': round(teacher_latency, 2),
+            'student_latency_ms': round(student_latency, 2),
+            'speedup': round(teacher_latency / student_latency, 2) if student_latency else None
+        }
+        return report
@@ -0,0 +1,382 @@
+"""
+배출 장소 대량 가져오기
+
+전국 시설 목록처럼 큰 CSV/JSON 파일을 한 줄(객체)씩 읽어 검증하고, 배치 단위로
+한 번에 씁니다. 장소마다 ORM add/commit/refresh를 하는 LocationService.add_recycling_location
+대신 Core insert(executemany)를 쓰고, PostgreSQL(psycopg2)에서는 COPY로 삽입합니다.
+
+- 자연 키 (source, external_id)로 upsert합니다. external_id(또는 id)가 없으면 이름+주소로 키를 만듭니다.
+- 다른 경로가 관리하는 출처(local: API로 직접 등록, public_api: 공공 시설 동기화)로는 가져올 수 없습니다.
+  가져온 행이 동기화 때 덮어써지거나 비활성화되기 때문입니다.
+- 내용 해시가 같고 활성 상태인 장소는 쓰지 않으므로 같은 파일을 다시 가져와도 안전합니다.
+- 배치마다 커밋하므로 중간에 실패해도 앞 배치는 반영되며, 다시 실행하면 이어서 맞춰집니다.
+- Core insert는 ORM 이벤트 리스너를 거치지 않으므로 geohash/비트마스크를 직접 계산합니다.
+- 공간 인덱스는 행마다 갱신하지 않고 마지막에 한 번 다시 만듭니다.
+
+JSON은 객체 배열과 JSON Lines(한 줄에 객체 하나)를 모두 지원합니다.
+
+LOCATION_IMPORT_BATCH_SIZE: 한 번에 쓰는 행 수 (기본값: 5000)
+"""
+import io
+import os
+import re
+import csv
+import json
+import time
+import hashlib
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, TextIO, Tuple
+
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.geo import encode_geohash
+from app.models.location import (
+    RecyclingLocation, LOCAL_SOURCE, PUBLIC_API_SOURCE, split_waste_types, waste_type_mask
+)
+from app.services.facility_sync import facility_content_hash
+from app.services.spatial_index import LocationSpatialIndex
+
+logger = logging.getLogger(__name__)
+
+IMPORT_SOURCE = 'import'
+# 다른 경로가 관리하는 출처 (가져오기로 쓰지 않음)
+RESERVED_SOURCES = (LOCAL_SOURCE, PUBLIC_API_SOURCE)
+SOURCE_PATTERN = re.compile(r'^[a-z0-9][a-z0-9_.-]{0,49}$')
+IMPORT_FORMATS = ('csv', 'json')
+MAX_REPORTED_ERRORS = 100
+JSON_CHUNK_SIZE = 64 * 1024
+
+# 삽입 시 쓰는 컬럼 (COPY 컬럼 순서)
+INSERT_COLUMNS = (
+    'name', 'address', 'latitude', 'longitude', 'geohash', 'waste_types', 'waste_type_mask',
+    'operating_hours', 'contact_info', 'description', 'is_active', 'source', 'external_id',
+    'content_hash', 'synced_at', 'created_at', 'updated_at'
+)
+# 내용이 바뀐 장소를 갱신할 때 쓰는 컬럼
+UPDATE_COLUMNS = (
+    'name', 'address', 'latitude', 'longitude', 'geohash', 'waste_types', 'waste_type_mask',
+    'operating_hours', 'contact_info', 'description', 'is_active', 'content_hash',
+    'synced_at', 'updated_at'
+)
+
+
+def detect_import_format(filename: str) -> str:
+    """파일 확장자로 형식 결정 (.csv -> csv, .json/.jsonl/.ndjson -> json)"""
+    extension = os.path.splitext(filename or '')[1].lower()
+    if extension == '.csv':
+        return 'csv'
+    if extension in ('.json', '.jsonl', '.ndjson'):
+        return 'json'
+    raise ValueError(f"지원하지 않는 파일 형식입니다: {filename} (csv, json만 가능)")
+
+
+def iter_csv_rows(stream: TextIO) -> Iterator[Dict[str, Any]]:
+    """CSV를 헤더 기준 딕셔너리로 한 행씩 읽기"""
+    yield from csv.DictReader(stream)
+
+
+def iter_json_rows(stream: TextIO, chunk_size: int = JSON_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """
+    JSON 객체 배열 또는 JSON Lines를 객체 단위로 읽기
+    
+    파일 전체를 메모리에 올리지 않고 chunk_size씩 읽으며 완성된 객체부터 돌려줍니다.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    eof = False
+    started = False
+    
+    def fill() -> bool:
+        nonlocal buffer, position, eof
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        buffer = buffer[position:] + chunk
+        position = 0
+        return True
+    
+    while True:
+        # 공백과 배열 구분자 건너뛰기
+        while position < len(buffer) and buffer[position] in ' \t\r\n,':
+            position += 1
+        if position >= len(buffer):
+            if eof or not fill():
+                return
+            continue
+        if not started:
+            started = True
+            if buffer[position] == '[':
+                position += 1
+                continue
+        if buffer[position] == ']':
+            return
+        try:
+            value, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            # 객체가 청크 경계에서 잘린 경우 더 읽어서 다시 시도
+            if not eof and fill():
+                continue
+            raise ValueError(f"JSON 형식이 올바르지 않습니다 (위치 {position} 근처)")
+        position = end
+        yield value
+
+
+def iter_import_rows(stream: TextIO, file_format: str) -> Iterator[Dict[str, Any]]:
+    """형식에 맞는 행 읽기"""
+    if file_format == 'csv':
+        return iter_csv_rows(stream)
+    if file_format == 'json':
+        return iter_json_rows(stream)
+    raise ValueError(f"지원하지 않는 형식입니다: {file_format} (csv, json만 가능)")
+
+
+def natural_key(name: str, address: str) -> str:
+    """external_id가 없는 행의 키 (정규화한 이름+주소의 해시)"""
+    normalized = f"{' '.join(name.split()).lower()}|{' '.join(address.split()).lower()}"
+    return 'na:' + hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+
+
+def _text(row: Dict[str, Any], name: str, max_length: int) -> Optional[str]:
+    value = row.get(name)
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value[:max_length] if value else None
+
+
+def validate_import_row(row: Any, source: str, now: datetime) -> Dict[str, Any]:
+    """
+    가져올 행을 검증해 recycling_locations 컬럼 값으로 변환
+    
+    Raises:
+        ValueError: 필수 값이 없거나 좌표가 잘못됨
+    """
+    if not isinstance(row, dict):
+        raise ValueError("행이 객체가 아닙니다")
+    
+    name = _text(row, 'name', 200)
+    address = _text(row, 'address', 500)
+    if not name or not address:
+        raise ValueError("name, address는 필수입니다")
+    
+    try:
+        latitude = float(row.get('latitude'))
+        longitude = float(row.get('longitude'))
+    except (TypeError, ValueError):
+        raise ValueError("latitude, longitude가 숫자가 아닙니다")
+    if not -90 <= latitude <= 90 or not -180 <= longitude <= 180 or (latitude == 0 and longitude == 0):
+        raise ValueError(f"좌표가 범위를 벗어났습니다: ({latitude}, {longitude})")
+    
+    waste_types = split_waste_types(row.get('waste_types'))
+    if not waste_types:
+        raise ValueError("waste_types는 한 개 이상 필요합니다")
+    
+    fields = {
+        'name': name,
+        'address': address,
+        'latitude': latitude,
+        'longitude': longitude,
+        'waste_types': ','.join(waste_types)[:200],
+        'operating_hours': _text(row, 'operating_hours', 100),
+        'contact_info': _text(row, 'contact_info', 100),
+        'description': _text(row, 'description', 10000)
+    }
+    external_id = _text(row, 'external_id', 100) or _text(row, 'id', 100) or natural_key(name, address)
+    fields.update({
+        'content_hash': facility_content_hash(fields),
+        'geohash': encode_geohash(latitude, longitude),
+        'waste_type_mask': waste_type_mask(waste_types),
+        'is_active': True,
+        'source': source,
+        'external_id': external_id,
+        'synced_at': now,
+        'created_at': now,
+        'updated_at': now
+    })
+    return fields
+
+
+def validate_import_source(source: str) -> str:
+    """
+    가져오기 출처 검증 (영문 소문자/숫자/_.- 50자 이내, 예약된 출처 불가)
+    
+    Raises:
+        ValueError: 출처 형식이 잘못되었거나 예약된 출처
+    """
+    if not source or not SOURCE_PATTERN.match(source):
+        raise ValueError("source는 영문 소문자, 숫자, '_', '.', '-'로 된 50자 이내 값이어야 합니다")
+    if source in RESERVED_SOURCES:
+        raise ValueError(f"source로 {', '.join(RESERVED_SOURCES)}는 사용할 수 없습니다")
+    return source
+
+
+def _copy_text_value(value: Any) -> str:
+    """COPY TEXT 형식 값 (NULL은 \\N, 구분자/줄바꿈/백슬래시 이스케이프)"""
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    return (str(value).replace('\\', '\\\\').replace('\t', '\\t')
+            .replace('\n', '\\n').replace('\r', '\\r'))
+
+
+class LocationImportService:
+    """배출 장소 대량 가져오기 (스트리밍 검증 -> 배치 upsert -> 공간 인덱스 재구성)"""
+    
+    def __init__(self,
+                 engine: Engine,
+                 location_index: Optional[LocationSpatialIndex] = None,
+                 batch_size: Optional[int] = None):
+        self.engine = engine
+        self.location_index = location_index
+        self.batch_size = batch_size or int(os.getenv("LOCATION_IMPORT_BATCH_SIZE", "5000"))
+        self.table = RecyclingLocation.__table__
+    
+    def import_stream(self,
+                      stream: TextIO,
+                      file_format: str,
+                      source: str = IMPORT_SOURCE,
+                      progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        텍스트 스트림의 배출 장소를 가져오고 결과 집계 반환
+        
+        Args:
+            stream: CSV/JSON 텍스트 스트림
+            file_format: 'csv' 또는 'json'
+            source: 가져온 장소의 출처 (자연 키의 일부)
+            progress: 배치마다 중간 집계를 받는 콜백
+        """
+        validate_import_source(source)
+        
+        started = time.perf_counter()
+        now = datetime.utcnow()
+        result = {
+            'source': source,
+            'rows': 0,
+            'invalid': 0,
+            'inserted': 0,
+            'updated': 0,
+            'unchanged': 0,
+            'errors': []
+        }
+        
+        batch: Dict[str, Dict[str, Any]] = {}
+        for line_no, row in enumerate(iter_import_rows(stream, file_format), start=1):
+            result['rows'] += 1
+            try:
+                fields = validate_import_row(row, source, now)
+            except ValueError as e:
+                result['invalid'] += 1
+                if len(result['errors']) < MAX_REPORTED_ERRORS:
+                    result['errors'].append({'row': line_no, 'error': str(e)})
+                continue
+            # 같은 배치 안의 중복 키는 마지막 값 사용
+            batch[fields['external_id']] = fields
+            if len(batch) >= self.batch_size:
+                self._write_batch(list(batch.values()), source, result)
+                batch = {}
+                if progress is not None:
+                    progress(self._summary(result, started))
+        
+        if batch:
+            self._write_batch(list(batch.values()), source, result)
+        
+        result['index_size'] = self._rebuild_index() if result['inserted'] or result['updated'] else None
+        summary = self._summary(result, started)
+        logger.info(f"배출 장소 가져오기 완료: 행 {summary['rows']}건, 삽입 {summary['inserted']}건, "
+                    f"갱신 {summary['updated']}건, 오류 {summary['invalid']}건, "
+                    f"{summary['rows_per_second']}행/초")
+        return summary
+    
+    @staticmethod
+    def _summary(result: Dict[str, Any], started: float) -> Dict[str, Any]:
+        duration = time.perf_counter() - started
+        summary = dict(result)
+        summary['duration_seconds'] = round(duration, 2)
+        summary['rows_per_second'] = round(result['rows'] / duration, 1) if duration > 0 else None
+        return summary
+    
+    # ------------------------------------------------------------------
+    # 배치 쓰기
+    # ------------------------------------------------------------------
+    def _write_batch(self, rows: List[Dict[str, Any]], source: str, result: Dict[str, Any]) -> None:
+        """한 배치를 하나의 트랜잭션으로 upsert"""
+        with self.engine.begin() as connection:
+            existing = self._existing(connection, source, [row['external_id'] for row in rows])
+            
+            to_insert = []
+            to_update = []
+            for row in rows:
+                current = existing.get(row['external_id'])
+                if current is None:
+                    to_insert.append(row)
+                elif current[1] != row['content_hash'] or not current[2]:
+                    to_update.append(dict(row, _id=current[0]))
+                else:
+                    result['unchanged'] += 1
+            
+            if to_insert:
+                self._insert(connection, to_insert)
+            if to_update:
+                connection.execute(
+                    update(self.table)
+                    .where(self.table.c.id == bindparam('_id'))
+                    .values({name: bindparam(name) for name in UPDATE_COLUMNS}),
+                    [{name: row[name] for name in UPDATE_COLUMNS + ('_id',)} for row in to_update]
+                )
+        
+        result['inserted'] += len(to_insert)
+        result['updated'] += len(to_update)
+    
+    def _existing(self, connection: Connection, source: str,
+                  external_ids: List[str]) -> Dict[str, Tuple[int, Optional[str], bool]]:
+        """자연 키로 기존 장소 조회 (external_id -> (id, 내용 해시, 활성 여부))"""
+        table = self.table
+        existing = {}
+        # IN 목록이 DB 바인드 변수 한도를 넘지 않도록 나눠서 조회
+        for start in range(0, len(external_ids), 500):
+            statement = (
+                select(table.c.id, table.c.external_id, table.c.content_hash, table.c.is_active)
+                .where(table.c.source == source)
+                .where(table.c.external_id.in_(external_ids[start:start + 500]))
+            )
+            for row in connection.execute(statement):
+                existing[row.external_id] = (row.id, row.content_hash, bool(row.is_active))
+        return existing
+    
+    def _insert(self, connection: Connection, rows: List[Dict[str, Any]]) -> None:
+        """새 장소 삽입 (PostgreSQL + psycopg2는 COPY, 그 외는 executemany)"""
+        if connection.dialect.name == 'postgresql':
+            dbapi_connection = connection.connection.dbapi_connection
+            cursor = dbapi_connection.cursor()
+            try:
+                if hasattr(cursor, 'copy_expert'):
+                    buffer = io.StringIO()
+                    for row in rows:
+                        buffer.write('\t'.join(_copy_text_value(row[name]) for name in INSERT_COLUMNS))
+                        buffer.write('\n')
+                    buffer.seek(0)
+                    cursor.copy_expert(
+                        f"COPY {self.table.name} ({', '.join(INSERT_COLUMNS)}) FROM STDIN", buffer
+                    )
+                    return
+            finally:
+                cursor.close()
+        
+        connection.execute(self.table.insert(), [{name: row[name] for name in INSERT_COLUMNS} for row in rows])
+    
+    def _rebuild_index(self) -> Optional[int]:
+        """이미 적재된 공간 인덱스를 DB의 활성 장소로 한 번에 다시 구성 (미적재면 첫 조회 때 적재)"""
+        if self.location_index is None or not self.location_index.is_loaded:
+            return None
+        table = self.table
+        with self.engine.connect() as connection:
+            rows = connection.execute(
+                select(table.c.id, table.c.latitude, table.c.longitude, table.c.waste_types)
+                .where(table.c.is_active == True)
+            )
+            return self.location_index.rebuild(rows)
@@ -1,43 +1,61 @@
 """
 위치 기반 쓰레기 배출 정보 서비스
+
+주변 조회는 공공 API(비동기)와 로컬 DB(작업 스레드)를 동시에 조회합니다. 출처마다 지연 예산이
+있고 전체 마감 시간을 넘긴 출처는 기다리지 않으며, 응답한 출처의 결과만으로 결과를 만듭니다.
+
+LOCATION_PUBLIC_API_BUDGET_MS: 공공 API 조회 지연 예산 (기본값: 1500)
+LOCATION_DB_BUDGET_MS: 로컬 DB 조회 지연 예산 (기본값: 1000)
+LOCATION_SEARCH_DEADLINE_MS: 주변 조회 전체 마감 시간 (기본값: 2000)
 """
-import math
+import os
+import time
+import asyncio
+import logging
 from datetime import datetime
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Tuple, Any, Awaitable
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
 
 from app.core.interfaces import ILocationService
-from app.models.location import RecyclingLocation, UserLocation
+from app.core.geo import haversine_km, filter_by_distance, deduplicate_locations
+from app.models.location import RecyclingLocation, UserLocation, split_waste_types
 from app.repositories.location_repository import LocationRepository, UserLocationRepository, LocationQueryBuilder
 from app.services.public_api_service import PublicAPIService
+from app.services.spatial_index import LocationSpatialIndex
+
+logger = logging.getLogger(__name__)
+
+PUBLIC_API_LOOKUP = 'public_api'
+LOCAL_DB_LOOKUP = 'local_db'
+
+
+def _env_seconds(name: str, default_ms: float) -> float:
+    return float(os.getenv(name, str(default_ms))) / 1000.0
 
 
 class LocationService(ILocationService):
     """위치 기반 서비스"""
     
-    def __init__(self, db_session: Session):
+    def __init__(self,
+                 db_session: Session,
+                 location_index: Optional[LocationSpatialIndex] = None,
+                 public_api_service: Optional[PublicAPIService] = None,
+                 use_public_api: bool = True):
         self.db = db_session
+        self.location_index = location_index
         self.location_repo = LocationRepository(db_session)
         self.user_location_repo = UserLocationRepository(db_session)
-        self.query_builder = LocationQueryBuilder(db_session)
-        self.public_api_service = PublicAPIService()
+        self.public_api_service = public_api_service or PublicAPIService()
+        # 공공 시설을 로컬 DB로 동기화하는 경우 요청 경로에서는 공공 API를 호출하지 않음
+        self.use_public_api = use_public_api
+        self.public_api_budget = _env_seconds("LOCATION_PUBLIC_API_BUDGET_MS", 1500)
+        self.db_budget = _env_seconds("LOCATION_DB_BUDGET_MS", 1000)
+        self.search_deadline = _env_seconds("LOCATION_SEARCH_DEADLINE_MS", 2000)
     
     def calculate_distance(self, lat1: float, lon1: float, lat2: float, lon2: float) -> float:
         """두 지점 간의 거리 계산 (km)"""
-        R = 6371  # 지구 반지름 (km)
-        
-        dlat = math.radians(lat2 - lat1)
-        dlon = math.radians(lon2 - lon1)
-        
-        a = (math.sin(dlat/2) * math.sin(dlat/2) + 
-             math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * 
-             math.sin(dlon/2) * math.sin(dlon/2))
-        
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-        distance = R * c
-        
-        return distance
+        return haversine_km(lat1, lon1, lat2, lon2)
     
     async def find_nearby_locations(self, 
                             latitude: float, 
@@ -46,7 +64,7 @@ class LocationService(ILocationService):
                             radius_km: float = 5.0,
                             limit: int = 10) -> List[Dict]:
         """
-        주변 분리수거 배출 장소 찾기 (공공 API + 로컬 DB)
+        주변 분리수거 배출 장소 찾기 (공공 API + 로컬 DB, 동기화 사용 시 로컬 DB만)
         
         Args:
             latitude: 사용자 위도
@@ -58,59 +76,262 @@ class LocationService(ILocationService):
         Returns:
             주변 배출 장소 목록
         """
+        result = await self.search_nearby_locations(latitude, longitude, waste_type, radius_km, limit)
+        return result['locations']
+        
+    async def search_nearby_locations(self,
+                                      latitude: float,
+                                      longitude: float,
+                                      waste_type: Optional[str] = None,
+                                      radius_km: float = 5.0,
+                                      limit: int = 10) -> Dict[str, Any]:
+        """
+        주변 배출 장소와 출처별 조회 결과
+        
+        공공 API와 로컬 DB를 동시에 조회하고, 예산/마감 시간 안에 응답한 출처의 결과만 합칩니다.
+        
+        Returns:
+            {'locations': 배출 장소 목록, 'sources': {출처: 상태/건수/지연 시간}}
+        """
+        lookups: Dict[str, Tuple[Awaitable[List[Dict]], float]] = {}
+        if self.use_public_api:
+            lookups[PUBLIC_API_LOOKUP] = (
+                self.public_api_service.get_waste_facilities(
+                    latitude=latitude,
+                    longitude=longitude,
+                    radius_km=radius_km,
+                    waste_type=waste_type
+                ),
+                self.public_api_budget
+            )
+        lookups[LOCAL_DB_LOOKUP] = (
+            self._local_lookup(latitude, longitude, waste_type, radius_km, limit),
+            self.db_budget
+        )
+        
+        outcomes = await asyncio.gather(*[
+            self._run_lookup(name, lookup, min(budget, self.search_deadline))
+            for name, (lookup, budget) in lookups.items()
+        ])
+        
         all_locations = []
+        origins = {}
+        sources = {}
+        for name, locations, report in outcomes:
+            for location in locations:
+                origins[id(location)] = name
+            all_locations.extend(locations)
+            sources[name] = report
         
-        # 1. 공공 API에서 배출장소 조회
-        try:
-            public_locations = await self.public_api_service.get_waste_facilities(
-                latitude=latitude,
-                longitude=longitude,
-                radius_km=radius_km,
-                waste_type=waste_type
+        # 거리순 정렬 및 중복 제거 (이름과 주소 기준)
+        all_locations.sort(key=lambda x: x['distance_km'])
+        unique_locations = deduplicate_locations(all_locations, limit)
+        
+        # 최종 결과에 실제로 포함된 출처별 건수
+        for report in sources.values():
+            report['returned'] = 0
+        for location in unique_locations:
+            sources[origins[id(location)]]['returned'] += 1
+        
+        return {'locations': unique_locations, 'sources': sources}
+    
+    async def find_nearby_locations_multi(self,
+                                          latitude: float,
+                                          longitude: float,
+                                          waste_types: List[str],
+                                          radius_km: float = 5.0,
+                                          limit: int = 3) -> Dict[str, List[Dict]]:
+        """
+        여러 쓰레기 종류의 주변 배출 장소를 한 번에 찾기
+        
+        종류마다 find_nearby_locations를 부르지 않고 공공 API와 로컬 DB를 종류 필터 없이
+        한 번씩만 (동시에) 조회해 후보의 거리를 한 번 계산한 뒤, 메모리에서 종류별로 나눠
+        종류마다 가까운 limit개를 고릅니다.
+        
+        Returns:
+            {쓰레기 종류: 거리순 배출 장소 목록}
+        """
+        lookups: Dict[str, Tuple[Awaitable[List[Dict]], float]] = {}
+        if self.use_public_api:
+            lookups[PUBLIC_API_LOOKUP] = (
+                self.public_api_service.get_waste_facilities(
+                    latitude=latitude,
+                    longitude=longitude,
+                    radius_km=radius_km
+                ),
+                self.public_api_budget
             )
-            all_locations.extend(public_locations)
+        lookups[LOCAL_DB_LOOKUP] = (
+            self._local_multi_lookup(latitude, longitude, waste_types, radius_km, limit),
+            self.db_budget
+        )
+        
+        outcomes = await asyncio.gather(*[
+            self._run_lookup(name, lookup, min(budget, self.search_deadline))
+            for name, (lookup, budget) in lookups.items()
+        ])
+        
+        candidates = [location for _, locations, _ in outcomes for location in locations]
+        candidates.sort(key=lambda x: x['distance_km'])
+        return self._partition_by_waste_type(candidates, waste_types, limit)
+    
+    @staticmethod
+    def _partition_by_waste_type(candidates: List[Dict],
+                                 waste_types: List[str],
+                                 limit: int) -> Dict[str, List[Dict]]:
+        """거리순 후보를 쓰레기 종류별로 나눠 중복 제거 후 종류마다 limit개 선택"""
+        matches: Dict[str, List[Dict]] = {waste_type: [] for waste_type in waste_types}
+        for location in candidates:
+            accepted = split_waste_types(location.get('waste_types'))
+            for waste_type in waste_types:
+                if waste_type.strip().lower() in accepted:
+                    matches[waste_type].append(location)
+        
+        return {
+            waste_type: deduplicate_locations(locations, limit)
+            for waste_type, locations in matches.items()
+        }
+    
+    async def _run_lookup(self, name: str, lookup: Awaitable[List[Dict]],
+                          timeout: float) -> Tuple[str, List[Dict], Dict[str, Any]]:
+        """출처 하나를 예산 안에서 조회 (시간 초과나 오류면 빈 결과와 상태 보고)"""
+        started = time.perf_counter()
+        report: Dict[str, Any] = {'budget_ms': round(timeout * 1000)}
+        locations: List[Dict] = []
+        try:
+            locations = await asyncio.wait_for(lookup, timeout=timeout)
+            report['status'] = 'ok'
+        except asyncio.TimeoutError:
+            report['status'] = 'timeout'
+            logger.warning(f"{name} 조회 시간 초과 ({report['budget_ms']}ms)")
         except Exception as e:
-            print(f"공공 API 조회 실패: {e}")
+            report['status'] = 'error'
+            report['error'] = str(e)
+            logger.warning(f"{name} 조회 실패: {e}")
+        report['count'] = len(locations)
+        report['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 1)
+        return name, locations, report
+    
+    def _local_lookup(self,
+                      latitude: float,
+                      longitude: float,
+                      waste_type: Optional[str],
+                      radius_km: float,
+                      limit: int) -> Awaitable[List[Dict]]:
+        """로컬 DB 조회 (동기 SQLAlchemy 조회는 이벤트 루프를 막지 않도록 작업 스레드에서 실행)"""
+        return asyncio.to_thread(self._find_local_locations, latitude, longitude, waste_type, radius_km, limit)
+    
+    def _find_local_locations(self,
+                              latitude: float,
+                              longitude: float,
+                              waste_type: Optional[str],
+                              radius_km: float,
+                              limit: int) -> List[Dict]:
+        """
+        로컬 DB 반경 조회 (작업 스레드에서 실행)
         
-        # 2. 로컬 DB에서 배출장소 조회
+        시간 초과로 결과를 기다리지 않아도 요청 세션이 닫힌 뒤까지 실행될 수 있으므로
+        같은 엔진의 별도 세션을 사용합니다.
+        """
+        session = Session(bind=self.db.get_bind())
         try:
-            query = self.query_builder.active_only().within_radius(latitude, longitude, radius_km)
-            
-            if waste_type:
-                query = query.by_waste_type(waste_type)
-            
-            query = query.order_by_distance(latitude, longitude).limit(limit)
-            db_locations = query.build()
-            
-            # DB 결과를 딕셔너리로 변환
-            for location in db_locations:
-                distance = self.calculate_distance(
-                    latitude, longitude, 
-                    location.latitude, location.longitude
-                )
+            # 공간 인덱스가 있으면 인덱스로 후보 선택
+            if self.location_index is not None and self.location_index.ensure_loaded(session):
+                hits = self.location_index.within_radius(latitude, longitude, radius_km, waste_type, limit=limit)
+                locations = LocationRepository(session).get_by_ids([location_id for location_id, _ in hits])
+                return self._indexed_results(hits, locations)
                 
-                if distance <= radius_km:
-                    location_dict = location.to_dict()
-                    location_dict['distance_km'] = round(distance, 2)
-                    location_dict['source'] = 'local_db'
-                    all_locations.append(location_dict)
-        except Exception as e:
-            print(f"로컬 DB 조회 실패: {e}")
+            query = self._nearby_query(LocationQueryBuilder(session), latitude, longitude, waste_type, radius_km, limit)
+            return self._radius_results(query.build(), latitude, longitude, radius_km)
+        finally:
+            session.close()
+    
+    def _local_multi_lookup(self,
+                            latitude: float,
+                            longitude: float,
+                            waste_types: List[str],
+                            radius_km: float,
+                            limit: int) -> Awaitable[List[Dict]]:
+        """여러 쓰레기 종류의 로컬 DB 조회 (작업 스레드에서 실행)"""
+        return asyncio.to_thread(self._find_local_locations_multi, latitude, longitude, waste_types, radius_km, limit)
+    
+    def _find_local_locations_multi(self,
+                                    latitude: float,
+                                    longitude: float,
+                                    waste_types: List[str],
+                                    radius_km: float,
+                                    limit: int) -> List[Dict]:
+        """
+        여러 쓰레기 종류의 로컬 DB 반경 조회 (종류별 상위 limit개의 합집합)
         
-        # 3. 거리순 정렬 및 중복 제거
-        all_locations.sort(key=lambda x: x['distance_km'])
+        공간 인덱스가 있으면 인덱스를 한 번 탐색하고 선택된 장소를 한 번에 조회하며,
+        인덱스가 없으면 같은 세션에서 종류별로 조회합니다.
+        """
+        session = Session(bind=self.db.get_bind())
+        try:
+            if self.location_index is not None and self.location_index.ensure_loaded(session):
+                hits = self._union_hits(
+                    self.location_index.within_radius_by_type(latitude, longitude, radius_km, waste_types, limit)
+                )
+                locations = LocationRepository(session).get_by_ids([location_id for location_id, _ in hits])
+                return self._indexed_results(hits, locations)
+            
+            locations = {}
+            for waste_type in waste_types:
+                query = self._nearby_query(LocationQueryBuilder(session), latitude, longitude, waste_type, radius_km, limit)
+                for location in self._radius_results(query.build(), latitude, longitude, radius_km):
+                    locations[location['id']] = location
+            return list(locations.values())
+        finally:
+            session.close()
+    
+    @staticmethod
+    def _union_hits(hits_by_type: Dict[str, List[Tuple[int, float]]]) -> List[Tuple[int, float]]:
+        """종류별 인덱스 결과의 합집합 (같은 장소는 한 번만, 정확한 거리순)"""
+        union: Dict[int, float] = {}
+        for hits in hits_by_type.values():
+            union.update(hits)
+        return sorted(union.items(), key=lambda x: x[1])
+    
+    @staticmethod
+    def _nearby_query(builder: LocationQueryBuilder,
+                      latitude: float,
+                      longitude: float,
+                      waste_type: Optional[str],
+                      radius_km: float,
+                      limit: int) -> LocationQueryBuilder:
+        """반경 내 활성 장소를 가까운 순으로 limit개 조회하는 쿼리"""
+        query = builder.active_only().within_cells(latitude, longitude, radius_km)
         
-        # 중복 제거 (이름과 주소 기준)
-        unique_locations = []
-        seen = set()
-        for location in all_locations:
-            key = (location.get('name', ''), location.get('address', ''))
-            if key not in seen:
-                seen.add(key)
-                unique_locations.append(location)
+        if waste_type:
+            query = query.by_waste_type(waste_type)
         
-        # 4. 제한된 수만큼 반환
-        return unique_locations[:limit]
+        return query.order_by_distance(latitude, longitude).limit(limit)
+    
+    @staticmethod
+    def _radius_results(db_locations: List[RecyclingLocation],
+                        latitude: float,
+                        longitude: float,
+                        radius_km: float) -> List[Dict]:
+        """DB 결과를 딕셔너리로 변환 후 정확한 거리로 일괄 필터링"""
+        db_dicts = []
+        for location in db_locations:
+            location_dict = location.to_dict()
+            location_dict['source'] = 'local_db'
+            db_dicts.append(location_dict)
+        return filter_by_distance(db_dicts, latitude, longitude, radius_km)
+    
+    @staticmethod
+    def _indexed_results(hits: List[Tuple[int, float]], db_locations: List[RecyclingLocation]) -> List[Dict]:
+        """공간 인덱스 결과(ID, 거리)와 DB 행을 합쳐 딕셔너리로 변환"""
+        distances = dict(hits)
+        locations = []
+        for location in db_locations:
+            location_dict = location.to_dict()
+            location_dict['distance_km'] = round(distances[location.id], 2)
+            location_dict['source'] = 'local_db'
+            locations.append(location_dict)
+        return locations
     
     def get_location_by_id(self, location_id: int) -> Optional[Dict]:
         """ID로 배출 장소 조회"""
@@ -142,12 +363,23 @@ class LocationService(ILocationService):
         )
         
         created_location = self.location_repo.create(location)
+        if self.location_index is not None:
+            self.location_index.upsert_location(created_location)
         return created_location.to_dict()
     
     def update_recycling_location(self, 
                                 location_id: int,
                                 **kwargs) -> Optional[Dict]:
         """분리수거 배출 장소 정보 수정"""
+        update_data = self._location_update_data(kwargs)
+        updated_location = self.location_repo.update(location_id, update_data)
+        if updated_location and self.location_index is not None:
+            self.location_index.upsert_location(updated_location)
+        return updated_location.to_dict() if updated_location else None
+    
+    @staticmethod
+    def _location_update_data(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """수정 요청에서 수정 가능한 필드만 골라 저장 형식으로 변환"""
         # 업데이트할 필드들
         updatable_fields = [
             'name', 'address', 'latitude', 'longitude', 
@@ -164,13 +396,14 @@ class LocationService(ILocationService):
                     update_data[field] = value
         
         update_data['updated_at'] = datetime.utcnow()
-        
-        updated_location = self.location_repo.update(location_id, update_data)
-        return updated_location.to_dict() if updated_location else None
+        return update_data
     
     def delete_recycling_location(self, location_id: int) -> bool:
         """분리수거 배출 장소 삭제 (비활성화)"""
-        return self.location_repo.delete(location_id)
+        deleted = self.location_repo.delete(location_id)
+        if deleted and self.location_index is not None:
+            self.location_index.remove(location_id)
+        return deleted
     
     def save_user_location(self, 
                           latitude: float, 
@@ -0,0 +1,344 @@
+"""
+모델 평가 서비스 - 배치 스트리밍 평가 + 속도 측정
+
+레이블된 디렉토리(클래스별 하위 디렉토리) 또는 TFRecord 샤드를 배치 단위로 읽어
+정확도, 혼동 행렬, 클래스별 정밀도/재현율, 보정(calibration), 배치 크기별 처리량/지연 시간을
+계산하고 배포 판정(gate)용 JSON 보고서를 만듭니다.
+"""
+import os
+import glob
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import List, Dict, Optional, Any, Iterator, Tuple, Sequence
+
+import numpy as np
+from PIL import Image
+
+from app.core.interfaces import IImageClassifier
+from app.core.data_processor import IMAGE_EXTENSIONS
+
+
+# TFRecord 샤드 특성 키 (image/class/label은 분류기 class_names 기준 인덱스)
+TFRECORD_IMAGE_KEY = 'image/encoded'
+TFRECORD_LABEL_KEY = 'image/class/label'
+
+DEFAULT_BENCHMARK_BATCH_SIZES = (1, 8, 32)
+CALIBRATION_BINS = 15
+
+
+def _load_image(path: str, target_size: Tuple[int, int]) -> Optional[np.ndarray]:
+    """이미지 디코딩 + 리사이즈 ([0, 1] float32), 실패 시 None"""
+    try:
+        with Image.open(path) as img:
+            img.draft('RGB', target_size)
+            img = img.convert('RGB').resize(target_size)
+            return np.asarray(img, dtype=np.float32) / 255.0
+    except Exception:
+        return None
+
+
+def iter_directory_batches(data_dir: str,
+                           class_names: List[str],
+                           batch_size: int = 32,
+                           target_size: Tuple[int, int] = (224, 224),
+                           num_workers: int = 4) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    레이블된 디렉토리를 (이미지 배치, 레이블 배치)로 스트리밍
+    
+    레이블은 하위 디렉토리 이름을 분류기 class_names에서 찾은 인덱스입니다.
+    분류기에 없는 클래스 디렉토리와 디코딩할 수 없는 파일은 건너뜁니다.
+    """
+    samples = []
+    for class_name in sorted(os.listdir(data_dir)):
+        class_dir = os.path.join(data_dir, class_name)
+        if not os.path.isdir(class_dir):
+            continue
+        if class_name not in class_names:
+            print(f"분류기에 없는 클래스 디렉토리를 건너뜁니다: {class_name}")
+            continue
+        label = class_names.index(class_name)
+        for filename in sorted(os.listdir(class_dir)):
+            if filename.lower().endswith(IMAGE_EXTENSIONS):
+                samples.append((os.path.join(class_dir, filename), label))
+    
+    # 디코딩은 스레드 풀에서 다음 배치를 미리 준비
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        def submit(start: int):
+            chunk = samples[start:start + batch_size]
+            return chunk, [executor.submit(_load_image, path, target_size) for path, _ in chunk]
+        
+        pending = submit(0) if samples else None
+        for start in range(0, len(samples), batch_size):
+            chunk, futures = pending
+            if start + batch_size < len(samples):
+                pending = submit(start + batch_size)
+            
+            images, labels = [], []
+            for (_, label), future in zip(chunk, futures):
+                image = future.result()
+                if image is not None:
+                    images.append(image)
+                    labels.append(label)
+            if images:
+                yield np.stack(images), np.asarray(labels, dtype=np.int64)
+
+
+def iter_tfrecord_batches(pattern: str,
+                          batch_size: int = 32,
+                          target_size: Tuple[int, int] = (224, 224)) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """TFRecord 샤드(glob 패턴)를 (이미지 배치, 레이블 배치)로 스트리밍"""
+    import tensorflow as tf
+    
+    files = sorted(glob.glob(pattern))
+    if not files:
+        raise ValueError(f"TFRecord 파일을 찾을 수 없습니다: {pattern}")
+    
+    features = {
+        TFRECORD_IMAGE_KEY: tf.io.FixedLenFeature([], tf.string),
+        TFRECORD_LABEL_KEY: tf.io.FixedLenFeature([], tf.int64)
+    }
+    
+    def parse(serialized):
+        example = tf.io.parse_single_example(serialized, features)
+        image = tf.io.decode_image(example[TFRECORD_IMAGE_KEY], channels=3, expand_animations=False)
+        image = tf.image.resize(tf.cast(image, tf.float32) / 255.0, target_size)
+        return image, example[TFRECORD_LABEL_KEY]
+    
+    dataset = (
+        tf.data.TFRecordDataset(files, num_parallel_reads=tf.data.AUTOTUNE)
+        .map(parse, num_parallel_calls=tf.data.AUTOTUNE)
+        .batch(batch_size)
+        .prefetch(tf.data.AUTOTUNE)
+    )
+    for images, labels in dataset.as_numpy_iterator():
+        yield images, labels
+
+
+def _percentile_ms(samples: List[float], q: float) -> float:
+    return round(float(np.percentile(samples, q)) * 1000, 2)
+
+
+class ModelEvaluator:
+    """IImageClassifier 백엔드(Keras, TFLite, ONNX) 공통 평가기"""
+    
+    def __init__(self, classifier: IImageClassifier, batch_size: int = 32):
+        self.classifier = classifier
+        self.batch_size = batch_size
+        self.class_names = classifier.get_class_info()['class_names']
+        self.input_size = tuple(getattr(classifier, 'input_size', (224, 224, 3)))
+    
+    def _probabilities(self, images: np.ndarray) -> np.ndarray:
+        """배치 예측 결과를 (N, num_classes) 확률 배열로 변환"""
+        results = self.classifier.predict_batch(images)
+        return np.asarray([
+            [result['class_probabilities'][name] for name in self.class_names]
+            for result in results
+        ], dtype=np.float64)
+    
+    def iter_batches(self, source: str) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """디렉토리 또는 TFRecord 패턴(.tfrecord, .tfrec, *)에서 배치 스트림 생성"""
+        target_size = self.input_size[:2]
+        if os.path.isdir(source):
+            return iter_directory_batches(source, self.class_names, self.batch_size, target_size)
+        return iter_tfrecord_batches(source, self.batch_size, target_size)
+    
+    def evaluate(self, source: str) -> Dict[str, Any]:
+        """
+        정확도 지표 계산 (배치마다 누적하므로 전체 예측을 메모리에 보관하지 않음)
+        
+        Args:
+            source: 레이블된 디렉토리 또는 TFRecord 샤드 glob 패턴
+        
+        Returns:
+            정확도, 혼동 행렬, 클래스별 지표, 보정 지표
+        """
+        num_classes = len(self.class_names)
+        confusion = np.zeros((num_classes, num_classes), dtype=np.int64)
+        bin_counts = np.zeros(CALIBRATION_BINS, dtype=np.int64)
+        bin_confidence = np.zeros(CALIBRATION_BINS)
+        bin_correct = np.zeros(CALIBRATION_BINS)
+        nll_sum = 0.0
+        brier_sum = 0.0
+        inference_sec = 0.0
+        
+        start_time = time.perf_counter()
+        for images, labels in self.iter_batches(source):
+            batch_start = time.perf_counter()
+            probabilities = self._probabilities(images)
+            inference_sec += time.perf_counter() - batch_start
+            
+            predicted = probabilities.argmax(axis=1)
+            confidence = probabilities.max(axis=1)
+            correct = predicted == labels
+            np.add.at(confusion, (labels, predicted), 1)
+            
+            bins = np.minimum((confidence * CALIBRATION_BINS).astype(int), CALIBRATION_BINS - 1)
+            np.add.at(bin_counts, bins, 1)
+            np.add.at(bin_confidence, bins, confidence)
+            np.add.at(bin_correct, bins, correct)
+            
+            true_probability = probabilities[np.arange(len(labels)), labels]
+            nll_sum += float(-np.log(np.clip(true_probability, 1e-12, 1.0)).sum())
+            one_hot = np.eye(num_classes)[labels]
+            brier_sum += float(np.square(probabilities - one_hot).sum(axis=1).sum())
+        
+        total = int(confusion.sum())
+        if total == 0:
+            raise ValueError(f"평가할 이미지가 없습니다: {source}")
+        
+        true_positives = np.diag(confusion)
+        predicted_counts = confusion.sum(axis=0)
+        support = confusion.sum(axis=1)
+        per_class = {}
+        for i, name in enumerate(self.class_names):
+            precision = true_positives[i] / predicted_counts[i] if predicted_counts[i] else 0.0
+            recall = true_positives[i] / support[i] if support[i] else 0.0
+            f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+            per_class[name] = {
+                'precision': round(float(precision), 4),
+                'recall': round(float(recall), 4),
+                'f1': round(float(f1), 4),
+                'support': int(support[i])
+            }
+        
+        # 기대 보정 오차(ECE): 신뢰도 구간별 |정확도 - 평균 신뢰도|의 가중 평균
+        nonempty = bin_counts > 0
+        bin_accuracy = np.divide(bin_correct, bin_counts, out=np.zeros(CALIBRATION_BINS), where=nonempty)
+        bin_mean_confidence = np.divide(bin_confidence, bin_counts, out=np.zeros(CALIBRATION_BINS), where=nonempty)
+        gaps = np.abs(bin_accuracy - bin_mean_confidence)
+        
+        present = [name for i, name in enumerate(self.class_names) if support[i]]
+        elapsed = time.perf_counter() - start_time
+        return {
+            'num_images': total,
+            'accuracy': round(float(true_positives.sum() / total), 4),
+            'macro_f1': round(float(np.mean([per_class[name]['f1'] for name in present])), 4),
+            'per_class': per_class,
+            'confusion_matrix': {
+                'labels': self.class_names,
+                'matrix': confusion.tolist()
+            },
+            'calibration': {
+                'ece': round(float(np.sum(gaps * bin_counts) / total), 4),
+                'max_calibration_error': round(float(gaps[nonempty].max()), 4),
+                'nll': round(nll_sum / total, 4),
+                'brier': round(brier_sum / total, 4),
+                'bins': [
+                    {
+                        'lower': round(i / CALIBRATION_BINS, 4),
+                        'upper': round((i + 1) / CALIBRATION_BINS, 4),
+                        'count': int(bin_counts[i]),
+                        'accuracy': round(float(bin_accuracy[i]), 4),
+                        'confidence': round(float(bin_mean_confidence[i]), 4)
+                    }
+                    for i in range(CALIBRATION_BINS) if bin_counts[i]
+                ]
+            },
+            'elapsed_sec': round(elapsed, 3),
+            'inference_sec': round(inference_sec, 3),
+            'images_per_sec': round(total / elapsed, 2) if elapsed else None
+        }
+    
+    def benchmark(self,
+                  batch_sizes: Sequence[int] = DEFAULT_BENCHMARK_BATCH_SIZES,
+                  iterations: int = 20,
+                  warmup: int = 3) -> Dict[str, Any]:
+        """
+        배치 크기별 지연 시간/처리량 측정 (임의 입력, 전처리 제외)
+        
+        Returns:
+            {배치 크기: {latency_ms_p50, latency_ms_p95, latency_ms_p99, images_per_sec}}
+        """
+        results = {}
+        for batch_size in batch_sizes:
+            batch = np.random.rand(batch_size, *self.input_size).astype(np.float32)
+            for _ in range(warmup):
+                self.classifier.predict_batch(batch)
+            
+            samples = []
+            for _ in range(iterations):
+                start = time.perf_counter()
+                self.classifier.predict_batch(batch)
+                samples.append(time.perf_counter() - start)
+            
+            results[str(batch_size)] = {
+                'latency_ms_p50': _percentile_ms(samples, 50),
+                'latency_ms_p95': _percentile_ms(samples, 95),
+                'latency_ms_p99': _percentile_ms(samples, 99),
+                'images_per_sec': round(batch_size * len(samples) / sum(samples), 2)
+            }
+        return results
+    
+    @staticmethod
+    def gate(report: Dict[str, Any],
+             min_accuracy: Optional[float] = None,
+             max_latency_ms: Optional[float] = None,
+             latency_batch_size: int = 1,
+             max_ece: Optional[float] = None) -> Dict[str, Any]:
+        """
+        배포 판정
+        
+        Args:
+            report: evaluate()/benchmark() 결과를 담은 보고서 ('metrics', 'performance')
+            min_accuracy: 최소 정확도
+            max_latency_ms: latency_batch_size 배치의 최대 p95 지연 시간
+            latency_batch_size: 지연 시간 기준 배치 크기
+            max_ece: 최대 기대 보정 오차
+        """
+        failures = []
+        metrics = report.get('metrics', {})
+        if min_accuracy is not None and metrics.get('accuracy', 0.0) < min_accuracy:
+            failures.append(f"정확도 {metrics.get('accuracy')} < {min_accuracy}")
+        if max_ece is not None and metrics.get('calibration', {}).get('ece', 1.0) > max_ece:
+            failures.append(f"ECE {metrics['calibration']['ece']} > {max_ece}")
+        if max_latency_ms is not None:
+            latency = report.get('performance', {}).get(str(latency_batch_size), {}).get('latency_ms_p95')
+            if latency is None:
+                failures.append(f"배치 크기 {latency_batch_size}의 지연 시간 측정값이 없습니다")
+            elif latency > max_latency_ms:
+                failures.append(f"p95 지연 시간 {latency}ms > {max_latency_ms}ms (배치 {latency_batch_size})")
+        
+        return {
+            'passed': not failures,
+            'failures': failures,
+            'thresholds': {
+                'min_accuracy': min_accuracy,
+                'max_latency_ms': max_latency_ms,
+                'latency_batch_size': latency_batch_size,
+                'max_ece': max_ece
+            }
+        }
+    
+    def run(self,
+            source: str,
+            batch_sizes: Sequence[int] = DEFAULT_BENCHMARK_BATCH_SIZES,
+            report_path: Optional[str] = None,
+            min_accuracy: Optional[float] = None,
+            max_latency_ms: Optional[float] = None,
+            max_ece: Optional[float] = None,
+            model_path: Optional[str] = None) -> Dict[str, Any]:
+        """평가 + 속도 측정 + 배포 판정 후 보고서 저장"""
+        report = {
+            'model_path': model_path,
+            'backend': type(self.classifier).__name__,
+            'source': source,
+            'created_at': datetime.utcnow().isoformat(),
+            'metrics': self.evaluate(source),
+            'performance': self.benchmark(batch_sizes) if batch_sizes else {}
+        }
+        report['gate'] = self.gate(
+            report,
+            min_accuracy=min_accuracy,
+            max_latency_ms=max_latency_ms,
+            latency_batch_size=min(batch_sizes) if batch_sizes else 1,
+            max_ece=max_ece
+        )
+        
+        if report_path:
+            os.makedirs(os.path.dirname(report_path) or '.', exist_ok=True)
+            with open(report_path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+        
+        return report
@@ -0,0 +1,270 @@
+"""
+모델 경량화 서비스 - 크기 기반 가지치기(pruning) + 가중치 클러스터링
+
+가지치기한 가중치는 0으로 바뀔 뿐 텐서 크기는 그대로이므로, 메모리 사용량과 .h5 파일 크기,
+지연 시간은 줄지 않습니다. 줄어드는 것은 0과 반복 값이 잘 압축되는 배포용 압축본(gzip) 크기뿐이며,
+보고서의 크기 비교도 압축본 기준입니다 (savings_scope).
+"""
+import os
+import gzip
+import json
+import shutil
+import tempfile
+from typing import List, Dict, Optional, Any
+
+import numpy as np
+from tensorflow import keras
+from tensorflow.keras import layers
+
+from app.models.recycling_classifier import RecyclingClassifier
+from app.services.knowledge_distiller import measure_latency_ms
+
+
+# 이보다 작은 레이어는 가지치기/클러스터링 대상에서 제외
+MIN_LAYER_PARAMS = 1024
+
+
+def _iter_layers(model: keras.Model):
+    """중첩 모델(백본 포함)의 모든 레이어 순회"""
+    for layer in model.layers:
+        if isinstance(layer, keras.Model):
+            yield from _iter_layers(layer)
+        else:
+            yield layer
+
+
+def _kernel(layer: layers.Layer):
+    """레이어의 커널 변수"""
+    if isinstance(layer, layers.DepthwiseConv2D):
+        return layer.depthwise_kernel
+    return layer.kernel
+
+
+def magnitude_mask(weights: np.ndarray, sparsity: float) -> np.ndarray:
+    """크기 기반 가지치기 마스크 (절댓값이 작은 sparsity 비율의 가중치를 0으로)"""
+    if sparsity <= 0:
+        return np.ones_like(weights, dtype=weights.dtype)
+    
+    threshold = np.quantile(np.abs(weights), sparsity)
+    return (np.abs(weights) > threshold).astype(weights.dtype)
+
+
+def cluster_weights(weights: np.ndarray, n_clusters: int, iterations: int = 10) -> np.ndarray:
+    """
+    1차원 k-means 가중치 클러스터링
+    
+    0(가지치기된 가중치)은 그대로 두고, 나머지를 n_clusters개의 중심값으로 치환합니다.
+    """
+    nonzero = weights[weights != 0]
+    if len(nonzero) <= n_clusters:
+        return weights
+    
+    # 선형 초기화 후 정렬된 중심값의 중간점으로 할당
+    centroids = np.linspace(nonzero.min(), nonzero.max(), n_clusters)
+    for _ in range(iterations):
+        assignments = np.searchsorted((centroids[1:] + centroids[:-1]) / 2, nonzero)
+        sums = np.bincount(assignments, weights=nonzero, minlength=n_clusters)
+        counts = np.bincount(assignments, minlength=n_clusters)
+        updated = np.where(counts > 0, sums / np.maximum(counts, 1), centroids)
+        centroids = np.sort(updated)
+    
+    clustered = weights.copy()
+    assignments = np.searchsorted((centroids[1:] + centroids[:-1]) / 2, nonzero)
+    clustered[weights != 0] = centroids[assignments]
+    return clustered
+
+
+class PruningCallback(keras.callbacks.Callback):
+    """
+    점진적 가지치기 콜백
+    
+    에포크마다 희소율을 목표치까지 3차 곡선으로 올리며 마스크를 다시 계산하고,
+    배치마다 마스크를 적용해 제거된 가중치가 되살아나지 않게 합니다.
+    """
+    
+    def __init__(self, target_layers: List[layers.Layer], target_sparsity: float, epochs: int):
+        super().__init__()
+        self.target_layers = target_layers
+        self.target_sparsity = target_sparsity
+        self.epochs = max(epochs, 1)
+        self.masks: List[np.ndarray] = []
+    
+    def _sparsity_at(self, epoch: int) -> float:
+        progress = min((epoch + 1) / self.epochs, 1.0)
+        return self.target_sparsity * (1 - (1 - progress) ** 3)
+    
+    def update_masks(self, sparsity: float):
+        """현재 가중치로 마스크 재계산"""
+        self.masks = [magnitude_mask(_kernel(layer).numpy(), sparsity) for layer in self.target_layers]
+        self.apply_masks()
+    
+    def apply_masks(self):
+        """마스크 적용"""
+        for layer, mask in zip(self.target_layers, self.masks):
+            kernel = _kernel(layer)
+            kernel.assign(kernel.numpy() * mask)
+    
+    def on_epoch_begin(self, epoch, logs=None):
+        self.update_masks(self._sparsity_at(epoch))
+    
+    def on_train_batch_end(self, batch, logs=None):
+        self.apply_masks()
+
+
+class ModelOptimizer:
+    """훈련된 분류기 경량화기"""
+    
+    def __init__(self, learning_rate: float = 1e-5):
+        self.learning_rate = learning_rate
+    
+    @staticmethod
+    def _target_layers(model: keras.Model) -> List[layers.Layer]:
+        """가지치기/클러스터링 대상 레이어 (마지막 분류 레이어 제외)"""
+        candidates = [
+            layer for layer in _iter_layers(model)
+            if isinstance(layer, (layers.Conv2D, layers.Dense))
+            and int(np.prod(_kernel(layer).shape)) >= MIN_LAYER_PARAMS
+        ]
+        output_layer = model.layers[-1]
+        return [layer for layer in candidates if layer is not output_layer]
+    
+    @staticmethod
+    def _set_trainable(model: keras.Model):
+        """배치 정규화를 제외한 전체 레이어를 훈련 가능하게 설정"""
+        model.trainable = True
+        for layer in _iter_layers(model):
+            if isinstance(layer, layers.BatchNormalization):
+                layer.trainable = False
+    
+    def _compile(self, model: keras.Model):
+        model.compile(
+            optimizer=keras.optimizers.Adam(learning_rate=self.learning_rate),
+            loss='categorical_crossentropy',
+            metrics=['accuracy']
+        )
+    
+    @staticmethod
+    def _compress(model_path: str, gzip_path: str) -> int:
+        """모델 파일 gzip 압축 후 압축 크기 반환"""
+        with open(model_path, 'rb') as src, gzip.open(gzip_path, 'wb', compresslevel=9) as dst:
+            shutil.copyfileobj(src, dst)
+        return os.path.getsize(gzip_path)
+    
+    def _measure(self,
+                 model: keras.Model,
+                 model_path: str,
+                 validation_data,
+                 target_layers: List[layers.Layer],
+                 compressed_path: Optional[str] = None) -> Dict[str, Any]:
+        """파라미터 수, 크기, 지연 시간, 정확도 측정 (compressed_path가 없으면 압축본은 임시 파일)"""
+        total_params = int(model.count_params())
+        pruned_params = sum(int(np.sum(_kernel(layer).numpy() == 0)) for layer in target_layers)
+        
+        if compressed_path:
+            compressed_size = self._compress(model_path, compressed_path)
+        else:
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                compressed_size = self._compress(model_path, os.path.join(tmp_dir, 'model.h5.gz'))
+        
+        metrics = {
+            'params': total_params,
+            'nonzero_params': total_params - pruned_params,
+            'sparsity': round(pruned_params / total_params, 4) if total_params else 0.0,
+            'size_mb': round(os.path.getsize(model_path) / 1024 / 1024, 2),
+            'compressed_size_mb': round(compressed_size / 1024 / 1024, 2),
+            'latency_ms': round(measure_latency_ms(model, model.input_shape[1:]), 2)
+        }
+        if validation_data is not None:
+            metrics['accuracy'] = round(float(model.evaluate(validation_data, verbose=0, return_dict=True)['accuracy']), 4)
+        return metrics
+    
+    def optimize(self,
+                 model_path: str,
+                 data_dir: str,
+                 save_path: Optional[str] = None,
+                 target_sparsity: float = 0.5,
+                 n_clusters: Optional[int] = None,
+                 fine_tune_epochs: int = 2,
+                 manifest_path: Optional[str] = None) -> Dict[str, Any]:
+        """
+        가지치기(미세 조정으로 정확도 회복) 후 가중치 클러스터링
+        
+        저장된 모델의 텐서 크기는 그대로이므로 크기 절감은 압축본(<save_path>.gz)에만 해당합니다.
+        
+        Args:
+            model_path: 파인튜닝된 모델 경로 (.h5)
+            data_dir: 미세 조정/평가용 훈련 데이터 디렉토리
+            save_path: 경량화 모델 저장 경로 (기본값: <model_path>_optimized.h5)
+            target_sparsity: 목표 희소율 (0~1)
+            n_clusters: 레이어별 가중치 클러스터 수 (None이면 클러스터링 생략)
+            fine_tune_epochs: 정확도 회복용 미세 조정 에포크 수
+            manifest_path: 중복 제거 매니페스트 경로 (선택사항)
+        
+        Returns:
+            경량화 전후 비교 보고서 (compression_ratio는 압축본 크기 비율)
+        """
+        if not 0 <= target_sparsity < 1:
+            raise ValueError(f"목표 희소율은 0 이상 1 미만이어야 합니다: {target_sparsity}")
+        
+        if save_path is None:
+            save_path = model_path.replace('.h5', '_optimized.h5')
+        
+        classifier = RecyclingClassifier(model_path)
+        if classifier.model is None:
+            raise ValueError(f"모델을 찾을 수 없습니다: {model_path}")
+        model = classifier.model
+        
+        train_gen, val_gen = classifier.prepare_data(data_dir, manifest_path=manifest_path)
+        target_layers = self._target_layers(model)
+        
+        self._compile(model)
+        baseline = self._measure(model, model_path, val_gen, target_layers)
+        print(f"경량화 전: {baseline}")
+        
+        # 1. 점진적 가지치기 + 미세 조정
+        pruning = PruningCallback(target_layers, target_sparsity, fine_tune_epochs)
+        if target_sparsity > 0:
+            self._set_trainable(model)
+            self._compile(model)
+            model.fit(
+                train_gen,
+                epochs=fine_tune_epochs,
+                validation_data=val_gen,
+                callbacks=[pruning],
+                verbose=1
+            )
+            pruning.apply_masks()
+        
+        # 2. 가중치 클러스터링 (가지치기된 0은 유지)
+        if n_clusters:
+            for layer in target_layers:
+                kernel = _kernel(layer)
+                kernel.assign(cluster_weights(kernel.numpy(), n_clusters))
+        
+        # 3. 저장 및 측정
+        os.makedirs(os.path.dirname(save_path) or '.', exist_ok=True)
+        model.save(save_path)
+        class_info = {
+            'class_names': classifier.class_names,
+            'num_classes': classifier.num_classes
+        }
+        with open(save_path.replace('.h5', '_classes.json'), 'w', encoding='utf-8') as f:
+            json.dump(class_info, f, ensure_ascii=False, indent=2)
+        
+        optimized = self._measure(model, save_path, val_gen, target_layers, compressed_path=f"{save_path}.gz")
+        print(f"경량화 후: {optimized}")
+        
+        return {
+            'model_path': save_path,
+            'compressed_path': f"{save_path}.gz",
+            'target_sparsity': target_sparsity,
+            'n_clusters': n_clusters,
+            'optimized_layers': len(target_layers),
+            'baseline': baseline,
+            'optimized': optimized,
+            'accuracy_drop': round(baseline.get('accuracy', 0.0) - optimized.get('accuracy', 0.0), 4),
+            # 0이 된 가중치도 밀집 텐서에 그대로 저장되므로 절감은 압축본에만 해당
+            'savings_scope': 'compressed_artifact',
+            'compression_ratio': round(baseline['compressed_size_mb'] / optimized['compressed_size_mb'], 2)
+            if optimized['compressed_size_mb'] else None
+        }
@@ -3,13 +3,19 @@
 """
 import os
 import argparse
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Sequence, List
 from tensorflow.keras.callbacks import EarlyStopping, ReduceLROnPlateau
 from tensorflow.keras.optimizers import Adam
 
 from app.core.interfaces import IModelTrainer
 from app.models.recycling_classifier import RecyclingClassifier
 from app.core.data_processor import DataProcessor, DataQualityChecker
+from app.services.knowledge_distiller import KnowledgeDistiller, STUDENT_ARCHITECTURES
+from app.services.model_optimizer import ModelOptimizer
+from app.services.model_evaluator import ModelEvaluator, DEFAULT_BENCHMARK_BATCH_SIZES
+from app.models.classifier_backends import load_classifier
+from app.services.hyperparameter_search import HyperparameterSearch, load_head_config
+from app.services.training_profiler import TrainingProfiler
 
 
 class ModelTrainer(IModelTrainer):
@@ -19,14 +25,37 @@ class ModelTrainer(IModelTrainer):
         self.data_processor = DataProcessor()
         self.quality_checker = DataQualityChecker(self.data_processor)
     
-    def train(self, data_dir: str, epochs: int = 10, save_path: str = None) -> Dict[str, Any]:
-        """모델 훈련"""
+    def train(self,
+              data_dir: str,
+              epochs: int = 10,
+              save_path: str = None,
+              manifest_path: Optional[str] = None,
+              target_sparsity: Optional[float] = None,
+              n_clusters: Optional[int] = None,
+              head_config: Optional[Dict[str, Any]] = None,
+              callbacks: Optional[List[Any]] = None,
+              profile_dir: Optional[str] = None) -> Dict[str, Any]:
+        """
+        모델 훈련
+        
+        Args:
+            manifest_path: 중복 제거 매니페스트 경로 (선택사항)
+            target_sparsity: 지정하면 훈련 후 가지치기로 경량화 (0~1)
+            n_clusters: 지정하면 훈련 후 레이어별 가중치 클러스터링
+            head_config: 분류 헤드 하이퍼파라미터 (하이퍼파라미터 탐색 결과, 선택사항)
+            callbacks: 추가 Keras 콜백 (진행 상황 보고 등, 선택사항)
+            profile_dir: 지정하면 입력 파이프라인 프로파일(요약 + 트레이스)을 이 디렉토리에 저장
+        """
         if save_path is None:
             save_path = "models/recycling_classifier.h5"
         
         print(f"데이터 디렉토리: {data_dir}")
         print(f"에포크 수: {epochs}")
         print(f"모델 저장 경로: {save_path}")
+        if manifest_path:
+            print(f"데이터 매니페스트: {manifest_path}")
+        if head_config:
+            print(f"헤드 설정: {head_config}")
         
         # 데이터 디렉토리 확인
         if not os.path.exists(data_dir):
@@ -38,33 +67,228 @@ class ModelTrainer(IModelTrainer):
         
         # 분류기 생성
         classifier = RecyclingClassifier()
+        profiler = TrainingProfiler(profile_dir) if profile_dir else None
         
         # 모델 훈련
         print("모델 훈련을 시작합니다...")
-        history = classifier.fine_tune(
-            data_dir=data_dir,
-            epochs=epochs,
-            save_path=save_path
-        )
+        try:
+            history = classifier.fine_tune(
+                data_dir=data_dir,
+                epochs=epochs,
+                save_path=save_path,
+                manifest_path=manifest_path,
+                head_config=head_config,
+                callbacks=callbacks,
+                profiler=profiler
+            )
+        finally:
+            profile_report = profiler.finish() if profiler else None
         
         print("모델 훈련이 완료되었습니다!")
         print(f"최종 훈련 정확도: {history.history['accuracy'][-1]:.4f}")
         print(f"최종 검증 정확도: {history.history['val_accuracy'][-1]:.4f}")
         
-        return {
+        result = {
             'history': history,
             'quality_report': quality_report,
             'final_accuracy': history.history['accuracy'][-1],
             'final_val_accuracy': history.history['val_accuracy'][-1]
         }
+        
+        if profile_report:
+            print(f"입력 파이프라인 프로파일: 병목={profile_report['bottleneck']}, "
+                  f"입력 대기 비율={profile_report['input_wait_ratio']:.1%}, "
+                  f"스텝 평균 {profile_report['step_ms'].get('mean')}ms "
+                  f"(입력 대기 {profile_report['input_wait_ms'].get('mean')}ms)")
+            print(f"프로파일 보고서: {profile_report['report_path']}, 트레이스: {profile_report['trace_path']}")
+            result['profile_report'] = profile_report
+        
+        # 경량화 단계 (선택사항)
+        if target_sparsity or n_clusters:
+            result['optimization_report'] = self.optimize(
+                model_path=save_path,
+                data_dir=data_dir,
+                target_sparsity=target_sparsity or 0.0,
+                n_clusters=n_clusters,
+                manifest_path=manifest_path
+            )
+        
+        return result
+    
+    def optimize(self,
+                 model_path: str,
+                 data_dir: str,
+                 save_path: Optional[str] = None,
+                 target_sparsity: float = 0.5,
+                 n_clusters: Optional[int] = None,
+                 fine_tune_epochs: int = 2,
+                 manifest_path: Optional[str] = None) -> Dict[str, Any]:
+        """훈련된 모델 경량화 (가지치기 + 가중치 클러스터링, 크기 절감은 압축본 기준)"""
+        print(f"모델 경량화: {model_path} (목표 희소율: {target_sparsity}, 클러스터 수: {n_clusters})")
+        
+        optimizer = ModelOptimizer()
+        report = optimizer.optimize(
+            model_path=model_path,
+            data_dir=data_dir,
+            save_path=save_path,
+            target_sparsity=target_sparsity,
+            n_clusters=n_clusters,
+            fine_tune_epochs=fine_tune_epochs,
+            manifest_path=manifest_path
+        )
+        
+        print(f"경량화 모델 저장: {report['model_path']} (압축본: {report['compressed_path']})")
+        print(f"압축본 크기 (모델 파일/메모리 크기는 그대로): {report['baseline']['compressed_size_mb']}MB -> {report['optimized']['compressed_size_mb']}MB, "
+              f"정확도 하락: {report['accuracy_drop']:.4f}")
+        
+        return report
+    
+    def search_hyperparameters(self,
+                               data_dir: str,
+                               n_trials: int = 27,
+                               max_epochs: int = 27,
+                               eta: int = 3,
+                               max_workers: Optional[int] = None,
+                               manifest_path: Optional[str] = None,
+                               save_path: Optional[str] = None,
+                               output_dir: str = "models/search") -> Dict[str, Any]:
+        """
+        분류 헤드 하이퍼파라미터 탐색
+        
+        캐시된 백본 특징 위에서 헤드 설정들을 병렬로 학습하고 successive halving으로 약한 설정을 조기 종료합니다.
+        최고 헤드는 백본과 결합해 바로 배포 가능한 모델로 저장됩니다.
+        """
+        if save_path is None:
+            save_path = "models/recycling_classifier_tuned.h5"
+        
+        if not os.path.exists(data_dir):
+            raise ValueError(f"데이터 디렉토리가 존재하지 않습니다: {data_dir}")
+        
+        searcher = HyperparameterSearch(self.quality_checker, max_workers=max_workers)
+        report = searcher.search(
+            data_dir=data_dir,
+            n_trials=n_trials,
+            max_epochs=max_epochs,
+            eta=eta,
+            manifest_path=manifest_path,
+            output_dir=output_dir,
+            save_path=save_path
+        )
+        
+        best = report['best']
+        print(f"최고 설정: {best['config']} (검증 정확도: {best['val_accuracy']:.4f})")
+        print(f"리더보드: {report['leaderboard_path']}, 모델: {best['model_path']}")
+        print(f"총 {report['total_trial_epochs']} 헤드 에포크, {report['elapsed_sec']}초 소요")
+        
+        return report
     
-    def validate_model(self, validation_data: Any) -> Dict[str, Any]:
-        """모델 검증"""
-        # 모델 검증 로직 구현
-        pass
+    def distill(self,
+                teacher_model_path: str,
+                data_dir: str,
+                unlabeled_dir: Optional[str] = None,
+                epochs: int = 10,
+                save_path: str = None,
+                student_architecture: str = 'mobilenet_v3_small',
+                temperature: float = 4.0,
+                alpha: float = 0.3,
+                accuracy_budget: float = 0.02) -> Dict[str, Any]:
+        """
+        지식 증류 훈련
+        
+        teacher(EfficientNetV2-S)의 soft target으로 경량 student 모델을 학습합니다.
+        저장된 student는 RecyclingClassifier / InferenceService로 그대로 로드할 수 있습니다.
+        """
+        if save_path is None:
+            save_path = "models/recycling_classifier_student.h5"
+        
+        print(f"teacher 모델: {teacher_model_path}")
+        print(f"student 아키텍처: {student_architecture}")
+        print(f"데이터 디렉토리: {data_dir}")
+        if unlabeled_dir:
+            print(f"레이블 없는 데이터 디렉토리: {unlabeled_dir}")
+        
+        if not os.path.exists(data_dir):
+            raise ValueError(f"데이터 디렉토리가 존재하지 않습니다: {data_dir}")
+        
+        distiller = KnowledgeDistiller(self.quality_checker, temperature=temperature, alpha=alpha)
+        report = distiller.distill(
+            teacher_model_path=teacher_model_path,
+            data_dir=data_dir,
+            unlabeled_dir=unlabeled_dir,
+            epochs=epochs,
+            save_path=save_path,
+            student_architecture=student_architecture,
+            accuracy_budget=accuracy_budget
+        )
+        
+        print("지식 증류가 완료되었습니다!")
+        print(f"teacher 정확도: {report['teacher_accuracy']:.4f}, student 정확도: {report['student_accuracy']:.4f}")
+        print(f"지연 시간: {report['teacher_latency_ms']}ms -> {report['student_latency_ms']}ms "
+              f"({report['speedup']}배)")
+        
+        return report
+    
+    def validate_model(self,
+                       validation_data: Any,
+                       model_path: str = "models/recycling_classifier.h5",
+                       classifier: Optional[Any] = None,
+                       batch_size: int = 32,
+                       batch_sizes: Sequence[int] = DEFAULT_BENCHMARK_BATCH_SIZES,
+                       report_path: Optional[str] = None,
+                       min_accuracy: Optional[float] = None,
+                       max_latency_ms: Optional[float] = None,
+                       max_ece: Optional[float] = None) -> Dict[str, Any]:
+        """
+        모델 검증 (배포 판정용 보고서 생성)
+        
+        Args:
+            validation_data: 레이블된 디렉토리 또는 TFRecord 샤드 glob 패턴
+            model_path: 검증할 모델 경로 (.h5, .keras, .tflite, .onnx)
+            classifier: 이미 로드된 IImageClassifier (지정 시 model_path 무시)
+            batch_size: 평가 배치 크기
+            batch_sizes: 지연 시간/처리량을 측정할 배치 크기 목록
+            report_path: JSON 보고서 저장 경로 (선택사항)
+            min_accuracy: 배포 판정 최소 정확도
+            max_latency_ms: 배포 판정 최대 p95 지연 시간 (가장 작은 배치 크기 기준)
+            max_ece: 배포 판정 최대 기대 보정 오차
+        
+        Returns:
+            평가 보고서 ('metrics', 'performance', 'gate')
+        """
+        if classifier is None:
+            classifier = load_classifier(model_path)
+        
+        print(f"모델 검증: {model_path} ({type(classifier).__name__}) / 데이터: {validation_data}")
+        
+        evaluator = ModelEvaluator(classifier, batch_size=batch_size)
+        report = evaluator.run(
+            validation_data,
+            batch_sizes=batch_sizes,
+            report_path=report_path,
+            min_accuracy=min_accuracy,
+            max_latency_ms=max_latency_ms,
+            max_ece=max_ece,
+            model_path=model_path
+        )
+        
+        metrics = report['metrics']
+        print(f"정확도: {metrics['accuracy']:.4f}, macro F1: {metrics['macro_f1']:.4f}, "
+              f"ECE: {metrics['calibration']['ece']:.4f} ({metrics['num_images']}장)")
+        for size, perf in report['performance'].items():
+            print(f"배치 {size}: p95 {perf['latency_ms_p95']}ms, {perf['images_per_sec']}장/초")
+        print(f"배포 판정: {'통과' if report['gate']['passed'] else '실패'} {report['gate']['failures']}")
+        
+        return report
 
 
-def train_model(data_dir: str, epochs: int = 10, model_save_path: str = "models/recycling_classifier.h5"):
+def train_model(data_dir: str,
+                epochs: int = 10,
+                model_save_path: str = "models/recycling_classifier.h5",
+                manifest_path: Optional[str] = None,
+                target_sparsity: Optional[float] = None,
+                n_clusters: Optional[int] = None,
+                head_config: Optional[Dict[str, Any]] = None,
+                profile_dir: Optional[str] = None):
     """
     모델 훈련 함수 (기존 호환성 유지)
     
@@ -72,26 +296,103 @@ def train_model(data_dir: str, epochs: int = 10, model_save_path: str = "models/
         data_dir: 훈련 데이터가 있는 디렉토리 경로
         epochs: 훈련 에포크 수
         model_save_path: 모델 저장 경로
+        manifest_path: 중복 제거 매니페스트 경로 (선택사항)
+        target_sparsity: 훈련 후 경량화 목표 희소율 (선택사항)
+        n_clusters: 훈련 후 가중치 클러스터 수 (선택사항)
+        head_config: 분류 헤드 하이퍼파라미터 (선택사항)
+        profile_dir: 입력 파이프라인 프로파일 저장 디렉토리 (선택사항)
     """
     trainer = ModelTrainer()
-    result = trainer.train(data_dir, epochs, model_save_path)
+    result = trainer.train(
+        data_dir,
+        epochs,
+        model_save_path,
+        manifest_path=manifest_path,
+        target_sparsity=target_sparsity,
+        n_clusters=n_clusters,
+        head_config=head_config,
+        profile_dir=profile_dir
+    )
     return result['history']
 
 
 def main():
     """메인 함수"""
     parser = argparse.ArgumentParser(description='분리수거 품목 분류 모델 훈련')
+    parser.add_argument('--mode', type=str, default='train', choices=['train', 'distill', 'optimize', 'validate', 'search'], help='훈련 모드')
     parser.add_argument('--data_dir', type=str, required=True, help='훈련 데이터 디렉토리 경로')
     parser.add_argument('--epochs', type=int, default=10, help='훈련 에포크 수')
     parser.add_argument('--model_path', type=str, default='models/recycling_classifier.h5', help='모델 저장 경로')
+    parser.add_argument('--manifest', type=str, default=None, help='중복 제거 매니페스트 경로')
+    parser.add_argument('--teacher_path', type=str, default='models/recycling_classifier.h5', help='증류 teacher 모델 경로')
+    parser.add_argument('--unlabeled_dir', type=str, default=None, help='증류용 레이블 없는 이미지 디렉토리')
+    parser.add_argument('--student', type=str, default='mobilenet_v3_small', choices=STUDENT_ARCHITECTURES, help='student 아키텍처')
+    parser.add_argument('--target_sparsity', type=float, default=None, help='경량화 목표 희소율 (0~1)')
+    parser.add_argument('--clusters', type=int, default=None, help='경량화 가중치 클러스터 수')
+    parser.add_argument('--report_path', type=str, default=None, help='검증 보고서(JSON) 저장 경로')
+    parser.add_argument('--min_accuracy', type=float, default=None, help='검증 통과 최소 정확도')
+    parser.add_argument('--max_latency_ms', type=float, default=None, help='검증 통과 최대 p95 지연 시간 (배치 1)')
+    parser.add_argument('--trials', type=int, default=27, help='하이퍼파라미터 탐색 설정 수')
+    parser.add_argument('--workers', type=int, default=None, help='하이퍼파라미터 탐색 워커 프로세스 수')
+    parser.add_argument('--head_config', type=str, default=None, help='헤드 설정 JSON 또는 탐색 리더보드 경로')
+    parser.add_argument('--profile_dir', type=str, default=None, help='입력 파이프라인 프로파일 저장 디렉토리')
+    parser.add_argument('--batch_sizes', type=int, nargs='+', default=list(DEFAULT_BENCHMARK_BATCH_SIZES), help='속도 측정 배치 크기')
     
     args = parser.parse_args()
     
     try:
+        if args.mode == 'distill':
+            ModelTrainer().distill(
+                teacher_model_path=args.teacher_path,
+                data_dir=args.data_dir,
+                unlabeled_dir=args.unlabeled_dir,
+                epochs=args.epochs,
+                save_path=args.model_path,
+                student_architecture=args.student
+            )
+            return 0
+        
+        if args.mode == 'search':
+            ModelTrainer().search_hyperparameters(
+                data_dir=args.data_dir,
+                n_trials=args.trials,
+                max_epochs=args.epochs,
+                max_workers=args.workers,
+                manifest_path=args.manifest,
+                save_path=args.model_path
+            )
+            return 0
+        
+        if args.mode == 'validate':
+            report = ModelTrainer().validate_model(
+                args.data_dir,
+                model_path=args.model_path,
+                batch_sizes=args.batch_sizes,
+                report_path=args.report_path,
+                min_accuracy=args.min_accuracy,
+                max_latency_ms=args.max_latency_ms
+            )
+            return 0 if report['gate']['passed'] else 1
+        
+        if args.mode == 'optimize':
+            ModelTrainer().optimize(
+                model_path=args.model_path,
+                data_dir=args.data_dir,
+                target_sparsity=args.target_sparsity or 0.0,
+                n_clusters=args.clusters,
+                manifest_path=args.manifest
+            )
+            return 0
+        
         train_model(
             data_dir=args.data_dir,
             epochs=args.epochs,
-            model_save_path=args.model_path
+            model_save_path=args.model_path,
+            manifest_path=args.manifest,
+            target_sparsity=args.target_sparsity,
+            n_clusters=args.clusters,
+            head_config=load_head_config(args.head_config) if args.head_config else None,
+            profile_dir=args.profile_dir
         )
     except Exception as e:
         print(f"훈련 중 오류가 발생했습니다: {e}")
@@ -1,21 +1,28 @@
 """
 공공 API 서비스 - 분리수거 배출장소 정보 조회
 """
-import httpx
-import asyncio
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 from datetime import datetime
 import logging
 
+from app.core.geo import filter_by_distance
+from app.core.http_client import get_http_client, http_timeout
+from app.core.circuit_breaker import create_circuit_breaker
+from app.services.facility_cache import create_facility_cache
+
 logger = logging.getLogger(__name__)
 
 
 class PublicAPIService:
-    """공공 API 서비스"""
+    """공공 API 서비스 (앱 전체에서 하나의 인스턴스와 공유 HTTP 연결 풀 사용)"""
     
     def __init__(self):
         self.base_url = "http://apis.data.go.kr"
-        self.timeout = 30.0
+        self.timeout = http_timeout()
+        # 요청 경로 호출용 서킷 브레이커 (p95 기반 적응형 타임아웃, 상위 장애 시 즉시 실패)
+        self.breaker = create_circuit_breaker('public_api', 'PUBLIC_API_BREAKER')
+        # geohash 타일 단위 응답 캐시 (TTL, 백그라운드 갱신, 실패 캐시)
+        self.facility_cache = create_facility_cache(self._request_facilities)
         
     async def get_waste_facilities(self, 
                                  latitude: float, 
@@ -35,39 +42,39 @@ class PublicAPIService:
             배출장소 목록
         """
         try:
-            # 실제 공공 API 연동 (예시)
-            # 실제로는 공공데이터포털에서 발급받은 API 키 사용
-            facilities = await self._fetch_from_public_api(latitude, longitude, radius_km, waste_type)
-            
-            # 거리 계산 및 정렬
-            nearby_facilities = []
-            for facility in facilities:
-                distance = self._calculate_distance(
-                    latitude, longitude,
-                    facility.get('latitude', 0),
-                    facility.get('longitude', 0)
-                )
-                
-                if distance <= radius_km:
-                    facility['distance_km'] = round(distance, 2)
-                    nearby_facilities.append(facility)
-            
-            # 거리순 정렬
-            nearby_facilities.sort(key=lambda x: x['distance_km'])
-            
-            return nearby_facilities
+            # 반경을 덮는 타일을 캐시에서 조립 (거리 계산, 반경 필터링, 거리순 정렬 포함)
+            return await self.facility_cache.get_facilities(latitude, longitude, radius_km, waste_type)
             
         except Exception as e:
-            logger.error(f"공공 API 조회 중 오류 발생: {e}")
-            return []
+            logger.warning(f"공공 API 호출 실패, 샘플 데이터 사용: {e}")
+            return self._get_sample_data(latitude, longitude, radius_km)
+        
+    async def _request_facilities(self, 
+                                  latitude: float, 
+                                  longitude: float, 
+                                  radius_km: float,
+                                  waste_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        공공 API 호출 (오류 응답이나 호출 실패 시 예외 발생)
+        
+        캐시가 실패를 구분해 저장할 수 있도록 샘플 데이터로 대체하지 않습니다.
+        서킷 브레이커를 거치므로 회로가 열려 있으면 CircuitOpenError가 즉시 발생합니다.
+        상위 API가 영역/종류 조건을 지원하지 않아 첫 페이지를 받으므로, 타일 캐시는
+        한 조회의 빠진 타일을 모아 한 번만 호출합니다.
+        """
+        facilities, _ = await self.breaker.call(self.fetch_facility_page, page_no=1, num_rows=100)
+        return facilities
     
-    async def _fetch_from_public_api(self, 
-                                   latitude: float, 
-                                   longitude: float, 
-                                   radius_km: float,
-                                   waste_type: Optional[str] = None) -> List[Dict[str, Any]]:
-        """공공 API에서 데이터 조회"""
+    async def fetch_facility_page(self, page_no: int, num_rows: int) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        공공 API 전체 목록의 한 페이지 조회 (오류 응답이나 호출 실패 시 예외 발생)
+        
+        전체 동기화는 큰 페이지를 받으므로 요청 경로의 서킷 브레이커/적응형 타임아웃을
+        거치지 않고 HTTP 타임아웃만 적용됩니다.
         
+        Returns:
+            (페이지의 시설 목록, 전체 시설 수)
+        """
         # 실제 공공 API 연동 예시
         # 환경부 폐기물처리시설 정보 API 사용 예시
         api_url = f"{self.base_url}/B552584/RecycleInfoService/getRecycleInfo"
@@ -75,24 +82,17 @@ class PublicAPIService:
         params = {
             'serviceKey': 'YOUR_API_KEY',  # 실제 API 키로 교체 필요
             'type': 'json',
-            'numOfRows': 100,
-            'pageNo': 1
+            'numOfRows': num_rows,
+            'pageNo': page_no
         }
         
-        try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(api_url, params=params)
+        client = await get_http_client()
+        response = await client.get(api_url, params=params, timeout=self.timeout)
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    return self._parse_api_response(data)
-                else:
-                    logger.warning(f"공공 API 응답 오류: {response.status_code}")
-                    return self._get_sample_data(latitude, longitude, radius_km)
-                    
-        except Exception as e:
-            logger.warning(f"공공 API 호출 실패, 샘플 데이터 사용: {e}")
-            return self._get_sample_data(latitude, longitude, radius_km)
+        if response.status_code != 200:
+            raise ValueError(f"공공 API 응답 오류: {response.status_code}")
+        data = response.json()
+        return self._parse_api_response(data), self._parse_total_count(data)
     
     def _parse_api_response(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """API 응답 파싱"""
@@ -122,6 +122,13 @@ class PublicAPIService:
             logger.error(f"API 응답 파싱 오류: {e}")
             return []
     
+    def _parse_total_count(self, data: Dict[str, Any]) -> int:
+        """API 응답의 전체 건수 (없으면 0)"""
+        try:
+            return int(data.get('response', {}).get('body', {}).get('totalCount', 0) or 0)
+        except (TypeError, ValueError, AttributeError):
+            return 0
+    
     def _get_sample_data(self, latitude: float, longitude: float, radius_km: float) -> List[Dict[str, Any]]:
         """샘플 데이터 반환 (API 연동 실패 시)"""
         # 서울시 주요 분리수거 배출장소 샘플 데이터
@@ -168,36 +175,7 @@ class PublicAPIService:
         ]
         
         # 사용자 위치 기준으로 거리 계산하여 반환
-        nearby_facilities = []
-        for facility in sample_facilities:
-            distance = self._calculate_distance(
-                latitude, longitude,
-                facility['latitude'], facility['longitude']
-            )
-            
-            if distance <= radius_km:
-                facility['distance_km'] = round(distance, 2)
-                nearby_facilities.append(facility)
-        
-        return nearby_facilities
-    
-    def _calculate_distance(self, lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-        """두 지점 간의 거리 계산 (km)"""
-        import math
-        
-        R = 6371  # 지구 반지름 (km)
-        
-        dlat = math.radians(lat2 - lat1)
-        dlon = math.radians(lon2 - lon1)
-        
-        a = (math.sin(dlat/2) * math.sin(dlat/2) + 
-             math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * 
-             math.sin(dlon/2) * math.sin(dlon/2))
-        
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-        distance = R * c
-        
-        return distance
+        return filter_by_distance(sample_facilities, latitude, longitude, radius_km)
     
     async def get_waste_type_info(self) -> Dict[str, Any]:
         """쓰레기 종류별 정보 조회"""
@@ -0,0 +1,420 @@
+"""
+분리수거 배출 장소 인메모리 공간 인덱스
+
+활성 RecyclingLocation 행을 위경도 격자(grid)에 쓰레기 종류별로 나누어 보관합니다.
+k-최근접 / 반경 검색은 질의 지점 주변 셀부터 고리(ring) 단위로 넓혀 가며 탐색하고,
+아직 보지 않은 셀까지의 최소 거리(하한)가 현재 결과보다 멀어지면 멈추므로
+결과는 전체 탐색과 동일(정확)합니다.
+"""
+import math
+import os
+import heapq
+import threading
+from typing import List, Dict, Optional, Tuple, Iterable, Any
+
+from sqlalchemy.orm import Session
+
+from app.core.geo import EARTH_RADIUS_KM, haversine_km
+from app.models.location import RecyclingLocation
+
+
+ALL_WASTE_TYPES = '*'
+DEFAULT_CELL_DEGREES = 0.05  # 위도 방향 약 5.5km
+
+Point = Tuple[float, float]
+Cell = Tuple[int, int]
+
+
+def parse_waste_types(waste_types: Any) -> Tuple[str, ...]:
+    """콤마 구분 문자열/리스트를 쓰레기 종류 튜플로 변환"""
+    if not waste_types:
+        return ()
+    if isinstance(waste_types, str):
+        waste_types = waste_types.split(',')
+    return tuple(sorted({w.strip().lower() for w in waste_types if w and w.strip()}))
+
+
+class LocationSpatialIndex:
+    """쓰레기 종류별 위경도 격자 인덱스 (스레드 안전)"""
+    
+    def __init__(self, cell_degrees: float = DEFAULT_CELL_DEGREES):
+        if cell_degrees <= 0 or cell_degrees > 10:
+            raise ValueError("cell_degrees는 0보다 크고 10 이하여야 합니다")
+        
+        self.cell_degrees = cell_degrees
+        self.n_lat_cells = int(math.ceil(180.0 / cell_degrees))
+        self.n_lon_cells = int(math.ceil(360.0 / cell_degrees))
+        
+        self._lock = threading.RLock()
+        # 적재가 끝나기를 기다리는 호출자를 깨우는 조건 변수
+        self._load_done = threading.Condition(self._lock)
+        self._points: Dict[int, Tuple[float, float, Tuple[str, ...]]] = {}
+        self._grids: Dict[str, Dict[Cell, Dict[int, Point]]] = {}
+        self._loaded = False
+        self._loading = False
+        self._pending: List[Tuple[str, tuple]] = []
+    
+    # ------------------------------------------------------------------
+    # 적재 / 증분 갱신
+    # ------------------------------------------------------------------
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded
+    
+    def __len__(self) -> int:
+        return len(self._points)
+    
+    def ensure_loaded(self, db_session: Session, wait: bool = True) -> bool:
+        """
+        처음 사용할 때 DB의 활성 배출 장소로 인덱스 구성 (적재 완료 여부 반환)
+        
+        다른 호출자가 적재 중이면 wait=True일 때 적재가 끝날 때까지 기다리고
+        (적재가 실패하면 직접 다시 적재), wait=False이면 바로 False를 반환합니다.
+        이벤트 루프 스레드에서는 적재 중인 코루틴을 막지 않도록 wait=False로 호출하고
+        False이면 SQL 조회로 대신합니다.
+        """
+        if self._loaded:
+            return True
+        with self._lock:
+            while self._loading:
+                if not wait:
+                    return False
+                self._load_done.wait()
+            if self._loaded:
+                return True
+            self._loading = True
+        
+        try:
+            rows = (
+                db_session.query(
+                    RecyclingLocation.id,
+                    RecyclingLocation.latitude,
+                    RecyclingLocation.longitude,
+                    RecyclingLocation.waste_types
+                )
+                .filter(RecyclingLocation.is_active == True)
+                .yield_per(10000)
+            )
+            self.rebuild(rows)
+        finally:
+            with self._lock:
+                self._loading = False
+                self._load_done.notify_all()
+        return self._loaded
+    
+    def rebuild(self, rows: Iterable[Tuple[int, float, float, Any]]) -> int:
+        """(id, 위도, 경도, 쓰레기 종류) 행 전체로 인덱스를 새로 만들고 교체"""
+        points: Dict[int, Tuple[float, float, Tuple[str, ...]]] = {}
+        grids: Dict[str, Dict[Cell, Dict[int, Point]]] = {}
+        for location_id, latitude, longitude, waste_types in rows:
+            entry = (float(latitude), float(longitude), parse_waste_types(waste_types))
+            points[location_id] = entry
+            self._insert(grids, location_id, entry)
+        
+        with self._lock:
+            self._points = points
+            self._grids = grids
+            self._loaded = True
+            # 적재 중 들어온 쓰기는 적재 결과 위에 다시 적용
+            pending, self._pending = self._pending, []
+            for operation, args in pending:
+                getattr(self, operation)(*args)
+        return len(points)
+    
+    def upsert(self, location_id: int, latitude: float, longitude: float,
+               waste_types: Any, is_active: bool = True) -> None:
+        """배출 장소 추가/수정 (비활성이면 제거)"""
+        with self._lock:
+            if self._loading:
+                self._pending.append(('upsert', (location_id, latitude, longitude, waste_types, is_active)))
+                return
+            if not self._loaded:
+                return  # 적재 시점에 DB에서 읽어 옴
+            
+            self._remove(location_id)
+            if is_active and latitude is not None and longitude is not None:
+                entry = (float(latitude), float(longitude), parse_waste_types(waste_types))
+                self._points[location_id] = entry
+                self._insert(self._grids, location_id, entry)
+    
+    def upsert_location(self, location: RecyclingLocation) -> None:
+        """RecyclingLocation 엔티티로 인덱스 갱신"""
+        self.upsert(location.id, location.latitude, location.longitude,
+                    location.waste_types, location.is_active is not False)
+    
+    def remove(self, location_id: int) -> None:
+        """배출 장소 제거"""
+        with self._lock:
+            if self._loading:
+                self._pending.append(('remove', (location_id,)))
+                return
+            self._remove(location_id)
+    
+    def _insert(self, grids: Dict[str, Dict[Cell, Dict[int, Point]]],
+                location_id: int, entry: Tuple[float, float, Tuple[str, ...]]) -> None:
+        latitude, longitude, waste_types = entry
+        cell = self._cell(latitude, longitude)
+        for key in (ALL_WASTE_TYPES,) + waste_types:
+            grids.setdefault(key, {}).setdefault(cell, {})[location_id] = (latitude, longitude)
+    
+    def _remove(self, location_id: int) -> None:
+        entry = self._points.pop(location_id, None)
+        if entry is None:
+            return
+        latitude, longitude, waste_types = entry
+        cell = self._cell(latitude, longitude)
+        for key in (ALL_WASTE_TYPES,) + waste_types:
+            grid = self._grids.get(key)
+            if grid is None or cell not in grid:
+                continue
+            grid[cell].pop(location_id, None)
+            if not grid[cell]:
+                del grid[cell]
+    
+    # ------------------------------------------------------------------
+    # 질의
+    # ------------------------------------------------------------------
+    def nearest(self, latitude: float, longitude: float, k: int = 10,
+                waste_type: Optional[str] = None,
+                max_distance_km: Optional[float] = None) -> List[Tuple[int, float]]:
+        """
+        k-최근접 배출 장소
+        
+        Returns:
+            거리순 (location_id, distance_km) 목록
+        """
+        if k <= 0:
+            return []
+        with self._lock:
+            grid = self._grids.get(self._grid_key(waste_type))
+            if not grid:
+                return []
+            
+            ci, cj = self._cell(latitude, longitude)
+            heap: List[Tuple[float, int]] = []  # (-거리, id) 최대 힙
+            
+            def consider(cell_points: Dict[int, Point]):
+                for location_id, (lat, lon) in cell_points.items():
+                    distance = haversine_km(latitude, longitude, lat, lon)
+                    if max_distance_km is not None and distance > max_distance_km:
+                        continue
+                    if len(heap) < k:
+                        heapq.heappush(heap, (-distance, location_id))
+                    elif distance < -heap[0][0]:
+                        heapq.heapreplace(heap, (-distance, location_id))
+            
+            ring = 0
+            while True:
+                # 고리가 점유 셀 수보다 커지면 점유 셀 전체를 보는 편이 빠름
+                if (2 * ring + 1) ** 2 > len(grid) or 2 * ring + 1 >= self.n_lon_cells:
+                    heap = []
+                    for cell_points in grid.values():
+                        consider(cell_points)
+                    break
+                
+                for cell in self._ring_cells(ci, cj, ring):
+                    cell_points = grid.get(cell)
+                    if cell_points:
+                        consider(cell_points)
+                
+                bound = self._unvisited_lower_bound_km(latitude, longitude, ci, cj, ring)
+                if max_distance_km is not None and bound > max_distance_km:
+                    break
+                if len(heap) == k and -heap[0][0] <= bound:
+                    break
+                ring += 1
+            
+            return sorted(((location_id, -d) for d, location_id in heap), key=lambda x: x[1])
+    
+    def within_radius(self, latitude: float, longitude: float, radius_km: float,
+                      waste_type: Optional[str] = None,
+                      limit: Optional[int] = None) -> List[Tuple[int, float]]:
+        """
+        반경 내 배출 장소 (거리순)
+        
+        Returns:
+            거리순 (location_id, distance_km) 목록
+        """
+        if radius_km < 0:
+            return []
+        if limit is not None:
+            return self.nearest(latitude, longitude, limit, waste_type, max_distance_km=radius_km)
+        
+        with self._lock:
+            grid = self._grids.get(self._grid_key(waste_type))
+            if not grid:
+                return []
+            
+            cells = self._cover_cells(latitude, longitude, radius_km)
+            if cells is None or len(cells) > len(grid):
+                candidates = grid.values()
+            else:
+                candidates = [grid[cell] for cell in cells if cell in grid]
+            
+            results = []
+            for cell_points in candidates:
+                for location_id, (lat, lon) in cell_points.items():
+                    distance = haversine_km(latitude, longitude, lat, lon)
+                    if distance <= radius_km:
+                        results.append((location_id, distance))
+            results.sort(key=lambda x: x[1])
+            return results
+    
+    def within_radius_by_type(self, latitude: float, longitude: float, radius_km: float,
+                              waste_types: List[str], limit: int) -> Dict[str, List[Tuple[int, float]]]:
+        """
+        여러 쓰레기 종류의 반경 내 배출 장소 (종류별 거리순 최대 limit개)
+        
+        종류별 격자를 따로 탐색하지 않고 전체 격자를 nearest와 같은 고리 순서로 한 번만 탐색해
+        장소마다 거리를 한 번 계산하고, 받는 종류별 힙에 나눠 담습니다. 모든 종류가 limit개를
+        채우고 아직 보지 않은 셀이 그보다 멀거나, 반경을 벗어나면 멈춥니다.
+        
+        Returns:
+            {쓰레기 종류: 거리순 (location_id, distance_km) 목록}
+        """
+        keys = {waste_type: self._grid_key(waste_type) for waste_type in waste_types}
+        heaps: Dict[str, List[Tuple[float, int]]] = {key: [] for key in keys.values()}  # (-거리, id) 최대 힙
+        if limit <= 0 or radius_km < 0 or not heaps:
+            return {waste_type: [] for waste_type in waste_types}
+        
+        with self._lock:
+            grid = self._grids.get(ALL_WASTE_TYPES)
+            if grid:
+                ci, cj = self._cell(latitude, longitude)
+                
+                def consider(cell_points: Dict[int, Point]):
+                    for location_id, (lat, lon) in cell_points.items():
+                        distance = None
+                        for key in self._points[location_id][2]:
+                            heap = heaps.get(key)
+                            if heap is None:
+                                continue
+                            if distance is None:
+                                distance = haversine_km(latitude, longitude, lat, lon)
+                                if distance > radius_km:
+                                    break
+                            if len(heap) < limit:
+                                heapq.heappush(heap, (-distance, location_id))
+                            elif distance < -heap[0][0]:
+                                heapq.heapreplace(heap, (-distance, location_id))
+                
+                ring = 0
+                while True:
+                    # 고리가 점유 셀 수보다 커지면 점유 셀 전체를 보는 편이 빠름
+                    if (2 * ring + 1) ** 2 > len(grid) or 2 * ring + 1 >= self.n_lon_cells:
+                        for heap in heaps.values():
+                            heap.clear()
+                        for cell_points in grid.values():
+                            consider(cell_points)
+                        break
+                    
+                    for cell in self._ring_cells(ci, cj, ring):
+                        cell_points = grid.get(cell)
+                        if cell_points:
+                            consider(cell_points)
+                    
+                    bound = self._unvisited_lower_bound_km(latitude, longitude, ci, cj, ring)
+                    if bound > radius_km:
+                        break
+                    if all(len(heap) == limit and -heap[0][0] <= bound for heap in heaps.values()):
+                        break
+                    ring += 1
+        
+        return {
+            waste_type: sorted(((location_id, -d) for d, location_id in heaps[key]), key=lambda x: x[1])
+            for waste_type, key in keys.items()
+        }
+    
+    def stats(self) -> Dict[str, Any]:
+        """인덱스 상태"""
+        with self._lock:
+            return {
+                'loaded': self._loaded,
+                'locations': len(self._points),
+                'cell_degrees': self.cell_degrees,
+                'waste_types': {
+                    key: sum(len(points) for points in grid.values())
+                    for key, grid in self._grids.items() if key != ALL_WASTE_TYPES
+                },
+                'occupied_cells': len(self._grids.get(ALL_WASTE_TYPES, {}))
+            }
+    
+    # ------------------------------------------------------------------
+    # 격자 계산
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _grid_key(waste_type: Optional[str]) -> str:
+        return waste_type.strip().lower() if waste_type else ALL_WASTE_TYPES
+    
+    def _cell(self, latitude: float, longitude: float) -> Cell:
+        i = int((latitude + 90.0) // self.cell_degrees)
+        j = int((longitude + 180.0) // self.cell_degrees)
+        return min(max(i, 0), self.n_lat_cells - 1), j % self.n_lon_cells
+    
+    def _ring_cells(self, ci: int, cj: int, ring: int) -> List[Cell]:
+        """(ci, cj)에서 체비쇼프 거리 ring 인 셀 목록"""
+        if ring == 0:
+            return [(ci, cj)]
+        cells = []
+        for di in range(-ring, ring + 1):
+            i = ci + di
+            if i < 0 or i >= self.n_lat_cells:
+                continue
+            if abs(di) == ring:
+                offsets = range(-ring, ring + 1)
+            else:
+                offsets = (-ring, ring)
+            for dj in offsets:
+                cells.append((i, (cj + dj) % self.n_lon_cells))
+        return cells
+    
+    def _unvisited_lower_bound_km(self, latitude: float, longitude: float,
+                                  ci: int, cj: int, ring: int) -> float:
+        """ring 까지 탐색한 상자 밖 임의 지점까지의 최소 거리 (km)"""
+        c = self.cell_degrees
+        lat_lo = (ci - ring) * c - 90.0
+        lat_hi = (ci + ring + 1) * c - 90.0
+        lon_lo = (cj - ring) * c - 180.0
+        lon_hi = (cj + ring + 1) * c - 180.0
+        
+        bounds = []
+        if lat_lo > -90.0:
+            bounds.append(math.radians(latitude - lat_lo) * EARTH_RADIUS_KM)
+        if lat_hi < 90.0:
+            bounds.append(math.radians(lat_hi - latitude) * EARTH_RADIUS_KM)
+        
+        # 자오선(경도 고정 대원)까지의 거리: asin(cos(lat) * sin(dlon))
+        dlon = min(longitude - lon_lo, lon_hi - longitude, 90.0)
+        bounds.append(
+            math.asin(min(1.0, math.cos(math.radians(latitude)) * math.sin(math.radians(dlon))))
+            * EARTH_RADIUS_KM
+        )
+        return min(bounds)
+    
+    def _cover_cells(self, latitude: float, longitude: float,
+                     radius_km: float) -> Optional[List[Cell]]:
+        """반경 원을 덮는 셀 목록 (극/전 경도를 덮으면 None)"""
+        angular = radius_km / EARTH_RADIUS_KM
+        dlat = math.degrees(angular)
+        if latitude + dlat >= 90.0 or latitude - dlat <= -90.0 or angular >= math.pi / 2:
+            return None
+        
+        # 구면 캡의 최대 경도 폭
+        dlon = math.degrees(math.asin(min(1.0, math.sin(angular) / math.cos(math.radians(latitude)))))
+        i_lo, _ = self._cell(latitude - dlat, longitude)
+        i_hi, _ = self._cell(latitude + dlat, longitude)
+        j_lo = int((longitude - dlon + 180.0) // self.cell_degrees)
+        j_hi = int((longitude + dlon + 180.0) // self.cell_degrees)
+        if j_hi - j_lo + 1 >= self.n_lon_cells:
+            return None
+        
+        return [
+            (i, j % self.n_lon_cells)
+            for i in range(i_lo, i_hi + 1)
+            for j in range(j_lo, j_hi + 1)
+        ]
+
+
+def create_location_index() -> LocationSpatialIndex:
+    """환경 변수(LOCATION_INDEX_CELL_DEGREES)로 셀 크기를 정해 인덱스 생성"""
+    return LocationSpatialIndex(float(os.getenv("LOCATION_INDEX_CELL_DEGREES", str(DEFAULT_CELL_DEGREES))))
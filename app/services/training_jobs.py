@@ -0,0 +1,435 @@
+"""
+훈련 작업 실행기 - 서빙 프로세스와 분리된 백그라운드 훈련
+
+훈련은 spawn으로 만든 별도 프로세스에서 실행되며, 서빙용 CPU 코어를 피하도록 CPU 친화도를 고정하고
+메모리 한도(RLIMIT_AS)와 낮은 우선순위(nice)를 적용합니다. 에포크별 진행 상황은 큐로 전달되고,
+완료된 모델은 아티팩트로 등록되어 추론 서비스에 무중단으로 교체할 수 있습니다.
+
+작업마다 진행 상황 큐와 취소 이벤트를 따로 둡니다. 취소는 이벤트로 요청해 훈련 프로세스가 다음 배치에서
+스스로 멈추게 하고, 정리 시간(cancel_grace_seconds)이 지나도 끝나지 않을 때만 강제 종료합니다.
+큐에 쓰는 중에 강제 종료되어 큐가 손상되더라도 해당 작업의 큐만 영향을 받습니다.
+종료된 프로세스의 join은 API 요청이 아닌 수신 스레드에서 잠금 밖에서 수행합니다.
+"""
+import os
+import time
+import uuid
+import queue
+import threading
+import traceback
+import multiprocessing
+from datetime import datetime
+from typing import List, Dict, Optional, Any, Callable, Tuple
+
+
+# 작업 상태
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_COMPLETED = 'completed'
+JOB_FAILED = 'failed'
+JOB_CANCELLED = 'cancelled'
+FINISHED_STATES = (JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED)
+
+CANCEL_GRACE_SECONDS = 10.0  # 취소 요청 후 강제 종료까지 기다리는 시간
+POLL_INTERVAL = 0.2  # 진행 상황 큐 확인 주기(초)
+
+
+class TrainingCancelled(Exception):
+    """취소 요청으로 훈련 중단 (훈련 프로세스 안에서만 사용)"""
+
+
+def _limit_resources(cpu_cores: Optional[List[int]], memory_limit_mb: Optional[int], nice: int):
+    """훈련 프로세스 자원 제한 (지원하지 않는 플랫폼에서는 건너뜀)"""
+    if cpu_cores and hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, cpu_cores)
+        
+        # TF/BLAS 스레드 풀을 할당된 코어 수에 맞춤 (TF 임포트 전에 설정해야 적용됨)
+        threads = str(len(cpu_cores))
+        os.environ['OMP_NUM_THREADS'] = threads
+        os.environ['TF_NUM_INTRAOP_THREADS'] = threads
+        os.environ['TF_NUM_INTEROP_THREADS'] = '1'
+    
+    if memory_limit_mb:
+        try:
+            import resource
+            limit = memory_limit_mb * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except (ImportError, ValueError, OSError) as e:
+            print(f"메모리 한도 설정 실패: {e}")
+    
+    if nice and hasattr(os, 'nice'):
+        os.nice(nice)
+
+
+def _run_training_job(job_id: str,
+                      params: Dict[str, Any],
+                      progress_queue,
+                      stop_event,
+                      cpu_cores: Optional[List[int]],
+                      memory_limit_mb: Optional[int],
+                      nice: int):
+    """훈련 프로세스 진입점 (spawn 프로세스에서 실행)"""
+    _limit_resources(cpu_cores, memory_limit_mb, nice)
+    
+    try:
+        from tensorflow import keras
+        from app.services.model_trainer import ModelTrainer
+        
+        if stop_event.is_set():
+            raise TrainingCancelled()
+        
+        class ProgressReporter(keras.callbacks.Callback):
+            """에포크 종료마다 지표를 부모 프로세스로 전달하고, 취소 요청이 있으면 배치 사이에서 중단"""
+            
+            def on_train_batch_end(self, batch, logs=None):
+                if stop_event.is_set():
+                    raise TrainingCancelled()
+            
+            def on_epoch_end(self, epoch, logs=None):
+                progress_queue.put({
+                    'job_id': job_id,
+                    'type': 'epoch',
+                    'epoch': epoch + 1,
+                    'metrics': {key: float(value) for key, value in (logs or {}).items()}
+                })
+        
+        result = ModelTrainer().train(
+            data_dir=params['data_dir'],
+            epochs=params['epochs'],
+            save_path=params['save_path'],
+            manifest_path=params.get('manifest_path'),
+            head_config=params.get('head_config'),
+            callbacks=[ProgressReporter()]
+        )
+        progress_queue.put({
+            'job_id': job_id,
+            'type': JOB_COMPLETED,
+            'result': {
+                'final_accuracy': float(result['final_accuracy']),
+                'final_val_accuracy': float(result['final_val_accuracy']),
+                'epochs_trained': len(result['history'].history['accuracy'])
+            }
+        })
+    except BaseException as e:
+        if stop_event.is_set():
+            # 부모는 이미 작업을 취소 상태로 바꾸고 이 큐를 더 읽지 않으므로 보내지 못한 메시지를 기다리지 않고 종료
+            progress_queue.cancel_join_thread()
+            return
+        progress_queue.put({
+            'job_id': job_id,
+            'type': JOB_FAILED,
+            'error': f"{type(e).__name__}: {e}",
+            'traceback': traceback.format_exc()
+        })
+
+
+def default_training_cores(reserved_cores: Optional[int] = None) -> Optional[List[int]]:
+    """
+    훈련용 CPU 코어 목록
+    
+    사용 가능한 코어 중 앞쪽 reserved_cores개(기본값: 절반, 최소 1개)는 서빙용으로 남깁니다.
+    코어가 1개뿐이거나 친화도를 지원하지 않으면 None을 반환합니다.
+    """
+    if not hasattr(os, 'sched_getaffinity'):
+        return None
+    cores = sorted(os.sched_getaffinity(0))
+    if len(cores) < 2:
+        return None
+    if reserved_cores is None:
+        reserved_cores = max(1, len(cores) // 2)
+    reserved_cores = min(max(reserved_cores, 1), len(cores) - 1)
+    return cores[reserved_cores:]
+
+
+class TrainingJobManager:
+    """백그라운드 훈련 작업 관리자 (제출/상태/취소)"""
+    
+    def __init__(self,
+                 max_concurrent_jobs: int = 1,
+                 cpu_cores: Optional[List[int]] = None,
+                 memory_limit_mb: Optional[int] = None,
+                 nice: int = 10,
+                 artifact_dir: str = "models/jobs",
+                 on_artifact: Optional[Callable[[str], Dict[str, Any]]] = None,
+                 cancel_grace_seconds: float = CANCEL_GRACE_SECONDS):
+        self.max_concurrent_jobs = max_concurrent_jobs
+        self.cpu_cores = cpu_cores if cpu_cores is not None else default_training_cores()
+        self.memory_limit_mb = memory_limit_mb
+        self.nice = nice
+        self.artifact_dir = artifact_dir
+        self.on_artifact = on_artifact
+        self.cancel_grace_seconds = cancel_grace_seconds
+        
+        self._context = multiprocessing.get_context('spawn')
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        # 실행 중인 작업별 프로세스/진행 상황 큐/취소 이벤트
+        self._runs: Dict[str, Dict[str, Any]] = {}
+        # 끝났지만 아직 join하지 않은 작업 (작업 ID, 실행 정보, 강제 종료 시각)
+        self._exiting: List[Tuple[str, Dict[str, Any], float]] = []
+        self._lock = threading.RLock()
+        self._monitor = None
+        self._stopped = threading.Event()
+    
+    def _ensure_monitor(self):
+        """진행 상황 수신 스레드 시작"""
+        if self._monitor is None or not self._monitor.is_alive():
+            self._stopped.clear()
+            self._monitor = threading.Thread(target=self._monitor_loop, name='training-job-monitor', daemon=True)
+            self._monitor.start()
+    
+    @staticmethod
+    def _public(job: Dict[str, Any]) -> Dict[str, Any]:
+        """외부 노출용 작업 정보 (내부 필드 제외)"""
+        return {key: value for key, value in job.items() if not key.startswith('_')}
+    
+    def submit(self,
+               data_dir: str,
+               epochs: int = 10,
+               manifest_path: Optional[str] = None,
+               head_config: Optional[Dict[str, Any]] = None,
+               auto_reload: bool = False) -> Dict[str, Any]:
+        """
+        훈련 작업 제출
+        
+        Args:
+            data_dir: 훈련 데이터 디렉토리
+            epochs: 훈련 에포크 수
+            manifest_path: 중복 제거 매니페스트 경로 (선택사항)
+            head_config: 분류 헤드 하이퍼파라미터 (선택사항)
+            auto_reload: 완료 후 추론 서비스 모델을 자동 교체할지 여부
+        
+        Returns:
+            작업 정보
+        """
+        if not os.path.exists(data_dir):
+            raise ValueError(f"데이터 디렉토리가 존재하지 않습니다: {data_dir}")
+        if epochs < 1:
+            raise ValueError(f"에포크 수는 1 이상이어야 합니다: {epochs}")
+        
+        job_id = uuid.uuid4().hex[:12]
+        job = {
+            'job_id': job_id,
+            'status': JOB_QUEUED,
+            'params': {
+                'data_dir': data_dir,
+                'epochs': epochs,
+                'manifest_path': manifest_path,
+                'head_config': head_config,
+                'save_path': os.path.join(self.artifact_dir, job_id, 'recycling_classifier.h5')
+            },
+            'auto_reload': auto_reload,
+            'created_at': datetime.utcnow().isoformat(),
+            'started_at': None,
+            'finished_at': None,
+            'current_epoch': 0,
+            'progress': [],
+            'result': None,
+            'artifact': None,
+            'deployment': None,
+            'error': None
+        }
+        
+        with self._lock:
+            self._jobs[job_id] = job
+            self._ensure_monitor()
+            self._start_queued_jobs()
+            return self._public(job)
+    
+    def _start_queued_jobs(self):
+        """동시 실행 한도 내에서 대기 작업 시작"""
+        running = sum(1 for job in self._jobs.values() if job['status'] == JOB_RUNNING)
+        for job in sorted(self._jobs.values(), key=lambda j: j['created_at']):
+            if running >= self.max_concurrent_jobs:
+                break
+            if job['status'] != JOB_QUEUED:
+                continue
+            
+            progress_queue = self._context.Queue()
+            stop_event = self._context.Event()
+            process = self._context.Process(
+                target=_run_training_job,
+                args=(job['job_id'], job['params'], progress_queue, stop_event,
+                      self.cpu_cores, self.memory_limit_mb, self.nice),
+                name=f"training-{job['job_id']}",
+                daemon=True
+            )
+            process.start()
+            self._runs[job['job_id']] = {'process': process, 'queue': progress_queue, 'stop_event': stop_event}
+            job['status'] = JOB_RUNNING
+            job['started_at'] = datetime.utcnow().isoformat()
+            job['pid'] = process.pid
+            running += 1
+    
+    def _finish(self, job: Dict[str, Any], status: str):
+        """작업 종료 처리 (프로세스 정리는 수신 스레드가 잠금 밖에서 수행)"""
+        job['status'] = status
+        job['finished_at'] = datetime.utcnow().isoformat()
+        run = self._runs.pop(job['job_id'], None)
+        if run is not None:
+            if status == JOB_CANCELLED:
+                run['stop_event'].set()
+            self._exiting.append((job['job_id'], run, time.monotonic() + self.cancel_grace_seconds))
+    
+    def _handle_message(self, message: Dict[str, Any]) -> bool:
+        """훈련 프로세스 메시지 처리 (자동 배포가 필요하면 True)"""
+        job = self._jobs.get(message['job_id'])
+        if job is None or job['status'] in FINISHED_STATES:
+            return False
+        
+        if message['type'] == 'epoch':
+            job['current_epoch'] = message['epoch']
+            job['progress'].append({
+                'epoch': message['epoch'],
+                'metrics': message['metrics'],
+                'timestamp': datetime.utcnow().isoformat()
+            })
+        elif message['type'] == JOB_COMPLETED:
+            job['result'] = message['result']
+            job['artifact'] = job['params']['save_path']
+            self._finish(job, JOB_COMPLETED)
+            return job['auto_reload']
+        elif message['type'] == JOB_FAILED:
+            job['error'] = message['error']
+            print(f"훈련 작업 실패 ({job['job_id']}): {message['traceback']}")
+            self._finish(job, JOB_FAILED)
+        return False
+    
+    def _check_processes(self):
+        """메시지 없이 종료된 프로세스(메모리 한도 초과 등) 처리"""
+        for job_id, run in list(self._runs.items()):
+            job = self._jobs[job_id]
+            process = run['process']
+            # 종료 전에 보낸 메시지가 큐에 남아 있으면 다음 확인에서 처리
+            if not process.is_alive() and run['queue'].empty() and job['status'] == JOB_RUNNING:
+                job['error'] = f"훈련 프로세스가 비정상 종료되었습니다 (exit code: {process.exitcode})"
+                self._finish(job, JOB_FAILED)
+    
+    @staticmethod
+    def _drain(progress_queue) -> List[Dict[str, Any]]:
+        """큐에 쌓인 메시지를 기다리지 않고 모두 꺼냄"""
+        messages = []
+        while True:
+            try:
+                messages.append(progress_queue.get_nowait())
+            except queue.Empty:
+                return messages
+    
+    def _reap(self, force: bool = False):
+        """
+        끝난 작업의 프로세스 정리 (잠금 밖에서 join)
+        
+        정리 시간이 지나도 살아 있거나 force이면 강제 종료합니다.
+        """
+        with self._lock:
+            exiting, self._exiting = self._exiting, []
+        
+        remaining = []
+        for item in exiting:
+            job_id, run, deadline = item
+            process = run['process']
+            if process.is_alive() and (force or time.monotonic() >= deadline):
+                print(f"훈련 프로세스가 제때 종료되지 않아 강제 종료합니다 ({job_id})")
+                process.terminate()
+                process.join(timeout=1)
+            if process.is_alive():
+                remaining.append(item)
+            else:
+                process.join()
+        
+        if remaining:
+            with self._lock:
+                self._exiting.extend(remaining)
+    
+    def _monitor_loop(self):
+        while not self._stopped.is_set():
+            with self._lock:
+                queues = [run['queue'] for run in self._runs.values()]
+            messages = [message for progress_queue in queues for message in self._drain(progress_queue)]
+            
+            deploy_jobs = []
+            with self._lock:
+                for message in messages:
+                    if self._handle_message(message):
+                        deploy_jobs.append(message['job_id'])
+                if not messages:
+                    self._check_processes()
+                self._start_queued_jobs()
+            
+            for job_id in deploy_jobs:
+                self.deploy(job_id)
+            self._reap()
+            
+            if not messages:
+                self._stopped.wait(POLL_INTERVAL)
+    
+    def _deploy_artifact(self, model_path: str) -> Dict[str, Any]:
+        """아티팩트를 추론 서비스에 교체 적용"""
+        if self.on_artifact is None:
+            return {'reloaded': False, 'error': '모델 교체 대상이 등록되지 않았습니다.'}
+        try:
+            return self.on_artifact(model_path)
+        except Exception as e:
+            return {'reloaded': False, 'error': str(e)}
+    
+    def get_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """작업 상태 조회"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return self._public(job) if job else None
+    
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        """전체 작업 목록 (최신순, 에포크 기록 제외)"""
+        with self._lock:
+            jobs = sorted(self._jobs.values(), key=lambda j: j['created_at'], reverse=True)
+            return [
+                {key: value for key, value in self._public(job).items() if key != 'progress'}
+                for job in jobs
+            ]
+    
+    def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        작업 취소
+        
+        실행 중이면 취소 이벤트로 훈련 프로세스에 중단을 요청하고 바로 반환합니다.
+        프로세스 종료 대기와 (정리 시간 초과 시) 강제 종료는 수신 스레드가 처리합니다.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            if job['status'] in FINISHED_STATES:
+                return self._public(job)
+            
+            self._finish(job, JOB_CANCELLED)
+            self._start_queued_jobs()
+            return self._public(job)
+    
+    def deploy(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """완료된 작업의 아티팩트를 추론 서비스에 적용"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            if job['status'] != JOB_COMPLETED:
+                raise ValueError(f"완료된 작업만 배포할 수 있습니다: {job['status']}")
+            artifact = job['artifact']
+        
+        # 모델 로드는 잠금 밖에서 수행 (진행 상황 수신을 막지 않도록)
+        deployment = self._deploy_artifact(artifact)
+        with self._lock:
+            job['deployment'] = deployment
+            return self._public(job)
+    
+    def shutdown(self, timeout: float = 5.0):
+        """실행 중인 작업 취소 후 timeout까지 종료를 기다리고 (남으면 강제 종료) 수신 스레드 정지"""
+        with self._lock:
+            for job_id in list(self._runs):
+                self.cancel(job_id)
+        self._stopped.set()
+        if self._monitor is not None:
+            self._monitor.join(timeout=timeout)
+        
+        deadline = time.monotonic() + timeout
+        while self._exiting and time.monotonic() < deadline:
+            self._reap()
+            time.sleep(0.1)
+        self._reap(force=True)
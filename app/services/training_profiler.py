@@ -0,0 +1,351 @@
+"""
+훈련 입력 파이프라인 프로파일러
+
+스텝마다 입력 대기 시간과 연산 시간을 나누어 기록하고, 배치 생성 단계(디코딩, 증강, 배치 구성)별
+소요 시간과 호스트 메모리(RSS)를 함께 수집합니다. 결과는 요약 보고서(JSON)와
+Chrome trace event 형식의 트레이스 파일(chrome://tracing, Perfetto에서 열람)로 저장됩니다.
+"""
+import os
+import json
+import time
+import queue
+import threading
+from datetime import datetime
+from typing import List, Dict, Optional, Any, Tuple
+
+import numpy as np
+from tensorflow import keras
+
+
+# 트레이스 이벤트 최대 수 (긴 훈련에서 메모리 사용 제한)
+MAX_TRACE_EVENTS = 200000
+
+# 전체 스텝 시간 중 입력 대기 비율이 이보다 크면 입력 병목으로 판정
+INPUT_BOUND_THRESHOLD = 0.2
+
+
+def current_rss_mb() -> Optional[float]:
+    """현재 프로세스 상주 메모리(MB) (psutil이 없으면 /proc 사용)"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 1024 / 1024
+    except ImportError:
+        pass
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class _TimedImageDataGenerator:
+    """ImageDataGenerator 증강 호출 시간 측정 프록시"""
+    
+    def __init__(self, generator, profiler: 'TrainingProfiler'):
+        self._generator = generator
+        self._profiler = profiler
+    
+    def _timed(self, method: str, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return getattr(self._generator, method)(*args, **kwargs)
+        finally:
+            self._profiler.add_stage_time('augment', time.perf_counter() - start)
+    
+    def random_transform(self, *args, **kwargs):
+        return self._timed('random_transform', *args, **kwargs)
+    
+    def apply_transform(self, *args, **kwargs):
+        return self._timed('apply_transform', *args, **kwargs)
+    
+    def standardize(self, *args, **kwargs):
+        return self._timed('standardize', *args, **kwargs)
+    
+    def __getattr__(self, name):
+        return getattr(self._generator, name)
+
+
+class ProfiledInput:
+    """
+    배치 생성기(keras Sequence) 프로파일링 래퍼
+    
+    백그라운드 스레드가 배치를 미리 만들어 큐에 넣고(Keras 기본 max_queue_size와 동일),
+    훈련 루프가 큐에서 꺼낼 때 기다린 시간을 입력 대기 시간으로 기록합니다.
+    """
+    
+    def __init__(self, sequence, profiler: 'TrainingProfiler', max_queue_size: int = 10):
+        self.sequence = sequence
+        self.profiler = profiler
+        self.steps_per_epoch = len(sequence)
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._stop = threading.Event()
+        self._producer = None
+        
+        # 호스트 증강 단계 측정 (ImageDataGenerator 기반 생성기: DirectoryIterator, ManifestSequence)
+        # 모델 내 증강 레이어는 그래프 안에서 실행되므로 연산 시간에 포함됨
+        if getattr(sequence, 'image_data_generator', None) is not None:
+            sequence.image_data_generator = _TimedImageDataGenerator(sequence.image_data_generator, profiler)
+    
+    def _produce(self):
+        epoch = 0
+        while not self._stop.is_set():
+            for index in range(self.steps_per_epoch):
+                augment_before = self.profiler.stage_totals['augment']
+                start = time.perf_counter()
+                batch = self.sequence[index]
+                duration = time.perf_counter() - start
+                augment = self.profiler.stage_totals['augment'] - augment_before
+                
+                # 디코딩 = 배치 생성 시간 - 증강 시간 (파일 읽기, 디코딩, 크기 조정 포함)
+                self.profiler.add_stage_time('batch', duration)
+                self.profiler.add_stage_time('decode', max(duration - augment, 0.0))
+                self.profiler.add_event('produce_batch', 'input', start, duration,
+                                        {'epoch': epoch, 'index': index, 'augment_ms': round(augment * 1000, 3)})
+                
+                while not self._stop.is_set():
+                    try:
+                        self._queue.put(batch, timeout=0.5)
+                        break
+                    except queue.Full:
+                        continue
+                if self._stop.is_set():
+                    return
+            
+            if hasattr(self.sequence, 'on_epoch_end'):
+                self.sequence.on_epoch_end()
+            epoch += 1
+    
+    def __iter__(self):
+        if self._producer is None:
+            self._producer = threading.Thread(target=self._produce, name='profiled-input', daemon=True)
+            self._producer.start()
+        return self
+    
+    def __next__(self) -> Tuple[np.ndarray, np.ndarray]:
+        start = time.perf_counter()
+        batch = self._queue.get()
+        wait = time.perf_counter() - start
+        self.profiler.add_input_wait(start, wait, self._queue.qsize())
+        return batch
+    
+    def close(self):
+        self._stop.set()
+        if self._producer is not None:
+            self._producer.join(timeout=5)
+
+
+class ProfilerCallback(keras.callbacks.Callback):
+    """스텝/에포크 경계 시각 및 메모리 기록"""
+    
+    def __init__(self, profiler: 'TrainingProfiler'):
+        super().__init__()
+        self.profiler = profiler
+    
+    def on_epoch_begin(self, epoch, logs=None):
+        self.profiler.begin_epoch(epoch)
+    
+    def on_train_batch_end(self, batch, logs=None):
+        self.profiler.end_step(batch)
+    
+    def on_epoch_end(self, epoch, logs=None):
+        self.profiler.end_epoch(epoch, logs)
+
+
+class TrainingProfiler:
+    """훈련 입력 파이프라인 프로파일러"""
+    
+    STAGES = ('decode', 'augment', 'batch')
+    
+    def __init__(self, output_dir: str = "models/profiles"):
+        self.output_dir = output_dir
+        self.stage_totals = {stage: 0.0 for stage in self.STAGES}
+        self.stage_counts = {stage: 0 for stage in self.STAGES}
+        self.steps: List[Dict[str, Any]] = []
+        self.epochs: List[Dict[str, Any]] = []
+        self.events: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._thread_ids: Dict[int, int] = {}
+        self._thread_names: Dict[int, str] = {}
+        self._pending_wait = 0.0
+        self._step_start = None
+        self._epoch_start = None
+        self._epoch = 0
+        self._input: Optional[ProfiledInput] = None
+        self.start_rss_mb = current_rss_mb()
+        self.peak_rss_mb = self.start_rss_mb or 0.0
+    
+    # 이벤트 기록
+    
+    def _tid(self) -> int:
+        ident = threading.get_ident()
+        if ident not in self._thread_ids:
+            tid = len(self._thread_ids) + 1
+            self._thread_ids[ident] = tid
+            self._thread_names[tid] = threading.current_thread().name
+        return self._thread_ids[ident]
+    
+    def _us(self, timestamp: float) -> float:
+        return round((timestamp - self._origin) * 1e6, 1)
+    
+    def add_event(self, name: str, category: str, start: float, duration: float, args: Optional[Dict[str, Any]] = None):
+        """구간 이벤트 (Chrome trace 'X')"""
+        with self._lock:
+            if len(self.events) >= MAX_TRACE_EVENTS:
+                return
+            self.events.append({
+                'name': name, 'cat': category, 'ph': 'X',
+                'ts': self._us(start), 'dur': round(duration * 1e6, 1),
+                'pid': os.getpid(), 'tid': self._tid(), 'args': args or {}
+            })
+    
+    def _add_counter(self, name: str, values: Dict[str, float]):
+        """카운터 이벤트 (Chrome trace 'C')"""
+        with self._lock:
+            if len(self.events) >= MAX_TRACE_EVENTS:
+                return
+            self.events.append({
+                'name': name, 'ph': 'C', 'ts': self._us(time.perf_counter()),
+                'pid': os.getpid(), 'tid': 0, 'args': values
+            })
+    
+    def add_stage_time(self, stage: str, duration: float):
+        with self._lock:
+            self.stage_totals[stage] += duration
+            self.stage_counts[stage] += 1
+    
+    def add_input_wait(self, start: float, duration: float, queue_size: int):
+        with self._lock:
+            self._pending_wait += duration
+        self.add_event('input_wait', 'step', start, duration, {'queue_size': queue_size})
+    
+    # 훈련 루프 경계
+    
+    def wrap_input(self, sequence, max_queue_size: int = 10) -> ProfiledInput:
+        """훈련 배치 생성기 래핑 (model.fit에는 steps_per_epoch와 함께 전달)"""
+        self._input = ProfiledInput(sequence, self, max_queue_size)
+        return self._input
+    
+    def callback(self) -> ProfilerCallback:
+        return ProfilerCallback(self)
+    
+    def begin_epoch(self, epoch: int):
+        self._epoch = epoch
+        self._epoch_start = time.perf_counter()
+        self._step_start = self._epoch_start
+        with self._lock:
+            self._pending_wait = 0.0
+    
+    def end_step(self, batch: int):
+        now = time.perf_counter()
+        step_time = now - self._step_start
+        with self._lock:
+            wait = min(self._pending_wait, step_time)
+            self._pending_wait = 0.0
+        
+        self.steps.append({
+            'epoch': self._epoch,
+            'step': batch,
+            'step_ms': step_time * 1000,
+            'input_wait_ms': wait * 1000,
+            'compute_ms': (step_time - wait) * 1000
+        })
+        self.add_event('train_step', 'step', self._step_start, step_time,
+                       {'epoch': self._epoch, 'step': batch, 'input_wait_ms': round(wait * 1000, 3)})
+        
+        rss = current_rss_mb()
+        if rss is not None:
+            self.peak_rss_mb = max(self.peak_rss_mb, rss)
+            self._add_counter('host_memory_mb', {'rss': round(rss, 1)})
+        self._step_start = now
+    
+    def end_epoch(self, epoch: int, logs: Optional[Dict[str, Any]] = None):
+        now = time.perf_counter()
+        epoch_steps = [s for s in self.steps if s['epoch'] == epoch]
+        self.epochs.append({
+            'epoch': epoch + 1,
+            'duration_sec': round(now - self._epoch_start, 3),
+            'steps': len(epoch_steps),
+            'input_wait_sec': round(sum(s['input_wait_ms'] for s in epoch_steps) / 1000, 3),
+            'compute_sec': round(sum(s['compute_ms'] for s in epoch_steps) / 1000, 3),
+            'metrics': {key: float(value) for key, value in (logs or {}).items()}
+        })
+        self.add_event(f'epoch {epoch + 1}', 'epoch', self._epoch_start, now - self._epoch_start)
+    
+    # 보고서
+    
+    @staticmethod
+    def _distribution(values: List[float]) -> Dict[str, float]:
+        if not values:
+            return {}
+        return {
+            'mean': round(float(np.mean(values)), 3),
+            'p50': round(float(np.percentile(values, 50)), 3),
+            'p95': round(float(np.percentile(values, 95)), 3),
+            'max': round(float(np.max(values)), 3)
+        }
+    
+    def summary(self) -> Dict[str, Any]:
+        """요약 보고서 (병목 판정 포함)"""
+        # 첫 스텝은 그래프 추적/컴파일 시간이 포함되므로 분포에서 제외
+        steady = self.steps[1:] if len(self.steps) > 1 else self.steps
+        total_step = sum(s['step_ms'] for s in steady)
+        total_wait = sum(s['input_wait_ms'] for s in steady)
+        input_wait_ratio = total_wait / total_step if total_step else 0.0
+        
+        batches = self.stage_counts['batch']
+        stages = {}
+        for stage in self.STAGES:
+            stages[stage] = {
+                'total_sec': round(self.stage_totals[stage], 3),
+                'mean_ms_per_batch': round(self.stage_totals[stage] / batches * 1000, 3) if batches else 0.0
+            }
+        
+        end_rss_mb = current_rss_mb()
+        if input_wait_ratio > INPUT_BOUND_THRESHOLD:
+            bottleneck = 'decode' if self.stage_totals['decode'] >= self.stage_totals['augment'] else 'augment'
+        else:
+            bottleneck = 'compute'
+        
+        return {
+            'created_at': datetime.utcnow().isoformat(),
+            'steps': len(self.steps),
+            'step_ms': self._distribution([s['step_ms'] for s in steady]),
+            'input_wait_ms': self._distribution([s['input_wait_ms'] for s in steady]),
+            'compute_ms': self._distribution([s['compute_ms'] for s in steady]),
+            'first_step_ms': round(self.steps[0]['step_ms'], 3) if self.steps else None,
+            'input_wait_ratio': round(input_wait_ratio, 4),
+            'bottleneck': bottleneck,
+            'stages': stages,
+            'host_memory_mb': {
+                'start': round(self.start_rss_mb, 1) if self.start_rss_mb is not None else None,
+                'peak': round(self.peak_rss_mb, 1) if self.peak_rss_mb else None,
+                'end': round(end_rss_mb, 1) if end_rss_mb is not None else None
+            },
+            'epochs': self.epochs
+        }
+    
+    def finish(self) -> Dict[str, Any]:
+        """입력 스레드 정리 후 요약 보고서와 트레이스 파일 저장"""
+        if self._input is not None:
+            self._input.close()
+        
+        report = self.summary()
+        os.makedirs(self.output_dir, exist_ok=True)
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        report_path = os.path.join(self.output_dir, f"profile_{timestamp}.json")
+        trace_path = os.path.join(self.output_dir, f"trace_{timestamp}.json")
+        
+        metadata = [
+            {'name': 'thread_name', 'ph': 'M', 'pid': os.getpid(), 'tid': tid, 'args': {'name': name}}
+            for tid, name in self._thread_names.items()
+        ]
+        with open(trace_path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': metadata + self.events, 'displayTimeUnit': 'ms'}, f)
+        
+        report['report_path'] = report_path
+        report['trace_path'] = trace_path
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        
+        return report
@@ -0,0 +1,261 @@
+"""
+사용자 위치 지연 쓰기(write-behind) 버퍼
+
+사용자 위치 저장은 요청마다 insert/commit/refresh를 하는 가장 잦은 쓰기 경로이므로,
+요청은 위치를 메모리 버퍼에 넣고 바로 반환하고 백그라운드 작업이 모아서 한 번에 씁니다.
+
+- 버퍼가 USER_LOCATION_FLUSH_SIZE만큼 차거나 가장 오래된 위치가
+  USER_LOCATION_FLUSH_INTERVAL_MS만큼 기다리면 한 트랜잭션으로 일괄 삽입합니다.
+- 버퍼 크기는 USER_LOCATION_BUFFER_MAX로 제한합니다. 가득 차면 저장 요청은 공간이 날 때까지
+  기다리고(backpressure), USER_LOCATION_ENQUEUE_TIMEOUT_MS가 지나면 직접 씁니다.
+- 쓰기 실패는 재시도하고, 그래도 실패하면 해당 배치를 버리고 dropped로 집계합니다.
+- 서버 종료 시 stop()으로 남은 위치를 모두 쓴 뒤 종료합니다.
+- Core insert는 ORM 이벤트 리스너를 거치지 않으므로 geohash를 직접 계산하고,
+  created_at은 플러시 시각이 아닌 요청 시각으로 기록합니다.
+
+USER_LOCATION_WRITE_BEHIND: 지연 쓰기 사용 여부 (기본값: true)
+"""
+import os
+import time
+import asyncio
+import logging
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.geo import encode_geohash
+from app.models.location import UserLocation
+
+logger = logging.getLogger(__name__)
+
+FLUSH_RETRIES = 2
+
+
+def write_behind_enabled() -> bool:
+    """사용자 위치 지연 쓰기 사용 여부"""
+    return os.getenv("USER_LOCATION_WRITE_BEHIND", "true").lower() in ("1", "true", "yes")
+
+
+class UserLocationWriteBuffer:
+    """크기/시간 기준으로 사용자 위치를 모아 일괄 삽입하는 버퍼"""
+    
+    def __init__(self,
+                 engine: AsyncEngine,
+                 flush_size: int = 500,
+                 flush_interval: float = 1.0,
+                 max_pending: int = 10000,
+                 enqueue_timeout: float = 1.0):
+        self.engine = engine
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.max_pending = max(max_pending, flush_size)
+        self.enqueue_timeout = enqueue_timeout
+        self.table = UserLocation.__table__
+        
+        # (버퍼에 넣은 시각, 행)
+        self._pending: Deque[Tuple[float, Dict[str, Any]]] = deque()
+        self._task: Optional[asyncio.Task] = None
+        # 이벤트는 이벤트 루프 안에서 만들도록 start()에서 생성
+        self._wakeup: Optional[asyncio.Event] = None
+        # 버퍼가 가득 차서 기다리는 저장 요청 (비워진 자리 수만큼 먼저 온 순서로 깨움)
+        self._space_waiters: Deque[asyncio.Future] = deque()
+        self._stopping = False
+        
+        self.enqueued = 0
+        self.flushed = 0
+        self.batches = 0
+        self.flush_failures = 0
+        self.dropped = 0
+        self.direct_writes = 0
+        self.backpressure_waits = 0
+        self.last_flush_ms: Optional[float] = None
+        self.last_error: Optional[str] = None
+    
+    # ------------------------------------------------------------------
+    # 시작 / 종료
+    # ------------------------------------------------------------------
+    def start(self) -> None:
+        """백그라운드 플러시 작업 시작 (이미 실행 중이면 무시)"""
+        if self._stopping or (self._task is not None and not self._task.done()):
+            return
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        self._task = asyncio.ensure_future(self._run())
+    
+    async def stop(self) -> None:
+        """새 위치는 직접 쓰도록 전환하고 버퍼에 남은 위치를 모두 쓴 뒤 종료"""
+        self._stopping = True
+        # 기다리던 저장 요청은 깨워서 직접 쓰게 함
+        while self._space_waiters:
+            waiter = self._space_waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+        if self._task is not None:
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        if self._pending:
+            await self._flush(self._take(len(self._pending)))
+    
+    # ------------------------------------------------------------------
+    # 저장 요청
+    # ------------------------------------------------------------------
+    async def enqueue(self,
+                      latitude: float,
+                      longitude: float,
+                      user_id: str = None,
+                      address: str = None) -> Dict[str, Any]:
+        """
+        사용자 위치를 버퍼에 넣고 바로 반환 (id는 플러시 후 생성되므로 None)
+        
+        버퍼가 가득 차면 공간이 날 때까지 기다리고, 제한 시간이 지나거나
+        종료 중이면 직접 씁니다.
+        """
+        row = {
+            'user_id': user_id,
+            'latitude': latitude,
+            'longitude': longitude,
+            'geohash': encode_geohash(latitude, longitude),
+            'address': address,
+            'created_at': datetime.utcnow()
+        }
+        
+        if self._stopping or not await self._wait_for_space():
+            self.direct_writes += 1
+            await self._write([row])
+        else:
+            self._pending.append((time.monotonic(), row))
+            self.enqueued += 1
+            # 첫 위치(플러시 시각 예약) 또는 배치가 찼을 때만 플러시 작업을 깨움
+            if len(self._pending) == 1 or len(self._pending) >= self.flush_size:
+                self._wakeup.set()
+        
+        return {
+            'id': None,
+            'user_id': user_id,
+            'latitude': latitude,
+            'longitude': longitude,
+            'address': address,
+            'created_at': row['created_at'].isoformat()
+        }
+    
+    async def _wait_for_space(self) -> bool:
+        """버퍼에 공간이 생길 때까지 대기 (제한 시간 초과 시 False)"""
+        self.start()
+        if len(self._pending) < self.max_pending:
+            return True
+        
+        self.backpressure_waits += 1
+        deadline = time.monotonic() + self.enqueue_timeout
+        while len(self._pending) >= self.max_pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or self._stopping:
+                return False
+            waiter = asyncio.get_running_loop().create_future()
+            self._space_waiters.append(waiter)
+            try:
+                await asyncio.wait_for(waiter, timeout=remaining)
+            except asyncio.TimeoutError:
+                return False
+            finally:
+                if waiter in self._space_waiters:
+                    self._space_waiters.remove(waiter)
+        return True
+    
+    # ------------------------------------------------------------------
+    # 플러시
+    # ------------------------------------------------------------------
+    async def _run(self) -> None:
+        """배치가 차거나 가장 오래된 위치가 플러시 간격을 넘기면 쓰기 (종료 시 모두 쓰고 끝남)"""
+        while True:
+            if not self._pending:
+                if self._stopping:
+                    return
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            
+            age = time.monotonic() - self._pending[0][0]
+            if len(self._pending) < self.flush_size and age < self.flush_interval and not self._stopping:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval - age)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            
+            await self._flush(self._take(self.flush_size))
+    
+    def _take(self, count: int) -> List[Dict[str, Any]]:
+        """버퍼 앞에서 최대 count개를 꺼내고 대기 중인 저장 요청을 깨움"""
+        batch = [self._pending.popleft()[1] for _ in range(min(count, len(self._pending)))]
+        for _ in range(min(len(batch), len(self._space_waiters))):
+            waiter = self._space_waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+        return batch
+    
+    async def _flush(self, batch: List[Dict[str, Any]]) -> None:
+        """배치 일괄 삽입 (실패 시 재시도 후 버림)"""
+        for attempt in range(FLUSH_RETRIES + 1):
+            started = time.perf_counter()
+            try:
+                await self._write(batch)
+            except Exception as e:
+                self.flush_failures += 1
+                self.last_error = str(e)
+                if attempt < FLUSH_RETRIES:
+                    await asyncio.sleep(0.5 * (2 ** attempt))
+                continue
+            self.flushed += len(batch)
+            self.batches += 1
+            self.last_flush_ms = round((time.perf_counter() - started) * 1000.0, 1)
+            return
+        
+        self.dropped += len(batch)
+        logger.error(f"사용자 위치 {len(batch)}건 저장 실패로 버림: {self.last_error}")
+    
+    async def _write(self, rows: List[Dict[str, Any]]) -> None:
+        """한 트랜잭션으로 executemany 삽입"""
+        async with self.engine.begin() as connection:
+            await connection.execute(self.table.insert(), rows)
+    
+    def stats(self) -> Dict[str, Any]:
+        """버퍼 상태"""
+        oldest_age = time.monotonic() - self._pending[0][0] if self._pending else 0.0
+        return {
+            'running': self._task is not None and not self._task.done(),
+            'pending': len(self._pending),
+            'max_pending': self.max_pending,
+            'oldest_pending_ms': round(oldest_age * 1000.0, 1),
+            'enqueued': self.enqueued,
+            'flushed': self.flushed,
+            'batches': self.batches,
+            'avg_batch_size': round(self.flushed / self.batches, 1) if self.batches else None,
+            'last_flush_ms': self.last_flush_ms,
+            'flush_failures': self.flush_failures,
+            'dropped': self.dropped,
+            'direct_writes': self.direct_writes,
+            'backpressure_waits': self.backpressure_waits,
+            'last_error': self.last_error
+        }
+
+
+def create_user_location_buffer(engine: AsyncEngine) -> UserLocationWriteBuffer:
+    """
+    환경 변수로 설정한 사용자 위치 버퍼 생성
+    
+    USER_LOCATION_FLUSH_SIZE: 한 번에 쓰는 최대 위치 수 (기본값: 500)
+    USER_LOCATION_FLUSH_INTERVAL_MS: 위치가 버퍼에 머무는 최대 시간 (기본값: 1000)
+    USER_LOCATION_BUFFER_MAX: 버퍼에 담을 수 있는 최대 위치 수 (기본값: 10000)
+    USER_LOCATION_ENQUEUE_TIMEOUT_MS: 버퍼가 가득 찼을 때 기다리는 최대 시간 (기본값: 1000)
+    """
+    return UserLocationWriteBuffer(
+        engine,
+        flush_size=int(os.getenv("USER_LOCATION_FLUSH_SIZE", "500")),
+        flush_interval=float(os.getenv("USER_LOCATION_FLUSH_INTERVAL_MS", "1000")) / 1000.0,
+        max_pending=int(os.getenv("USER_LOCATION_BUFFER_MAX", "10000")),
+        enqueue_timeout=float(os.getenv("USER_LOCATION_ENQUEUE_TIMEOUT_MS", "1000")) / 1000.0
+    )
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+haversine 거리 계산 벤치마크
+
+후보 1천~100만 개에 대해 Python 루프(math)와 NumPy 일괄 계산(app.core.geo)의
+일대다 거리 계산 시간을 비교하고, 다대다 거리 행렬 계산 시간도 측정합니다.
+
+사용법:
+    python benchmarks/haversine_benchmark.py
+    python benchmarks/haversine_benchmark.py --sizes 1000 100000 --repeat 5
+"""
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.geo import haversine_km, distances_from, distance_matrix
+
+LAT_RANGE = (33.0, 38.7)
+LON_RANGE = (124.5, 131.0)
+
+
+def best_of(func, repeat: int) -> float:
+    """repeat 회 중 최소 실행 시간 (초)"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='haversine 거리 계산 벤치마크')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000, 1000000],
+                        help='후보 수 목록')
+    parser.add_argument('--matrix_sizes', type=int, nargs='+', default=[100, 1000, 3000],
+                        help='거리 행렬 한 변 크기 목록')
+    parser.add_argument('--repeat', type=int, default=3, help='반복 횟수 (최소값 사용)')
+    parser.add_argument('--seed', type=int, default=42, help='난수 시드')
+    args = parser.parse_args()
+    
+    rng = np.random.RandomState(args.seed)
+    origin = (37.5665, 126.9780)
+    
+    print("일대다 거리 계산")
+    print(f"{'후보 수':>10} {'Python 루프':>14} {'NumPy':>12} {'배속':>8} {'최대 오차(m)':>14}")
+    for size in args.sizes:
+        latitudes = rng.uniform(*LAT_RANGE, size)
+        longitudes = rng.uniform(*LON_RANGE, size)
+        lat_list, lon_list = latitudes.tolist(), longitudes.tolist()
+        
+        loop_time = best_of(
+            lambda: [haversine_km(origin[0], origin[1], la, lo) for la, lo in zip(lat_list, lon_list)],
+            args.repeat
+        )
+        numpy_time = best_of(lambda: distances_from(origin[0], origin[1], latitudes, longitudes), args.repeat)
+        
+        expected = np.array([haversine_km(origin[0], origin[1], la, lo) for la, lo in zip(lat_list, lon_list)])
+        error_m = float(np.max(np.abs(distances_from(origin[0], origin[1], latitudes, longitudes) - expected))) * 1000
+        print(f"{size:>10} {loop_time * 1000:>12.2f}ms {numpy_time * 1000:>10.2f}ms "
+              f"{loop_time / numpy_time:>7.1f}x {error_m:>14.2e}")
+    
+    print("\n다대다 거리 행렬")
+    print(f"{'크기':>12} {'NumPy':>12}")
+    for size in args.matrix_sizes:
+        latitudes = rng.uniform(*LAT_RANGE, size)
+        longitudes = rng.uniform(*LON_RANGE, size)
+        matrix_time = best_of(lambda: distance_matrix(latitudes, longitudes, latitudes, longitudes), args.repeat)
+        print(f"{f'{size}x{size}':>12} {matrix_time * 1000:>10.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+배출 장소 공간 인덱스 벤치마크
+
+무작위 배출 장소(한반도 범위) 1만/10만/100만 개로 LocationSpatialIndex를 만들고
+k-최근접·반경 질의 지연 시간을 전체 선형 탐색(NumPy haversine)과 비교합니다.
+표본 질의마다 두 결과가 같은지도 확인합니다.
+
+사용법:
+    python benchmarks/location_index_benchmark.py
+    python benchmarks/location_index_benchmark.py --sizes 10000 100000 --queries 200
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import statistics
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.geo import distances_from
+from app.services.spatial_index import LocationSpatialIndex
+
+WASTE_TYPES = ['glass', 'paper', 'plastic', 'metal', 'trash']
+LAT_RANGE = (33.0, 38.7)
+LON_RANGE = (124.5, 131.0)
+
+
+def generate_rows(size: int, seed: int):
+    """(id, 위도, 경도, 쓰레기 종류) 무작위 행 생성"""
+    rng = random.Random(seed)
+    latitudes = np.random.RandomState(seed).uniform(*LAT_RANGE, size)
+    longitudes = np.random.RandomState(seed + 1).uniform(*LON_RANGE, size)
+    return [
+        (i, float(latitudes[i]), float(longitudes[i]),
+         ','.join(rng.sample(WASTE_TYPES, rng.randint(1, 3))))
+        for i in range(size)
+    ]
+
+
+def linear_scan(latitudes, longitudes, masks, lat, lon, waste_type, radius_km, k):
+    """비교 기준: 전체 후보에 대한 NumPy haversine"""
+    distances = distances_from(lat, lon, latitudes, longitudes)
+    candidates = np.flatnonzero(masks[waste_type] & (distances <= radius_km))
+    order = candidates[np.argsort(distances[candidates], kind='stable')][:k]
+    return [(int(i), float(distances[i])) for i in order]
+
+
+def percentile(values, q):
+    return float(np.percentile(values, q)) * 1000.0
+
+
+def benchmark_size(size: int, queries: int, k: int, radius_km: float, cell_degrees: float, seed: int):
+    rows = generate_rows(size, seed)
+    
+    start = time.perf_counter()
+    index = LocationSpatialIndex(cell_degrees)
+    index.rebuild(rows)
+    build_seconds = time.perf_counter() - start
+    
+    latitudes = np.array([r[1] for r in rows])
+    longitudes = np.array([r[2] for r in rows])
+    masks = {wt: np.array([wt in r[3].split(',') for r in rows]) for wt in WASTE_TYPES}
+    
+    rng = random.Random(seed + 2)
+    probes = [
+        (rng.uniform(*LAT_RANGE), rng.uniform(*LON_RANGE), rng.choice(WASTE_TYPES))
+        for _ in range(queries)
+    ]
+    
+    knn_times, radius_times, scan_times = [], [], []
+    mismatches = 0
+    for lat, lon, waste_type in probes:
+        t0 = time.perf_counter()
+        knn = index.nearest(lat, lon, k, waste_type, max_distance_km=radius_km)
+        t1 = time.perf_counter()
+        index.within_radius(lat, lon, radius_km, waste_type)
+        t2 = time.perf_counter()
+        expected = linear_scan(latitudes, longitudes, masks, lat, lon, waste_type, radius_km, k)
+        t3 = time.perf_counter()
+        
+        knn_times.append(t1 - t0)
+        radius_times.append(t2 - t1)
+        scan_times.append(t3 - t2)
+        if [round(d, 6) for _, d in knn] != [round(d, 6) for _, d in expected]:
+            mismatches += 1
+    
+    # 증분 갱신 비용 (질의 측정 후 1000개 위치 이동)
+    update_start = time.perf_counter()
+    for location_id, lat, lon, waste_types in rows[:1000]:
+        index.upsert(location_id, lat + 0.01, lon, waste_types)
+    update_ms = (time.perf_counter() - update_start) / min(1000, size) * 1000.0
+    
+    return {
+        'size': size,
+        'build_s': build_seconds,
+        'knn_p50_ms': percentile(knn_times, 50),
+        'knn_p95_ms': percentile(knn_times, 95),
+        'radius_p50_ms': percentile(radius_times, 50),
+        'scan_p50_ms': percentile(scan_times, 50),
+        'upsert_ms': update_ms,
+        'mismatches': mismatches,
+        'speedup': statistics.median(scan_times) / max(statistics.median(knn_times), 1e-9)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='배출 장소 공간 인덱스 벤치마크')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000],
+                        help='배출 장소 수 목록')
+    parser.add_argument('--queries', type=int, default=100, help='크기별 질의 수')
+    parser.add_argument('--k', type=int, default=10, help='최근접 결과 수')
+    parser.add_argument('--radius_km', type=float, default=5.0, help='검색 반경 (km)')
+    parser.add_argument('--cell_degrees', type=float, default=0.05, help='격자 셀 크기 (도)')
+    parser.add_argument('--seed', type=int, default=42, help='난수 시드')
+    args = parser.parse_args()
+    
+    header = f"{'size':>9} {'build(s)':>9} {'knn p50':>9} {'knn p95':>9} {'radius p50':>11} " \
+             f"{'scan p50':>9} {'upsert':>8} {'speedup':>8} {'mismatch':>9}"
+    print(header)
+    print('-' * len(header))
+    for size in args.sizes:
+        r = benchmark_size(size, args.queries, args.k, args.radius_km, args.cell_degrees, args.seed)
+        print(f"{r['size']:>9} {r['build_s']:>9.2f} {r['knn_p50_ms']:>8.3f}ms {r['knn_p95_ms']:>8.3f}ms "
+              f"{r['radius_p50_ms']:>10.3f}ms {r['scan_p50_ms']:>8.3f}ms {r['upsert_ms']:>7.4f}ms "
+              f"{r['speedup']:>7.0f}x {r['mismatches']:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+SQLite 동시 읽기/쓰기 벤치마크
+
+읽기 스레드(반경 검색)와 쓰기 스레드(사용자 위치 저장)를 동시에 실행해
+기본 설정(롤백 저널, synchronous=FULL)과 app.core.database의 PRAGMA 설정(WAL 등)의
+처리량, 지연 시간, 잠금 오류 수를 비교합니다.
+
+사용법:
+    python benchmarks/sqlite_concurrency_benchmark.py
+    python benchmarks/sqlite_concurrency_benchmark.py --readers 8 --writers 4 --seconds 10
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import threading
+
+import numpy as np
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import engine_options, sqlite_pragmas, apply_sqlite_pragmas
+from app.core.geo import encode_geohash
+from app.models.location import Base, RecyclingLocation, UserLocation
+from app.repositories.location_repository import LocationQueryBuilder
+
+WASTE_TYPES = ['glass', 'paper', 'plastic', 'metal', 'trash']
+LAT_RANGE = (37.4, 37.7)
+LON_RANGE = (126.8, 127.2)
+
+# 비교 대상: SQLite 기본 동작과 앱 설정
+CONFIGS = {
+    'default': {'journal_mode': 'DELETE', 'synchronous': 'FULL', 'busy_timeout': '5000'},
+    'tuned': sqlite_pragmas(),
+}
+
+
+def create_benchmark_engine(path: str, pragmas):
+    database_url = f"sqlite:///{path}"
+    engine = create_engine(database_url, connect_args={"check_same_thread": False}, **engine_options(database_url))
+    apply_sqlite_pragmas(engine, pragmas)
+    return engine
+
+
+def populate(engine, size: int, seed: int):
+    """무작위 배출 장소를 일괄 삽입"""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(size):
+        latitude, longitude = rng.uniform(*LAT_RANGE), rng.uniform(*LON_RANGE)
+        rows.append({
+            'name': f'장소 {i}',
+            'address': f'주소 {i}',
+            'latitude': latitude,
+            'longitude': longitude,
+            # Core insert는 ORM 이벤트 리스너를 거치지 않으므로 geohash를 직접 계산
+            'geohash': encode_geohash(latitude, longitude),
+            'waste_types': ','.join(rng.sample(WASTE_TYPES, rng.randint(1, 3))),
+            'is_active': True
+        })
+    with engine.begin() as connection:
+        connection.execute(RecyclingLocation.__table__.insert(), rows)
+        connection.execute(text('ANALYZE'))
+
+
+def run_workload(engine, readers: int, writers: int, seconds: float, radius_km: float, seed: int):
+    """읽기/쓰기 스레드를 seconds 동안 실행하고 작업별 지연 시간과 오류 수 반환"""
+    Session = sessionmaker(bind=engine)
+    stop = threading.Event()
+    lock = threading.Lock()
+    results = {'read': [], 'write': [], 'errors': 0}
+    
+    def reader(worker_id: int):
+        rng = random.Random(seed + worker_id)
+        timings = []
+        errors = 0
+        while not stop.is_set():
+            latitude, longitude = rng.uniform(*LAT_RANGE), rng.uniform(*LON_RANGE)
+            session = Session()
+            start = time.perf_counter()
+            try:
+                (LocationQueryBuilder(session)
+                 .active_only()
+                 .within_cells(latitude, longitude, radius_km)
+                 .order_by_distance(latitude, longitude)
+                 .limit(10)
+                 .build())
+                timings.append(time.perf_counter() - start)
+            except OperationalError:
+                errors += 1
+            finally:
+                session.close()
+        with lock:
+            results['read'].extend(timings)
+            results['errors'] += errors
+    
+    def writer(worker_id: int):
+        rng = random.Random(seed + 1000 + worker_id)
+        timings = []
+        errors = 0
+        while not stop.is_set():
+            session = Session()
+            start = time.perf_counter()
+            try:
+                session.add(UserLocation(
+                    user_id=f'user-{worker_id}',
+                    latitude=rng.uniform(*LAT_RANGE),
+                    longitude=rng.uniform(*LON_RANGE)
+                ))
+                session.commit()
+                timings.append(time.perf_counter() - start)
+            except OperationalError:
+                session.rollback()
+                errors += 1
+            finally:
+                session.close()
+        with lock:
+            results['write'].extend(timings)
+            results['errors'] += errors
+    
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    threads += [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def summarize(name: str, results, seconds: float):
+    line = f"{name:>8}:"
+    for kind in ('read', 'write'):
+        timings_ms = np.array(results[kind]) * 1000.0
+        if len(timings_ms):
+            line += (f" {kind} {len(timings_ms) / seconds:8.1f}/s"
+                     f" (p50 {np.percentile(timings_ms, 50):6.2f}ms, p95 {np.percentile(timings_ms, 95):7.2f}ms)")
+        else:
+            line += f" {kind} 0/s"
+    print(f"{line}, 잠금 오류 {results['errors']}건")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SQLite 동시 읽기/쓰기 벤치마크')
+    parser.add_argument('--size', type=int, default=50000, help='배출 장소 수')
+    parser.add_argument('--readers', type=int, default=8, help='읽기 스레드 수')
+    parser.add_argument('--writers', type=int, default=2, help='쓰기 스레드 수')
+    parser.add_argument('--seconds', type=float, default=5.0, help='설정별 실행 시간(초)')
+    parser.add_argument('--radius_km', type=float, default=2.0, help='검색 반경 (km)')
+    parser.add_argument('--seed', type=int, default=42, help='난수 시드')
+    args = parser.parse_args()
+    
+    directory = tempfile.mkdtemp()
+    print(f"배출 장소 {args.size}개, 읽기 스레드 {args.readers}개, 쓰기 스레드 {args.writers}개, 설정별 {args.seconds}초")
+    for name, pragmas in CONFIGS.items():
+        engine = create_benchmark_engine(os.path.join(directory, f'{name}.db'), pragmas)
+        Base.metadata.create_all(bind=engine)
+        populate(engine, args.size, args.seed)
+        results = run_workload(engine, args.readers, args.writers, args.seconds, args.radius_km, args.seed)
+        summarize(name, results, args.seconds)
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
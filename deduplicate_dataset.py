@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+훈련 데이터 중복 제거 스크립트
+
+사용법:
+    python deduplicate_dataset.py --data_dir ./data/train --output ./data/dedup_manifest.json
+    python train_model.py --data_dir ./data/train --manifest ./data/dedup_manifest.json
+"""
+
+import argparse
+import json
+import sys
+import os
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.image_quality import DataQualityChecker
+from app.core.deduplication import DatasetDeduplicator
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description='훈련 데이터 완전/근접 중복 제거')
+    parser.add_argument(
+        '--data_dir',
+        type=str,
+        required=True,
+        help='훈련 데이터 디렉토리 경로 (각 클래스별로 하위 디렉토리 구성)'
+    )
+    parser.add_argument(
+        '--output',
+        type=str,
+        default=None,
+        help='중복 제거 매니페스트 저장 경로 (기본값: <data_dir>/dedup_manifest.json)'
+    )
+    parser.add_argument(
+        '--threshold',
+        type=int,
+        default=6,
+        help='근접 중복으로 볼 지각 해시 해밍 거리 (기본값: 6)'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='병렬 작업 프로세스 수 (기본값: CPU 수)'
+    )
+    parser.add_argument(
+        '--seconds_per_image',
+        type=float,
+        default=None,
+        help='에포크당 이미지 1장 처리 시간 (절약 시간 추정용, 선택사항)'
+    )
+    
+    args = parser.parse_args()
+    
+    if not os.path.exists(args.data_dir):
+        print(f"오류: 데이터 디렉토리가 존재하지 않습니다: {args.data_dir}")
+        return 1
+    
+    quality_checker = DataQualityChecker(max_workers=args.workers)
+    deduplicator = DatasetDeduplicator(
+        quality_checker,
+        hamming_threshold=args.threshold,
+        max_workers=args.workers
+    )
+    
+    try:
+        report = deduplicator.deduplicate(
+            args.data_dir,
+            output_path=args.output,
+            seconds_per_image=args.seconds_per_image
+        )
+    except Exception as e:
+        print(f"오류: 중복 제거 중 문제가 발생했습니다: {e}")
+        return 1
+    
+    print("=" * 50)
+    print("중복 제거 결과")
+    print("=" * 50)
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    print(f"\n전체 {report['total_images']}장 중 {report['removed_images']}장 제거 "
+          f"(에포크 시간 약 {report['epoch_time_saved_ratio'] * 100:.1f}% 절약)")
+    
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+배출 장소 대량 가져오기 스크립트
+
+CSV/JSON(JSON Lines 포함) 파일의 배출 장소를 배치 단위로 로컬 DB에 반영합니다.
+같은 출처(--source) 안에서 external_id(없으면 이름+주소)로 upsert하므로 다시 실행해도 안전합니다.
+
+CSV 컬럼 / JSON 필드:
+    name, address, latitude, longitude, waste_types(콤마 구분)는 필수,
+    external_id(또는 id), operating_hours, contact_info, description은 선택
+
+사용법:
+    python import_locations.py facilities.csv
+    python import_locations.py facilities.jsonl --source nationwide --batch_size 10000
+"""
+import sys
+import os
+import argparse
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.database import engine, DATABASE_URL, create_tables
+from app.services.location_import import LocationImportService, IMPORT_SOURCE, IMPORT_FORMATS, detect_import_format
+
+def print_progress(result):
+    print(f"   {result['rows']}행 처리 (삽입 {result['inserted']}, 갱신 {result['updated']}, "
+          f"변경 없음 {result['unchanged']}, 오류 {result['invalid']}) - {result['rows_per_second']}행/초")
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description='배출 장소 대량 가져오기')
+    parser.add_argument('path', type=str, help='CSV/JSON 파일 경로')
+    parser.add_argument('--format', type=str, choices=IMPORT_FORMATS, default=None,
+                        help='파일 형식 (기본값: 확장자로 판단)')
+    parser.add_argument('--source', type=str, default=IMPORT_SOURCE, help='데이터 출처')
+    parser.add_argument('--batch_size', type=int, default=None, help='한 번에 쓰는 행 수')
+    args = parser.parse_args()
+    
+    print("=" * 50)
+    print("배출 장소 대량 가져오기")
+    print("=" * 50)
+    print(f"대상 DB: {DATABASE_URL}")
+    print(f"파일: {args.path}")
+    
+    try:
+        file_format = args.format or detect_import_format(args.path)
+        create_tables()
+        service = LocationImportService(engine, batch_size=args.batch_size)
+        with open(args.path, 'r', encoding='utf-8-sig', newline='') as stream:
+            result = service.import_stream(stream, file_format, args.source, progress=print_progress)
+        
+        print(f"✅ 가져오기 완료 ({result['duration_seconds']}초, {result['rows_per_second']}행/초)")
+        for key in ('rows', 'inserted', 'updated', 'unchanged', 'invalid'):
+            print(f"   {key}: {result[key]}")
+        for error in result['errors'][:10]:
+            print(f"   ⚠️ {error['row']}행: {error['error']}")
+        if result['invalid'] > 10:
+            print(f"   ... 외 {result['invalid'] - 10}건")
+        return 0
+    except Exception as e:
+        print(f"❌ 오류: 가져오기 중 문제가 발생했습니다: {e}")
+        return 1
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+데이터베이스 마이그레이션 스크립트
+
+기존 DB에 새 컬럼/인덱스를 추가하고 데이터를 백필합니다 (예: 위치 geohash).
+"""
+import sys
+import os
+import argparse
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.database import engine, DATABASE_URL
+from app.core.migrations import MIGRATIONS, applied_migrations, run_migrations
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description='데이터베이스 마이그레이션')
+    parser.add_argument('--status', action='store_true', help='적용 상태만 출력')
+    args = parser.parse_args()
+    
+    print("=" * 50)
+    print("데이터베이스 마이그레이션")
+    print("=" * 50)
+    print(f"대상 DB: {DATABASE_URL}")
+    
+    try:
+        if args.status:
+            done = set(applied_migrations(engine))
+            for version, description, _ in MIGRATIONS:
+                mark = "✅" if version in done else "⏳"
+                print(f"{mark} {version} - {description}")
+            return 0
+        
+        applied = run_migrations(engine)
+        if applied:
+            print(f"✅ 마이그레이션 {len(applied)}개 적용 완료")
+        else:
+            print("✅ 적용할 마이그레이션이 없습니다.")
+        return 0
+    except Exception as e:
+        print(f"❌ 오류: 마이그레이션 중 문제가 발생했습니다: {e}")
+        return 1
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+공공 배출시설 동기화 스크립트
+
+공공 API의 전체 시설 목록을 받아 로컬 DB에 반영합니다. 여러 워커로 서버를 띄우는 경우
+앱 안의 주기 동기화(FACILITY_SYNC_INTERVAL) 대신 cron 등으로 이 스크립트를 실행하세요.
+"""
+import sys
+import os
+import asyncio
+import argparse
+
+# 프로젝트 루트를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.database import SessionLocal, DATABASE_URL, create_tables
+from app.core.http_client import close_http_client
+from app.services.public_api_service import PublicAPIService
+from app.services.facility_sync import FacilitySyncService
+
+async def run(args):
+    service = FacilitySyncService(
+        PublicAPIService(),
+        SessionLocal,
+        page_size=args.page_size,
+        concurrency=args.concurrency,
+        max_delete_ratio=args.max_delete_ratio
+    )
+    try:
+        return await service.sync()
+    finally:
+        await close_http_client()
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description='공공 배출시설 동기화')
+    parser.add_argument('--page_size', type=int, default=None, help='페이지당 시설 수')
+    parser.add_argument('--concurrency', type=int, default=None, help='동시 페이지 요청 수')
+    parser.add_argument('--max_delete_ratio', type=float, default=None,
+                        help='한 번에 비활성화할 수 있는 최대 비율')
+    args = parser.parse_args()
+    
+    print("=" * 50)
+    print("공공 배출시설 동기화")
+    print("=" * 50)
+    print(f"대상 DB: {DATABASE_URL}")
+    
+    try:
+        create_tables()
+        result = asyncio.run(run(args))
+        print(f"✅ 동기화 완료 ({result['duration_seconds']}초)")
+        for key in ('pages', 'failed_pages', 'fetched', 'invalid', 'inserted', 'updated',
+                    'unchanged', 'deactivated', 'deactivation_skipped'):
+            print(f"   {key}: {result[key]}")
+        return 0 if result['failed_pages'] == 0 else 1
+    except Exception as e:
+        print(f"❌ 오류: 동기화 중 문제가 발생했습니다: {e}")
+        return 1
+
+if __name__ == "__main__":
+    exit(main())
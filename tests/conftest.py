@@ -0,0 +1,36 @@
+"""
+테스트 공통 설정
+
+app.core.database는 import 시점에 DATABASE_URL로 엔진을 만들므로, 테스트가 작업 디렉토리의
+recycling_app.db를 건드리지 않도록 메모리 DB를 기본값으로 지정합니다.
+각 테스트는 임시 디렉토리의 SQLite 파일 DB를 사용합니다.
+"""
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+import pytest
+
+from app.core.database import create_db_engine
+from app.models.location import Base
+
+
+@pytest.fixture
+def db_url(tmp_path) -> str:
+    """임시 SQLite 파일 DB URL (테이블 없음)"""
+    return f"sqlite:///{tmp_path / 'test.db'}"
+
+
+@pytest.fixture
+def engine(db_url):
+    """PRAGMA를 적용한 빈 DB 엔진"""
+    db_engine = create_db_engine(db_url)
+    yield db_engine
+    db_engine.dispose()
+
+
+@pytest.fixture
+def location_engine(engine):
+    """현재 모델 스키마로 테이블을 만든 엔진"""
+    Base.metadata.create_all(bind=engine)
+    return engine
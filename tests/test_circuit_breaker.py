@@ -0,0 +1,153 @@
+"""
+서킷 브레이커 상태 전이 테스트
+"""
+import asyncio
+import time
+
+import pytest
+
+from app.core.circuit_breaker import (
+    CircuitBreaker,
+    CircuitOpenError,
+    STATE_CLOSED,
+    STATE_OPEN,
+    STATE_HALF_OPEN
+)
+
+
+async def _ok():
+    return 'ok'
+
+
+async def _fail():
+    raise ConnectionError("upstream down")
+
+
+def _breaker(**kwargs) -> CircuitBreaker:
+    options = {
+        'consecutive_failure_threshold': 3,
+        'min_calls': 100,
+        'open_seconds': 0.05,
+        'max_timeout': 1.0,
+    }
+    options.update(kwargs)
+    return CircuitBreaker('test', **options)
+
+
+async def _fail_times(breaker: CircuitBreaker, count: int):
+    for _ in range(count):
+        with pytest.raises(ConnectionError):
+            await breaker.call(_fail)
+
+
+def test_consecutive_failures_open_circuit():
+    async def scenario():
+        breaker = _breaker()
+        await _fail_times(breaker, 2)
+        assert breaker.state == STATE_CLOSED
+        await _fail_times(breaker, 1)
+        assert breaker.state == STATE_OPEN
+        
+        # 열린 동안에는 호출하지 않고 바로 실패
+        calls = []
+        
+        async def tracked():
+            calls.append(1)
+        
+        with pytest.raises(CircuitOpenError):
+            await breaker.call(tracked)
+        assert calls == []
+        assert breaker.stats()['rejected'] == 1
+        assert breaker.stats()['opened'] == 1
+    
+    asyncio.run(scenario())
+
+
+def test_failure_rate_opens_circuit():
+    async def scenario():
+        breaker = _breaker(consecutive_failure_threshold=100, min_calls=4, failure_rate_threshold=0.5)
+        for func in (_ok, _fail, _ok):
+            try:
+                await breaker.call(func)
+            except ConnectionError:
+                pass
+        assert breaker.state == STATE_CLOSED
+        await _fail_times(breaker, 1)
+        assert breaker.state == STATE_OPEN
+    
+    asyncio.run(scenario())
+
+
+def test_half_open_probe_success_closes_circuit():
+    async def scenario():
+        breaker = _breaker()
+        await _fail_times(breaker, 3)
+        await asyncio.sleep(0.06)
+        
+        assert breaker.allow_request()
+        assert breaker.state == STATE_HALF_OPEN
+        assert await breaker.call(_ok) == 'ok'
+        assert breaker.state == STATE_CLOSED
+        assert breaker.stats()['recent_failure_rate'] == 0.0
+    
+    asyncio.run(scenario())
+
+
+def test_half_open_probe_failure_reopens_with_longer_wait():
+    async def scenario():
+        breaker = _breaker()
+        await _fail_times(breaker, 3)
+        await asyncio.sleep(0.06)
+        
+        await _fail_times(breaker, 1)
+        assert breaker.state == STATE_OPEN
+        assert breaker.stats()['opened'] == 2
+        
+        # 대기 시간이 두 배(0.1초)가 되어 처음 대기 시간만 지나서는 반열림으로 가지 않음
+        await asyncio.sleep(0.06)
+        assert not breaker.allow_request()
+        await asyncio.sleep(0.06)
+        assert breaker.allow_request()
+    
+    asyncio.run(scenario())
+
+
+def test_half_open_allows_single_probe():
+    async def scenario():
+        breaker = _breaker()
+        await _fail_times(breaker, 3)
+        await asyncio.sleep(0.06)
+        
+        release = asyncio.Event()
+        
+        async def slow_ok():
+            await release.wait()
+            return 'ok'
+        
+        probe = asyncio.ensure_future(breaker.call(slow_ok))
+        await asyncio.sleep(0)
+        with pytest.raises(CircuitOpenError):
+            await breaker.call(_ok)
+        
+        release.set()
+        assert await probe == 'ok'
+        assert breaker.state == STATE_CLOSED
+    
+    asyncio.run(scenario())
+
+
+def test_timeout_counts_as_failure():
+    async def scenario():
+        breaker = _breaker(consecutive_failure_threshold=1, max_timeout=0.05)
+        
+        async def hang():
+            await asyncio.sleep(1)
+        
+        started = time.monotonic()
+        with pytest.raises(asyncio.TimeoutError):
+            await breaker.call(hang)
+        assert time.monotonic() - started < 0.5
+        assert breaker.stats()['timeouts'] == 1
+        assert breaker.state == STATE_OPEN
+    
+    asyncio.run(scenario())
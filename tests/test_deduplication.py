@@ -0,0 +1,92 @@
+"""
+훈련 데이터 중복 제거 (완전/근접 중복, 레이블 충돌) 테스트
+"""
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from app.core.deduplication import DatasetDeduplicator, BKTree, load_dedup_manifest
+from app.core.image_quality import DataQualityChecker
+
+
+def _pattern(seed: int, size=(256, 192)) -> Image.Image:
+    """시드별로 다른 저주파 무늬 (리사이즈해도 dHash가 유지됨)"""
+    rng = np.random.default_rng(seed)
+    coarse = rng.integers(0, 255, (6, 8), dtype=np.uint8)
+    return Image.fromarray(coarse).resize(size, Image.BILINEAR).convert('RGB')
+
+
+def _save(image: Image.Image, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    image.save(path, format='PNG')
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    data_dir = tmp_path / 'train'
+    # 같은 클래스 안의 완전 중복
+    _save(_pattern(1), str(data_dir / 'plastic' / 'a.png'))
+    (data_dir / 'plastic' / 'a_copy.png').write_bytes((data_dir / 'plastic' / 'a.png').read_bytes())
+    # 근접 중복 (축소본) - 해상도가 큰 원본을 남김
+    _save(_pattern(2), str(data_dir / 'plastic' / 'b_large.png'))
+    _save(_pattern(2, size=(128, 96)), str(data_dir / 'plastic' / 'b_small.png'))
+    # 다른 클래스의 완전 중복 - 레이블 충돌
+    _save(_pattern(3), str(data_dir / 'plastic' / 'c.png'))
+    _save(_pattern(3), str(data_dir / 'glass' / 'c.png'))
+    _save(_pattern(4), str(data_dir / 'glass' / 'd.png'))
+    return str(data_dir)
+
+
+def test_module_does_not_import_tensorflow():
+    code = (
+        "import sys; import app.core.deduplication; "
+        "sys.exit(1 if 'tensorflow' in sys.modules else 0)"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    assert subprocess.run([sys.executable, '-c', code], cwd=root).returncode == 0
+
+
+def test_deduplicate(dataset, tmp_path):
+    output_path = str(tmp_path / 'manifest.json')
+    report = DatasetDeduplicator(DataQualityChecker()).deduplicate(dataset, output_path)
+    
+    assert report['total_images'] == 7
+    assert report['exact_duplicates_removed'] == 1
+    assert report['near_duplicates_removed'] == 1
+    assert report['label_conflict_clusters'] == 1
+    
+    manifest = load_dedup_manifest(output_path)
+    kept = {image['path'] for image in manifest['images']}
+    assert kept == {
+        os.path.join('plastic', 'a.png'),
+        os.path.join('plastic', 'b_large.png'),
+        os.path.join('plastic', 'c.png'),
+        os.path.join('glass', 'c.png'),
+        os.path.join('glass', 'd.png'),
+    }
+    conflict = manifest['label_conflicts'][0]
+    assert {member['class_name'] for member in conflict['kept']} == {'plastic', 'glass'}
+
+
+def test_chained_near_duplicates_are_not_merged():
+    # A-B, B-C는 3비트 차이지만 A-C는 6비트 차이 (임계값 4)
+    hashes = [0b000000, 0b000111, 0b111111]
+    deduplicator = DatasetDeduplicator(DataQualityChecker(), hamming_threshold=4)
+    assert deduplicator._cluster_near_duplicates(hashes) == [0, 0, 2]
+
+
+def test_bk_tree_search_matches_brute_force():
+    rng = np.random.default_rng(5)
+    hashes = [int(h) for h in rng.integers(0, 2 ** 16, 500)]
+    tree = BKTree()
+    for index, value in enumerate(hashes):
+        tree.add(value, index)
+    
+    for query in hashes[:50]:
+        found = sorted(index for _, index in tree.search(query, 3))
+        expected = [i for i, value in enumerate(hashes) if bin(value ^ query).count('1') <= 3]
+        assert found == expected
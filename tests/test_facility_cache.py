@@ -0,0 +1,155 @@
+"""
+공공 시설 타일 캐시 (조회 합치기, stale-while-revalidate, negative caching) 테스트
+"""
+import asyncio
+
+import pytest
+
+from app.services import facility_cache
+from app.services.facility_cache import FacilityTileCache, TileFetchError
+
+LATITUDE, LONGITUDE = 37.5665, 126.9780
+
+
+class _Clock:
+    """캐시 모듈의 time.monotonic 대체 (이벤트 루프 시계는 그대로 둠)"""
+    
+    def __init__(self):
+        self.now = 1000.0
+    
+    def monotonic(self) -> float:
+        return self.now
+
+
+class _Fetcher:
+    """호출 횟수를 세는 상위 API 대역"""
+    
+    def __init__(self, facilities=None, delay: float = 0.0):
+        self.facilities = facilities if facilities is not None else [
+            {'name': '시청 수거함', 'latitude': LATITUDE + 0.001, 'longitude': LONGITUDE,
+             'waste_types': 'plastic,glass'},
+            {'name': '광화문 수거함', 'latitude': LATITUDE + 0.004, 'longitude': LONGITUDE + 0.002,
+             'waste_types': 'battery'},
+        ]
+        self.delay = delay
+        self.calls = []
+        self.error = None
+    
+    async def __call__(self, latitude, longitude, radius_km, waste_type):
+        self.calls.append((latitude, longitude, radius_km, waste_type))
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return [dict(f) for f in self.facilities]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = _Clock()
+    monkeypatch.setattr(facility_cache, 'time', fake)
+    return fake
+
+
+def test_missing_tiles_are_fetched_once_and_shared(clock):
+    fetcher = _Fetcher(delay=0.05)
+    cache = FacilityTileCache(fetcher, ttl_seconds=60, stale_seconds=60)
+    
+    async def scenario():
+        # 같은 타일을 덮는 동시 요청은 상위 API를 한 번만 호출
+        first, second = await asyncio.gather(
+            cache.get_facilities(LATITUDE, LONGITUDE, 1.0),
+            cache.get_facilities(LATITUDE, LONGITUDE, 1.0, waste_type='battery')
+        )
+        return first, second
+    
+    first, second = asyncio.run(scenario())
+    assert len(fetcher.calls) == 1
+    # 캐시는 모든 종류를 저장하고 조립 후 거름
+    assert fetcher.calls[0][3] is None
+    assert [f['name'] for f in first] == ['시청 수거함', '광화문 수거함']
+    assert [f['name'] for f in second] == ['광화문 수거함']
+    
+    # 이후 조회는 캐시 적중
+    asyncio.run(cache.get_facilities(LATITUDE, LONGITUDE, 1.0))
+    assert len(fetcher.calls) == 1
+    assert cache.stats()['hits'] > 0
+
+
+def test_stale_tiles_are_served_while_refreshing(clock):
+    fetcher = _Fetcher()
+    cache = FacilityTileCache(fetcher, ttl_seconds=60, stale_seconds=600)
+    
+    async def scenario():
+        await cache.get_facilities(LATITUDE, LONGITUDE, 1.0)
+        fetcher.facilities = [{'name': '새 수거함', 'latitude': LATITUDE, 'longitude': LONGITUDE,
+                               'waste_types': 'paper'}]
+        clock.now += 120
+        
+        # TTL이 지나도 stale 허용 시간 안이면 기존 데이터를 즉시 반환
+        stale = await cache.get_facilities(LATITUDE, LONGITUDE, 1.0)
+        await asyncio.gather(*list(cache._refresh_tasks))
+        fresh = await cache.get_facilities(LATITUDE, LONGITUDE, 1.0)
+        return stale, fresh
+    
+    stale, fresh = asyncio.run(scenario())
+    assert [f['name'] for f in stale] == ['시청 수거함', '광화문 수거함']
+    assert [f['name'] for f in fresh] == ['새 수거함']
+    stats = cache.stats()
+    assert stats['stale_hits'] > 0
+    assert stats['refreshes'] == 1
+    assert len(fetcher.calls) == 2
+
+
+def test_expired_stale_tiles_are_fetched_again(clock):
+    fetcher = _Fetcher()
+    cache = FacilityTileCache(fetcher, ttl_seconds=60, stale_seconds=60)
+    
+    asyncio.run(cache.get_facilities(LATITUDE, LONGITUDE, 1.0))
+    clock.now += 200
+    asyncio.run(cache.get_facilities(LATITUDE, LONGITUDE, 1.0))
+    assert len(fetcher.calls) == 2
+    assert cache.stats()['stale_hits'] == 0
+
+
+def test_failures_are_cached_for_negative_ttl(clock):
+    fetcher = _Fetcher()
+    fetcher.error = RuntimeError("상위 API 장애")
+    cache = FacilityTileCache(fetcher, negative_ttl_seconds=30)
+    
+    with pytest.raises(TileFetchError):
+        asyncio.run(cache.get_facilities(LATITUDE, LONGITUDE, 1.0))
+    assert len(fetcher.calls) == 1
+    
+    # negative TTL 안에서는 상위 API를 다시 호출하지 않음
+    with pytest.raises(TileFetchError):
+        asyncio.run(cache.get_facilities(LATITUDE, LONGITUDE, 1.0))
+    assert len(fetcher.calls) == 1
+    assert cache.stats()['negative_hits'] > 0
+    
+    fetcher.error = None
+    clock.now += 31
+    facilities = asyncio.run(cache.get_facilities(LATITUDE, LONGITUDE, 1.0))
+    assert len(fetcher.calls) == 2
+    assert len(facilities) == 2
+
+
+def test_failed_refresh_keeps_stale_data_and_delays_retry(clock):
+    fetcher = _Fetcher()
+    cache = FacilityTileCache(fetcher, ttl_seconds=60, stale_seconds=600, negative_ttl_seconds=30)
+    
+    async def scenario():
+        await cache.get_facilities(LATITUDE, LONGITUDE, 1.0)
+        fetcher.error = RuntimeError("상위 API 장애")
+        clock.now += 120
+        await cache.get_facilities(LATITUDE, LONGITUDE, 1.0)
+        await asyncio.gather(*list(cache._refresh_tasks))
+        
+        # 갱신이 실패해도 오래된 데이터를 반환하고, 재시도는 negative TTL 이후
+        facilities = await cache.get_facilities(LATITUDE, LONGITUDE, 1.0)
+        return facilities
+    
+    facilities = asyncio.run(scenario())
+    assert len(facilities) == 2
+    assert len(fetcher.calls) == 2
+    assert cache.stats()['refresh_failures'] == 1
@@ -0,0 +1,132 @@
+"""
+공공 시설 동기화 (내용 해시 비교 upsert, 비활성화 보호) 테스트
+"""
+import asyncio
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.models.location import RecyclingLocation, PUBLIC_API_SOURCE
+from app.services import facility_sync
+from app.services.facility_sync import FacilitySyncService
+
+
+def _facility(i: int, **overrides):
+    facility = {
+        'id': f'F{i:04d}',
+        'name': f'시설 {i}',
+        'address': f'서울 중구 {i}',
+        'latitude': 37.5 + i * 0.001,
+        'longitude': 127.0 + i * 0.001,
+        'waste_types': 'plastic, glass'
+    }
+    facility.update(overrides)
+    return facility
+
+
+class _PublicAPI:
+    """페이지 단위 상위 API 대역 (failing_pages의 페이지는 항상 실패)"""
+    
+    def __init__(self, facilities):
+        self.facilities = facilities
+        self.failing_pages = set()
+    
+    async def fetch_facility_page(self, page_no: int, page_size: int):
+        if page_no in self.failing_pages:
+            raise RuntimeError(f"{page_no}페이지 오류")
+        start = (page_no - 1) * page_size
+        return self.facilities[start:start + page_size], len(self.facilities)
+
+
+@pytest.fixture
+def session_factory(location_engine):
+    return sessionmaker(bind=location_engine)
+
+
+def _service(api, session_factory, **kwargs):
+    return FacilitySyncService(api, session_factory, page_size=4, concurrency=2, **kwargs)
+
+
+def _active_ids(session_factory):
+    session = session_factory()
+    try:
+        return {
+            row.external_id for row in session.query(RecyclingLocation.external_id)
+            .filter(RecyclingLocation.source == PUBLIC_API_SOURCE, RecyclingLocation.is_active == True)
+        }
+    finally:
+        session.close()
+
+
+def test_only_changed_facilities_are_written(session_factory):
+    api = _PublicAPI([_facility(i) for i in range(10)])
+    service = _service(api, session_factory)
+    
+    result = asyncio.run(service.sync())
+    assert result['inserted'] == 10
+    assert result['pages'] == 3
+    
+    result = asyncio.run(service.sync())
+    assert (result['inserted'], result['updated'], result['unchanged']) == (0, 0, 10)
+    
+    api.facilities[3] = _facility(3, name='이름 변경')
+    result = asyncio.run(service.sync())
+    assert (result['inserted'], result['updated'], result['unchanged']) == (0, 1, 9)
+    
+    session = session_factory()
+    try:
+        location = session.query(RecyclingLocation).filter_by(external_id='F0003').one()
+        assert location.name == '이름 변경'
+        assert location.waste_types == 'plastic,glass'
+        assert location.geohash is not None and location.waste_type_mask
+    finally:
+        session.close()
+
+
+def test_invalid_facilities_are_skipped(session_factory):
+    api = _PublicAPI([_facility(0), _facility(1, latitude=0, longitude=0), _facility(2, id='')])
+    result = asyncio.run(_service(api, session_factory).sync())
+    assert (result['inserted'], result['invalid']) == (1, 2)
+
+
+def test_vanished_facilities_are_deactivated(session_factory):
+    api = _PublicAPI([_facility(i) for i in range(10)])
+    service = _service(api, session_factory)
+    asyncio.run(service.sync())
+    
+    del api.facilities[5]
+    result = asyncio.run(service.sync())
+    assert result['deactivated'] == 1
+    assert 'F0005' not in _active_ids(session_factory)
+    
+    # 다시 나타나면 활성화
+    api.facilities.append(_facility(5))
+    result = asyncio.run(service.sync())
+    assert result['updated'] == 1
+    assert 'F0005' in _active_ids(session_factory)
+
+
+def test_mass_disappearance_is_not_deactivated(session_factory):
+    api = _PublicAPI([_facility(i) for i in range(10)])
+    service = _service(api, session_factory, max_delete_ratio=0.3)
+    asyncio.run(service.sync())
+    
+    api.facilities = api.facilities[:5]
+    result = asyncio.run(service.sync())
+    assert result['deactivated'] == 0
+    assert result['deactivation_skipped'] == 5
+    assert len(_active_ids(session_factory)) == 10
+
+
+def test_incomplete_fetch_does_not_deactivate(session_factory, monkeypatch):
+    monkeypatch.setattr(facility_sync, 'PAGE_RETRIES', 0)
+    api = _PublicAPI([_facility(i) for i in range(10)])
+    service = _service(api, session_factory)
+    asyncio.run(service.sync())
+    
+    api.failing_pages = {2}
+    result = asyncio.run(service.sync())
+    assert result['failed_pages'] == 1
+    assert result['deactivated'] == 0
+    assert result['deactivation_skipped'] == 4
+    assert len(_active_ids(session_factory)) == 10
@@ -0,0 +1,54 @@
+"""
+NumPy 벡터화 거리 계산 (distances_from, distance_matrix, filter_by_distance) 테스트
+"""
+import random
+
+import numpy as np
+
+from app.core.geo import distance_matrix, distances_from, filter_by_distance, haversine_km
+
+
+def _points(n: int, seed: int):
+    rng = random.Random(seed)
+    return [rng.uniform(-89.0, 89.0) for _ in range(n)], [rng.uniform(-180.0, 180.0) for _ in range(n)]
+
+
+def test_distances_from_matches_scalar_haversine():
+    latitudes, longitudes = _points(500, 1)
+    distances = distances_from(37.5665, 126.9780, latitudes, longitudes)
+    
+    expected = [haversine_km(37.5665, 126.9780, lat, lon) for lat, lon in zip(latitudes, longitudes)]
+    assert distances.shape == (500,)
+    assert np.allclose(distances, expected, rtol=1e-9, atol=1e-6)
+
+
+def test_distance_matrix_matches_scalar_haversine():
+    lat_a, lon_a = _points(20, 2)
+    lat_b, lon_b = _points(30, 3)
+    matrix = distance_matrix(lat_a, lon_a, lat_b, lon_b)
+    
+    assert matrix.shape == (20, 30)
+    for i in range(20):
+        for j in range(30):
+            assert np.isclose(matrix[i, j], haversine_km(lat_a[i], lon_a[i], lat_b[j], lon_b[j]),
+                              rtol=1e-9, atol=1e-6)
+
+
+def test_antipodal_points_do_not_produce_nan():
+    distances = distances_from(0.0, 0.0, [0.0, 0.0], [180.0, -180.0])
+    assert not np.isnan(distances).any()
+    assert np.allclose(distances, np.pi * 6371.0)
+
+
+def test_filter_by_distance_keeps_radius_and_sorts():
+    locations = [
+        {'name': '먼 곳', 'latitude': 37.60, 'longitude': 127.00},
+        {'name': '가까운 곳', 'latitude': 37.5670, 'longitude': 126.9780},
+        {'name': '반경 밖', 'latitude': 35.18, 'longitude': 129.08},
+        {'name': '좌표 없음', 'latitude': None, 'longitude': None},
+    ]
+    result = filter_by_distance(locations, 37.5665, 126.9780, 10.0)
+    
+    assert [location['name'] for location in result] == ['가까운 곳', '먼 곳']
+    assert result[0]['distance_km'] == round(haversine_km(37.5665, 126.9780, 37.5670, 126.9780), 2)
+    assert filter_by_distance([], 37.5, 127.0, 1.0) == []
@@ -0,0 +1,78 @@
+"""
+이미지 품질 검사 (증분 매니페스트, 병렬 검사) 테스트
+"""
+import os
+import subprocess
+import sys
+
+import pytest
+from PIL import Image
+
+from app.core import image_quality
+from app.core.image_quality import DataQualityChecker, MANIFEST_FILENAME
+
+
+def _write_image(path, size=(64, 48), color=(200, 10, 10)):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    Image.new('RGB', size, color).save(path, format='JPEG')
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    data_dir = tmp_path / 'train'
+    for i in range(3):
+        _write_image(str(data_dir / 'plastic' / f'{i}.jpg'), color=(i * 40, 10, 10))
+    _write_image(str(data_dir / 'glass' / 'a.jpg'), size=(300, 300), color=(0, 0, 0))
+    # plastic/0.jpg와 내용이 같은 파일 (다른 클래스)
+    (data_dir / 'glass' / 'dup.jpg').write_bytes((data_dir / 'plastic' / '0.jpg').read_bytes())
+    (data_dir / 'glass' / 'broken.jpg').write_bytes(b'not an image')
+    return str(data_dir)
+
+
+def test_module_does_not_import_tensorflow():
+    code = (
+        "import sys; import app.core.image_quality; "
+        "sys.exit(1 if 'tensorflow' in sys.modules else 0)"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    assert subprocess.run([sys.executable, '-c', code], cwd=root).returncode == 0
+
+
+def test_quality_report(dataset):
+    report = DataQualityChecker().check_dataset_quality(dataset)
+    
+    assert report['total_images'] == 6
+    assert report['valid_images'] == 5
+    assert report['invalid_images'] == 1
+    assert report['class_distribution'] == {'glass': 2, 'plastic': 3}
+    assert report['duplicate_images'] == 1
+    assert report['cross_class_duplicates'] == 1
+    assert report['validated_images'] == 6
+
+
+def test_rescan_only_validates_changed_files(dataset):
+    checker = DataQualityChecker()
+    checker.check_dataset_quality(dataset)
+    assert os.path.exists(os.path.join(dataset, MANIFEST_FILENAME))
+    
+    report = checker.check_dataset_quality(dataset)
+    assert report['cached_images'] == 6
+    assert report['validated_images'] == 0
+    
+    _write_image(os.path.join(dataset, 'plastic', '1.jpg'), size=(80, 80), color=(1, 2, 3))
+    os.remove(os.path.join(dataset, 'glass', 'broken.jpg'))
+    report = checker.check_dataset_quality(dataset)
+    assert report['validated_images'] == 1
+    assert report['total_images'] == 5
+    assert report['invalid_images'] == 0
+
+
+def test_parallel_inspection_matches_serial(dataset, monkeypatch):
+    serial = DataQualityChecker(manifest_path=os.path.join(dataset, 'serial.json')).scan_dataset(dataset)
+    
+    monkeypatch.setattr(image_quality, 'PARALLEL_THRESHOLD', 0)
+    parallel = DataQualityChecker(manifest_path=os.path.join(dataset, 'parallel.json'),
+                                  max_workers=2).scan_dataset(dataset)
+    
+    key = lambda record: record['path']
+    assert sorted(serial, key=key) == sorted(parallel, key=key)
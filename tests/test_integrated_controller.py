@@ -0,0 +1,186 @@
+"""
+분류 + 위치 조회의 위치 미리 조회(prefetch) 취소/정리 테스트
+
+컨트롤러는 app.core.factories를 통해 분류 모델(TensorFlow)을 임포트하므로
+TensorFlow가 설치된 환경에서만 실행합니다.
+"""
+import asyncio
+import time
+
+import pytest
+
+pytest.importorskip("tensorflow")
+
+from fastapi import HTTPException
+
+from app.api.controllers.integrated_controller import IntegratedController
+
+WASTE_INFO = {'plastic': {'name': '플라스틱'}, 'glass': {'name': '유리'}}
+LOCATIONS = {
+    'plastic': [{'name': '수거함', 'address': '서울', 'distance_km': 0.3}],
+    'glass': []
+}
+
+
+class _Upload:
+    def __init__(self, content_type: str = 'image/jpeg'):
+        self.filename = 'photo.jpg'
+        self.content_type = content_type
+    
+    async def read(self) -> bytes:
+        return b'image'
+
+
+class _Classifier:
+    def __init__(self, result=None, delay: float = 0.0, error: Exception = None):
+        self.result = result or {
+            'predicted_class': 'plastic', 'confidence': 0.9,
+            'is_recyclable': True, 'class_probabilities': {'plastic': 0.9}
+        }
+        self.delay = delay
+        self.error = error
+    
+    def classify_image_from_bytes(self, contents: bytes):
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class _LocationService:
+    """조회 시작/취소를 기록하는 위치 서비스 대역 (release가 설정될 때까지 응답하지 않음)"""
+    
+    def __init__(self, error: Exception = None):
+        self.error = error
+        self.started = None
+        self.cancelled = False
+        self.release = None
+    
+    def get_waste_type_info(self):
+        return WASTE_INFO
+    
+    async def find_nearby_locations_multi(self, latitude, longitude, waste_types, radius_km, limit):
+        self.started = time.perf_counter()
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error is not None:
+            raise self.error
+        return {waste_type: LOCATIONS.get(waste_type, []) for waste_type in waste_types}
+    
+    async def find_nearby_locations(self, **kwargs):
+        return []
+
+
+def _controller(classifier, location_service):
+    controller = IntegratedController.__new__(IntegratedController)
+    controller.classifier = classifier
+    controller.location_service = location_service
+    return controller
+
+
+def _run(scenario):
+    """시나리오 실행 (회수되지 않은 작업 예외를 함께 반환)"""
+    unhandled = []
+    
+    async def main():
+        loop = asyncio.get_running_loop()
+        loop.set_exception_handler(lambda _, context: unhandled.append(context))
+        return await scenario()
+    
+    return asyncio.run(main()), unhandled
+
+
+def test_lookup_overlaps_inference():
+    locations = _LocationService()
+    classifier = _Classifier(delay=0.2)
+    controller = _controller(classifier, locations)
+    
+    async def scenario():
+        locations.release = asyncio.Event()
+        asyncio.get_running_loop().call_later(0.1, locations.release.set)
+        started = time.perf_counter()
+        response = await controller.classify_and_find_locations(_Upload(), 37.5, 127.0, 2.0, 5)
+        return response, started
+    
+    (response, started), unhandled = _run(scenario)
+    assert response.success
+    assert response.data['nearby_locations']['locations'] == LOCATIONS['plastic']
+    # 위치 조회는 추론을 기다리지 않고 시작
+    assert locations.started - started < 0.1
+    assert not locations.cancelled
+    assert not unhandled
+
+
+def test_prefetch_is_cancelled_when_classification_fails():
+    locations = _LocationService()
+    controller = _controller(_Classifier(result={'error': '이미지를 읽을 수 없습니다'}), locations)
+    
+    async def scenario():
+        locations.release = asyncio.Event()
+        response = await controller.classify_and_find_locations(_Upload(), 37.5, 127.0, 2.0, 5)
+        await asyncio.sleep(0)
+        return response, asyncio.all_tasks() - {asyncio.current_task()}
+    
+    (response, pending), unhandled = _run(scenario)
+    assert not response.success
+    assert locations.cancelled
+    assert not pending
+    assert not unhandled
+
+
+def test_prefetch_is_cancelled_when_inference_raises():
+    locations = _LocationService()
+    controller = _controller(_Classifier(error=RuntimeError("모델 오류")), locations)
+    
+    async def scenario():
+        locations.release = asyncio.Event()
+        with pytest.raises(HTTPException):
+            await controller.classify_and_find_locations(_Upload(), 37.5, 127.0, 2.0, 5)
+        await asyncio.sleep(0)
+        return asyncio.all_tasks() - {asyncio.current_task()}
+    
+    pending, unhandled = _run(scenario)
+    assert locations.cancelled
+    assert not pending
+    assert not unhandled
+
+
+def test_failed_prefetch_is_collected_without_warning():
+    # 분류가 실패하기 전에 위치 조회가 먼저 실패해도 작업 예외가 회수되어야 함
+    locations = _LocationService(error=RuntimeError("DB 오류"))
+    controller = _controller(_Classifier(result={'error': '분류 실패'}, delay=0.1), locations)
+    
+    async def scenario():
+        locations.release = asyncio.Event()
+        locations.release.set()
+        response = await controller.classify_and_find_locations(_Upload(), 37.5, 127.0, 2.0, 5)
+        return response
+    
+    response, unhandled = _run(scenario)
+    assert not response.success
+    assert not locations.cancelled
+    assert not unhandled
+
+
+def test_batch_prefetch_is_cancelled_when_no_image_is_classified():
+    locations = _LocationService()
+    controller = _controller(_Classifier(), locations)
+    
+    async def scenario():
+        locations.release = asyncio.Event()
+        response = await controller.batch_classify_and_find_locations(
+            [_Upload('text/plain'), _Upload('application/pdf')], 37.5, 127.0, 2.0, 5
+        )
+        await asyncio.sleep(0)
+        # 시작 전에 취소되었거나 조회 중에 취소되어 남은 작업이 없어야 함
+        return response, asyncio.all_tasks() - {asyncio.current_task()}
+    
+    (response, pending), unhandled = _run(scenario)
+    assert response.success
+    assert all(result['error'] for result in response.data['results'])
+    assert locations.started is None or locations.cancelled
+    assert not pending
+    assert not unhandled
@@ -0,0 +1,81 @@
+"""
+배출 장소 대량 가져오기 (JSON 스트리밍, 출처 검증, 배치 upsert) 테스트
+"""
+import io
+import json
+
+import pytest
+
+from app.models.location import LOCAL_SOURCE, PUBLIC_API_SOURCE
+from app.services.location_import import (
+    LocationImportService,
+    iter_json_rows,
+    validate_import_source
+)
+
+ROWS = [
+    {'name': '강남 "재활용" 센터', 'address': '서울 강남구 [1]', 'latitude': 37.4979,
+     'longitude': 127.0276, 'waste_types': 'plastic, glass', 'description': '},{ 괄호가 든 설명'},
+    {'name': '마포 클린하우스', 'address': '서울 마포구', 'latitude': 37.5663,
+     'longitude': 126.9019, 'waste_types': ['paper', 'metal']},
+    {'external_id': 'J-3', 'name': '종로 수거함', 'address': '서울 종로구', 'latitude': 37.5735,
+     'longitude': 126.9790, 'waste_types': 'battery'},
+]
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 7, 64, 1 << 16])
+def test_json_array_is_streamed_across_chunk_boundaries(chunk_size):
+    text = json.dumps(ROWS, ensure_ascii=False, indent=2)
+    assert list(iter_json_rows(io.StringIO(text), chunk_size=chunk_size)) == ROWS
+
+
+@pytest.mark.parametrize('chunk_size', [1, 5, 1 << 16])
+def test_json_lines_are_streamed_across_chunk_boundaries(chunk_size):
+    text = '\n'.join(json.dumps(row, ensure_ascii=False) for row in ROWS) + '\n'
+    assert list(iter_json_rows(io.StringIO(text), chunk_size=chunk_size)) == ROWS
+
+
+def test_truncated_json_is_rejected():
+    text = json.dumps(ROWS, ensure_ascii=False)[:-20]
+    with pytest.raises(ValueError):
+        list(iter_json_rows(io.StringIO(text), chunk_size=8))
+
+
+@pytest.mark.parametrize('source', [LOCAL_SOURCE, PUBLIC_API_SOURCE, '', 'Upper', 'has space', 'x' * 51])
+def test_reserved_or_malformed_sources_are_rejected(source):
+    with pytest.raises(ValueError):
+        validate_import_source(source)
+
+
+def test_reserved_source_is_rejected_before_reading(location_engine):
+    service = LocationImportService(location_engine)
+    with pytest.raises(ValueError):
+        service.import_stream(io.StringIO(json.dumps(ROWS)), 'json', source=PUBLIC_API_SOURCE)
+
+
+def test_import_is_idempotent(location_engine):
+    service = LocationImportService(location_engine, batch_size=2)
+    rows = ROWS + [{'name': '좌표 없음', 'address': '어딘가', 'waste_types': 'plastic'}]
+    text = json.dumps(rows, ensure_ascii=False)
+    
+    result = service.import_stream(io.StringIO(text), 'json', source='seoul-2024')
+    assert (result['rows'], result['inserted'], result['invalid']) == (4, 3, 1)
+    assert result['errors'][0]['row'] == 4
+    
+    result = service.import_stream(io.StringIO(text), 'json', source='seoul-2024')
+    assert (result['inserted'], result['updated'], result['unchanged']) == (0, 0, 3)
+    
+    rows[2] = dict(rows[2], name='종로 수거함 (이전)')
+    result = service.import_stream(io.StringIO(json.dumps(rows, ensure_ascii=False)), 'json',
+                                   source='seoul-2024')
+    assert (result['inserted'], result['updated'], result['unchanged']) == (0, 1, 2)
+
+
+def test_csv_import(location_engine):
+    text = (
+        "name,address,latitude,longitude,waste_types\n"
+        "강남 재활용센터,서울 강남구,37.4979,127.0276,\"plastic,glass\"\n"
+        "잘못된 좌표,서울,abc,127.0,plastic\n"
+    )
+    result = LocationImportService(location_engine).import_stream(io.StringIO(text), 'csv')
+    assert (result['inserted'], result['invalid']) == (1, 1)
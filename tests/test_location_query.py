@@ -0,0 +1,130 @@
+"""
+geohash 셀 커버 반경 검색 (LocationQueryBuilder.within_cells)과 쓰레기 종류 인덱스 테스트
+"""
+import random
+
+import numpy as np
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+
+from app.core.geo import encode_geohash, haversine_km
+from app.models.location import RecyclingLocation, waste_type_mask
+from app.repositories.location_repository import LocationQueryBuilder, LocationRepository
+
+LAT_RANGE = (37.40, 37.70)
+LON_RANGE = (126.80, 127.20)
+
+
+@pytest.fixture
+def locations(location_engine):
+    """무작위 배출 장소 (일부 비활성) 삽입 후 (세션, 행 목록) 반환"""
+    rng = random.Random(11)
+    rows = []
+    for i in range(3000):
+        latitude, longitude = rng.uniform(*LAT_RANGE), rng.uniform(*LON_RANGE)
+        rows.append({
+            'name': f'장소 {i}',
+            'address': f'주소 {i}',
+            'latitude': latitude,
+            'longitude': longitude,
+            'geohash': encode_geohash(latitude, longitude),
+            'waste_types': 'plastic' if i % 3 else 'glass,battery',
+            'waste_type_mask': waste_type_mask('plastic' if i % 3 else 'glass,battery'),
+            'is_active': i % 10 != 0
+        })
+    with location_engine.begin() as connection:
+        connection.execute(RecyclingLocation.__table__.insert(), rows)
+    
+    session = sessionmaker(bind=location_engine)()
+    yield session, rows
+    session.close()
+
+
+@pytest.mark.parametrize('radius_km', [0.5, 2.0, 5.0])
+def test_within_cells_top_k_matches_brute_force(locations, radius_km):
+    session, rows = locations
+    rng = random.Random(int(radius_km * 10))
+    k = 10
+    
+    for _ in range(25):
+        latitude, longitude = rng.uniform(*LAT_RANGE), rng.uniform(*LON_RANGE)
+        found = (
+            LocationQueryBuilder(session)
+            .active_only()
+            .within_cells(latitude, longitude, radius_km)
+            .order_by_distance(latitude, longitude)
+            .limit(k)
+            .build()
+        )
+        found_distances = sorted(
+            d for d in (haversine_km(latitude, longitude, r.latitude, r.longitude) for r in found)
+            if d <= radius_km
+        )
+        
+        expected = sorted(
+            d for d in (
+                haversine_km(latitude, longitude, row['latitude'], row['longitude'])
+                for row in rows if row['is_active']
+            )
+            if d <= radius_km
+        )[:k]
+        
+        assert len(found_distances) == len(expected)
+        assert np.allclose(found_distances, expected)
+
+
+def test_within_cells_returns_every_location_in_radius(locations):
+    session, rows = locations
+    latitude, longitude, radius_km = 37.55, 127.0, 3.0
+    
+    found = (
+        LocationQueryBuilder(session)
+        .active_only()
+        .within_cells(latitude, longitude, radius_km)
+        .build()
+    )
+    found_ids = {
+        r.id for r in found
+        if haversine_km(latitude, longitude, r.latitude, r.longitude) <= radius_km
+    }
+    
+    # 삽입 순서대로 id가 1부터 부여됨
+    expected_ids = {
+        i + 1 for i, row in enumerate(rows)
+        if row['is_active'] and haversine_km(latitude, longitude, row['latitude'], row['longitude']) <= radius_km
+    }
+    assert found_ids == expected_ids
+
+
+def _plan(session, query) -> str:
+    engine = session.get_bind()
+    sql = str(query.statement.compile(engine, compile_kwargs={'literal_binds': True}))
+    with engine.connect() as connection:
+        return ' | '.join(row[3] for row in connection.execute(text("EXPLAIN QUERY PLAN " + sql)))
+
+
+def test_waste_type_filter_uses_partial_index(locations):
+    session, rows = locations
+    
+    query = LocationQueryBuilder(session).active_only().by_waste_type('glass').query
+    assert 'ix_recycling_locations_type_glass' in _plan(session, query)
+    expected = {i + 1 for i, row in enumerate(rows) if row['is_active'] and 'glass' in row['waste_types']}
+    assert {location.id for location in query.all()} == expected
+    
+    found = LocationRepository(session).find_by_criteria({'waste_type': 'Glass'})
+    assert len(found) == sum(1 for row in rows if 'glass' in row['waste_types'])
+
+
+def test_radius_search_with_waste_type_keeps_geohash_index(locations):
+    session, _ = locations
+    query = (
+        LocationQueryBuilder(session)
+        .active_only()
+        .within_cells(37.55, 127.0, 2.0)
+        .by_waste_type('glass')
+        .order_by_distance(37.55, 127.0)
+        .limit(10)
+        .query
+    )
+    assert 'ix_recycling_locations_geohash' in _plan(session, query)
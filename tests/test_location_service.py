@@ -0,0 +1,167 @@
+"""
+주변 조회 (출처별 지연 예산, 여러 쓰레기 종류 한 번에 조회) 테스트
+"""
+import asyncio
+import random
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.core.geo import encode_geohash, filter_by_distance
+from app.models.location import RecyclingLocation, waste_type_mask
+from app.services.location_service import LocationService
+from app.services.spatial_index import LocationSpatialIndex
+
+LATITUDE, LONGITUDE = 37.55, 127.0
+WASTE_TYPES = ['plastic', 'glass', 'battery']
+
+
+class _PublicAPI:
+    """반경 안의 고정 시설을 거리순으로 돌려주는 공공 API 대역"""
+    
+    def __init__(self, facilities, delay: float = 0.0, error: Exception = None):
+        self.facilities = facilities
+        self.delay = delay
+        self.error = error
+        self.calls = []
+    
+    async def get_waste_facilities(self, latitude, longitude, radius_km, waste_type=None):
+        self.calls.append(waste_type)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return filter_by_distance([dict(f) for f in self.facilities], latitude, longitude, radius_km)
+
+
+@pytest.fixture
+def session(location_engine):
+    rng = random.Random(3)
+    type_choices = ['plastic', 'glass', 'battery', 'paper', 'plastic,glass', 'glass,battery']
+    rows = []
+    for i in range(300):
+        latitude, longitude = LATITUDE + rng.uniform(-0.03, 0.03), LONGITUDE + rng.uniform(-0.03, 0.03)
+        waste_types = rng.choice(type_choices)
+        # Core insert는 ORM 이벤트 리스너를 거치지 않으므로 geohash/비트마스크를 직접 계산
+        rows.append({
+            'name': f'장소 {i}',
+            'address': f'주소 {i}',
+            'latitude': latitude,
+            'longitude': longitude,
+            'geohash': encode_geohash(latitude, longitude),
+            'waste_types': waste_types,
+            'waste_type_mask': waste_type_mask(waste_types),
+            'is_active': i % 7 != 0
+        })
+    with location_engine.begin() as connection:
+        connection.execute(RecyclingLocation.__table__.insert(), rows)
+    db_session = sessionmaker(bind=location_engine)()
+    yield db_session
+    db_session.close()
+
+
+def _names(locations):
+    return [location['name'] for location in locations]
+
+
+@pytest.mark.parametrize('use_index', [False, True])
+def test_multi_matches_per_type_lookups(session, use_index):
+    location_index = LocationSpatialIndex() if use_index else None
+    service = LocationService(session, location_index=location_index,
+                              public_api_service=_PublicAPI([]), use_public_api=False)
+    
+    async def scenario():
+        combined = await service.find_nearby_locations_multi(LATITUDE, LONGITUDE, WASTE_TYPES, 2.0, 5)
+        separate = {
+            waste_type: await service.find_nearby_locations(LATITUDE, LONGITUDE, waste_type, 2.0, 5)
+            for waste_type in WASTE_TYPES
+        }
+        return combined, separate
+    
+    combined, separate = asyncio.run(scenario())
+    assert set(combined) == set(WASTE_TYPES)
+    for waste_type in WASTE_TYPES:
+        assert len(combined[waste_type]) == 5
+        assert _names(combined[waste_type]) == _names(separate[waste_type])
+        for location in combined[waste_type]:
+            assert waste_type in location['waste_types']
+
+
+def test_public_api_is_called_once_and_partitioned(session):
+    facilities = [
+        {'name': '공공 수거함 A', 'address': '서울 중구', 'latitude': LATITUDE, 'longitude': LONGITUDE,
+         'waste_types': 'plastic, glass'},
+        {'name': '공공 수거함 B', 'address': '서울 중구', 'latitude': LATITUDE, 'longitude': LONGITUDE + 0.0001,
+         'waste_types': 'Battery'},
+        # A와 이름/주소가 같은 중복 시설
+        {'name': '공공 수거함 A', 'address': '서울 중구', 'latitude': LATITUDE + 0.0002, 'longitude': LONGITUDE,
+         'waste_types': 'plastic'},
+    ]
+    public_api = _PublicAPI(facilities)
+    service = LocationService(session, public_api_service=public_api, use_public_api=True)
+    
+    result = asyncio.run(service.find_nearby_locations_multi(LATITUDE, LONGITUDE, WASTE_TYPES, 2.0, 3))
+    
+    # 종류 필터 없이 한 번만 조회
+    assert public_api.calls == [None]
+    assert _names(result['plastic'])[0] == '공공 수거함 A'
+    assert _names(result['plastic']).count('공공 수거함 A') == 1
+    assert _names(result['glass'])[0] == '공공 수거함 A'
+    assert _names(result['battery'])[0] == '공공 수거함 B'
+    for locations in result.values():
+        distances = [location['distance_km'] for location in locations]
+        assert distances == sorted(distances)
+
+
+def test_partition_keeps_locations_accepting_several_types():
+    candidates = [
+        {'name': 'A', 'address': '1', 'waste_types': 'plastic,glass', 'distance_km': 0.1},
+        {'name': 'B', 'address': '2', 'waste_types': ['glass'], 'distance_km': 0.2},
+        {'name': 'C', 'address': '3', 'waste_types': 'paper', 'distance_km': 0.3},
+    ]
+    result = LocationService._partition_by_waste_type(candidates, ['plastic', 'glass', 'battery'], 1)
+    assert {waste_type: _names(locations) for waste_type, locations in result.items()} == {
+        'plastic': ['A'], 'glass': ['A'], 'battery': []
+    }
+
+
+PUBLIC_FACILITY = {'name': '공공 수거함', 'address': '서울 중구', 'latitude': LATITUDE, 'longitude': LONGITUDE,
+                   'waste_types': 'plastic'}
+
+
+def test_slow_public_api_is_not_awaited_past_its_budget(session, caplog):
+    service = LocationService(session, public_api_service=_PublicAPI([PUBLIC_FACILITY], delay=2.0))
+    service.public_api_budget = 0.1
+    
+    result = asyncio.run(service.search_nearby_locations(LATITUDE, LONGITUDE, 'plastic', 2.0, 5))
+    
+    sources = result['sources']
+    assert sources['public_api']['status'] == 'timeout'
+    assert sources['local_db']['status'] == 'ok'
+    assert sources['public_api']['elapsed_ms'] < 1000
+    assert len(result['locations']) == sources['local_db']['returned'] == 5
+    assert '조회 시간 초과' in caplog.text
+
+
+def test_failed_source_is_reported_and_other_results_are_kept(session, caplog):
+    service = LocationService(session, public_api_service=_PublicAPI([], error=RuntimeError("상위 API 오류")))
+    
+    result = asyncio.run(service.search_nearby_locations(LATITUDE, LONGITUDE, 'plastic', 2.0, 5))
+    
+    assert result['sources']['public_api']['status'] == 'error'
+    assert result['sources']['public_api']['error'] == '상위 API 오류'
+    assert result['sources']['public_api']['returned'] == 0
+    assert len(result['locations']) == 5
+    assert '조회 실패' in caplog.text
+
+
+def test_results_from_both_sources_are_merged_by_distance(session):
+    service = LocationService(session, public_api_service=_PublicAPI([PUBLIC_FACILITY]))
+    
+    result = asyncio.run(service.search_nearby_locations(LATITUDE, LONGITUDE, 'plastic', 2.0, 5))
+    
+    assert result['locations'][0]['name'] == '공공 수거함'
+    assert result['sources']['public_api']['returned'] == 1
+    assert result['sources']['local_db']['returned'] == 4
+    distances = [location['distance_km'] for location in result['locations']]
+    assert distances == sorted(distances)
@@ -0,0 +1,176 @@
+"""
+스키마 마이그레이션 테스트 (새 DB / 초기 스키마 DB 업그레이드)
+"""
+import pytest
+from sqlalchemy import inspect, text
+from sqlalchemy.orm import sessionmaker
+
+from app.core.geo import encode_geohash
+from app.core import migrations
+from app.core.migrations import MIGRATIONS, applied_migrations, run_migrations
+from app.models.location import Base, RecyclingLocation, LOCAL_SOURCE, WASTE_TYPE_INDEXES, waste_type_mask
+
+ALL_VERSIONS = [version for version, _, _ in MIGRATIONS]
+WASTE_TYPE_INDEX_NAMES = {index.name for index in WASTE_TYPE_INDEXES}
+
+# 마이그레이션 도입 전 초기 스키마
+BASELINE_SCHEMA = [
+    "CREATE TABLE recycling_locations ("
+    "id INTEGER NOT NULL PRIMARY KEY, "
+    "name VARCHAR(200) NOT NULL, "
+    "address VARCHAR(500) NOT NULL, "
+    "latitude FLOAT NOT NULL, "
+    "longitude FLOAT NOT NULL, "
+    "waste_types VARCHAR(200) NOT NULL, "
+    "operating_hours VARCHAR(100), "
+    "contact_info VARCHAR(100), "
+    "description TEXT, "
+    "is_active BOOLEAN, "
+    "created_at DATETIME, "
+    "updated_at DATETIME)",
+    "CREATE INDEX ix_recycling_locations_id ON recycling_locations (id)",
+    "CREATE TABLE user_locations ("
+    "id INTEGER NOT NULL PRIMARY KEY, "
+    "user_id VARCHAR(100), "
+    "latitude FLOAT NOT NULL, "
+    "longitude FLOAT NOT NULL, "
+    "address VARCHAR(500), "
+    "created_at DATETIME)",
+    "CREATE INDEX ix_user_locations_id ON user_locations (id)",
+]
+
+BASELINE_LOCATIONS = [
+    (1, '강남 재활용센터', '서울 강남구', 37.4979, 127.0276, 'plastic,glass'),
+    (2, '마포 클린하우스', '서울 마포구', 37.5663, 126.9019, 'paper, Metal'),
+    (3, '종로 수거함', '서울 종로구', 37.5735, 126.9790, 'battery'),
+]
+
+
+def _columns(engine, table: str):
+    return {column['name'] for column in inspect(engine).get_columns(table)}
+
+
+def _indexes(engine, table: str):
+    return {index['name'] for index in inspect(engine).get_indexes(table)}
+
+
+def _create_baseline(engine):
+    with engine.begin() as connection:
+        for statement in BASELINE_SCHEMA:
+            connection.execute(text(statement))
+        connection.execute(
+            text("INSERT INTO recycling_locations (id, name, address, latitude, longitude, waste_types, is_active) "
+                 "VALUES (:id, :name, :address, :latitude, :longitude, :waste_types, 1)"),
+            [
+                {'id': id_, 'name': name, 'address': address, 'latitude': lat, 'longitude': lon, 'waste_types': types}
+                for id_, name, address, lat, lon, types in BASELINE_LOCATIONS
+            ]
+        )
+        connection.execute(text(
+            "INSERT INTO user_locations (user_id, latitude, longitude) VALUES ('u1', 37.55, 126.99)"
+        ))
+
+
+def test_fresh_database(engine):
+    Base.metadata.create_all(bind=engine)
+    
+    assert run_migrations(engine) == ALL_VERSIONS
+    assert applied_migrations(engine) == sorted(ALL_VERSIONS)
+    assert run_migrations(engine) == []
+    
+    indexes = _indexes(engine, 'recycling_locations')
+    assert 'ix_recycling_locations_geohash' in indexes
+    assert 'ux_recycling_locations_source_external_id' in indexes
+    assert WASTE_TYPE_INDEX_NAMES <= indexes
+    assert 'ix_user_locations_geohash' in _indexes(engine, 'user_locations')
+
+
+def test_empty_database_records_migrations(engine):
+    # 테이블이 없으면 마이그레이션은 건너뛰고 기록만 남음 (이후 create_all이 현재 스키마로 생성)
+    assert run_migrations(engine) == ALL_VERSIONS
+    Base.metadata.create_all(bind=engine)
+    assert run_migrations(engine) == []
+
+
+def test_upgrade_from_baseline_schema(engine):
+    _create_baseline(engine)
+    
+    assert run_migrations(engine) == ALL_VERSIONS
+    
+    location_columns = _columns(engine, 'recycling_locations')
+    for column in ('geohash', 'waste_type_mask', 'source', 'external_id', 'content_hash', 'synced_at'):
+        assert column in location_columns
+    assert 'geohash' in _columns(engine, 'user_locations')
+    assert {'ix_recycling_locations_geohash', 'ux_recycling_locations_source_external_id'} | \
+        WASTE_TYPE_INDEX_NAMES <= _indexes(engine, 'recycling_locations')
+    
+    # 백필된 값은 ORM 이벤트 리스너가 계산하는 값과 같아야 함
+    session = sessionmaker(bind=engine)()
+    try:
+        locations = {location.id: location for location in session.query(RecyclingLocation).all()}
+        for id_, _, _, latitude, longitude, waste_types in BASELINE_LOCATIONS:
+            location = locations[id_]
+            assert location.geohash == encode_geohash(latitude, longitude)
+            assert location.waste_type_mask == waste_type_mask(waste_types)
+            assert location.source == LOCAL_SOURCE
+            assert location.external_id is None
+        assert locations[2].get_waste_types() == ['paper', 'metal']
+        assert locations[3].get_waste_types() == ['battery']
+    finally:
+        session.close()
+    
+    with engine.connect() as connection:
+        user_geohash = connection.execute(text("SELECT geohash FROM user_locations")).scalar()
+    assert user_geohash == encode_geohash(37.55, 126.99)
+    
+    # 업그레이드한 DB에도 현재 모델의 테이블/인덱스 생성이 충돌 없이 적용됨
+    Base.metadata.create_all(bind=engine)
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+
+def test_upgrade_drops_unused_location_indexes(engine):
+    _create_baseline(engine)
+    run_migrations(engine)
+    
+    # 0004 이전 버전이 만든 위경도 복합/종류별 부분 인덱스가 남아 있는 DB
+    with engine.begin() as connection:
+        connection.execute(text("DELETE FROM schema_migrations WHERE version = '0004_drop_unused_location_indexes'"))
+        connection.execute(text(
+            "CREATE INDEX ix_recycling_locations_lat_lon ON recycling_locations (latitude, longitude)"
+        ))
+        connection.execute(text(
+            "CREATE INDEX ix_recycling_locations_plastic_geohash ON recycling_locations (geohash) "
+            "WHERE (waste_type_mask & 4) != 0"
+        ))
+    
+    assert run_migrations(engine) == ['0004_drop_unused_location_indexes']
+    indexes = _indexes(engine, 'recycling_locations')
+    assert 'ix_recycling_locations_lat_lon' not in indexes
+    assert 'ix_recycling_locations_plastic_geohash' not in indexes
+    assert 'ix_recycling_locations_geohash' in indexes
+    assert WASTE_TYPE_INDEX_NAMES <= indexes
+
+
+def test_failed_migration_is_not_recorded_and_is_retried(engine, monkeypatch):
+    _create_baseline(engine)
+    calls = []
+    
+    def failing(connection):
+        calls.append(1)
+        connection.execute(text("ALTER TABLE recycling_locations ADD COLUMN geohash VARCHAR(12)"))
+        raise RuntimeError("마이그레이션 실패")
+    
+    version, description, _ = MIGRATIONS[0]
+    monkeypatch.setattr(migrations, 'MIGRATIONS', [(version, description, failing)] + MIGRATIONS[1:])
+    with pytest.raises(RuntimeError):
+        run_migrations(engine)
+    assert applied_migrations(engine) == []
+    
+    # SQLite 드라이버는 DDL을 바로 커밋하므로 추가된 컬럼이 남을 수 있어,
+    # 다시 실행할 때 각 마이그레이션이 이미 있는 컬럼/인덱스를 건너뛰어야 함
+    
+    monkeypatch.undo()
+    assert run_migrations(engine) == ALL_VERSIONS
+    assert len(calls) == 1
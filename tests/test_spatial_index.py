@@ -0,0 +1,154 @@
+"""
+인메모리 공간 인덱스 동시 적재 테스트
+"""
+import random
+import threading
+import time
+
+from sqlalchemy.orm import sessionmaker
+
+from app.core.geo import haversine_km
+from app.models.location import RecyclingLocation
+from app.services.spatial_index import LocationSpatialIndex
+
+
+def _add_locations(engine, count: int, seed: int = 7):
+    rng = random.Random(seed)
+    session = sessionmaker(bind=engine)()
+    for i in range(count):
+        session.add(RecyclingLocation(
+            name=f'장소 {i}',
+            address=f'주소 {i}',
+            latitude=rng.uniform(37.45, 37.65),
+            longitude=rng.uniform(126.85, 127.15),
+            waste_types=rng.choice(['plastic', 'glass,paper', 'plastic,metal']),
+            is_active=True
+        ))
+    session.commit()
+    session.close()
+
+
+def _slow_rebuild(index: LocationSpatialIndex, delay: float):
+    """rebuild 호출 수를 세고, 적재 중인 상태가 길게 유지되도록 지연"""
+    calls = []
+    rebuild = index.rebuild
+    
+    def wrapper(rows):
+        calls.append(threading.current_thread().name)
+        time.sleep(delay)
+        return rebuild(rows)
+    
+    index.rebuild = wrapper
+    return calls
+
+
+def test_concurrent_ensure_loaded_waits_for_single_load(location_engine):
+    _add_locations(location_engine, 300)
+    Session = sessionmaker(bind=location_engine)
+    index = LocationSpatialIndex()
+    calls = _slow_rebuild(index, 0.2)
+    
+    n_threads = 8
+    barrier = threading.Barrier(n_threads)
+    results = [None] * n_threads
+    
+    def query(slot: int):
+        session = Session()
+        try:
+            barrier.wait()
+            loaded = index.ensure_loaded(session)
+            # 적재를 기다린 호출자도 빈 격자가 아닌 전체 결과를 받아야 함
+            results[slot] = (loaded, index.within_radius(37.55, 127.0, 50.0))
+        finally:
+            session.close()
+    
+    threads = [threading.Thread(target=query, args=(i,)) for i in range(n_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+    
+    assert len(calls) == 1
+    assert len(index) == 300
+    for loaded, found in results:
+        assert loaded is True
+        assert len(found) == 300
+
+
+def test_ensure_loaded_without_wait_returns_false_while_loading(location_engine):
+    _add_locations(location_engine, 50)
+    Session = sessionmaker(bind=location_engine)
+    index = LocationSpatialIndex()
+    _slow_rebuild(index, 0.3)
+    
+    loader = threading.Thread(target=lambda: index.ensure_loaded(Session()))
+    loader.start()
+    while not index._loading:
+        time.sleep(0.01)
+    
+    session = Session()
+    try:
+        assert index.ensure_loaded(session, wait=False) is False
+        loader.join(timeout=10)
+        assert index.ensure_loaded(session, wait=False) is True
+    finally:
+        session.close()
+
+
+def test_failed_load_is_retried_by_waiting_caller(location_engine):
+    _add_locations(location_engine, 20)
+    Session = sessionmaker(bind=location_engine)
+    index = LocationSpatialIndex()
+    rebuild = index.rebuild
+    attempts = []
+    
+    def flaky_rebuild(rows):
+        attempts.append(1)
+        if len(attempts) == 1:
+            time.sleep(0.2)
+            raise RuntimeError("적재 실패")
+        return rebuild(rows)
+    
+    index.rebuild = flaky_rebuild
+    errors = []
+    
+    def failing_loader():
+        try:
+            index.ensure_loaded(Session())
+        except RuntimeError as e:
+            errors.append(e)
+    
+    loader = threading.Thread(target=failing_loader)
+    loader.start()
+    while not index._loading:
+        time.sleep(0.01)
+    
+    session = Session()
+    try:
+        assert index.ensure_loaded(session) is True
+    finally:
+        session.close()
+    loader.join(timeout=10)
+    
+    assert len(errors) == 1
+    assert len(attempts) == 2
+    assert len(index) == 20
+
+
+def test_nearest_matches_brute_force():
+    rng = random.Random(3)
+    rows = [
+        (i, rng.uniform(37.0, 38.0), rng.uniform(126.5, 127.5), rng.choice(['plastic', 'glass', 'plastic,glass']))
+        for i in range(2000)
+    ]
+    index = LocationSpatialIndex()
+    index.rebuild(rows)
+    
+    for _ in range(20):
+        latitude, longitude = rng.uniform(37.0, 38.0), rng.uniform(126.5, 127.5)
+        found = index.nearest(latitude, longitude, k=10, waste_type='glass')
+        expected = sorted(
+            (haversine_km(latitude, longitude, lat, lon), location_id)
+            for location_id, lat, lon, waste_types in rows if 'glass' in waste_types
+        )[:10]
+        assert [location_id for location_id, _ in found] == [location_id for _, location_id in expected]
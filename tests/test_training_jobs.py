@@ -0,0 +1,89 @@
+"""
+백그라운드 훈련 작업 취소/정리 테스트
+
+훈련 프로세스는 TensorFlow를 임포트하므로, TensorFlow가 없는 환경에서는 작업이 바로 실패합니다.
+취소 경로는 그와 무관하게 확인하고, 실패 보고 테스트는 TensorFlow가 없을 때만 실행합니다.
+"""
+import importlib.util
+import time
+
+import pytest
+
+from app.services.training_jobs import (
+    TrainingJobManager,
+    JOB_CANCELLED,
+    JOB_FAILED,
+    FINISHED_STATES
+)
+
+requires_missing_tensorflow = pytest.mark.skipif(
+    importlib.util.find_spec('tensorflow') is not None,
+    reason="TensorFlow가 설치되어 있으면 훈련이 실제로 실행됨"
+)
+
+
+@pytest.fixture
+def manager(tmp_path):
+    job_manager = TrainingJobManager(
+        max_concurrent_jobs=2,
+        cpu_cores=None,
+        nice=0,
+        artifact_dir=str(tmp_path / 'jobs'),
+        cancel_grace_seconds=5.0
+    )
+    yield job_manager
+    job_manager.shutdown(timeout=5.0)
+
+
+def _wait_until(predicate, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "제한 시간 안에 조건을 만족하지 않음"
+        time.sleep(0.05)
+
+
+def test_cancel_returns_without_joining_process(manager, tmp_path):
+    job = manager.submit(data_dir=str(tmp_path), epochs=1)
+    
+    started = time.monotonic()
+    cancelled = manager.cancel(job['job_id'])
+    assert time.monotonic() - started < 0.5
+    assert cancelled['status'] == JOB_CANCELLED
+    
+    # 프로세스는 수신 스레드가 정리
+    _wait_until(lambda: not manager._exiting)
+    assert manager.get_status(job['job_id'])['status'] == JOB_CANCELLED
+
+
+def test_cancel_finished_or_unknown_job(manager, tmp_path):
+    assert manager.cancel('missing') is None
+    job = manager.submit(data_dir=str(tmp_path), epochs=1)
+    manager.cancel(job['job_id'])
+    assert manager.cancel(job['job_id'])['status'] == JOB_CANCELLED
+
+
+@requires_missing_tensorflow
+def test_cancelled_job_does_not_affect_other_job_reports(manager, tmp_path):
+    first = manager.submit(data_dir=str(tmp_path), epochs=1)
+    second = manager.submit(data_dir=str(tmp_path), epochs=1)
+    manager.cancel(first['job_id'])
+    
+    _wait_until(lambda: manager.get_status(second['job_id'])['status'] in FINISHED_STATES)
+    status = manager.get_status(second['job_id'])
+    assert status['status'] == JOB_FAILED
+    assert 'tensorflow' in status['error'].lower()
+    assert manager.get_status(first['job_id'])['status'] == JOB_CANCELLED
+
+
+def test_process_ignoring_cancel_is_terminated_after_grace(manager):
+    process = manager._context.Process(target=time.sleep, args=(60,), daemon=True)
+    process.start()
+    manager._exiting.append(('stuck', {'process': process}, time.monotonic() + 0.3))
+    
+    # 정리 시간 전에는 기다리고, 지나면 강제 종료
+    manager._reap()
+    assert process.is_alive()
+    time.sleep(0.4)
+    manager._reap()
+    assert not process.is_alive()
+    assert process.exitcode is not None and process.exitcode < 0
@@ -0,0 +1,150 @@
+"""
+사용자 위치 지연 쓰기 버퍼 테스트
+"""
+import asyncio
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.database import async_database_url
+from app.services.user_location_buffer import UserLocationWriteBuffer
+
+
+def _count_rows(engine) -> int:
+    with engine.connect() as connection:
+        return connection.execute(text("SELECT COUNT(*) FROM user_locations")).scalar()
+
+
+async def _wait_until(predicate, timeout: float = 2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline, "제한 시간 안에 조건을 만족하지 않음"
+        await asyncio.sleep(0.01)
+
+
+def test_flush_when_batch_is_full(location_engine, db_url):
+    async def scenario():
+        async_engine = create_async_engine(async_database_url(db_url))
+        buffer = UserLocationWriteBuffer(async_engine, flush_size=5, flush_interval=60.0)
+        try:
+            for i in range(5):
+                result = await buffer.enqueue(37.5 + i * 0.001, 127.0, user_id='u1')
+                assert result['id'] is None
+            await _wait_until(lambda: buffer.flushed == 5)
+            assert buffer.batches == 1
+        finally:
+            await buffer.stop()
+            await async_engine.dispose()
+    
+    asyncio.run(scenario())
+    assert _count_rows(location_engine) == 5
+
+
+def test_flush_after_interval(location_engine, db_url):
+    async def scenario():
+        async_engine = create_async_engine(async_database_url(db_url))
+        buffer = UserLocationWriteBuffer(async_engine, flush_size=100, flush_interval=0.05)
+        try:
+            for _ in range(3):
+                await buffer.enqueue(37.5, 127.0)
+            assert buffer.stats()['pending'] == 3
+            await _wait_until(lambda: buffer.flushed == 3)
+            assert buffer.stats()['pending'] == 0
+        finally:
+            await buffer.stop()
+            await async_engine.dispose()
+    
+    asyncio.run(scenario())
+    assert _count_rows(location_engine) == 3
+
+
+def test_backpressure_waits_for_space():
+    async def scenario():
+        buffer = UserLocationWriteBuffer(None, flush_size=2, flush_interval=60.0,
+                                         max_pending=2, enqueue_timeout=5.0)
+        written = []
+        gate = asyncio.Event()
+        
+        async def gated_write(rows):
+            await gate.wait()
+            written.extend(rows)
+        
+        buffer._write = gated_write
+        
+        # 첫 배치는 쓰기 중에 멈춰 있고, 다음 두 위치로 버퍼가 가득 참
+        for _ in range(2):
+            await buffer.enqueue(37.5, 127.0)
+        await _wait_until(lambda: buffer.stats()['pending'] == 0)
+        for _ in range(2):
+            await buffer.enqueue(37.5, 127.0)
+        
+        blocked = asyncio.ensure_future(buffer.enqueue(37.6, 127.1))
+        await asyncio.sleep(0.05)
+        assert not blocked.done()
+        assert buffer.backpressure_waits == 1
+        
+        # 쓰기가 끝나 다음 배치를 꺼내면 기다리던 저장 요청이 버퍼에 들어감
+        gate.set()
+        await asyncio.wait_for(blocked, timeout=2.0)
+        await buffer.stop()
+        
+        assert len(written) == 5
+        assert buffer.direct_writes == 0
+        assert buffer.dropped == 0
+    
+    asyncio.run(scenario())
+
+
+def test_backpressure_timeout_writes_directly():
+    async def scenario():
+        buffer = UserLocationWriteBuffer(None, flush_size=1, flush_interval=60.0,
+                                         max_pending=1, enqueue_timeout=0.05)
+        written = []
+        gate = asyncio.Event()
+        
+        async def gated_write(rows):
+            if not written:
+                written.append(None)  # 첫 배치만 멈춤
+                await gate.wait()
+            written.extend(rows)
+        
+        buffer._write = gated_write
+        
+        await buffer.enqueue(37.5, 127.0)
+        await _wait_until(lambda: buffer.stats()['pending'] == 0)
+        await buffer.enqueue(37.5, 127.0)
+        await buffer.enqueue(37.6, 127.1)
+        assert buffer.direct_writes == 1
+        
+        gate.set()
+        await buffer.stop()
+        assert len([row for row in written if row is not None]) == 3
+    
+    asyncio.run(scenario())
+
+
+def test_stop_drains_pending_and_writes_directly_afterwards(location_engine, db_url):
+    async def scenario():
+        async_engine = create_async_engine(async_database_url(db_url))
+        buffer = UserLocationWriteBuffer(async_engine, flush_size=100, flush_interval=60.0)
+        try:
+            for i in range(10):
+                await buffer.enqueue(37.5, 127.0 + i * 0.001)
+            assert buffer.stats()['pending'] == 10
+            
+            await buffer.stop()
+            stats = buffer.stats()
+            assert stats['pending'] == 0
+            assert stats['flushed'] == 10
+            assert stats['running'] is False
+            
+            await buffer.enqueue(37.5, 127.0)
+            assert buffer.direct_writes == 1
+        finally:
+            await async_engine.dispose()
+    
+    asyncio.run(scenario())
+    assert _count_rows(location_engine) == 11
+    with location_engine.connect() as connection:
+        missing = connection.execute(text("SELECT COUNT(*) FROM user_locations WHERE geohash IS NULL")).scalar()
+    assert missing == 0
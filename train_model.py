@@ -54,6 +54,12 @@ data/
         default='models/recycling_classifier.h5', 
         help='모델 저장 경로 (기본값: models/recycling_classifier.h5)'
     )
+    parser.add_argument(
+        '--manifest', 
+        type=str, 
+        default=None, 
+        help='중복 제거 매니페스트 경로 (deduplicate_dataset.py 출력, 선택사항)'
+    )
     
     args = parser.parse_args()
     
@@ -68,6 +74,8 @@ data/
     print(f"데이터 디렉토리: {args.data_dir}")
     print(f"에포크 수: {args.epochs}")
     print(f"모델 저장 경로: {args.model_path}")
+    if args.manifest:
+        print(f"데이터 매니페스트: {args.manifest}")
     print("=" * 50)
     
     try:
@@ -75,7 +83,8 @@ data/
         history = train_model(
             data_dir=args.data_dir,
             epochs=args.epochs,
-            model_save_path=args.model_path
+            model_save_path=args.model_path,
+            manifest_path=args.manifest
         )
         
         print("\n" + "=" * 50)